@@ -0,0 +1,836 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from aplicacion.orquestador_proyecto import (
+    _extraer_tension,
+    adaptar_estructuras,
+    aplicar_descripciones,
+    ejecutar_proyecto,
+)
+from ayuda.debug import debug_activo
+from ayuda.medicion import Medidor, etapa
+from ayuda.sesion import estado_sesion
+from costos_precios.costos_estructuras import calcular_costos_por_estructura
+from costos_precios.costos_materiales import (
+    _norm_material,
+    _norm_text,
+    calcular_lista_materiales_con_costos,
+    preparar_catalogo_costos,
+)
+from costos_precios.costos_proyecto import calcular_costos_proyecto
+from costos_precios.indice_precios import IndicePrecios
+from costos_precios.mano_obra_por_punto import (
+    calcular_detalle_mano_obra,
+    obtener_lista_precios,
+)
+from costos_precios.orquestador_costos import precios_por_estructura
+from costos_precios.precio_estructura import _agregar_cable_a_precios
+from entradas.codigos import canonizar
+from entradas.orquestador_entradas import ejecutar_entradas
+from exportadores.orquestador_reportes import DEPENDENCIAS_REPORTES, generar_reportes
+from interfaz.contratos import ResultadoProyecto, SalidaInterfaz
+from materiales.calculos.bom_estructuras import obtener_bom
+from materiales.calculos.calculo_estructuras import estructuras_desde_filas
+from materiales.calculos.calculo_materiales import (
+    _normalizar_df_materiales,
+    _normalizar_estructuras,
+    _validar_match_estructuras,
+    integrar_cables,
+)
+from materiales.calculos.materiales_puntos import (
+    expandir_estructuras,
+    materiales_por_estructura_desde_bom,
+    materiales_por_punto_desde_filas,
+)
+from materiales.orquestador_materiales import _merge_materiales
+
+
+# =========================================================
+# 🔷 RECÁLCULO INCREMENTAL POR PUNTO
+# =========================================================
+# Al editar un punto en modo manual solo cambia la contribución
+# de ese punto. El estado guarda, de la última corrida:
+#
+#   ✔ materiales por punto (sin cables) y cantidades por código
+#   ✔ cantidades por estructura para costos
+#   ✔ costos por estructura, mano de obra y lista de costos
+#   ✔ huella de cada tabla que usan los reportes
+#
+# Con una edición se comparan los puntos (huella de sus filas),
+# se resta la contribución vieja de los puntos cambiados y se
+# suma la nueva: df_materiales, df_costos_materiales y
+# df_precios_estructura se rehacen sin recorrer los demás puntos.
+# Los PDF cuyas tablas cambiaron quedan como obsoletos y se
+# regeneran al exportar (actualizar_reportes).
+#
+# Si cambian tensión, contratista, cables, materiales extra,
+# datos del proyecto o catálogo, o demasiados puntos, se ejecuta
+# el proyecto completo. Cualquier error en el delta también cae
+# al cálculo completo (que reporta el error como siempre).
+FRACCION_MAXIMA = float(os.environ.get("CALCULO_INCREMENTAL_MAX_FRACCION", 0.5))
+
+GRUPOS_REPORTES = (
+    "df_estructuras",
+    "df_estructuras_por_punto",
+    "df_materiales",
+    "df_materiales_por_punto",
+    "df_costos_materiales",
+    "df_precios_estructura",
+    "costos",
+)
+
+
+@dataclass
+class EstadoIncremental:
+    """
+    Última corrida completa o incremental de un proyecto.
+    """
+
+    firma: str
+    resultado: ResultadoProyecto
+    contexto: Dict[str, Any]
+
+    huellas_puntos: pd.Series           # Punto → huella de sus filas
+    filas: pd.DataFrame                 # expandir_estructuras()
+    detalle_puntos: pd.DataFrame        # materiales por punto, sin cables
+    cantidades: pd.Series               # Codigo → cantidad (materiales)
+    cantidades_costos: pd.Series        # estructura → cantidad (costos)
+    catalogo_costos: pd.DataFrame
+    indice_catalogo: Optional[IndicePrecios] = None
+
+    huellas_reportes: Dict[str, str] = field(default_factory=dict)
+    obsoletos: Set[str] = field(default_factory=set)
+
+
+# =========================================================
+# HUELLAS
+# =========================================================
+def _huella(obj) -> str:
+    """
+    SHA-1 del contenido: DataFrame/Series por valores, dict por
+    clave (recursivo), lo demás por repr.
+    """
+
+    h = hashlib.sha1()
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        columnas = list(obj.columns) if isinstance(obj, pd.DataFrame) else [obj.name]
+        h.update(repr(columnas).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+
+    elif isinstance(obj, dict):
+        for k in sorted(obj, key=str):
+            h.update(str(k).encode("utf-8"))
+            h.update(_huella(obj[k]).encode("ascii"))
+
+    else:
+        h.update(repr(obj).encode("utf-8"))
+
+    return h.hexdigest()
+
+
+def _firma(salida, tension: float, contratista: str) -> str:
+    """
+    Todo lo que no son estructuras: si cambia, cálculo completo.
+    """
+
+    return _huella({
+        "datos_proyecto": salida.datos_proyecto or {},
+        "df_cables": salida.df_cables,
+        "df_materiales_extra": salida.df_materiales_extra,
+        "tension": tension,
+        "contratista": contratista,
+        # mismo snapshot de catálogo (el estado lo mantiene vivo)
+        "catalogo": id(salida.base_datos),
+    })
+
+
+def huellas_puntos(df_estructuras: pd.DataFrame) -> pd.Series:
+    """
+    SALIDA:
+    -------
+    Serie Punto (str) → tupla con la huella de cada fila del punto.
+    """
+
+    filas = pd.util.hash_pandas_object(
+        df_estructuras[["Estructura", "Cantidad"]].astype(str), index=False
+    )
+
+    return filas.groupby(
+        df_estructuras["Punto"].astype(str).to_numpy(), sort=False
+    ).agg(tuple)
+
+
+def puntos_cambiados(anteriores: pd.Series, actuales: pd.Series) -> Set[str]:
+    """
+    Puntos nuevos, borrados o con otras filas.
+    """
+
+    todos = anteriores.index.union(actuales.index)
+
+    a = anteriores.reindex(todos)
+    b = actuales.reindex(todos)
+
+    return {p for p, x, y in zip(todos, a, b) if x != y}
+
+
+def _huellas_reportes(entrada_rep) -> Dict[str, str]:
+
+    costos = entrada_rep.costos or {}
+
+    tablas = {
+        "df_estructuras": entrada_rep.df_estructuras,
+        "df_estructuras_por_punto": entrada_rep.df_estructuras_por_punto,
+        "df_materiales": entrada_rep.df_materiales,
+        "df_materiales_por_punto": entrada_rep.df_materiales_por_punto,
+        "df_costos_materiales": entrada_rep.df_costos_materiales,
+        "df_precios_estructura": costos.get("df_precios_estructura"),
+        "costos": costos,
+    }
+
+    return {g: _huella(tablas[g]) for g in GRUPOS_REPORTES}
+
+
+# =========================================================
+# CONTRIBUCIONES
+# =========================================================
+def _por_clave(claves: pd.Series, cantidades: pd.Series) -> pd.Series:
+
+    s = pd.to_numeric(cantidades, errors="coerce").fillna(0).groupby(
+        claves.astype(str).to_numpy()
+    ).sum()
+
+    return s.astype(float)
+
+
+def _contribucion_materiales(filas: pd.DataFrame) -> pd.Series:
+    return _por_clave(filas["Codigo"], filas["Cantidad"])
+
+
+def _contribucion_costos(df: pd.DataFrame) -> pd.Series:
+    # misma clave que calcular_costos_por_estructura()
+    return _por_clave(
+        canonizar(df["Estructura"], lambda e: e.str.strip()), df["Cantidad"]
+    )
+
+
+def _aplicar(total: pd.Series, vieja: pd.Series, nueva: pd.Series) -> pd.Series:
+    total = total.sub(vieja, fill_value=0).add(nueva, fill_value=0)
+    return total[total > 0]
+
+
+def _recategorizar(df: pd.DataFrame, columnas) -> pd.DataFrame:
+    """
+    concat de Categorical con otras categorías deja object: se
+    vuelven a canonizar (sin limpiar).
+    """
+
+    for c in columnas:
+        if c in df.columns:
+            df[c] = canonizar(df[c], lambda s: s)
+
+    return df
+
+
+# =========================================================
+# ESTADO
+# =========================================================
+def construir_estado(
+    resultado: ResultadoProyecto,
+    contexto: Dict[str, Any],
+) -> EstadoIncremental:
+    """
+    Estado a partir de una corrida completa de ejecutar_proyecto
+    (con contexto=dict).
+    """
+
+    salida = contexto["salida"]
+    tension = contexto["tension"]
+    df_estructuras = contexto["df_estructuras"]
+    datos = salida.datos_proyecto or {}
+
+    filas = expandir_estructuras(_normalizar_estructuras(df_estructuras))
+
+    detalle = resultado.materiales.df_materiales_por_punto
+
+    if "Punto" not in detalle.columns:
+        # con cables el detalle sale consolidado: se rehace por punto
+        detalle = _normalizar_df_materiales(materiales_por_punto_desde_filas(
+            hojas_base=salida.base_datos,
+            filas=filas,
+            tension=tension,
+            bom=obtener_bom(salida.base_datos, filas["Codigo"].unique()),
+            calibre_mt=datos.get("calibre_mt", ""),
+            tabla_conectores_mt=datos.get("tabla_conectores_mt", {}),
+        ))
+
+    catalogo = preparar_catalogo_costos(contexto["entrada_costos"].df_catalogo)
+
+    return EstadoIncremental(
+        firma=_firma(salida, tension, contexto["contratista"]),
+        resultado=resultado,
+        contexto=contexto,
+        huellas_puntos=huellas_puntos(df_estructuras),
+        filas=filas,
+        detalle_puntos=detalle,
+        cantidades=_contribucion_materiales(filas),
+        cantidades_costos=_contribucion_costos(df_estructuras),
+        catalogo_costos=catalogo,
+        indice_catalogo=IndicePrecios.desde_df(catalogo),
+        huellas_reportes=_huellas_reportes(contexto["entrada_reportes"]),
+    )
+
+
+# =========================================================
+# DELTA DE MATERIALES
+# =========================================================
+def _delta_materiales(estado: EstadoIncremental, df_viejas, df_nuevas):
+    """
+    SALIDA:
+    -------
+    (SalidaMateriales, filas, detalle_puntos, cantidades) o None
+    si hay que recalcular todo.
+    """
+
+    ctx = estado.contexto
+    salida = ctx["salida"]
+    base = salida.base_datos
+    tension = ctx["tension"]
+    datos = salida.datos_proyecto or {}
+
+    vacias = estado.filas.iloc[:0]
+
+    if not df_nuevas.empty:
+        # estructura inexistente → el cálculo completo da el error
+        _validar_match_estructuras(df_nuevas, base)
+
+    filas_viejas = expandir_estructuras(df_viejas) if not df_viejas.empty else vacias
+    filas_nuevas = expandir_estructuras(df_nuevas) if not df_nuevas.empty else vacias
+
+    # Punto en filas es el texto limpio ("" → "General")
+    etiquetas = set(filas_viejas["Punto"].astype(str)) | set(filas_nuevas["Punto"].astype(str))
+    en_cambiados = estado.filas["Punto"].astype(str).isin(etiquetas)
+
+    if int(en_cambiados.sum()) != len(filas_viejas):
+        # un punto sin cambios comparte etiqueta con uno cambiado
+        return None
+
+    cantidades = _aplicar(
+        estado.cantidades,
+        _contribucion_materiales(filas_viejas),
+        _contribucion_materiales(filas_nuevas),
+    )
+
+    if cantidades.empty:
+        return None
+
+    bom = obtener_bom(base, cantidades.index)
+
+    # -----------------------------
+    # Materiales por punto
+    # -----------------------------
+    detalle = estado.detalle_puntos
+    partes = [detalle[~detalle["Punto"].astype(str).isin(etiquetas)]]
+
+    if not filas_nuevas.empty:
+        try:
+            partes.append(_normalizar_df_materiales(materiales_por_punto_desde_filas(
+                hojas_base=base,
+                filas=filas_nuevas,
+                tension=tension,
+                bom=bom,
+                calibre_mt=datos.get("calibre_mt", ""),
+                tabla_conectores_mt=datos.get("tabla_conectores_mt", {}),
+            )))
+        except ValueError:
+            # ninguna estructura del punto tiene BOM a esta tensión:
+            # el cálculo completo también las omite
+            pass
+
+    detalle = _recategorizar(
+        _normalizar_df_materiales(pd.concat(partes, ignore_index=True)), ["Punto"]
+    )
+    detalle = detalle.sort_values(["Punto", "Materiales"]).reset_index(drop=True)
+
+    # -----------------------------
+    # Global = cantidades × BOM (+ cables + extras)
+    # -----------------------------
+    df_global = _normalizar_df_materiales(bom.matriz(tension).multiplicar(cantidades))
+    df_global, df_detalle = integrar_cables(df_global, detalle, salida.df_cables)
+
+    warnings = []
+    extra = salida.df_materiales_extra
+
+    if isinstance(extra, pd.DataFrame) and not extra.empty:
+        try:
+            df_global = _merge_materiales(df_global, extra)
+        except Exception as e:
+            warnings.append(f"Error integrando materiales extra: {e}")
+
+    filas = _recategorizar(
+        pd.concat([estado.filas[~en_cambiados], filas_nuevas], ignore_index=True),
+        ["Punto", "Estructura", "Codigo"],
+    )
+
+    res_mat = dataclasses.replace(
+        estado.resultado.materiales,
+        warnings=warnings,
+        df_materiales=df_global,
+        df_materiales_por_punto=df_detalle,
+        df_materiales_por_estructura=materiales_por_estructura_desde_bom(
+            bom, filas["Codigo"], tension
+        ),
+        **estructuras_desde_filas(filas),
+    )
+
+    return res_mat, filas, detalle, cantidades
+
+
+# =========================================================
+# DELTA DE COSTOS
+# =========================================================
+def _claves_costo(df: pd.DataFrame) -> pd.Series:
+    """
+    (Materiales, Unidad) como las deja calcular_lista_materiales_con_costos.
+    """
+
+    materiales = canonizar(df["Materiales"], lambda s: s.map(_norm_material))
+    unidades = canonizar(df["Unidad"], lambda s: s.map(_norm_text))
+
+    return pd.Series(
+        list(zip(materiales.astype(str), unidades.astype(str))), index=df.index
+    )
+
+
+def _delta_costos_materiales(estado, df_materiales: pd.DataFrame) -> pd.DataFrame:
+    """
+    Solo se vuelven a costear los materiales cuya cantidad cambió.
+    """
+
+    anterior = estado.resultado.materiales.df_materiales
+    df_costos = estado.resultado.costos["df_costos_materiales"]
+
+    cambios = anterior[["Materiales", "Unidad", "Cantidad"]].astype(
+        {"Materiales": str, "Unidad": str}
+    ).merge(
+        df_materiales[["Materiales", "Unidad", "Cantidad"]].astype(
+            {"Materiales": str, "Unidad": str}
+        ),
+        on=["Materiales", "Unidad"],
+        how="outer",
+        suffixes=("_a", "_b"),
+    )
+
+    cambios = cambios[~(cambios["Cantidad_a"] == cambios["Cantidad_b"])]
+
+    if cambios.empty:
+        return df_costos
+
+    afectadas = set(_claves_costo(cambios))
+    claves = _claves_costo(df_materiales)
+
+    a_costear = df_materiales[claves.isin(afectadas)]
+
+    partes = [df_costos[~_claves_costo(df_costos).isin(afectadas)]]
+
+    if not a_costear.empty:
+        try:
+            partes.append(calcular_lista_materiales_con_costos(
+                df_materiales=a_costear,
+                df_catalogo_costos=(
+                    estado.indice_catalogo if estado.indice_catalogo is not None
+                    else estado.catalogo_costos
+                ),
+            ))
+        except ValueError:
+            # sin costo en el catálogo: el cálculo completo las descarta
+            pass
+
+    return (
+        pd.concat(partes, ignore_index=True)
+        .sort_values(["Materiales", "Unidad"])
+        .reset_index(drop=True)
+    )
+
+
+def _delta_costos(estado, res_mat, df_viejas, df_nuevas, df_estructuras, cambiados):
+    """
+    SALIDA:
+    -------
+    (dict como ejecutar_costos, EntradaCostos, cantidades_costos)
+    o None si hay que recalcular todo.
+    """
+
+    ctx = estado.contexto
+    anterior = estado.resultado.costos
+
+    df_materiales = res_mat.df_materiales.copy()
+
+    with etapa("materiales", df_materiales) as e:
+        df_costos_materiales = _delta_costos_materiales(estado, df_materiales)
+        e.salida(df_costos_materiales)
+
+    # -----------------------------
+    # Costos por estructura: solo las afectadas
+    # -----------------------------
+    vieja = _contribucion_costos(df_viejas)
+    nueva = _contribucion_costos(df_nuevas)
+
+    cantidades = _aplicar(estado.cantidades_costos, vieja, nueva)
+    afectadas = set(vieja.index) | set(nueva.index)
+
+    df_ce = anterior["df_costos_estructura"]
+    partes = [df_ce[~df_ce["codigodeestructura"].astype(str).isin(afectadas)]]
+
+    recalcular = cantidades[cantidades.index.isin(afectadas)]
+
+    with etapa("por_estructura", recalcular) as e:
+        if not recalcular.empty:
+            try:
+                partes.append(calcular_costos_por_estructura(
+                    df_estructuras=pd.DataFrame({
+                        "Estructura": recalcular.index,
+                        "Cantidad": recalcular.to_numpy(),
+                    }),
+                    df_materiales_por_estructura=res_mat.df_materiales_por_estructura,
+                    df_precios_materiales=estado.catalogo_costos,
+                ))
+            except ValueError:
+                # ninguna con materiales: se omiten como en el completo
+                pass
+
+        df_costos_estructura = (
+            pd.concat(partes, ignore_index=True)
+            .sort_values("codigodeestructura")
+            .reset_index(drop=True)
+        )
+        e.salida(df_costos_estructura)
+
+    if df_costos_estructura.empty:
+        return None
+
+    # -----------------------------
+    # Mano de obra: filas de los puntos cambiados
+    # -----------------------------
+    df_mo = anterior["df_mano_obra"]
+    en_cambiados = df_mo["Punto"].astype(str).isin(cambiados)
+
+    if int(en_cambiados.sum()) != len(df_viejas):
+        # filas de cables / desmontaje con el nombre de un punto
+        return None
+
+    with etapa("mano_obra", df_nuevas) as e:
+        df_mano_obra = pd.concat(
+            [
+                df_mo[~en_cambiados],
+                calcular_detalle_mano_obra(
+                    df_nuevas, obtener_lista_precios(ctx["contratista"])
+                ),
+            ],
+            ignore_index=True,
+        ).sort_values(["Punto", "Estructura"])
+        e.salida(df_mano_obra)
+
+    # -----------------------------
+    # Precios (+ cables) como ejecutar_costos
+    # -----------------------------
+    entrada_costos = dataclasses.replace(
+        ctx["entrada_costos"],
+        df_materiales=df_materiales,
+        df_estructuras=df_estructuras,
+        df_materiales_por_estructura=res_mat.df_materiales_por_estructura,
+    )
+    entrada_costos.df_costos_materiales = df_costos_materiales
+
+    df_precios = precios_por_estructura(df_costos_estructura, df_mano_obra)
+
+    if df_precios.empty:
+        return None
+
+    df_precios = _agregar_cable_a_precios(df_precios, entrada_costos)
+    df_precios["Subtotal"] = df_precios["Total Proyecto"]
+
+    total = float(df_precios["Subtotal"].sum())
+
+    res_costos = {
+        **anterior,
+        "df_costos_materiales": df_costos_materiales,
+        "df_costos_estructura": df_costos_estructura,
+        "df_mano_obra": df_mano_obra,
+        "df_precios_estructura": df_precios,
+        "total_materiales": total,
+        "total_proyecto": total,
+    }
+
+    return res_costos, entrada_costos, cantidades
+
+
+# =========================================================
+# DELTA COMPLETO
+# =========================================================
+def _aplicar_cambios(
+    salida_interfaz: SalidaInterfaz,
+    estado: EstadoIncremental,
+    debug: Dict[str, Any],
+) -> Optional[Tuple[ResultadoProyecto, EstadoIncremental]]:
+
+    ctx = estado.contexto
+
+    with etapa("entradas") as e:
+        salida = ejecutar_entradas(salida_interfaz)
+        e.salida(salida.df_estructuras)
+
+    if not salida.ok or salida.df_estructuras is None or salida.df_estructuras.empty:
+        debug["motivo"] = "entradas sin estructuras"
+        return None
+
+    with etapa("descripciones", salida.df_estructuras) as e:
+        df_estructuras = aplicar_descripciones(
+            adaptar_estructuras(salida.df_estructuras), ctx["mapa"], {}
+        )
+        e.salida(df_estructuras)
+
+    tension = _extraer_tension(salida.datos_proyecto or {})
+    contratista = (
+        (salida.datos_proyecto or {}).get("contratista")
+        or estado_sesion().get("contratista", "C1")
+    )
+
+    if _firma(salida, tension, contratista) != estado.firma:
+        debug["motivo"] = "cambiaron datos del proyecto, cables, extras o catálogo"
+        return None
+
+    huellas = huellas_puntos(df_estructuras)
+    cambiados = puntos_cambiados(estado.huellas_puntos, huellas)
+
+    debug["puntos_cambiados"] = len(cambiados)
+
+    if not cambiados:
+        debug["modo"] = "sin_cambios"
+        return estado.resultado, estado
+
+    if len(cambiados) > FRACCION_MAXIMA * max(len(huellas), 1):
+        debug["motivo"] = f"{len(cambiados)} de {len(huellas)} puntos cambiados"
+        return None
+
+    anterior = ctx["df_estructuras"]
+
+    df_viejas = _normalizar_estructuras(anterior[anterior["Punto"].astype(str).isin(cambiados)])
+    df_nuevas = _normalizar_estructuras(df_estructuras[df_estructuras["Punto"].astype(str).isin(cambiados)])
+
+    # =====================================================
+    # MATERIALES
+    # =====================================================
+    with etapa("materiales", df_nuevas):
+        delta = _delta_materiales(estado, df_viejas, df_nuevas)
+
+    if delta is None:
+        debug["motivo"] = "puntos con la misma etiqueta"
+        return None
+
+    res_mat, filas, detalle, cantidades = delta
+
+    # =====================================================
+    # COSTOS
+    # =====================================================
+    with etapa("costos", df_nuevas):
+        delta = _delta_costos(estado, res_mat, df_viejas, df_nuevas, df_estructuras, cambiados)
+
+    if delta is None:
+        debug["motivo"] = "costos sin filas o puntos con la misma etiqueta"
+        return None
+
+    res_costos, entrada_costos, cantidades_costos = delta
+    df_precios = res_costos["df_precios_estructura"]
+
+    with etapa("costos_proyecto", df_estructuras):
+        res_cp = calcular_costos_proyecto(SimpleNamespace(
+            df_estructuras=df_estructuras,
+            df_cables=salida.df_cables,
+            df_costos_materiales=res_costos["df_costos_materiales"],
+            precio_venta_proyecto=float(
+                pd.to_numeric(df_precios["Total Proyecto"], errors="coerce").fillna(0).sum()
+            ),
+        ))
+
+    # =====================================================
+    # REPORTES: solo se marcan los obsoletos
+    # =====================================================
+    df_mat_pp = res_mat.df_materiales_por_punto.copy()
+
+    if "Punto" not in df_mat_pp.columns:
+        df_mat_pp["Punto"] = "GLOBAL"
+
+    entrada_rep = dataclasses.replace(
+        ctx["entrada_reportes"],
+        df_estructuras=df_estructuras,
+        df_estructuras_por_punto=aplicar_descripciones(
+            res_mat.df_estructuras_por_punto, ctx["mapa"], {}
+        ),
+        df_materiales=res_mat.df_materiales.copy(),
+        df_materiales_por_punto=df_mat_pp,
+        df_costos_materiales=res_costos["df_costos_materiales"],
+        costos={
+            "df_costos_estructura": res_costos["df_costos_estructura"],
+            "df_precios_estructura": df_precios,
+            **res_cp,
+        },
+    )
+
+    huellas_rep = _huellas_reportes(entrada_rep)
+    grupos = {g for g in GRUPOS_REPORTES if huellas_rep[g] != estado.huellas_reportes.get(g)}
+
+    obsoletos = set(estado.obsoletos) | {
+        nombre for nombre, deps in DEPENDENCIAS_REPORTES.items()
+        if grupos.intersection(deps)
+    }
+
+    previos = estado.resultado.reportes or {}
+
+    reportes = {
+        "archivos": {
+            k: v for k, v in previos.get("archivos", {}).items() if k not in obsoletos
+        },
+        "errores": [
+            e for e in previos.get("errores", []) if e.split(":", 1)[0] not in obsoletos
+        ],
+        "obsoletos": sorted(obsoletos),
+        "debug": {},
+    }
+
+    debug.update(modo="delta", obsoletos=sorted(obsoletos))
+
+    resultado = ResultadoProyecto(
+        ok=True,
+        errores=[],
+        warnings=[],
+        materiales=res_mat,
+        costos=res_costos,
+        reportes=reportes,
+        debug={"TOTAL_PROYECTO": res_costos["total_proyecto"]},
+    )
+
+    nuevo = EstadoIncremental(
+        firma=estado.firma,
+        resultado=resultado,
+        contexto={
+            **ctx,
+            "salida": salida,
+            "df_estructuras": df_estructuras,
+            "entrada_costos": entrada_costos,
+            "costos_proyecto": res_cp,
+            "entrada_reportes": entrada_rep,
+        },
+        huellas_puntos=huellas,
+        filas=filas,
+        detalle_puntos=detalle,
+        cantidades=cantidades,
+        cantidades_costos=cantidades_costos,
+        catalogo_costos=estado.catalogo_costos,
+        indice_catalogo=estado.indice_catalogo,
+        huellas_reportes=huellas_rep,
+        obsoletos=obsoletos,
+    )
+
+    return resultado, nuevo
+
+
+# =========================================================
+# API
+# =========================================================
+def _completo(salida_interfaz: SalidaInterfaz, debug: Dict[str, Any]):
+
+    contexto: Dict[str, Any] = {}
+    resultado = ejecutar_proyecto(salida_interfaz, contexto)
+
+    estado = None
+
+    if resultado.ok and contexto:
+        estado = construir_estado(resultado, contexto)
+
+    debug["modo"] = "completo"
+
+    if resultado.debug is None:
+        resultado.debug = {}
+
+    resultado.debug["INCREMENTAL"] = debug
+
+    return resultado, estado
+
+
+def ejecutar_proyecto_incremental(
+    salida_interfaz: SalidaInterfaz,
+    estado: Optional[EstadoIncremental] = None,
+) -> Tuple[ResultadoProyecto, Optional[EstadoIncremental]]:
+    """
+    Como ejecutar_proyecto, pero reutiliza el estado de la corrida
+    anterior: solo se recalculan los puntos que cambiaron y los
+    reportes afectados quedan en reportes["obsoletos"].
+
+    SALIDA:
+    -------
+    (ResultadoProyecto, EstadoIncremental para la próxima edición;
+    None si el cálculo falló)
+    """
+
+    debug: Dict[str, Any] = {}
+
+    if estado is None:
+        debug["motivo"] = "sin estado previo"
+        return _completo(salida_interfaz, debug)
+
+    with Medidor("incremental", memoria=debug_activo("full")) as medidor:
+        try:
+            aplicado = _aplicar_cambios(salida_interfaz, estado, debug)
+        except Exception as e:
+            aplicado = None
+            debug["motivo"] = f"{type(e).__name__}: {e}"
+
+    if aplicado is None:
+        return _completo(salida_interfaz, debug)
+
+    resultado, nuevo = aplicado
+
+    if nuevo is not estado:
+        resultado.debug["TIEMPOS"] = medidor.a_dict()
+        resultado.debug["INCREMENTAL"] = debug
+
+    return resultado, nuevo
+
+
+def actualizar_reportes(estado: EstadoIncremental) -> ResultadoProyecto:
+    """
+    Regenera solo los PDF obsoletos del último resultado.
+    """
+
+    if not estado.obsoletos:
+        return estado.resultado
+
+    reportes = estado.resultado.reportes or {}
+
+    nuevos = generar_reportes(
+        estado.contexto["entrada_reportes"], solo=estado.obsoletos
+    )
+
+    archivos = {**reportes.get("archivos", {}), **nuevos.get("archivos", {})}
+
+    estado.resultado.reportes = {
+        # mismo orden que la corrida completa
+        "archivos": {k: archivos[k] for k in DEPENDENCIAS_REPORTES if k in archivos},
+        "errores": list(reportes.get("errores", [])) + list(nuevos.get("errores", [])),
+        "obsoletos": [],
+        "debug": nuevos.get("debug", {}),
+    }
+
+    estado.obsoletos = set()
+
+    return estado.resultado
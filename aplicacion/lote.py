@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+lote.py
+
+Ejecución por lotes SIN Streamlit: entradas → materiales → costos →
+reportes para cada DXF/Excel de una carpeta, en un pool de procesos.
+
+Uso:
+  python -m aplicacion.lote proyectos/ --tension 13.8
+  python -m aplicacion.lote proyectos/ --salida salida/ --procesos 4 --contratista C2
+
+Por proyecto:
+  <salida>/<nombre>/*.pdf
+  <salida>/<nombre>/tiempos.json   (árbol de etapas)
+Resumen:
+  <salida>/resumen_lote.csv
+
+Datos de proyecto (de menor a mayor prioridad):
+  --datos archivo.json → hoja 'datos_proyecto' del Excel → <nombre>.json
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ayuda.sesion import reiniciar_estado_local
+from entradas.base_datos import obtener_catalogo
+from entradas.leer_excel import leer_datos_proyecto, leer_entrada_excel
+from interfaz.contratos import SalidaInterfaz
+
+
+EXTENSIONES = {
+    ".dxf": "dxf",
+    ".xlsx": "excel",
+    ".xls": "excel",
+}
+
+COLUMNAS_RESUMEN = [
+    "proyecto",
+    "archivo",
+    "ok",
+    "total_proyecto",
+    "estructuras",
+    "materiales",
+    "pdfs",
+    "segundos",
+    "errores",
+]
+
+
+# =========================================================
+# ENTRADAS
+# =========================================================
+def descubrir_entradas(carpeta: Path) -> List[Path]:
+    """
+    ✔ .dxf / .xlsx / .xls de la carpeta (sin subcarpetas)
+    ❌ temporales de Excel (~$...)
+    """
+
+    return sorted(
+        p for p in Path(carpeta).iterdir()
+        if p.is_file()
+        and p.suffix.lower() in EXTENSIONES
+        and not p.name.startswith("~$")
+    )
+
+
+def _datos_proyecto(ruta: Path, data: Any, tipo: str, datos_base: Dict[str, Any]) -> Dict[str, Any]:
+
+    datos = {"nombre_proyecto": ruta.stem, **datos_base}
+
+    if tipo == "excel":
+        try:
+            datos.update(leer_datos_proyecto(data))
+        except Exception:
+            pass
+
+    lateral = ruta.with_suffix(".json")
+
+    if lateral.exists():
+        with open(lateral, encoding="utf-8") as f:
+            datos.update(json.load(f))
+
+    return datos
+
+
+def construir_salida_interfaz(ruta: Path, datos_base: Dict[str, Any]) -> SalidaInterfaz:
+    """
+    Mismo contrato que arma la interfaz, leído desde disco.
+    """
+
+    tipo = EXTENSIONES[ruta.suffix.lower()]
+
+    data: Any = ruta
+
+    if tipo == "dxf":
+        data = io.BytesIO(ruta.read_bytes())
+
+    elif tipo == "excel":
+        # una apertura del libro: estructuras + datos_proyecto
+        try:
+            data = leer_entrada_excel(ruta)
+        except Exception:
+            data = ruta
+
+    return SalidaInterfaz(
+        ok=True,
+        tipo_entrada=tipo,
+        data_entrada=data,
+        datos_proyecto=_datos_proyecto(ruta, data, tipo, datos_base),
+    )
+
+
+# =========================================================
+# WORKER
+# =========================================================
+def _inicializar_worker():
+    # Un catálogo por proceso (snapshot + BOM compilada en disco)
+    obtener_catalogo()
+
+
+def _guardar_archivos(archivos: Dict[str, Any], carpeta: Path) -> int:
+
+    carpeta.mkdir(parents=True, exist_ok=True)
+
+    for nombre, contenido in archivos.items():
+
+        if isinstance(contenido, io.BytesIO):
+            contenido = contenido.getvalue()
+
+        (carpeta / Path(nombre).name).write_bytes(contenido)
+
+    return len(archivos)
+
+
+def procesar_proyecto(
+    ruta: Path,
+    carpeta_salida: Path,
+    datos_base: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    SALIDA:
+    -------
+    dict con las columnas de COLUMNAS_RESUMEN (una fila del CSV).
+    Nunca lanza: los errores quedan en la columna "errores".
+    """
+
+    from aplicacion.orquestador_proyecto import ejecutar_proyecto
+
+    ruta = Path(ruta)
+    datos_base = datos_base or {}
+
+    fila = {c: None for c in COLUMNAS_RESUMEN}
+    fila.update(proyecto=ruta.stem, archivo=ruta.name, ok=False, pdfs=0)
+
+    t0 = time.perf_counter()
+
+    try:
+        salida = construir_salida_interfaz(ruta, datos_base)
+
+        # Estado aislado por proyecto: los datos hacen de session_state
+        # (contratista, logística) y el debug no se acumula
+        reiniciar_estado_local(dict(salida.datos_proyecto))
+
+        resultado = ejecutar_proyecto(salida)
+
+        errores = list(resultado.errores or [])
+
+        tiempos = (resultado.debug or {}).get("TIEMPOS")
+
+        if tiempos:
+            carpeta = Path(carpeta_salida) / ruta.stem
+            carpeta.mkdir(parents=True, exist_ok=True)
+            (carpeta / "tiempos.json").write_text(
+                json.dumps(tiempos, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+
+        if resultado.ok:
+            reportes = resultado.reportes or {}
+            errores += list(reportes.get("errores") or [])
+
+            fila["pdfs"] = _guardar_archivos(
+                reportes.get("archivos") or {},
+                Path(carpeta_salida) / ruta.stem,
+            )
+
+            materiales = resultado.materiales
+            fila["total_proyecto"] = resultado.debug.get("TOTAL_PROYECTO")
+            fila["materiales"] = len(materiales.df_materiales)
+            fila["estructuras"] = (
+                len(materiales.df_estructuras)
+                if isinstance(materiales.df_estructuras, pd.DataFrame) else 0
+            )
+
+        fila["ok"] = bool(resultado.ok)
+        fila["errores"] = " | ".join(str(e).splitlines()[0] for e in errores if e)
+
+    except Exception as e:
+        fila["errores"] = f"{e}\n{traceback.format_exc()}"
+
+    fila["segundos"] = round(time.perf_counter() - t0, 3)
+
+    return fila
+
+
+# =========================================================
+# LOTE
+# =========================================================
+def ejecutar_lote(
+    carpeta: Path,
+    carpeta_salida: Path,
+    procesos: Optional[int] = None,
+    datos_base: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    procesos=1 → en este mismo proceso (útil para depurar).
+    """
+
+    entradas = descubrir_entradas(carpeta)
+
+    if not entradas:
+        raise ValueError(f"No hay archivos DXF/Excel en {carpeta}")
+
+    carpeta_salida = Path(carpeta_salida)
+    carpeta_salida.mkdir(parents=True, exist_ok=True)
+
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(entradas)))
+
+    # El snapshot se compila una vez aquí; los workers solo lo cargan
+    obtener_catalogo()
+
+    if procesos == 1:
+        filas = [procesar_proyecto(r, carpeta_salida, datos_base) for r in entradas]
+
+    else:
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicializar_worker,
+        ) as pool:
+            filas = list(pool.map(
+                procesar_proyecto,
+                entradas,
+                [carpeta_salida] * len(entradas),
+                [datos_base] * len(entradas),
+            ))
+
+    df = pd.DataFrame(filas, columns=COLUMNAS_RESUMEN).astype({
+        "estructuras": "Int64",
+        "materiales": "Int64",
+    })
+    df["total_proyecto"] = pd.to_numeric(df["total_proyecto"]).round(2)
+    df.to_csv(carpeta_salida / "resumen_lote.csv", index=False, encoding="utf-8")
+
+    return df
+
+
+# =========================================================
+# CLI
+# =========================================================
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(
+        description="Cálculo por lotes de proyectos DXF/Excel (sin Streamlit)"
+    )
+    parser.add_argument("carpeta", type=Path)
+    parser.add_argument("--salida", type=Path, help="Por defecto <carpeta>/salida_lote")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--tension", type=float, help="Tensión por defecto (kV)")
+    parser.add_argument("--contratista", help="Lista de precios (C1, C2, ... de data/precios_contratistas.json)")
+    parser.add_argument("--datos", type=Path, help="JSON con datos_proyecto por defecto")
+    args = parser.parse_args(argv)
+
+    datos_base: Dict[str, Any] = {}
+
+    if args.datos:
+        with open(args.datos, encoding="utf-8") as f:
+            datos_base.update(json.load(f))
+
+    if args.tension is not None:
+        datos_base["tension"] = args.tension
+
+    if args.contratista:
+        datos_base["contratista"] = args.contratista
+
+    df = ejecutar_lote(
+        args.carpeta,
+        args.salida or args.carpeta / "salida_lote",
+        procesos=args.procesos,
+        datos_base=datos_base,
+    )
+
+    print(df[["proyecto", "ok", "total_proyecto", "pdfs", "segundos"]].to_string(index=False))
+
+    return 0 if df["ok"].all() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
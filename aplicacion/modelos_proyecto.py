@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping
 import pandas as pd
 
+from entradas.base_datos import CatalogoBase
+
 
 @dataclass
 class EntradaProyecto:
@@ -21,7 +23,7 @@ class EntradaProyecto:
     # =========================
     # BASE OBLIGATORIA
     # =========================
-    base_datos: Dict[str, pd.DataFrame]
+    base_datos: Mapping[str, pd.DataFrame]
     df_estructuras: pd.DataFrame
 
     # =========================
@@ -59,12 +61,15 @@ class EntradaProyecto:
         # =====================================================
         # BASE DATOS
         # =====================================================
-        if not isinstance(self.base_datos, dict) or not self.base_datos:
+        if not isinstance(self.base_datos, Mapping) or not self.base_datos:
             raise ValueError("base_datos inválido o vacío")
 
-        for k, v in self.base_datos.items():
-            if not isinstance(v, pd.DataFrame):
-                raise TypeError(f"base_datos[{k}] no es DataFrame")
+        # El catálogo compartido solo contiene DataFrames; revisarlo
+        # obligaría a cargar todas las hojas.
+        if not isinstance(self.base_datos, CatalogoBase):
+            for k, v in self.base_datos.items():
+                if not isinstance(v, pd.DataFrame):
+                    raise TypeError(f"base_datos[{k}] no es DataFrame")
 
         # =====================================================
         # ESTRUCTURAS
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping
 import traceback
 import pandas as pd
 import unicodedata
@@ -22,7 +22,11 @@ from materiales.orquestador_materiales import ejecutar_materiales
 from costos_precios.orquestador_costos import ejecutar_costos, EntradaCostos
 from exportadores.orquestador_reportes import generar_reportes, EntradaReportes
 from entradas.base_datos import obtener_catalogo_materiales
+from entradas.codigos import canonizar
 from costos_precios.costos_proyecto import calcular_costos_proyecto
+from ayuda.sesion import estado_sesion
+from ayuda.debug import debug_activo
+from ayuda.medicion import Medidor, etapa
 
 
 # =========================================================
@@ -97,12 +101,8 @@ def adaptar_estructuras(df: pd.DataFrame) -> pd.DataFrame:
     if isinstance(col, pd.DataFrame):
         col = col.iloc[:, 0]
 
-    # 🔹 Limpieza
-    df["Estructura"] = (
-        col.astype(str)
-           .str.upper()
-           .str.strip()
-    )
+    # 🔹 Limpieza (Categorical: solo recorre las categorías)
+    df["Estructura"] = canonizar(col)
 
     # 🔹 ASEGURAR CANTIDAD
     if "Cantidad" not in df.columns:
@@ -113,7 +113,7 @@ def adaptar_estructuras(df: pd.DataFrame) -> pd.DataFrame:
 # =========================================================
 # MAPA INDICE (DESCRIPCIONES)
 # =========================================================
-def construir_mapa_indice(base: dict, debug: dict) -> dict:
+def construir_mapa_indice(base: Mapping, debug: dict) -> dict:
 
     df_indice = base.get("INDICE") 
 
@@ -121,16 +121,16 @@ def construir_mapa_indice(base: dict, debug: dict) -> dict:
         dbg(debug, "INDICE", "NO_ENCONTRADO")
         return {}
 
-    df_indice = df_indice.copy()
-    df_indice.columns = [limpiar_columna(c) for c in df_indice.columns]
+    # La hoja es compartida (catálogo del proceso): no se copia ni se muta
+    columnas = {limpiar_columna(c): c for c in df_indice.columns}
 
-    dbg(debug, "INDICE_COLUMNS", list(df_indice.columns))
+    dbg(debug, "INDICE_COLUMNS", list(columnas))
 
     col_codigo = None
     col_desc = None
 
     # 🔥 CORRECCIÓN AQUÍ
-    for c in df_indice.columns:
+    for c in columnas:
         if "CODIGO" in c:
             col_codigo = c
         if "DESCRIP" in c or "ESTRUCTURA" in c:
@@ -140,10 +140,10 @@ def construir_mapa_indice(base: dict, debug: dict) -> dict:
         dbg(debug, "INDICE_ERROR", "COLUMNAS_NO_DETECTADAS")
         return {}
 
-    df_indice[col_codigo] = df_indice[col_codigo].astype(str).str.upper().str.strip()
-    df_indice[col_desc] = df_indice[col_desc].astype(str).str.strip()
+    codigos = df_indice[columnas[col_codigo]].astype(str).str.upper().str.strip()
+    descripciones = df_indice[columnas[col_desc]].astype(str).str.strip()
 
-    mapa = dict(zip(df_indice[col_codigo], df_indice[col_desc]))
+    mapa = dict(zip(codigos, descripciones))
 
     dbg(debug, "MAPA_SIZE", len(mapa))
 
@@ -158,7 +158,7 @@ def aplicar_descripciones(df: pd.DataFrame, mapa: dict, debug: dict) -> pd.DataF
     df = df.copy()
 
     # 1. Generas la descripción
-    df["Descripcion"] = df["Estructura"].map(mapa).fillna("")
+    df["Descripcion"] = df["Estructura"].map(mapa).astype(object).fillna("")
 
     # 2. Detectas cuáles NO tienen match
     sin_desc = df[df["Descripcion"] == ""]["Estructura"].unique()
@@ -192,7 +192,33 @@ def aplicar_descripciones(df: pd.DataFrame, mapa: dict, debug: dict) -> pd.DataF
 # =========================================================
 # ORQUESTADOR PRINCIPAL
 # =========================================================
-def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
+def ejecutar_proyecto(
+    salida_interfaz: SalidaInterfaz,
+    contexto: Optional[dict] = None,
+) -> ResultadoProyecto:
+    """
+    debug["TIEMPOS"]: árbol de etapas (tiempo, CPU, filas y, con
+    debug "full", pico de tracemalloc). Ver ayuda/medicion.py.
+
+    contexto: si se pasa un dict, se llena con las tablas
+    intermedias (lo usa aplicacion/incremental.py).
+    """
+
+    with Medidor("proyecto", memoria=debug_activo("full")) as medidor:
+        resultado = _ejecutar_etapas(salida_interfaz, contexto)
+
+    if resultado.debug is None:
+        resultado.debug = {}
+
+    resultado.debug["TIEMPOS"] = medidor.a_dict()
+
+    return resultado
+
+
+def _ejecutar_etapas(
+    salida_interfaz: SalidaInterfaz,
+    contexto: Optional[dict] = None,
+) -> ResultadoProyecto:
 
     debug: Dict[str, Any] = {}
 
@@ -202,7 +228,9 @@ def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
         # =====================================================
         # 1. ENTRADAS
         # =====================================================
-        salida = ejecutar_entradas(salida_interfaz)
+        with etapa("entradas") as e:
+            salida = ejecutar_entradas(salida_interfaz)
+            e.salida(salida.df_estructuras)
 
         from interfaz.contratos import ResultadoProyecto
 
@@ -213,16 +241,21 @@ def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
             warnings=salida.warnings
         )
 
-        df_estructuras = adaptar_estructuras(salida.df_estructuras)
+        with etapa("descripciones", salida.df_estructuras) as e:
+            df_estructuras = adaptar_estructuras(salida.df_estructuras)
 
-        dbg(debug, "DF_STRUCT", df_estructuras.shape)
+            dbg(debug, "DF_STRUCT", df_estructuras.shape)
 
-        # =====================================================
-        # 2. DESCRIPCIONES (FIX REAL)
-        # =====================================================
-        mapa = construir_mapa_indice(salida.base_datos or {}, debug)
+            if "asignacion_espacial" in (salida.debug or {}):
+                dbg(debug, "ASIGNACION_ESPACIAL", salida.debug["asignacion_espacial"])
 
-        df_estructuras = aplicar_descripciones(df_estructuras, mapa, debug)
+            # =================================================
+            # 2. DESCRIPCIONES (FIX REAL)
+            # =================================================
+            mapa = construir_mapa_indice(salida.base_datos or {}, debug)
+
+            df_estructuras = aplicar_descripciones(df_estructuras, mapa, debug)
+            e.salida(df_estructuras)
 
         # =====================================================
         # 3. PROYECTO
@@ -256,7 +289,9 @@ def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
             tabla_conectores_mt=entrada_proyecto.tabla_conectores_mt,
         )
 
-        res_mat = ejecutar_materiales(entrada_mat)
+        with etapa("materiales", df_estructuras) as e:
+            res_mat = ejecutar_materiales(entrada_mat)
+            e.salida(getattr(res_mat, "df_materiales", None))
 
         df_materiales = (
             res_mat.df_materiales.copy()
@@ -302,9 +337,10 @@ def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
         # 5. COSTOS
         # =====================================================
         df_catalogo = obtener_catalogo_materiales(salida.base_datos)
-        import streamlit as st  # si no está arriba
-
-        contratista = st.session_state.get("contratista", "C1")
+        contratista = (
+            (salida.datos_proyecto or {}).get("contratista")
+            or estado_sesion().get("contratista", "C1")
+        )
         entrada_costos = EntradaCostos(
             df_materiales=df_materiales,
             df_catalogo=df_catalogo,
@@ -316,7 +352,9 @@ def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
 
         
 
-        res_costos = ejecutar_costos(entrada_costos)
+        with etapa("costos", df_materiales) as e:
+            res_costos = ejecutar_costos(entrada_costos)
+            e.salida(res_costos.get("df_precios_estructura"))
        
 
         dbg(debug, "COSTOS_OK", res_costos.get("ok"))
@@ -351,7 +389,8 @@ def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
         entrada_cp.df_costos_materiales = res_costos.get("df_costos_materiales")
         entrada_cp.precio_venta_proyecto = total
 
-        res_cp = calcular_costos_proyecto(entrada_cp)
+        with etapa("costos_proyecto", df_estructuras):
+            res_cp = calcular_costos_proyecto(entrada_cp)
         df_costos_materiales = res_costos.get("df_costos_materiales")
 
         # =====================================================
@@ -388,10 +427,24 @@ def ejecutar_proyecto(salida_interfaz: SalidaInterfaz) -> ResultadoProyecto:
             df_cables=salida.df_cables
         )
 
-        reportes = generar_reportes(entrada_rep)
+        with etapa("reportes", df_materiales) as e:
+            reportes = generar_reportes(entrada_rep)
+            e.salida((reportes or {}).get("archivos"))
 
         dbg(debug, "FIN", "OK")
 
+        if contexto is not None:
+            contexto.update(
+                salida=salida,
+                mapa=mapa,
+                tension=tension,
+                contratista=contratista,
+                df_estructuras=df_estructuras,
+                entrada_costos=entrada_costos,
+                costos_proyecto=res_cp,
+                entrada_reportes=entrada_rep,
+            )
+
         return ResultadoProyecto(
             ok=True,
             errores=[],
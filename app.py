@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 import streamlit as st
 
+from costos_precios.listas_precios import contratistas_disponibles
 from interfaz.orquestador_interfaz import ejecutar_orquestador_interfaz
 
 
@@ -125,7 +126,7 @@ def main():
 
     st.radio(
         "👷 Contratista",
-        ["C1", "C2"],
+        contratistas_disponibles(),
         key="contratista",
     )
 
@@ -136,6 +137,22 @@ def main():
     st.number_input("Costo flete", value=25000, key="costo_flete")
     st.number_input("Viajes", value=1, key="viajes_flete")
     st.number_input("Ingeniería", value=25000, key="ingenieria")
+    st.number_input(
+        "Simulaciones Monte Carlo (0 = sin simular)",
+        min_value=0,
+        max_value=100_000,
+        value=0,
+        step=10_000,
+        key="simulacion_muestras",
+    )
+    st.number_input(
+        "Cuadrillas en paralelo (0 = cronograma en serie)",
+        min_value=0,
+        max_value=50,
+        value=0,
+        step=1,
+        key="cuadrillas",
+    )
 
 
 
@@ -1,9 +1,208 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import json
+import os
+import re
+import sys
+
 import streamlit as st
 import pandas as pd
-import re
+
+from ayuda.medicion import tabla_tiempos
+from ayuda.sesion import estado_sesion
+
+
+# =========================================================
+# 🔷 NIVEL Y LÍMITE
+# =========================================================
+# off     → debug_guardar no hace nada (ni evalúa el payload)
+# summary → DataFrames como forma/columnas, textos y listas recortados
+# full    → payload completo
+NIVELES_DEBUG = ("off", "summary", "full")
+
+_NIVEL = os.environ.get("CALCULO_DEBUG", "summary").strip().lower()
+_MAX_BYTES = int(os.environ.get("CALCULO_DEBUG_MAX_BYTES", 5 * 1024 * 1024))
+
+if _NIVEL not in NIVELES_DEBUG:
+    _NIVEL = "summary"
+
+_CLAVE_NIVEL = "debug_pipeline_nivel"
+_CLAVE_TAMANOS = "debug_pipeline_tamanos"
+_CLAVE_BYTES = "debug_pipeline_bytes"
+
+_MAX_TEXTO = 500
+_MAX_ELEMENTOS = 20
+_MAX_PROFUNDIDAD = 4
+
+
+def configurar_debug(nivel: str | None = None, max_bytes: int | None = None):
+    """
+    ✔ Cambia el nivel por defecto del proceso (scripts, lotes, benchmarks)
+    ✔ max_bytes: tope del buffer; se descarta lo más antiguo
+    ❌ No usar desde la app: la pestaña Debug cambia solo la sesión
+    """
+
+    global _NIVEL, _MAX_BYTES
+
+    if nivel is not None:
+        nivel = str(nivel).strip().lower()
+
+        if nivel not in NIVELES_DEBUG:
+            raise ValueError(f"Nivel de debug inválido: {nivel} ({NIVELES_DEBUG})")
+
+        _NIVEL = nivel
+
+    if max_bytes is not None:
+        _MAX_BYTES = int(max_bytes)
+
+
+def _nivel_sesion(ss) -> str:
+    nivel = ss.get(_CLAVE_NIVEL)
+    return nivel if nivel in NIVELES_DEBUG else _NIVEL
+
+
+def nivel_debug() -> str:
+    """
+    Nivel de la sesión actual; si no lo eligió, el del proceso
+    (CALCULO_DEBUG).
+    """
+
+    return _nivel_sesion(estado_sesion())
+
+
+def debug_activo(nivel: str = "summary") -> bool:
+    """
+    Para bloques de debug caros que no pasan por debug_guardar.
+    """
+
+    return NIVELES_DEBUG.index(nivel_debug()) >= NIVELES_DEBUG.index(nivel)
+
+
+# =========================================================
+# 🔷 RESUMEN Y TAMAÑO
+# =========================================================
+def _resumir(valor, profundidad: int = 0):
+
+    if isinstance(valor, pd.DataFrame):
+        return {
+            "filas": len(valor),
+            "columnas": [str(c) for c in valor.columns[:_MAX_ELEMENTOS]],
+        }
+
+    if isinstance(valor, pd.Series):
+        return {"largo": len(valor), "nombre": str(valor.name)}
+
+    if isinstance(valor, str):
+        if len(valor) > _MAX_TEXTO:
+            return valor[:_MAX_TEXTO] + f"... (+{len(valor) - _MAX_TEXTO})"
+        return valor
+
+    if profundidad >= _MAX_PROFUNDIDAD:
+        return _resumir(str(valor), profundidad)
+
+    if isinstance(valor, dict):
+        items = list(valor.items())
+        salida = {
+            k: _resumir(v, profundidad + 1)
+            for k, v in items[:_MAX_ELEMENTOS * 2]
+        }
+        if len(items) > _MAX_ELEMENTOS * 2:
+            salida["..."] = f"+{len(items) - _MAX_ELEMENTOS * 2} claves"
+        return salida
+
+    if isinstance(valor, (list, tuple, set)):
+        items = list(valor)
+        salida = [_resumir(v, profundidad + 1) for v in items[:_MAX_ELEMENTOS]]
+        if len(items) > _MAX_ELEMENTOS:
+            salida.append(f"... (+{len(items) - _MAX_ELEMENTOS})")
+        return salida
+
+    return valor
+
+
+def _tamano(valor, profundidad: int = 0) -> int:
+    """
+    Estimación en bytes (no exacta, suficiente para el tope).
+    """
+
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        try:
+            return int(valor.memory_usage(deep=True).sum())
+        except Exception:
+            return sys.getsizeof(valor)
+
+    if isinstance(valor, (str, bytes)):
+        return sys.getsizeof(valor)
+
+    if profundidad < _MAX_PROFUNDIDAD:
+
+        if isinstance(valor, dict):
+            return sys.getsizeof(valor) + sum(
+                _tamano(k, profundidad + 1) + _tamano(v, profundidad + 1)
+                for k, v in valor.items()
+            )
+
+        if isinstance(valor, (list, tuple, set)):
+            return sys.getsizeof(valor) + sum(
+                _tamano(v, profundidad + 1) for v in valor
+            )
+
+    return sys.getsizeof(valor)
+
+
+# =========================================================
+# 🔷 BUFFER CON TOPE (FIFO)
+# =========================================================
+def _quitar(dbg: dict, ruta: tuple):
+    nodos = [dbg]
+
+    for k in ruta[:-1]:
+        siguiente = nodos[-1].get(k)
+        if not isinstance(siguiente, dict):
+            return
+        nodos.append(siguiente)
+
+    nodos[-1].pop(ruta[-1], None)
+
+    # dominios/etapas que quedaron vacíos
+    for nodo, k in zip(reversed(nodos[:-1]), reversed(ruta[:-1])):
+        if nodo.get(k) != {}:
+            break
+        nodo.pop(k)
+
+
+def _insertar(ss, ruta: tuple, valor):
+
+    dbg = ss.setdefault("debug_pipeline", {})
+    tamanos = ss.setdefault(_CLAVE_TAMANOS, {})
+    total = ss.get(_CLAVE_BYTES, 0)
+
+    # Lo que se pisa deja de contar (la propia ruta o sus hijos)
+    for r in [r for r in tamanos if r[:len(ruta)] == ruta or ruta[:len(r)] == r]:
+        total -= tamanos.pop(r)
+
+    tamano = _tamano(valor)
+
+    if tamano > _MAX_BYTES:
+        valor = f"<omitido: ~{tamano} bytes, tope {_MAX_BYTES}>"
+        tamano = _tamano(valor)
+
+    # Descartar lo más antiguo hasta que quepa
+    while tamanos and total + tamano > _MAX_BYTES:
+        viejo = next(iter(tamanos))
+        total -= tamanos.pop(viejo)
+        _quitar(dbg, viejo)
+
+    nodo = dbg
+    for k in ruta[:-1]:
+        if not isinstance(nodo.get(k), dict):
+            nodo[k] = {}
+        nodo = nodo[k]
+
+    nodo[ruta[-1]] = valor
+    tamanos[ruta] = tamano
+    ss[_CLAVE_BYTES] = total + tamano
 
 
 # =========================================================
@@ -14,51 +213,46 @@ def debug_guardar(*args):
     MODOS:
     ✔ debug_guardar(clave, valor)
     ✔ debug_guardar(dominio, etapa, clave, valor)
-    """
-
-    if "debug_pipeline" not in st.session_state:
-        st.session_state["debug_pipeline"] = {}
-
-    dbg = st.session_state["debug_pipeline"]
 
-    # =========================
-    # MODO SIMPLE (LEGACY)
-    # =========================
-    if len(args) == 2:
-        clave, valor = args
+    valor puede ser un callable sin argumentos: solo se evalúa
+    si el nivel no es "off" (ej. lambda: df.head(10)).
+    """
 
-        try:
-            dbg[clave] = valor
-        except:
-            dbg[clave] = str(valor)
+    ss = estado_sesion()
+    nivel = _nivel_sesion(ss)
 
+    if nivel == "off":
         return
 
-    # =========================
-    # MODO PROFESIONAL
-    # =========================
-    if len(args) == 4:
-        dominio, etapa, clave, valor = args
-
-        if dominio not in dbg:
-            dbg[dominio] = {}
+    if len(args) not in (2, 4):
+        return
 
-        if etapa not in dbg[dominio]:
-            dbg[dominio][etapa] = {}
+    *ruta, valor = args
 
+    if callable(valor) and not isinstance(valor, type):
         try:
-            dbg[dominio][etapa][clave] = valor
-        except:
-            dbg[dominio][etapa][clave] = str(valor)
+            valor = valor()
+        except Exception as e:
+            valor = f"<error evaluando debug: {e}>"
 
-        return
+    if nivel == "summary":
+        valor = _resumir(valor)
+
+    _insertar(ss, tuple(ruta), valor)
 
 
 # =========================================================
 # 🔷 LIMPIAR DEBUG
 # =========================================================
 def debug_limpiar():
-    st.session_state["debug_pipeline"] = {}
+    ss = estado_sesion()
+    ss["debug_pipeline"] = {}
+    ss[_CLAVE_TAMANOS] = {}
+    ss[_CLAVE_BYTES] = 0
+
+
+def debug_bytes() -> int:
+    return int(estado_sesion().get(_CLAVE_BYTES, 0))
 
 
 # =========================================================
@@ -153,10 +347,63 @@ def _mostrar_debug_valor(nombre, valor, nivel=4):
     st.write(valor)
 
 
+def _seccion_tiempos():
+
+    resultado = st.session_state.get("resultado_calculo")
+    tiempos = (getattr(resultado, "debug", None) or {}).get("TIEMPOS")
+
+    if not tiempos:
+        return
+
+    st.markdown("### ⏱️ Tiempos por etapa")
+
+    df = tabla_tiempos(tiempos)
+    df["Etapa"] = [
+        "\u2003" * n + e.rsplit("/", 1)[-1]
+        for n, e in zip(df["Nivel"], df["Etapa"])
+    ]
+
+    st.dataframe(df.drop(columns=["Nivel"]), use_container_width=True)
+
+    if not tiempos.get("memoria"):
+        st.caption("Memoria pico: solo con nivel de debug \"full\" (tracemalloc).")
+
+    st.download_button(
+        "⬇️ Exportar tiempos (JSON)",
+        json.dumps(tiempos, ensure_ascii=False, indent=2),
+        file_name="tiempos_proyecto.json",
+        mime="application/json",
+    )
+
+
 def seccion_debug():
 
     st.title("🧠 Debug del sistema")
 
+    # =====================================================
+    # NIVEL / TOPE
+    # =====================================================
+    # Solo para esta sesión: el del proceso es CALCULO_DEBUG
+    col_nivel, col_bytes = st.columns(2)
+
+    actual = nivel_debug()
+
+    nivel = col_nivel.selectbox(
+        "Nivel de debug (esta sesión)",
+        NIVELES_DEBUG,
+        index=NIVELES_DEBUG.index(actual),
+    )
+
+    if nivel != actual:
+        st.session_state[_CLAVE_NIVEL] = nivel
+
+    col_bytes.metric(
+        "Buffer usado",
+        f"{debug_bytes() / 1024:.0f} KB",
+        f"tope {_MAX_BYTES / 1024 / 1024:.1f} MB",
+        delta_color="off",
+    )
+
     debug = st.session_state.get("debug_pipeline", {})
 
     if debug:
@@ -169,6 +416,8 @@ def seccion_debug():
     else:
         st.info("No hay debug aún")
 
+    _seccion_tiempos()
+
     # =====================================================
     # BOTÓN LIMPIAR
     # =====================================================
@@ -200,7 +449,7 @@ def seccion_debug():
 
     if "Cantidad" in df.columns:
         st.dataframe(
-            df.groupby(col)["Cantidad"].sum().sort_values(ascending=False),
+            df.groupby(col, observed=True)["Cantidad"].sum().sort_values(ascending=False),
             use_container_width=True,
         )
     else:
@@ -239,7 +488,7 @@ def ejecutar_debug_completo():
     st.markdown("### 🔢 Conteo por estructura")
 
     if "Cantidad" in df.columns:
-        conteo = df.groupby(col)["Cantidad"].sum().sort_values(ascending=False)
+        conteo = df.groupby(col, observed=True)["Cantidad"].sum().sort_values(ascending=False)
     else:
         conteo = df[col].value_counts()
 
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+
+# =========================================================
+# 🔷 MEDICIÓN POR ETAPAS (TIEMPO / CPU / FILAS / MEMORIA)
+# =========================================================
+# ejecutar_proyecto abre un Medidor; las funciones internas
+# marcan sub-etapas con `with etapa("nombre"):` sin recibirlo
+# por parámetro. Sin Medidor activo, etapa() no mide nada.
+_MEDIDOR_ACTUAL: ContextVar[Optional["Medidor"]] = ContextVar(
+    "medidor_actual", default=None
+)
+
+VERSION_TIEMPOS = 1
+
+# tracemalloc es del proceso (start/stop/reset_peak globales) y en
+# Streamlit las sesiones son hilos del mismo proceso: solo un
+# Medidor por vez mide memoria.
+_MEMORIA_LOCK = threading.Lock()
+
+
+def contar_filas(obj) -> Optional[int]:
+    """
+    ✔ DataFrame / Series / list / dict → len
+    ❌ otro → None
+    """
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, list, tuple, dict)):
+        return len(obj)
+
+    return None
+
+
+@dataclass
+class NodoEtapa:
+    nombre: str
+    segundos: float = 0.0
+    cpu_segundos: float = 0.0
+    filas_entrada: Optional[int] = None
+    filas_salida: Optional[int] = None
+    memoria_pico_bytes: Optional[int] = None
+    error: Optional[str] = None
+    hijos: List["NodoEtapa"] = field(default_factory=list)
+
+    def salida(self, obj) -> None:
+        """
+        Registra las filas de salida de la etapa.
+        """
+
+        self.filas_salida = contar_filas(obj)
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "nombre": self.nombre,
+            "segundos": round(self.segundos, 6),
+            "cpu_segundos": round(self.cpu_segundos, 6),
+            "filas_entrada": self.filas_entrada,
+            "filas_salida": self.filas_salida,
+            "memoria_pico_bytes": self.memoria_pico_bytes,
+            "error": self.error,
+            "hijos": [h.a_dict() for h in self.hijos],
+        }
+
+
+@dataclass
+class _Marco:
+    nodo: NodoEtapa
+    t0: float
+    c0: float
+    memoria_base: int = 0
+    memoria_pico: int = 0
+
+
+class Medidor:
+    """
+    Árbol de tiempos de una ejecución.
+
+    ✔ cpu_segundos: CPU del hilo (time.thread_time), no cuenta el
+      trabajo de otras sesiones del mismo proceso
+    ✔ memoria=True activa tracemalloc (≈2-3x más lento): el pico de
+      cada etapa es relativo a la memoria trazada al entrar en ella
+    ❌ Si otro Medidor ya está midiendo memoria, este corre sin
+      memoria (a_dict()["memoria"] = False). El pico incluye lo que
+      asignen otros hilos mientras tanto
+    """
+
+    def __init__(self, nombre: str = "proyecto", memoria: bool = False):
+        self.memoria = memoria
+        self.raiz = NodoEtapa(nombre)
+        self._pila: List[_Marco] = []
+        self._token = None
+        self._detener_tracemalloc = False
+        self._lock_memoria = False
+
+    # -------------------------
+    # Contexto raíz
+    # -------------------------
+    def __enter__(self) -> "Medidor":
+
+        if self.memoria:
+            if _MEMORIA_LOCK.acquire(blocking=False):
+                self._lock_memoria = True
+
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._detener_tracemalloc = True
+            else:
+                self.memoria = False
+
+        self._token = _MEDIDOR_ACTUAL.set(self)
+        self._abrir(self.raiz)
+        return self
+
+    def __exit__(self, tipo, exc, tb):
+
+        try:
+            self._cerrar(exc)
+            _MEDIDOR_ACTUAL.reset(self._token)
+        finally:
+            if self._detener_tracemalloc:
+                tracemalloc.stop()
+                self._detener_tracemalloc = False
+
+            if self._lock_memoria:
+                _MEMORIA_LOCK.release()
+                self._lock_memoria = False
+
+        return False
+
+    # -------------------------
+    # Sub-etapas
+    # -------------------------
+    @contextmanager
+    def etapa(self, nombre: str, entrada=None) -> Iterator[NodoEtapa]:
+
+        nodo = NodoEtapa(nombre, filas_entrada=contar_filas(entrada))
+
+        if self._pila:
+            self._pila[-1].nodo.hijos.append(nodo)
+
+        self._abrir(nodo)
+
+        try:
+            yield nodo
+        except BaseException as e:
+            self._cerrar(e)
+            raise
+        else:
+            self._cerrar(None)
+
+    def _abrir(self, nodo: NodoEtapa):
+
+        marco = _Marco(nodo, time.perf_counter(), time.thread_time())
+
+        if self.memoria and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+
+            # el pico acumulado hasta aquí pertenece al padre
+            if self._pila:
+                padre = self._pila[-1]
+                padre.memoria_pico = max(padre.memoria_pico, pico)
+
+            tracemalloc.reset_peak()
+            marco.memoria_base = marco.memoria_pico = actual
+
+        self._pila.append(marco)
+
+    def _cerrar(self, exc):
+
+        marco = self._pila.pop()
+        nodo = marco.nodo
+
+        nodo.segundos = time.perf_counter() - marco.t0
+        nodo.cpu_segundos = time.thread_time() - marco.c0
+
+        if exc is not None:
+            nodo.error = f"{type(exc).__name__}: {exc}"
+
+        if self.memoria and tracemalloc.is_tracing():
+            _, pico = tracemalloc.get_traced_memory()
+            marco.memoria_pico = max(marco.memoria_pico, pico)
+            nodo.memoria_pico_bytes = marco.memoria_pico - marco.memoria_base
+
+            if self._pila:
+                padre = self._pila[-1]
+                padre.memoria_pico = max(padre.memoria_pico, marco.memoria_pico)
+
+            tracemalloc.reset_peak()
+
+    # -------------------------
+    # Exportar
+    # -------------------------
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "version": VERSION_TIEMPOS,
+            "memoria": self.memoria,
+            "arbol": self.raiz.a_dict(),
+        }
+
+    def a_json(self, indent: int = 2) -> str:
+        return json.dumps(self.a_dict(), ensure_ascii=False, indent=indent)
+
+
+# =========================================================
+# 🔷 API PARA LAS ETAPAS INTERNAS
+# =========================================================
+@contextmanager
+def etapa(nombre: str, entrada=None) -> Iterator[NodoEtapa]:
+    """
+    with etapa("bom", df) as e:
+        ...
+        e.salida(df_out)
+    """
+
+    medidor = _MEDIDOR_ACTUAL.get()
+
+    if medidor is None:
+        yield NodoEtapa(nombre)
+        return
+
+    with medidor.etapa(nombre, entrada) as nodo:
+        yield nodo
+
+
+def tabla_tiempos(tiempos: Dict[str, Any]) -> pd.DataFrame:
+    """
+    SALIDA:
+    -------
+    Una fila por etapa (recorrido en profundidad) con la ruta
+    "proyecto/materiales/bom" y las métricas del nodo.
+    """
+
+    filas = []
+
+    def recorrer(nodo, ruta, nivel):
+        ruta = f"{ruta}/{nodo['nombre']}" if ruta else nodo["nombre"]
+        filas.append({
+            "Etapa": ruta,
+            "Nivel": nivel,
+            "Segundos": nodo.get("segundos"),
+            "CPU": nodo.get("cpu_segundos"),
+            "Filas entrada": nodo.get("filas_entrada"),
+            "Filas salida": nodo.get("filas_salida"),
+            "Memoria pico (KB)": (
+                round(nodo["memoria_pico_bytes"] / 1024, 1)
+                if nodo.get("memoria_pico_bytes") is not None else None
+            ),
+            "Error": nodo.get("error"),
+        })
+
+        for hijo in nodo.get("hijos", []):
+            recorrer(hijo, ruta, nivel + 1)
+
+    arbol = (tiempos or {}).get("arbol")
+
+    if arbol:
+        recorrer(arbol, "", 0)
+
+    return pd.DataFrame(filas)
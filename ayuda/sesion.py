@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from typing import Any, Dict, MutableMapping, Optional
+
+
+# =========================================================
+# 🔷 ESTADO DE SESIÓN (STREAMLIT O LOCAL)
+# =========================================================
+# Fuera de `streamlit run` (lotes, scripts, benchmarks) no hay
+# st.session_state real: se usa un dict del proceso.
+_ESTADO_LOCAL: Dict[str, Any] = {}
+
+
+def en_streamlit() -> bool:
+    """
+    ✔ True dentro de `streamlit run`
+    ❌ False en scripts, lotes y procesos hijos
+    """
+
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except Exception:
+        return False
+
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+
+def estado_sesion() -> MutableMapping[str, Any]:
+
+    if en_streamlit():
+        import streamlit as st
+        return st.session_state
+
+    return _ESTADO_LOCAL
+
+
+def reiniciar_estado_local(valores: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Deja el estado local solo con `valores` (un proyecto por vez).
+    """
+
+    _ESTADO_LOCAL.clear()
+    _ESTADO_LOCAL.update(valores or {})
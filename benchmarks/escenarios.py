@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de evaluar_escenarios frente a repetir el costeo por
+cada escenario (contratista × utilidad).
+
+Antes cada escenario era una corrida más: ejecutar_costos del
+orquestador (catálogo, materiales, costos por estructura, mano de
+obra) y precio_estructura.ejecutar_costos con su utilidad. Ahora el
+costeo de materiales se hace una vez y los escenarios se evalúan
+como columnas. Se comprueba que cada df_precios_estructura sea igual
+al de la corrida separada.
+
+Uso:
+  python -m benchmarks.escenarios
+  python -m benchmarks.escenarios --puntos 500 2000 --utilidades 0 0.1 0.2 --json escenarios.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+
+from aplicacion.orquestador_proyecto import (
+    adaptar_estructuras,
+    aplicar_descripciones,
+    construir_mapa_indice,
+)
+from benchmarks.proyecto import familias_catalogo, generar_proyecto
+from costos_precios import precio_estructura
+from costos_precios.escenarios import Escenario, evaluar_escenarios
+from costos_precios.listas_precios import contratistas_disponibles
+from costos_precios.orquestador_costos import EntradaCostos, ejecutar_costos
+from entradas.base_datos import obtener_catalogo, obtener_catalogo_materiales
+from entradas.codigos import canonizar_columnas
+from entradas.normalizar import normalizar_estructuras
+from materiales.calculos.calculo_materiales import calcular_materiales_proyecto
+from materiales.orquestador_materiales import _merge_materiales
+
+
+# ==========================================================
+# PROYECTO (MATERIALES UNA VEZ)
+# ==========================================================
+def preparar(catalogo, puntos: int, tension: float, semilla: int = 0):
+
+    familias = familias_catalogo(catalogo, tension)
+    proyecto = generar_proyecto(familias, obtener_catalogo_materiales(catalogo), puntos, semilla)
+
+    df_norm, errores, _ = normalizar_estructuras(proyecto.df_texto)
+
+    if errores:
+        raise RuntimeError(f"normalizar_estructuras: {errores}")
+
+    mapa = construir_mapa_indice(catalogo, {})
+    df_estructuras = aplicar_descripciones(adaptar_estructuras(canonizar_columnas(df_norm)), mapa, {})
+
+    res_mat = calcular_materiales_proyecto(
+        hojas_base=catalogo,
+        df_estructuras=df_estructuras,
+        tension=tension,
+        df_cables=proyecto.df_cables,
+    )
+
+    return proyecto, df_estructuras, res_mat
+
+
+def _entrada_costos(catalogo, proyecto, df_estructuras, res_mat, contratista):
+
+    return EntradaCostos(
+        df_materiales=_merge_materiales(res_mat["df_materiales"], proyecto.df_materiales_extra),
+        df_catalogo=obtener_catalogo_materiales(catalogo),
+        df_estructuras=df_estructuras,
+        df_materiales_por_estructura=res_mat["df_materiales_por_estructura"],
+        df_cables=proyecto.df_cables,
+        contratista=contratista,
+    )
+
+
+def _entrada_precios(res_costos, proyecto):
+    # lo que precio_estructura.ejecutar_costos lee de entrada
+    return SimpleNamespace(
+        df_costos_estructura=res_costos["df_costos_estructura"],
+        df_costos_materiales=res_costos["df_costos_materiales"],
+        df_cables=proyecto.df_cables,
+        df_materiales_extra=proyecto.df_materiales_extra,
+    )
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(puntos_lista, utilidades, tension: float, semilla: int = 0):
+
+    catalogo = obtener_catalogo()
+    escenarios = [
+        Escenario(contratista=c, porcentaje_utilidad=u)
+        for c in contratistas_disponibles()
+        for u in utilidades
+    ]
+
+    resultados = []
+
+    for puntos in puntos_lista:
+
+        proyecto, df_estructuras, res_mat = preparar(catalogo, puntos, tension, semilla)
+
+        # -------------------------------------------------
+        # anterior: una corrida de costos por escenario
+        # -------------------------------------------------
+        t0 = time.perf_counter()
+        anteriores = {}
+
+        for e in escenarios:
+            res = ejecutar_costos(_entrada_costos(catalogo, proyecto, df_estructuras, res_mat, e.contratista))
+            anteriores[e.etiqueta] = precio_estructura.ejecutar_costos(
+                _entrada_precios(res, proyecto), e.contratista, e.porcentaje_utilidad
+            )["df_precios_estructura"]
+
+        t_anterior = time.perf_counter() - t0
+
+        # -------------------------------------------------
+        # escenarios: costeo una vez + columnas
+        # -------------------------------------------------
+        t0 = time.perf_counter()
+        res = ejecutar_costos(_entrada_costos(catalogo, proyecto, df_estructuras, res_mat, "C1"))
+        t_costeo = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        salida = evaluar_escenarios(_entrada_precios(res, proyecto), escenarios)
+        t_escenarios = time.perf_counter() - t0
+
+        if not salida["ok"]:
+            raise RuntimeError(salida["errores"])
+
+        for etiqueta, df in salida["precios"].items():
+            pd.testing.assert_frame_equal(
+                anteriores[etiqueta].reset_index(drop=True)[df.columns],
+                df,
+                check_dtype=False,
+                obj=etiqueta,
+            )
+
+        fila = {
+            "puntos": puntos,
+            "escenarios": len(escenarios),
+            "anterior_s": round(t_anterior, 3),
+            "costeo_s": round(t_costeo, 3),
+            "escenarios_s": round(t_escenarios, 3),
+        }
+        resultados.append(fila)
+
+        print(
+            f"{puntos:>6,} puntos x {len(escenarios)} escenarios | anterior {fila['anterior_s']:>7} s | "
+            f"costeo {fila['costeo_s']} s + escenarios {fila['escenarios_s']} s"
+        )
+
+    print(salida["df_comparacion"][["Escenario", "Total Proyecto", "Diferencia", "Diferencia %"]].to_string(index=False))
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--puntos", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--utilidades", type=float, nargs="+", default=[0.0, 0.1, 0.2])
+    parser.add_argument("--tension", type=float, default=13.8)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.puntos, args.utilidades, args.tension, args.semilla)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
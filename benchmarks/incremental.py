@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del recálculo incremental (edición de un punto en modo
+manual) frente a ejecutar_proyecto completo.
+
+Por cada edición se comprueba que las tablas del delta son las
+mismas que las del cálculo completo y se miden ambos tiempos,
+más la regeneración de los PDF obsoletos.
+
+Uso:
+  python -m benchmarks.incremental
+  python -m benchmarks.incremental --puntos 100 500 --json incremental.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from aplicacion.incremental import actualizar_reportes, ejecutar_proyecto_incremental
+from aplicacion.orquestador_proyecto import ejecutar_proyecto
+from ayuda.sesion import reiniciar_estado_local
+from benchmarks.proyecto import MEZCLA, familias_catalogo
+from entradas.base_datos import obtener_catalogo
+from interfaz.contratos import SalidaInterfaz
+
+
+TABLAS_MATERIALES = [
+    "df_materiales",
+    "df_materiales_por_punto",
+    "df_estructuras",
+    "df_estructuras_por_punto",
+]
+
+TABLAS_COSTOS = [
+    "df_costos_materiales",
+    "df_costos_estructura",
+    "df_mano_obra",
+    "df_precios_estructura",
+]
+
+
+# ==========================================================
+# PROYECTO MANUAL SINTÉTICO
+# ==========================================================
+def generar_puntos(familias, puntos: int, semilla: int = 0) -> pd.DataFrame:
+    """
+    Como construir_dataframe_salida(): Punto, Estructuras ("a; b").
+    """
+
+    rng = np.random.default_rng(semilla)
+    nombres = [f for f in MEZCLA if f in familias]
+
+    filas = []
+
+    for i in range(puntos):
+        codigos = [rng.choice(familias["POSTE"])]
+        codigos += [rng.choice(familias[f]) for f in rng.choice(nombres, size=rng.integers(1, 4))]
+        filas.append({"Punto": f"P-{i + 1:03d}", "Estructuras": "; ".join(codigos)})
+
+    return pd.DataFrame(filas)
+
+
+def ediciones(df: pd.DataFrame, familias, semilla: int = 1):
+    """
+    Agregar una estructura, borrar un punto, punto nuevo con un
+    código que el proyecto no usaba.
+    """
+
+    rng = np.random.default_rng(semilla)
+
+    usados = {c for t in df["Estructuras"] for c in t.split("; ")}
+    nuevos = [c for f in familias.values() for c in f if c not in usados]
+
+    i = int(rng.integers(len(df)))
+    editado = df.copy()
+    editado.loc[i, "Estructuras"] += f"; {rng.choice(familias['A'])}"
+    yield "agregar estructura", editado
+
+    editado = editado.drop(index=int(rng.integers(len(editado)))).reset_index(drop=True)
+    yield "borrar punto", editado
+
+    editado = pd.concat([editado, pd.DataFrame([{
+        "Punto": "P-NUEVO",
+        "Estructuras": f"{familias['POSTE'][0]}; {nuevos[0] if nuevos else familias['B'][0]}",
+    }])], ignore_index=True)
+    yield "punto nuevo", editado
+
+
+def _salida(df: pd.DataFrame, tension: float) -> SalidaInterfaz:
+    return SalidaInterfaz(
+        ok=True,
+        tipo_entrada="manual",
+        data_entrada=df,
+        datos_proyecto={"nombre_proyecto": "Incremental", "tension": tension},
+    )
+
+
+# ==========================================================
+# COMPARACIÓN
+# ==========================================================
+def _comparable(df: pd.DataFrame) -> pd.DataFrame:
+
+    df = df.copy()
+
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype(str)
+        elif df[c].dtype == object:
+            numeros = pd.to_numeric(df[c], errors="coerce")
+            df[c] = numeros if numeros.notna().all() else df[c].astype(str)
+
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def comparar_resultados(delta, completo) -> None:
+
+    for nombre in TABLAS_MATERIALES:
+        pd.testing.assert_frame_equal(
+            _comparable(getattr(delta.materiales, nombre)),
+            _comparable(getattr(completo.materiales, nombre)),
+            check_dtype=False,
+            obj=nombre,
+        )
+
+    for nombre in TABLAS_COSTOS:
+        pd.testing.assert_frame_equal(
+            _comparable(delta.costos[nombre]),
+            _comparable(completo.costos[nombre]),
+            check_dtype=False,
+            obj=nombre,
+        )
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(puntos, tension: float, semilla: int = 0):
+
+    catalogo = obtener_catalogo()
+    familias = familias_catalogo(catalogo, tension)
+
+    resultados = []
+
+    for n in puntos:
+
+        reiniciar_estado_local({"tension": tension})
+
+        df = generar_puntos(familias, n, semilla)
+
+        t0 = time.perf_counter()
+        _, estado = ejecutar_proyecto_incremental(_salida(df, tension))
+        inicial = time.perf_counter() - t0
+
+        if estado is None:
+            raise RuntimeError("La corrida inicial falló")
+
+        print(f"\n{n} puntos | corrida inicial {inicial:.2f} s")
+
+        for nombre, editado in ediciones(df, familias, semilla + 1):
+
+            t0 = time.perf_counter()
+            delta, estado = ejecutar_proyecto_incremental(_salida(editado, tension), estado)
+            t_delta = time.perf_counter() - t0
+
+            modo = delta.debug.get("INCREMENTAL", {}).get("modo")
+            obsoletos = len(estado.obsoletos)
+
+            t0 = time.perf_counter()
+            completo = ejecutar_proyecto(_salida(editado, tension))
+            t_completo = time.perf_counter() - t0
+
+            if not completo.ok:
+                raise RuntimeError(f"{nombre}: {completo.errores}")
+
+            comparar_resultados(delta, completo)
+
+            t0 = time.perf_counter()
+            actualizar_reportes(estado)
+            t_reportes = time.perf_counter() - t0
+
+            fila = {
+                "puntos": n,
+                "edicion": nombre,
+                "modo": modo,
+                "delta_s": round(t_delta, 3),
+                "completo_s": round(t_completo, 3),
+                "reportes_obsoletos": obsoletos,
+                "reportes_s": round(t_reportes, 3),
+            }
+            resultados.append(fila)
+
+            print(
+                f"  {nombre:<20} {modo:<8} delta {fila['delta_s']:>7} s | "
+                f"completo {fila['completo_s']:>7} s | "
+                f"{obsoletos} PDF obsoletos ({fila['reportes_s']} s)"
+            )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--puntos", type=int, nargs="+", default=[200])
+    parser.add_argument("--tension", type=float, default=13.8)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.puntos, args.tension, args.semilla)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del índice de precios frente a la búsqueda anterior de
+materiales extra.
+
+La búsqueda anterior copiaba df_costos_materiales y le pasaba
+_norm_material a cada fila por cada material extra (O(extras x
+filas)). El índice se arma una vez y cada búsqueda es O(1).
+
+Uso:
+  python -m benchmarks.indice_precios
+  python -m benchmarks.indice_precios --filas 1000 5000 --extras 200 --json indice.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from costos_precios.costos_materiales import _norm_material
+from costos_precios.indice_precios import IndicePrecios
+
+
+# ==========================================================
+# TABLA SINTÉTICA
+# ==========================================================
+def generar_costos(filas: int, semilla: int = 0) -> pd.DataFrame:
+
+    rng = np.random.default_rng(semilla)
+
+    return pd.DataFrame({
+        "Materiales": [f"CABLE DE ALUMINIO # {i}/0 AWG , TIPO {i % 7}" for i in range(filas)],
+        "Unidad": rng.choice(["PIE", "C/U", "M"], size=filas),
+        "Cantidad": rng.integers(1, 100, size=filas).astype(float),
+        "Costo Unitario": rng.uniform(1, 500, size=filas).round(2),
+    })
+
+
+# ==========================================================
+# REFERENCIA: BÚSQUEDA ANTERIOR (COPIA + REGEX POR FILA)
+# ==========================================================
+def _buscar_anterior(material, unidad, df_costos_materiales) -> float:
+
+    df_busqueda = df_costos_materiales.copy()
+    df_busqueda["_Clave Material"] = df_busqueda["Materiales"].astype(str).apply(_norm_material)
+    df_busqueda["_Clave Unidad"] = df_busqueda["Unidad"].astype(str).str.strip().str.upper()
+
+    coincidencias = df_busqueda[
+        df_busqueda["_Clave Material"].eq(_norm_material(material))
+        & df_busqueda["_Clave Unidad"].eq(str(unidad).strip().upper())
+    ]
+
+    return float(coincidencias["Costo Unitario"].iloc[0])
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(filas_lista, extras: int, semilla: int = 0):
+
+    resultados = []
+
+    for filas in filas_lista:
+
+        df = generar_costos(filas, semilla)
+        elegidos = df.sample(n=min(extras, filas), random_state=semilla)
+
+        t0 = time.perf_counter()
+        anterior = [
+            _buscar_anterior(m, u, df)
+            for m, u in zip(elegidos["Materiales"], elegidos["Unidad"])
+        ]
+        t_anterior = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        indice = IndicePrecios.desde_df(df)
+        t_armar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        nuevos = [indice.precio(m, u) for m, u in zip(elegidos["Materiales"], elegidos["Unidad"])]
+        t_buscar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        lote = indice.precios_df(elegidos)
+        t_lote = time.perf_counter() - t0
+
+        if anterior != nuevos or anterior != lote.tolist():
+            raise RuntimeError("El índice no devuelve los mismos precios")
+
+        fila = {
+            "filas": filas,
+            "extras": len(elegidos),
+            "anterior_s": round(t_anterior, 4),
+            "indice_armar_s": round(t_armar, 4),
+            "indice_buscar_s": round(t_buscar, 4),
+            "indice_lote_s": round(t_lote, 4),
+        }
+        resultados.append(fila)
+
+        print(
+            f"{filas:>7,} filas x {len(elegidos)} extras | anterior {fila['anterior_s']:>8} s | "
+            f"índice {fila['indice_armar_s']} s + {fila['indice_buscar_s']} s "
+            f"(lote {fila['indice_lote_s']} s)"
+        )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--extras", type=int, default=100)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.filas, args.extras, args.semilla)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de leer_dxf (streaming) frente al lector anterior.
+
+El lector anterior leía todo el archivo, lo decodificaba y hacía
+splitlines(): varias copias del DXF en memoria. El actual recorre
+el binario por bloques y solo arma las entidades TEXT/MTEXT.
+
+Uso:
+  python -m benchmarks.leer_dxf
+  python -m benchmarks.leer_dxf --mb 10 80 150 --json dxf.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from entradas.leer_dxf import CAPA_OBJETIVO, leer_dxf
+
+
+# ==========================================================
+# DXF SINTÉTICO
+# ==========================================================
+def _par(codigo, valor) -> str:
+    return f"{codigo:>3}\n{valor}\n"
+
+
+def generar_dxf(ruta: str, mb: float, semilla: int = 0) -> int:
+    """
+    DXF ASCII de ~mb megabytes con la forma de un levantamiento:
+    HEADER y TABLES chicos, BLOCKS y OBJECTS con relleno, y en
+    ENTITIES muchas LINE/LWPOLYLINE con un TEXT/MTEXT de estructuras
+    cada ~40 entidades.
+
+    SALIDA: cantidad de textos en la capa objetivo.
+    """
+
+    rng = np.random.default_rng(semilla)
+    objetivo = int(mb * 1024 * 1024)
+
+    linea = (
+        _par(0, "LINE") + _par(5, "1F") + _par(8, "TOPOGRAFIA")
+        + _par(10, "512345.1234") + _par(20, "1534567.5678") + _par(30, "0.0")
+        + _par(11, "512355.4321") + _par(21, "1534577.8765") + _par(31, "0.0")
+    )
+    polilinea = (
+        _par(0, "LWPOLYLINE") + _par(5, "2A") + _par(8, "CURVAS") + _par(90, 4) + _par(70, 0)
+        + "".join(_par(10, f"5123{i}.25") + _par(20, f"15345{i}.75") for i in range(4))
+    )
+    relleno = linea * 30 + polilinea * 10
+
+    textos = 0
+    escrito = 0
+
+    with open(ruta, "w", encoding="latin-1", newline="\n") as f:
+
+        def escribir(txt):
+            nonlocal escrito
+            f.write(txt)
+            escrito += len(txt)
+
+        escribir(_par(0, "SECTION") + _par(2, "HEADER"))
+        escribir(_par(9, "$ACADVER") + _par(1, "AC1015"))
+        escribir(_par(9, "$CLAYER") + _par(8, "0"))
+        escribir(_par(0, "ENDSEC"))
+
+        escribir(_par(0, "SECTION") + _par(2, "TABLES"))
+        for capa in ("0", "TOPOGRAFIA", "CURVAS", CAPA_OBJETIVO):
+            escribir(_par(0, "LAYER") + _par(2, capa) + _par(70, 0) + _par(62, 7))
+        escribir(_par(0, "ENDSEC"))
+
+        escribir(_par(0, "SECTION") + _par(2, "BLOCKS"))
+        while escrito < objetivo * 0.1:
+            escribir(_par(0, "BLOCK") + _par(8, "0") + _par(2, "SIMBOLO") + relleno + _par(0, "ENDBLK"))
+        escribir(_par(0, "ENDSEC"))
+
+        escribir(_par(0, "SECTION") + _par(2, "ENTITIES"))
+
+        punto = 0
+        while escrito < objetivo * 0.9:
+            escribir(relleno)
+
+            punto += 1
+            codigos = " ".join(
+                f"{c} (P)" for c in rng.choice(
+                    ["PC-40", "A-I-1", "B-I-4", "R-3V", "2R-2", "CS-2"],
+                    size=rng.integers(1, 4),
+                )
+            )
+            tipo = "MTEXT" if punto % 2 else "TEXT"
+
+            escribir(
+                _par(0, tipo) + _par(5, f"{punto:X}") + _par(8, CAPA_OBJETIVO)
+                + _par(10, "512345.0") + _par(20, "1534567.0") + _par(40, "2.5")
+                + _par(1, f"P-{punto} {codigos}")
+            )
+            textos += 1
+
+        # el lector anterior arrastraba la capa de la última entidad
+        # y tomaba los código 3 de OBJECTS: se cierra con geometría
+        escribir(relleno + _par(0, "ENDSEC"))
+
+        escribir(_par(0, "SECTION") + _par(2, "OBJECTS"))
+        while escrito < objetivo:
+            escribir(_par(0, "DICTIONARY") + _par(5, "C") + _par(3, "ACAD_GROUP") + _par(350, "D") * 50)
+        escribir(_par(0, "ENDSEC") + _par(0, "EOF"))
+
+    return textos
+
+
+# ==========================================================
+# REFERENCIA: LECTOR ANTERIOR (TODO EN MEMORIA)
+# ==========================================================
+def _leer_dxf_anterior(archivo) -> list:
+
+    contenido = archivo.read().decode("latin-1", errors="ignore")
+    lineas = contenido.splitlines()
+
+    layer_actual = ""
+    buffer_texto = []
+    textos = []
+
+    for i in range(len(lineas) - 1):
+
+        codigo = lineas[i].strip()
+        valor = lineas[i + 1].strip()
+
+        if codigo == "8":
+            layer_actual = valor.upper()
+
+        if codigo in ("1", "3") and CAPA_OBJETIVO in layer_actual:
+            buffer_texto.append(valor)
+
+        if codigo == "0" and buffer_texto:
+            texto_unido = " ".join(buffer_texto).strip()
+            if texto_unido:
+                textos.append(texto_unido)
+            buffer_texto = []
+
+    if buffer_texto:
+        texto_unido = " ".join(buffer_texto).strip()
+        if texto_unido:
+            textos.append(texto_unido)
+
+    return textos
+
+
+def _medir(funcion, ruta: str):
+    """
+    SALIDA: (segundos, pico_bytes, resultado)
+    Tiempo sin tracemalloc; memoria en una segunda pasada.
+    """
+
+    gc.collect()
+
+    with open(ruta, "rb") as f:
+        t0 = time.perf_counter()
+        resultado = funcion(f)
+        segundos = time.perf_counter() - t0
+
+    del resultado
+    gc.collect()
+
+    tracemalloc.start()
+
+    with open(ruta, "rb") as f:
+        resultado = funcion(f)
+
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return segundos, pico, resultado
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(tamanos, referencia: bool = True):
+
+    resultados = []
+
+    with tempfile.TemporaryDirectory() as carpeta:
+
+        for mb in tamanos:
+
+            ruta = os.path.join(carpeta, f"sintetico_{mb}mb.dxf")
+            textos = generar_dxf(ruta, mb)
+
+            t_nuevo, pico_nuevo, df = _medir(leer_dxf, ruta)
+
+            if len(df) != textos:
+                raise RuntimeError(f"leer_dxf devolvió {len(df)} textos, se esperaban {textos}")
+
+            fila = {
+                "mb": round(os.path.getsize(ruta) / 1024 / 1024, 1),
+                "textos": textos,
+                "streaming_s": round(t_nuevo, 3),
+                "streaming_pico_mb": round(pico_nuevo / 1024 / 1024, 2),
+                "anterior_s": None,
+                "anterior_pico_mb": None,
+            }
+
+            if referencia:
+                t_ref, pico_ref, textos_ref = _medir(_leer_dxf_anterior, ruta)
+
+                if textos_ref != df["texto"].tolist():
+                    raise RuntimeError("El lector anterior y el streaming no coinciden")
+
+                fila["anterior_s"] = round(t_ref, 3)
+                fila["anterior_pico_mb"] = round(pico_ref / 1024 / 1024, 2)
+
+            resultados.append(fila)
+            print(
+                f"{fila['mb']:>7} MB | {textos:>7} textos | "
+                f"streaming {fila['streaming_s']:>7} s {fila['streaming_pico_mb']:>8} MB | "
+                f"anterior {fila['anterior_s'] if fila['anterior_s'] is not None else '-':>7} s "
+                f"{fila['anterior_pico_mb'] if fila['anterior_pico_mb'] is not None else '-':>8} MB"
+            )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=float, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--sin-referencia", action="store_true", help="No medir el lector anterior")
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.mb, referencia=not args.sin_referencia)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
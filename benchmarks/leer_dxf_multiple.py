@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de leer_dxf_multiple: un alimentador partido en varias
+hojas DXF, en serie frente al pool de procesos.
+
+Hojas consecutivas comparten el punto del borde (mismas estructuras
+→ duplicado); cada tercera hoja lo trae con otra estructura
+(conflicto → unión en un solo punto). También mide la segunda subida con una
+hoja más: solo esa pasa por lectura y normalización.
+
+Uso:
+  python -m benchmarks.leer_dxf_multiple
+  python -m benchmarks.leer_dxf_multiple --hojas 4 8 --mb 5 --json dxf_multiple.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.leer_dxf import _par
+from entradas.cache_entradas import limpiar_cache_entradas
+from entradas.leer_dxf import CAPA_OBJETIVO
+from entradas.leer_dxf_multiple import leer_dxf_multiple
+
+
+CODIGOS = ["PC-40", "A-I-1", "B-I-4", "R-3V", "2R-2", "CS-2"]
+
+
+# ==========================================================
+# HOJAS SINTÉTICAS
+# ==========================================================
+def _estructuras(punto: int) -> str:
+    # mismas estructuras para el mismo punto en cualquier hoja
+    rng = np.random.default_rng(punto)
+    return " ".join(f"{c} (P)" for c in rng.choice(CODIGOS, size=rng.integers(1, 4)))
+
+
+def generar_hoja(ruta: str, hoja: int, puntos: int, mb: float) -> None:
+    """
+    Hoja k: puntos k*(puntos-1)+1 … k*(puntos-1)+puntos; el primero
+    es el último de la hoja anterior.
+    """
+
+    inicio = hoja * (puntos - 1) + 1
+    relleno = (
+        _par(0, "LINE") + _par(8, "TOPOGRAFIA")
+        + _par(10, "512345.1234") + _par(20, "1534567.5678")
+        + _par(11, "512355.4321") + _par(21, "1534577.8765")
+    ) * 40
+    por_punto = max(1, int(mb * 1024 * 1024 / puntos / len(relleno)))
+
+    with open(ruta, "w", encoding="latin-1", newline="\n") as f:
+
+        f.write(_par(0, "SECTION") + _par(2, "ENTITIES"))
+
+        for p in range(inicio, inicio + puntos):
+
+            f.write(relleno * por_punto)
+
+            texto = _estructuras(p)
+            if p == inicio and hoja % 3 == 2:
+                texto += " CS-2 (P)"
+
+            f.write(
+                _par(0, "TEXT") + _par(8, CAPA_OBJETIVO)
+                + _par(10, f"{512000 + p * 30}.0") + _par(20, "1534567.0")
+                + _par(1, f"P-{p} {texto}")
+            )
+
+        f.write(_par(0, "ENDSEC") + _par(0, "EOF"))
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def _medir(rutas, procesos):
+
+    limpiar_cache_entradas()
+
+    t0 = time.perf_counter()
+    procesada, errores, informe = leer_dxf_multiple(rutas, procesos=procesos)
+    segundos = time.perf_counter() - t0
+
+    if errores:
+        raise RuntimeError(errores)
+
+    return segundos, procesada, informe
+
+
+def ejecutar(hojas_lista, puntos: int, mb: float, procesos=None):
+
+    resultados = []
+
+    with tempfile.TemporaryDirectory() as carpeta:
+
+        for hojas in hojas_lista:
+
+            rutas = []
+            for k in range(hojas + 1):
+                ruta = os.path.join(carpeta, f"hoja{k + 1}.dxf")
+                if not os.path.exists(ruta):
+                    generar_hoja(ruta, k, puntos, mb)
+                rutas.append(ruta)
+
+            t_serie, df_serie, _ = _medir(rutas[:hojas], 1)
+            t_pool, procesada, informe = _medir(rutas[:hojas], procesos)
+
+            if not df_serie.df_estructuras.equals(procesada.df_estructuras):
+                raise RuntimeError("El pool y la versión en serie no coinciden")
+
+            # segunda subida con una hoja más: el resto sale de la caché
+            t0 = time.perf_counter()
+            _, errores, informe_mas = leer_dxf_multiple(rutas, procesos=procesos)
+            t_mas = time.perf_counter() - t0
+
+            if errores:
+                raise RuntimeError(errores)
+
+            conflictos = informe["dxf_conflictos"]
+            esperados = hojas * (puntos - 1) + 1
+
+            if procesada.df_estructuras["Punto"].nunique() != esperados:
+                raise RuntimeError("Cantidad de puntos unidos inesperada")
+
+            if procesada.df_estructuras.duplicated(["Punto", "Estructura"]).any():
+                raise RuntimeError("Estructura repetida en un punto unido")
+
+            fila = {
+                "hojas": hojas,
+                "mb_por_hoja": mb,
+                "puntos": esperados,
+                "serie_s": round(t_serie, 3),
+                "pool_s": round(t_pool, 3),
+                "hoja_extra_s": round(t_mas, 3),
+                "cache_hoja_extra": int(informe_mas["dxf_archivos"]["Cache"].sum()),
+                "duplicados": int((conflictos["Tipo"] == "duplicado").sum()),
+                "conflictos": int((conflictos["Tipo"] == "conflicto").sum()),
+            }
+            resultados.append(fila)
+
+            print(
+                f"{hojas:>3} hojas x {mb} MB | serie {fila['serie_s']:>7} s | "
+                f"pool {fila['pool_s']:>7} s | +1 hoja {fila['hoja_extra_s']:>7} s "
+                f"({fila['cache_hoja_extra']} de caché) | "
+                f"{fila['duplicados']} duplicados, {fila['conflictos']} conflictos"
+            )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hojas", type=int, nargs="+", default=[4, 8])
+    parser.add_argument("--puntos", type=int, default=200, help="Puntos por hoja")
+    parser.add_argument("--mb", type=float, default=5, help="Tamaño de cada hoja")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    print(f"CPU: {os.cpu_count()}")
+
+    resultados = ejecutar(args.hojas, args.puntos, args.mb, args.procesos)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la entrada Excel: una apertura en streaming +
+limpieza vectorizada frente a la lectura anterior.
+
+La lectura anterior abría el libro una vez por hoja
+(pd.read_excel de 'estructuras' completa, 'datos_proyecto' y
+'materialesadicionados') y limpiaba celda por celda con apply.
+
+Se prueban los dos formatos de 'estructuras': vertical (Punto,
+Estructura 1..3) y el horizontal de la interfaz (Punto | Poste |
+Primario | ... | Luminarias). La salida de normalizar_estructuras
+debe ser idéntica en ambos.
+
+Uso:
+  python -m benchmarks.leer_excel
+  python -m benchmarks.leer_excel --filas 20000 100000 --formatos horizontal --json excel.json
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from entradas.leer_excel import (
+    leer_adicionales,
+    leer_datos_proyecto,
+    leer_entrada_excel,
+    leer_estructuras,
+)
+from entradas.normalizar import normalizar_estructuras
+
+
+CODIGOS = ["PC-40", "A-I-1", "B-I-4", "B-III-1", "R-3V", "2R-2", "CS-2", "TS-37.5KVA", "CT-A"]
+
+# columnas de interfaz/estructuras_ui._fila_horizontal → códigos
+HORIZONTAL = {
+    "Poste": ["PC-40", "PC-35"],
+    "Primario": ["A-I-1", "A-I-4", "A-III-1"],
+    "Secundario": ["B-I-4", "B-III-1"],
+    "Retenidas": ["R-3V", "R-1"],
+    "Conexiones a tierra": ["CS-2", "CT-A"],
+    "Transformadores": ["TS-37.5KVA"],
+    "Luminarias": ["LL-1"],
+}
+
+FORMATOS = ("vertical", "horizontal")
+
+
+# ==========================================================
+# LIBRO SINTÉTICO
+# ==========================================================
+def _hoja_vertical(ws, filas: int, rng) -> None:
+    """
+    Punto, Estructura 1..3 (celdas con saltos de línea y espacios
+    de más), y columnas que la normalización no usa: coordenadas,
+    observaciones y fecha.
+    """
+
+    ws.append([
+        "Punto", "Estructura 1", "Estructura 2", "Estructura 3",
+        "Coordenada X", "Coordenada Y", "Observaciones", "Fecha levantamiento",
+    ])
+
+    for n in range(filas):
+        estructuras = [
+            f" {rng.choice(CODIGOS)}  (P)\n" if rng.random() < 0.8 else None
+            for _ in range(3)
+        ]
+        ws.append([
+            f"P-{n + 1}", *estructuras,
+            float(rng.uniform(500000, 510000)), float(rng.uniform(1500000, 1510000)),
+            "revisar  servidumbre\ncon propietario" if n % 7 == 0 else None,
+            "2026-03-01",
+        ])
+
+
+def _hoja_horizontal(ws, filas: int, rng) -> None:
+    """
+    Formato de la interfaz: Punto | Poste | Primario | Secundario |
+    Retenidas | Conexiones a tierra | Transformadores | Luminarias,
+    con "2xR-3V, CS-2" en las celdas como _agrupar.
+    """
+
+    ws.append(["Punto", *HORIZONTAL])
+
+    for n in range(filas):
+        celdas = []
+
+        for codigos in HORIZONTAL.values():
+            if rng.random() < 0.5:
+                celdas.append(None)
+                continue
+
+            cantidad = int(rng.integers(1, 3))
+            codigo = str(rng.choice(codigos))
+            celdas.append(codigo if cantidad == 1 else f"{cantidad}x{codigo}")
+
+        ws.append([f"P-{n + 1}", *celdas])
+
+
+def generar_excel(filas: int, semilla: int = 0, formato: str = "vertical") -> bytes:
+    """
+    'estructuras' en formato vertical u horizontal, más
+    'datos_proyecto' y 'materialesadicionados'.
+    """
+
+    rng = np.random.default_rng(semilla)
+
+    # Workbook normal (no write_only): escribe <dimension> como Excel
+    wb = Workbook()
+
+    ws = wb.active
+    ws.title = "estructuras"
+
+    if formato == "horizontal":
+        _hoja_horizontal(ws, filas, rng)
+    else:
+        _hoja_vertical(ws, filas, rng)
+
+    ws = wb.create_sheet("datos_proyecto")
+    ws.append(["campo", "valor"])
+    for campo, valor in [("Nombre_proyecto", "Sintético"), ("Tension", 13.8), ("Cliente", "ENEE")]:
+        ws.append([campo, valor])
+
+    ws = wb.create_sheet("materialesadicionados")
+    ws.append(["Material", "Unidad", "Cantidad"])
+    ws.append(["CINTA AISLANTE", "C/U", 10])
+
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+# ==========================================================
+# REFERENCIA: LECTURA ANTERIOR
+# ==========================================================
+def _limpiar_texto_basico(s):
+    if pd.isna(s):
+        return ""
+
+    s = str(s).strip()
+    s = s.replace("\n", " ").replace("\r", " ")
+    s = re.sub(r"\s+", " ", s)
+
+    return s
+
+
+def _leer_anterior(datos: bytes):
+
+    df = pd.read_excel(io.BytesIO(datos), sheet_name="estructuras")
+    df.columns = [str(c).strip() for c in df.columns]
+
+    for col in df.columns:
+        df[col] = df[col].apply(_limpiar_texto_basico)
+
+    proyecto = pd.read_excel(io.BytesIO(datos), sheet_name="datos_proyecto", usecols=[0, 1], nrows=20)
+    adicionales = pd.read_excel(io.BytesIO(datos), sheet_name="materialesadicionados")
+
+    return df, proyecto, adicionales
+
+
+def _leer_nuevo(datos: bytes):
+
+    libro = leer_entrada_excel(datos)
+
+    return leer_estructuras(libro), leer_datos_proyecto(libro), leer_adicionales(libro)
+
+
+def _medir(funcion, repeticiones: int):
+    tiempos = []
+    resultado = None
+
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t0)
+
+    return min(tiempos), resultado
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(filas, repeticiones: int, formatos=FORMATOS):
+
+    resultados = []
+
+    for n, formato in ((n, f) for n in filas for f in formatos):
+
+        datos = generar_excel(n, formato=formato)
+
+        t_nuevo, (df_nuevo, _, _) = _medir(lambda: _leer_nuevo(datos), repeticiones)
+        t_ref, (df_ref, _, _) = _medir(lambda: _leer_anterior(datos), repeticiones)
+
+        norm_nuevo, _, _ = normalizar_estructuras(df_nuevo)
+        norm_ref, _, _ = normalizar_estructuras(df_ref)
+
+        if norm_ref.empty:
+            raise RuntimeError(f"Formato {formato}: la lectura anterior no dio estructuras")
+
+        pd.testing.assert_frame_equal(norm_nuevo, norm_ref)
+
+        fila = {
+            "filas": n,
+            "formato": formato,
+            "mb": round(len(datos) / 1024 / 1024, 2),
+            "columnas": f"{df_nuevo.shape[1]}/{df_ref.shape[1]}",
+            "nuevo_s": round(t_nuevo, 3),
+            "anterior_s": round(t_ref, 3),
+            "aceleracion": round(t_ref / t_nuevo, 1),
+        }
+
+        resultados.append(fila)
+        print(
+            f"{n:>7} filas {formato:<10} ({fila['mb']} MB) | columnas {fila['columnas']} | "
+            f"nuevo {fila['nuevo_s']:>7} s | anterior {fila['anterior_s']:>7} s | x{fila['aceleracion']}"
+        )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[20_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=list(FORMATOS))
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.filas, args.repeticiones, args.formatos)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
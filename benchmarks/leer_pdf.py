@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de leer_pdf sobre un juego de planos sintético.
+
+Compara el lector (hash por página + filtro PyPDF2 + pdfplumber
+solo en páginas con estructuras, en pool) con extraer todas las
+páginas con pdfplumber en serie. Mide también la segunda lectura
+del mismo archivo (todo desde la caché por página).
+
+Uso:
+  python -m benchmarks.leer_pdf
+  python -m benchmarks.leer_pdf --paginas 50 300 --procesos 4 --json pdf.json
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import time
+
+import numpy as np
+import pdfplumber
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A3, landscape
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+from entradas.leer_pdf import limpiar_cache_pdf, leer_pdf
+from entradas.normalizar import normalizar_estructuras
+
+
+CODIGOS = ["PC-40", "A-I-1", "B-I-4", "B-III-1", "R-3V", "2R-2", "CS-2", "TS-37.5KVA"]
+
+FILAS_POR_TABLA = 25
+
+
+# ==========================================================
+# PDF SINTÉTICO
+# ==========================================================
+def _plano(c, rng, n: int, ancho: float, alto: float):
+    """
+    Página de planta: líneas, curvas de nivel y notas generales
+    (mucho texto, ningún código de estructura).
+    """
+
+    c.setLineWidth(0.3)
+    for _ in range(400):
+        x, y = rng.uniform(0, ancho), rng.uniform(0, alto)
+        c.line(x, y, x + rng.uniform(-80, 80), y + rng.uniform(-80, 80))
+
+    c.setFont("Helvetica", 7)
+    for i in range(60):
+        c.drawString(40, alto - 60 - i * 10, f"NOTA {i + 1}: verificar cota de terreno y servidumbre, hoja {n}")
+
+
+def _tabla(c, rng, punto: int, alto: float) -> int:
+    """
+    Tabla Punto | Estructuras + una anotación suelta al pie.
+    SALIDA: último punto usado.
+    """
+
+    datos = [["PUNTO", "ESTRUCTURAS"]]
+
+    for _ in range(FILAS_POR_TABLA):
+        punto += 1
+        codigos = " ".join(f"{k} (P)" for k in rng.choice(CODIGOS, size=rng.integers(1, 4)))
+        datos.append([f"P-{punto}", codigos])
+
+    tabla = Table(datos, colWidths=[60, 320])
+    tabla.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ]))
+
+    _, h = tabla.wrapOn(c, 0, 0)
+    tabla.drawOn(c, 60, alto - 80 - h)
+
+    punto += 1
+    c.setFont("Helvetica", 8)
+    c.drawString(500, alto - 100, f"P-{punto} A-I-1 (P) CS-2 (P) R-2 (E)")
+
+    return punto
+
+
+def generar_pdf(paginas: int, cada: int = 10, semilla: int = 0) -> bytes:
+    """
+    paginas páginas A3; una de cada `cada` es de tablas de
+    estructuras, el resto planta + notas, y la carátula se repite
+    al inicio de cada tramo (páginas idénticas).
+    """
+
+    rng = np.random.default_rng(semilla)
+    ancho, alto = landscape(A3)
+
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=(ancho, alto))
+
+    punto = 0
+
+    for n in range(paginas):
+        if n % cada == 0:
+            c.setFont("Helvetica-Bold", 24)
+            c.drawString(60, alto / 2, "RED DE DISTRIBUCIÓN - TRAMO")
+        elif n % cada == cada - 1:
+            punto = _tabla(c, rng, punto, alto)
+        else:
+            _plano(c, rng, n, ancho, alto)
+
+        c.showPage()
+
+    c.save()
+    return buf.getvalue()
+
+
+# ==========================================================
+# REFERENCIA: TODAS LAS PÁGINAS CON PDFPLUMBER
+# ==========================================================
+def _leer_todo(datos: bytes) -> int:
+
+    lineas = 0
+
+    with pdfplumber.open(io.BytesIO(datos)) as pdf:
+        for pagina in pdf.pages:
+            lineas += len(pagina.extract_text_lines())
+            pagina.find_tables()
+            pagina.close()
+
+    return lineas
+
+
+def _medir(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - t0, resultado
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(paginas, procesos, referencia: bool = True):
+
+    resultados = []
+
+    for n in paginas:
+
+        datos = generar_pdf(n)
+
+        limpiar_cache_pdf()
+        t_frio, df = _medir(lambda: leer_pdf(datos, procesos=procesos))
+        t_cache, df_cache = _medir(lambda: leer_pdf(datos, procesos=procesos))
+
+        if not df.equals(df_cache):
+            raise RuntimeError("La lectura desde caché no coincide")
+
+        df_norm, errores, _ = normalizar_estructuras(df)
+
+        if errores:
+            raise RuntimeError(f"normalizar_estructuras falló: {errores}")
+
+        fila = {
+            "paginas": n,
+            "mb": round(len(datos) / 1024 / 1024, 2),
+            "filas": len(df),
+            "puntos": int(df_norm["Punto"].nunique()),
+            "lector_s": round(t_frio, 3),
+            "cache_s": round(t_cache, 3),
+            "todo_pdfplumber_s": None,
+        }
+
+        if referencia:
+            t_ref, _ = _medir(lambda: _leer_todo(datos))
+            fila["todo_pdfplumber_s"] = round(t_ref, 3)
+
+        resultados.append(fila)
+        print(
+            f"{n:>5} páginas ({fila['mb']} MB) | {fila['puntos']:>5} puntos | "
+            f"lector {fila['lector_s']:>7} s | caché {fila['cache_s']:>6} s | "
+            f"todo pdfplumber {fila['todo_pdfplumber_s'] if referencia else '-':>7} s"
+        )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paginas", type=int, nargs="+", default=[50, 300])
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--sin-referencia", action="store_true", help="No medir pdfplumber sobre todo el archivo")
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.paginas, args.procesos, referencia=not args.sin_referencia)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
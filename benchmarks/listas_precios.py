@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de las listas de precios de contratistas compiladas frente
+a la búsqueda anterior (exacto + recorrido startswith por fila).
+
+Genera una lista con N claves y un detalle de mano de obra con
+códigos que coinciden exacto, por prefijo o no coinciden. Las dos
+versiones deben dar los mismos precios (la lista sintética no tiene
+claves que sean prefijo de otras, donde "primera" y "más larga"
+pueden diferir).
+
+Uso:
+  python -m benchmarks.listas_precios
+  python -m benchmarks.listas_precios --claves 100 2000 --filas 50000 --json listas.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from costos_precios.listas_precios import ListaPrecios
+from costos_precios.mano_obra_por_punto import calcular_detalle_mano_obra
+
+
+# ==========================================================
+# LISTA Y DETALLE SINTÉTICOS
+# ==========================================================
+def generar_lista(claves: int, semilla: int = 0) -> dict:
+
+    rng = np.random.default_rng(semilla)
+
+    return {
+        f"E{i:05d}-": int(p)
+        for i, p in enumerate(rng.integers(300, 5000, size=claves))
+    }
+
+
+def generar_detalle(lista: dict, filas: int, semilla: int = 0) -> pd.DataFrame:
+
+    rng = np.random.default_rng(semilla)
+    claves = list(lista)
+
+    codigos = []
+    for k in rng.integers(len(claves), size=filas):
+        tipo = rng.integers(3)
+        if tipo == 0:
+            codigos.append(claves[k])
+        elif tipo == 1:
+            codigos.append(f"{claves[k]}V")
+        else:
+            codigos.append(f"X-{k}")
+
+    return pd.DataFrame({
+        "Punto": [f"P-{i // 4 + 1}" for i in range(filas)],
+        "Estructura": codigos,
+        "Cantidad": rng.integers(1, 4, size=filas),
+    })
+
+
+# ==========================================================
+# REFERENCIA: BÚSQUEDA ANTERIOR
+# ==========================================================
+def _precio_anterior(estructura, lista_precios) -> float:
+
+    estructura = str(estructura).upper().strip()
+
+    if estructura in lista_precios:
+        return lista_precios[estructura]
+
+    for key in lista_precios:
+        if estructura.startswith(key):
+            return lista_precios[key]
+
+    return 0
+
+
+def _detalle_anterior(df: pd.DataFrame, lista_precios) -> pd.DataFrame:
+
+    filas = []
+
+    for _, row in df.iterrows():
+
+        cantidad = int(row["Cantidad"])
+        precio = _precio_anterior(row["Estructura"], lista_precios)
+
+        filas.append({
+            "Punto": row["Punto"],
+            "Estructura": row["Estructura"],
+            "Cantidad": cantidad,
+            "Precio": round(precio, 2),
+            "Subtotal": round(precio * cantidad, 2),
+        })
+
+    return pd.DataFrame(filas)
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(claves_lista, filas: int, semilla: int = 0):
+
+    resultados = []
+
+    for claves in claves_lista:
+
+        precios = generar_lista(claves, semilla)
+        df = generar_detalle(precios, filas, semilla)
+
+        t0 = time.perf_counter()
+        anterior = _detalle_anterior(df, precios)
+        t_anterior = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        lista = ListaPrecios(nombre="BENCH", precios=precios)
+        t_compilar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        nuevo = calcular_detalle_mano_obra(df, lista)
+        t_nuevo = time.perf_counter() - t0
+
+        pd.testing.assert_frame_equal(anterior, nuevo)
+
+        fila = {
+            "claves": claves,
+            "filas": filas,
+            "anterior_s": round(t_anterior, 4),
+            "compilar_s": round(t_compilar, 4),
+            "lista_s": round(t_nuevo, 4),
+        }
+        resultados.append(fila)
+
+        print(
+            f"{claves:>6,} claves x {filas:,} filas | anterior {fila['anterior_s']:>8} s | "
+            f"compilada {fila['compilar_s']} s + {fila['lista_s']} s"
+        )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--claves", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--filas", type=int, default=20000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.claves, args.filas, args.semilla)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de calcular_materiales_por_punto.
+
+Compara el cálculo por lotes (un merge contra la BOM compilada)
+con el recorrido fila por fila que usaba antes.
+
+Uso:
+  python -m benchmarks.materiales_por_punto
+  python -m benchmarks.materiales_por_punto --filas 1000 10000 --tension 34.5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from entradas.base_datos import obtener_catalogo
+from materiales.calculos.bom_estructuras import obtener_bom
+from materiales.calculos.materiales_puntos import (
+    calcular_materiales_estructura,
+    calcular_materiales_por_punto,
+)
+
+
+# ==========================================================
+# DATOS SINTÉTICOS
+# ==========================================================
+def generar_estructuras(codigos, filas: int, semilla: int = 0) -> pd.DataFrame:
+    """
+    filas estructuras repartidas en puntos de 1 a 6 estructuras,
+    con cantidades de 1 a 3.
+    """
+
+    rng = np.random.default_rng(semilla)
+
+    por_punto = rng.integers(1, 7, size=filas)
+    punto = np.repeat(np.arange(filas), por_punto)[:filas]
+
+    return pd.DataFrame({
+        "Punto": [f"P-{p + 1:06d}" for p in punto],
+        "Estructura": rng.choice(codigos, size=filas),
+        "Cantidad": rng.integers(1, 4, size=filas),
+    })
+
+
+# ==========================================================
+# REFERENCIA: FILA POR FILA
+# ==========================================================
+def _por_filas(hojas_base, df_estructuras, tension, bom) -> pd.DataFrame:
+
+    resultados = []
+
+    for row in df_estructuras.to_dict("records"):
+
+        df_mat = calcular_materiales_estructura(
+            hojas_base=hojas_base,
+            estructura=row["Estructura"],
+            cantidad=row["Cantidad"],
+            tension=tension,
+            bom=bom,
+        ).copy()
+
+        df_mat["Punto"] = row["Punto"]
+        resultados.append(df_mat)
+
+    return (
+        pd.concat(resultados, ignore_index=True)
+        .groupby(["Punto", "Materiales", "Unidad"], as_index=False)["Cantidad"]
+        .sum()
+        .sort_values(["Punto", "Materiales"])
+        .reset_index(drop=True)
+    )[["Punto", "Materiales", "Unidad", "Cantidad"]]
+
+
+def _medir(funcion, repeticiones: int):
+    tiempos = []
+    resultado = None
+
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t0)
+
+    return min(tiempos), resultado
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(filas, tension: float, repeticiones: int, max_referencia: int):
+
+    catalogo = obtener_catalogo()
+    bom = obtener_bom(catalogo)
+
+    codigos = sorted(bom.por_estructura(tension))
+
+    resultados = []
+
+    for n in filas:
+
+        df = generar_estructuras(codigos, n)
+
+        t_lote, df_lote = _medir(
+            lambda: calcular_materiales_por_punto(catalogo, df, tension, bom=bom),
+            repeticiones,
+        )
+
+        fila = {
+            "filas": n,
+            "puntos": int(df["Punto"].nunique()),
+            "lote_s": round(t_lote, 4),
+            "por_filas_s": None,
+            "aceleracion": None,
+        }
+
+        if n <= max_referencia:
+            t_ref, df_ref = _medir(
+                lambda: _por_filas(catalogo, df, tension, bom), 1
+            )
+
+            pd.testing.assert_frame_equal(df_lote, df_ref, check_dtype=False)
+
+            fila["por_filas_s"] = round(t_ref, 4)
+            fila["aceleracion"] = round(t_ref / t_lote, 1)
+
+        resultados.append(fila)
+        print(
+            f"{n:>8} filas | lote {fila['lote_s']:>8.4f} s | "
+            f"por filas {fila['por_filas_s'] if fila['por_filas_s'] is not None else '-':>8} s | "
+            f"x{fila['aceleracion'] if fila['aceleracion'] is not None else '-'}"
+        )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--tension", type=float, default=13.8)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument(
+        "--max-referencia", type=int, default=100_000,
+        help="No ejecutar la referencia fila por fila por encima de este tamaño",
+    )
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(
+        args.filas, args.tension, args.repeticiones, args.max_referencia
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de normalizar_estructuras sobre volcados de texto DXF.
+
+Compara el parser vectorizado (str.findall + limpieza por token
+distinto) con el recorrido fila por fila que usaba antes.
+
+Uso:
+  python -m benchmarks.normalizar
+  python -m benchmarks.normalizar --filas 10000 100000 --json norm.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from entradas.normalizar import (
+    PATRON,
+    PATRON_PUNTO,
+    _convertir,
+    limpiar_codigo,
+    limpiar_texto_dxf,
+)
+
+
+CODIGOS = [
+    "PC-40", "PM-30", "A-I-1", "A-II-2", "B-I-4", "B-III-1", "G-I-1",
+    "ER-II-3", "CS-2", "CA-1", "TS-37.5KVA", "CT-A", "R-2", "R-3V",
+    "LL-1-2", "TM-I-1",
+]
+
+
+# ==========================================================
+# VOLCADO DXF SINTÉTICO
+# ==========================================================
+def generar_textos(filas: int, semilla: int = 0) -> pd.DataFrame:
+    """
+    Una fila por MTEXT: "P-n" seguido de 1 a 4 estructuras con
+    multiplicador ocasional, estado (P)/(E)/(R) y formato MTEXT
+    en una de cada diez filas. Un tercio de las filas no trae
+    punto (se arrastra el anterior).
+    """
+
+    rng = np.random.default_rng(semilla)
+
+    textos = []
+
+    for n in range(filas):
+
+        partes = [] if n % 3 == 2 else [f"P-{n + 1}"]
+
+        for _ in range(rng.integers(1, 5)):
+            mult = f"{rng.integers(2, 4)}" if rng.random() < 0.15 else ""
+            estado = rng.choice(["(P)", "(P)", "(P)", "(E)", "(R)"])
+            partes.append(f"{mult}{rng.choice(CODIGOS)} {estado}")
+
+        texto = " ".join(partes)
+
+        if n % 10 == 0:
+            texto = "{\\fArial|b0;" + texto.replace(" P-", "\\PP-") + "}"
+
+        textos.append(texto)
+
+    return pd.DataFrame({"texto": textos})
+
+
+# ==========================================================
+# REFERENCIA: FILA POR FILA
+# ==========================================================
+def _convertir_por_filas(df: pd.DataFrame) -> pd.DataFrame:
+
+    registros = []
+    punto_actual = None
+
+    for idx, row in df.iterrows():
+
+        texto = limpiar_texto_dxf(" ".join(str(v) for v in row.values if pd.notna(v)))
+
+        if not texto:
+            continue
+
+        texto_upper = texto.upper()
+
+        m_punto = PATRON_PUNTO.search(texto_upper)
+        if m_punto:
+            punto_actual = f"P-{m_punto.group(1)}"
+
+        if not punto_actual:
+            punto_actual = f"SIN_PUNTO_{idx+1}"
+
+        for token in re.findall(r"\S+(?:\s*\([EPDR]\))?", texto_upper):
+
+            m_tipo = re.search(r"\((P|D|E|R)\)", token)
+
+            if m_tipo:
+                if m_tipo.group(1) != "P":
+                    continue
+                est_raw = re.sub(r"\s*\([EPDR]\)", "", token)
+            else:
+                est_raw = token
+
+            cantidad = 1
+
+            m_mult = re.match(r"^(\d+)([A-Z].*)$", est_raw.strip())
+
+            if m_mult:
+                cantidad = int(m_mult.group(1))
+                est_raw = m_mult.group(2).strip()
+
+            est = limpiar_codigo(est_raw)
+
+            if not est or not PATRON.match(est):
+                continue
+
+            registros.append({"Punto": punto_actual, "Estructura": est, "Cantidad": cantidad})
+
+    return (
+        pd.DataFrame(registros)
+        .groupby(["Punto", "Estructura"], as_index=False)["Cantidad"]
+        .sum()
+    )
+
+
+def _medir(funcion, repeticiones: int):
+    tiempos = []
+    resultado = None
+
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t0)
+
+    return min(tiempos), resultado
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(filas, repeticiones: int, max_referencia: int):
+
+    resultados = []
+
+    for n in filas:
+
+        df = generar_textos(n)
+
+        t_vec, (df_vec, _) = _medir(lambda: _convertir(df), repeticiones)
+
+        fila = {
+            "filas": n,
+            "estructuras": int(df_vec["Cantidad"].sum()),
+            "vectorizado_s": round(t_vec, 4),
+            "por_filas_s": None,
+            "aceleracion": None,
+        }
+
+        if n <= max_referencia:
+            t_ref, df_ref = _medir(lambda: _convertir_por_filas(df), 1)
+
+            pd.testing.assert_frame_equal(df_vec, df_ref, check_dtype=False)
+
+            fila["por_filas_s"] = round(t_ref, 4)
+            fila["aceleracion"] = round(t_ref / t_vec, 1)
+
+        resultados.append(fila)
+        print(
+            f"{n:>8} filas | vectorizado {fila['vectorizado_s']:>8.4f} s | "
+            f"por filas {fila['por_filas_s'] if fila['por_filas_s'] is not None else '-':>8} s | "
+            f"x{fila['aceleracion'] if fila['aceleracion'] is not None else '-'}"
+        )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument(
+        "--max-referencia", type=int, default=100_000,
+        help="No ejecutar la referencia fila por fila por encima de este tamaño",
+    )
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.filas, args.repeticiones, args.max_referencia)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
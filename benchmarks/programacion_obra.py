@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de programar_obra (ruta crítica + cuadrillas) frente a la
+misma programación sobre un networkx.DiGraph con diccionarios por
+nodo.
+
+La referencia recorre nx.topological_sort y calcula inicio/fin
+temprano y tardío nodo por nodo; la nivelación usa el mismo criterio
+(menor inicio tardío, empate por id). Inicio, fin y cuadrilla de
+cada actividad deben coincidir. Además se comprueba que con una
+cuadrilla el plazo sea la suma de duraciones y que con cuadrillas de
+sobra sea el de la ruta crítica. Se muestra también el plazo en serie
+de _calcular_tiempos.
+
+Para el Monte Carlo, plazos_por_muestras (plan de cuadrillas con
+duraciones por muestra, vectorizado) se compara con ruta_critica del
+plan con las duraciones de cada muestra, una por una; sin variación
+debe dar el plazo del programa.
+
+Uso:
+  python -m benchmarks.programacion_obra
+  python -m benchmarks.programacion_obra --puntos 1000 10000 50000 --cuadrillas 1 4 --muestras 1000 --json programa.json
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import time
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from costos_precios.costos_proyecto import _calcular_tiempos, _extraer_metricas_estructuras
+from costos_precios.programacion_obra import (
+    RENDIMIENTO_POR_TIPO,
+    GrafoActividades,
+    _dia_fin,
+    construir_grafo,
+    nivelar_cuadrillas,
+    plan_cuadrillas,
+    plazos_por_muestras,
+    programar_grafo,
+    ruta_critica,
+)
+
+
+# ==========================================================
+# PROYECTO SINTÉTICO
+# ==========================================================
+def generar_estructuras(puntos: int, semilla: int = 0) -> pd.DataFrame:
+    """
+    Poste en el 90 % de los puntos, una o dos estructuras y
+    retenidas en el 30 %.
+    """
+
+    rng = np.random.default_rng(semilla)
+    filas = []
+
+    for i in range(puntos):
+
+        punto = f"P-{i + 1}"
+
+        if rng.random() < 0.9:
+            filas.append((punto, "PC-40", 1))
+
+        filas.append((punto, "A-I-1" if rng.random() < 0.7 else "B-I-4", int(rng.integers(1, 3))))
+
+        if rng.random() < 0.3:
+            filas.append((punto, "R-1", int(rng.integers(1, 3))))
+
+    return pd.DataFrame(filas, columns=["Punto", "Estructura", "Cantidad"])
+
+
+# ==========================================================
+# REFERENCIA: NETWORKX NODO POR NODO
+# ==========================================================
+def _anterior(grafo: nx.DiGraph, cuadrillas: int):
+
+    orden = list(nx.topological_sort(grafo))
+    ids = {n: i for i, n in enumerate(grafo)}
+    dur = {n: grafo.nodes[n]["duracion"] for n in grafo}
+
+    es, ef = {}, {}
+
+    for n in orden:
+        es[n] = max((ef[p] for p in grafo.pred[n]), default=0.0)
+        ef[n] = es[n] + dur[n]
+
+    total = max(ef.values(), default=0.0)
+    ls, lf = {}, {}
+
+    for n in reversed(orden):
+        lf[n] = min((ls[s] for s in grafo.succ[n]), default=total)
+        ls[n] = lf[n] - dur[n]
+
+    pendientes = {n: grafo.in_degree(n) for n in grafo}
+    listos = [(ls[n], ids[n], n) for n in grafo if pendientes[n] == 0]
+    heapq.heapify(listos)
+
+    libres = list(range(1, cuadrillas + 1))
+    en_curso = []
+    programa = {}
+    t = 0.0
+
+    while listos or en_curso:
+
+        while listos and libres:
+            _, i, n = heapq.heappop(listos)
+            c = heapq.heappop(libres)
+            programa[n] = (t, t + dur[n], c)
+            heapq.heappush(en_curso, (t + dur[n], i, n, c))
+
+        t = en_curso[0][0]
+
+        while en_curso and en_curso[0][0] <= t + 1e-9:
+            _, _, n, c = heapq.heappop(en_curso)
+            heapq.heappush(libres, c)
+            for s in grafo.succ[n]:
+                pendientes[s] -= 1
+                if pendientes[s] == 0:
+                    heapq.heappush(listos, (ls[s], ids[s], s))
+
+    return programa
+
+
+# ==========================================================
+# REFERENCIA: PLAZO DE CADA MUESTRA POR SEPARADO
+# ==========================================================
+def _plazos_anterior(plan: GrafoActividades, factores: dict, muestras: int):
+
+    plazos = []
+
+    for i in range(muestras):
+        duraciones = plan.duraciones.copy()
+        for tipo, factor in factores.items():
+            duraciones[plan.tipos == tipo] *= factor[i]
+
+        escalado = GrafoActividades(plan.tipos, plan.etiquetas, duraciones, plan.origen, plan.destino)
+        plazos.append(_dia_fin(ruta_critica(escalado)["duracion"]))
+
+    return plazos
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(puntos_lista, cuadrillas_lista, referencia_max: int, semilla: int = 0, muestras: int = 1000):
+
+    resultados = []
+
+    for puntos in puntos_lista:
+
+        df = generar_estructuras(puntos, semilla)
+        primario, secundario = 40.0 * puntos, 30.0 * puntos
+
+        t0 = time.perf_counter()
+        grafo = construir_grafo(df, primario, secundario)
+        t_grafo = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        cpm = ruta_critica(grafo)
+        t_cpm = time.perf_counter() - t0
+
+        total, postes, retenidas = _extraer_metricas_estructuras(df)
+        serie = _calcular_tiempos(primario, secundario, total, postes, retenidas)["dias_totales"]
+
+        # una cuadrilla: trabajo continuo; de sobra: ruta crítica
+        assert math.isclose(
+            nivelar_cuadrillas(grafo, 1, cpm)["fin"].max(), grafo.duraciones.sum(), rel_tol=1e-9
+        )
+        assert math.isclose(
+            nivelar_cuadrillas(grafo, len(grafo), cpm)["fin"].max(), cpm["duracion"], rel_tol=1e-9
+        )
+
+        grafo_nx = grafo.como_networkx() if puntos <= referencia_max else None
+
+        for cuadrillas in cuadrillas_lista:
+
+            t0 = time.perf_counter()
+            res = programar_grafo(grafo, cuadrillas)
+            t_programa = time.perf_counter() - t0
+
+            fila = {
+                "puntos": puntos,
+                "actividades": len(grafo),
+                "precedencias": int(len(grafo.origen)),
+                "cuadrillas": cuadrillas,
+                "grafo_s": round(t_grafo, 3),
+                "ruta_critica_s": round(t_cpm, 3),
+                "programa_s": round(t_programa, 3),
+                "anterior_s": None,
+                "dias": res["dias_totales"],
+                "dias_ruta_critica": res["dias_ruta_critica"],
+                "dias_en_serie": serie,
+                "muestras": muestras,
+                "plazos_s": None,
+                "plazos_anterior_s": None,
+            }
+
+            # -------------------------------------------------
+            # plazo por muestra (Monte Carlo)
+            # -------------------------------------------------
+            plan = plan_cuadrillas(grafo, nivelar_cuadrillas(grafo, cuadrillas, cpm))
+
+            assert plazos_por_muestras(plan, {}, 1)[0] == res["dias_totales"]
+
+            rng = np.random.default_rng(semilla)
+            factores = {tipo: 1 / rng.triangular(0.7, 1.0, 1.1, muestras) for tipo in RENDIMIENTO_POR_TIPO}
+
+            t0 = time.perf_counter()
+            plazos = plazos_por_muestras(plan, factores, muestras)
+            fila["plazos_s"] = round(time.perf_counter() - t0, 3)
+
+            if puntos <= referencia_max:
+                n_ref = min(muestras, 50)
+                t0 = time.perf_counter()
+                anterior = _plazos_anterior(plan, factores, n_ref)
+                fila["plazos_anterior_s"] = round((time.perf_counter() - t0) / n_ref * muestras, 2)
+                np.testing.assert_array_equal(plazos[:n_ref], anterior)
+
+            if grafo_nx is not None:
+
+                t0 = time.perf_counter()
+                anterior = _anterior(grafo_nx, cuadrillas)
+                fila["anterior_s"] = round(time.perf_counter() - t0, 3)
+
+                nuevo = nivelar_cuadrillas(grafo, cuadrillas, cpm)
+                nombres = list(grafo_nx)
+
+                np.testing.assert_allclose(nuevo["inicio"], [anterior[n][0] for n in nombres], rtol=1e-12)
+                np.testing.assert_allclose(nuevo["fin"], [anterior[n][1] for n in nombres], rtol=1e-12)
+                np.testing.assert_array_equal(nuevo["cuadrilla"], [anterior[n][2] for n in nombres])
+
+            resultados.append(fila)
+
+            print(
+                f"{puntos:>7,} puntos ({fila['actividades']:,} act.) x {cuadrillas:>2} cuadrillas | "
+                f"grafo {fila['grafo_s']} s + ruta {fila['ruta_critica_s']} s + programa {fila['programa_s']} s"
+                f" | networkx {fila['anterior_s'] if fila['anterior_s'] is not None else '—'} s"
+                f" | {fila['dias']} días (ruta crítica {fila['dias_ruta_critica']}, en serie {serie})"
+                f" | {muestras:,} plazos {fila['plazos_s']} s"
+                f" (por muestra ~{fila['plazos_anterior_s'] if fila['plazos_anterior_s'] is not None else '—'} s)"
+            )
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--puntos", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--cuadrillas", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--referencia-max", type=int, default=10000,
+                        help="Comparar con networkx hasta esta cantidad de puntos")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--muestras", type=int, default=1000, help="Muestras de plazo (Monte Carlo)")
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.puntos, args.cuadrillas, args.referencia_max, args.semilla, args.muestras)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
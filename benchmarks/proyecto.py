@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del flujo completo sobre proyectos sintéticos.
+
+Genera proyectos con códigos reales del catálogo (familias de
+PATRON en entradas/normalizar.py), cables y materiales extra, y
+mide cada etapa pública con el árbol de ayuda/medicion.py.
+
+Uso:
+  python -m benchmarks.proyecto
+  python -m benchmarks.proyecto --puntos 100 1000 --json bench.json
+  python -m benchmarks.proyecto --puntos 50000 --max-pdf 0 --memoria
+  python -m benchmarks.proyecto --json nuevo.json --comparar base.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from aplicacion.orquestador_proyecto import (
+    adaptar_estructuras,
+    aplicar_descripciones,
+    construir_mapa_indice,
+)
+from ayuda.debug import configurar_debug, NIVELES_DEBUG
+from ayuda.medicion import Medidor, tabla_tiempos
+from ayuda.sesion import reiniciar_estado_local
+from costos_precios.costos_proyecto import calcular_costos_proyecto
+from costos_precios.orquestador_costos import EntradaCostos, ejecutar_costos
+from entradas.base_datos import obtener_catalogo, obtener_catalogo_materiales
+from entradas.codigos import canonizar_columnas
+from entradas.normalizar import PATRON, normalizar_estructuras
+from exportadores.orquestador_reportes import EntradaReportes, generar_reportes
+from materiales.cables.cables_logica import _validar_y_calcular
+from materiales.calculos.bom_estructuras import obtener_bom
+from materiales.calculos.calculo_materiales import calcular_materiales_proyecto
+from materiales.orquestador_materiales import _merge_materiales
+
+
+# ==========================================================
+# FAMILIAS (MISMO ORDEN QUE LOS GRUPOS DE PATRON)
+# ==========================================================
+FAMILIAS = [
+    "A", "B", "G", "ER", "CS", "CA",
+    "POSTE", "TRANSFORMADOR", "CT", "R", "LL", "TM",
+]
+
+# Estructuras por punto además del poste (peso relativo)
+MEZCLA = {
+    "A": 6, "B": 4, "G": 1, "ER": 1, "CS": 2, "CA": 1,
+    "TRANSFORMADOR": 1, "CT": 1, "R": 3, "LL": 2, "TM": 1,
+}
+
+# Mismos calibres por defecto que interfaz/cables_ui.py
+CABLES = [
+    ("MT", "Cable de Aluminio ACSR # 1/0 AWG Raven", "3F"),
+    ("N", "Cable de Aluminio ACSR # 2 AWG Sparrow", "N"),
+    ("BT", "Cable de Aluminio Forrado WP # 3/0 AWG Fig", "2F"),
+]
+
+VANO_M = 35.0
+
+PUNTOS_POR_DEFECTO = [100, 1_000, 10_000, 50_000]
+
+
+@dataclass
+class ProyectoSintetico:
+    puntos: int
+    df_texto: pd.DataFrame          # una fila "P-1 PC-40 (P) A-I-1 (P)" por punto
+    df_cables: pd.DataFrame
+    df_materiales_extra: pd.DataFrame
+
+
+def familias_catalogo(catalogo, tension: float) -> Dict[str, List[str]]:
+    """
+    Códigos del catálogo con materiales en la tensión, por familia.
+    """
+
+    if len(FAMILIAS) != PATRON.groups:
+        raise RuntimeError("FAMILIAS no coincide con los grupos de PATRON")
+
+    con_materiales = obtener_bom(catalogo).por_estructura(tension)
+
+    familias: Dict[str, List[str]] = {f: [] for f in FAMILIAS}
+
+    for codigo in sorted(con_materiales):
+        m = PATRON.fullmatch(codigo)
+
+        if not m:
+            continue
+
+        familias[FAMILIAS[m.lastindex - 1]].append(codigo)
+
+    return {f: c for f, c in familias.items() if c}
+
+
+# ==========================================================
+# DATOS SINTÉTICOS
+# ==========================================================
+def generar_proyecto(
+    familias: Dict[str, List[str]],
+    df_catalogo_materiales: pd.DataFrame,
+    puntos: int,
+    semilla: int = 0,
+) -> ProyectoSintetico:
+    """
+    Por punto: un poste + 1 a 3 estructuras según MEZCLA,
+    a veces con multiplicador (2R-2) y a veces una existente (E)
+    que normalizar descarta, como en los DXF reales.
+    """
+
+    if "POSTE" not in familias:
+        raise ValueError("El catálogo no tiene postes para la tensión pedida")
+
+    rng = np.random.default_rng(semilla)
+
+    nombres = [f for f in MEZCLA if f in familias]
+    pesos = np.array([MEZCLA[f] for f in nombres], dtype=float)
+    pesos /= pesos.sum()
+
+    extra = rng.integers(1, 4, size=puntos)
+    textos = []
+
+    for i in range(puntos):
+
+        tokens = [f"P-{i + 1}", f"{rng.choice(familias['POSTE'])} (P)"]
+
+        for familia in rng.choice(nombres, size=extra[i], p=pesos):
+            codigo = rng.choice(familias[familia])
+            multiplicador = rng.integers(2, 4) if rng.random() < 0.1 else None
+
+            tokens.append(f"{multiplicador or ''}{codigo} (P)")
+
+        if rng.random() < 0.15:
+            tokens.append(f"{rng.choice(familias['POSTE'])} (E)")
+
+        textos.append(" ".join(tokens))
+
+    vano_total = VANO_M * max(puntos - 1, 1)
+
+    df_cables = _validar_y_calcular(pd.DataFrame([
+        {"Tipo": tipo, "Calibre": calibre, "Config": config, "Longitud": vano_total}
+        for tipo, calibre, config in CABLES
+    ]))
+
+    muestra = df_catalogo_materiales.sample(
+        n=min(5, len(df_catalogo_materiales)), random_state=semilla
+    )
+
+    df_materiales_extra = pd.DataFrame({
+        "Materiales": muestra["Materiales"].to_numpy(),
+        "Unidad": muestra["Unidad"].to_numpy(),
+        "Cantidad": rng.integers(1, 20, size=len(muestra)).astype(float),
+    })
+
+    return ProyectoSintetico(
+        puntos=puntos,
+        df_texto=pd.DataFrame({"texto": textos}),
+        df_cables=df_cables,
+        df_materiales_extra=df_materiales_extra,
+    )
+
+
+# ==========================================================
+# ETAPAS (MISMO CABLEADO QUE ejecutar_proyecto)
+# ==========================================================
+def ejecutar_etapas(
+    catalogo,
+    proyecto: ProyectoSintetico,
+    tension: float,
+    contratista: str = "C1",
+    reportes: bool = True,
+    memoria: bool = False,
+) -> Medidor:
+
+    datos_proyecto = {
+        "nombre_proyecto": f"Sintético {proyecto.puntos}",
+        "tension": tension,
+        "contratista": contratista,
+    }
+
+    reiniciar_estado_local(dict(datos_proyecto))
+
+    with Medidor("proyecto", memoria=memoria) as medidor:
+
+        with medidor.etapa("normalizar_estructuras", proyecto.df_texto) as e:
+            df_norm, errores, _ = normalizar_estructuras(proyecto.df_texto)
+            df_norm = canonizar_columnas(df_norm)  # frontera de entradas
+            e.salida(df_norm)
+
+        if errores:
+            raise RuntimeError(f"normalizar_estructuras: {errores}")
+
+        with medidor.etapa("descripciones", df_norm) as e:
+            mapa = construir_mapa_indice(catalogo, {})
+            df_estructuras = aplicar_descripciones(adaptar_estructuras(df_norm), mapa, {})
+            e.salida(df_estructuras)
+
+        with medidor.etapa("calcular_materiales_proyecto", df_estructuras) as e:
+            res_mat = calcular_materiales_proyecto(
+                hojas_base=catalogo,
+                df_estructuras=df_estructuras,
+                tension=tension,
+                df_cables=proyecto.df_cables,
+            )
+            df_materiales = _merge_materiales(
+                res_mat["df_materiales"], proyecto.df_materiales_extra
+            )
+            e.salida(df_materiales)
+
+        # calcular_costos_por_estructura y calcular_mano_obra_proyecto
+        # quedan como sub-etapas de ejecutar_costos
+        with medidor.etapa("ejecutar_costos", df_materiales) as e:
+            res_costos = ejecutar_costos(EntradaCostos(
+                df_materiales=df_materiales,
+                df_catalogo=obtener_catalogo_materiales(catalogo),
+                df_estructuras=df_estructuras,
+                df_materiales_por_estructura=res_mat["df_materiales_por_estructura"],
+                df_cables=proyecto.df_cables,
+                contratista=contratista,
+            ))
+            e.salida(res_costos.get("df_precios_estructura"))
+
+        if not res_costos.get("ok"):
+            raise RuntimeError(f"ejecutar_costos: {res_costos.get('error')}")
+
+        df_precios = res_costos["df_precios_estructura"]
+
+        with medidor.etapa("calcular_costos_proyecto", df_estructuras):
+            res_cp = calcular_costos_proyecto(SimpleNamespace(
+                df_estructuras=df_estructuras,
+                df_cables=proyecto.df_cables,
+                df_costos_materiales=res_costos.get("df_costos_materiales"),
+                precio_venta_proyecto=float(df_precios["Total Proyecto"].sum()),
+            ))
+
+        if not reportes:
+            return medidor
+
+        df_mat_pp = res_mat["df_materiales_por_punto"].copy()
+
+        if "Punto" not in df_mat_pp.columns:
+            df_mat_pp["Punto"] = "GLOBAL"
+
+        # cada PDF es una sub-etapa de generar_reportes
+        with medidor.etapa("generar_reportes", df_materiales) as e:
+            resultado = generar_reportes(EntradaReportes(
+                df_estructuras=df_estructuras,
+                df_estructuras_por_punto=aplicar_descripciones(
+                    res_mat["df_estructuras_por_punto"], mapa, {}
+                ),
+                df_materiales=df_materiales,
+                df_materiales_por_punto=df_mat_pp,
+                df_costos_materiales=res_costos.get("df_costos_materiales"),
+                base_datos=catalogo,
+                costos={
+                    "df_costos_estructura": res_costos.get("df_costos_estructura"),
+                    "df_precios_estructura": df_precios,
+                    **res_cp,
+                },
+                nombre_proyecto=datos_proyecto["nombre_proyecto"],
+                datos_proyecto=datos_proyecto,
+                df_cables=proyecto.df_cables,
+            ))
+            e.salida(resultado.get("archivos"))
+
+        if resultado.get("errores"):
+            raise RuntimeError(f"generar_reportes: {resultado['errores'][0]}")
+
+    return medidor
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(
+    puntos,
+    tension: float,
+    contratista: str = "C1",
+    max_pdf: int = 1_000,
+    memoria: bool = False,
+    semilla: int = 0,
+) -> List[dict]:
+
+    catalogo = obtener_catalogo()
+    familias = familias_catalogo(catalogo, tension)
+    df_catalogo_materiales = obtener_catalogo_materiales(catalogo)
+
+    resultados = []
+
+    for n in puntos:
+
+        proyecto = generar_proyecto(familias, df_catalogo_materiales, n, semilla)
+
+        t0 = time.perf_counter()
+        medidor = ejecutar_etapas(
+            catalogo,
+            proyecto,
+            tension,
+            contratista=contratista,
+            reportes=n <= max_pdf,
+            memoria=memoria,
+        )
+        total = time.perf_counter() - t0
+
+        df = tabla_tiempos(medidor.a_dict())
+
+        resultados.append({
+            "puntos": n,
+            "estructuras": medidor.raiz.hijos[0].filas_salida,
+            "segundos": round(total, 4),
+            "reportes": n <= max_pdf,
+            "etapas": dict(zip(df["Etapa"], df["Segundos"])),
+            "tiempos": medidor.a_dict(),
+        })
+
+        print(f"\n{n:,} puntos | {total:.2f} s")
+        print(
+            df[df["Nivel"] <= 2]
+            .drop(columns=["Nivel", "Error"])
+            .to_string(index=False)
+        )
+
+    return resultados
+
+
+def comparar(base: dict, resultados: List[dict]) -> pd.DataFrame:
+    """
+    SALIDA:
+    -------
+    Una fila por (puntos, etapa) presente en ambas corridas,
+    con segundos base/actual y la razón actual / base.
+    """
+
+    anteriores = {r["puntos"]: r["etapas"] for r in base.get("resultados", [])}
+    filas = []
+
+    for r in resultados:
+        etapas_base = anteriores.get(r["puntos"], {})
+
+        for etapa, segundos in r["etapas"].items():
+            if etapa not in etapas_base:
+                continue
+
+            filas.append({
+                "puntos": r["puntos"],
+                "etapa": etapa,
+                "base_s": etapas_base[etapa],
+                "actual_s": segundos,
+                "razon": round(segundos / etapas_base[etapa], 2)
+                if etapas_base[etapa] else None,
+            })
+
+    return pd.DataFrame(filas)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--puntos", type=int, nargs="+", default=PUNTOS_POR_DEFECTO)
+    parser.add_argument("--tension", type=float, default=13.8)
+    parser.add_argument("--contratista", default="C1")
+    parser.add_argument(
+        "--max-pdf", type=int, default=1_000,
+        help="No generar reportes PDF por encima de esta cantidad de puntos",
+    )
+    parser.add_argument("--memoria", action="store_true", help="Pico de memoria con tracemalloc")
+    parser.add_argument("--debug", choices=NIVELES_DEBUG, default="off")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    configurar_debug(args.debug)
+
+    resultados = ejecutar(
+        args.puntos,
+        args.tension,
+        contratista=args.contratista,
+        max_pdf=args.max_pdf,
+        memoria=args.memoria,
+        semilla=args.semilla,
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "tension": args.tension,
+                "contratista": args.contratista,
+                "debug": args.debug,
+                "semilla": args.semilla,
+                "resultados": resultados,
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            df = comparar(json.load(f), resultados)
+
+        print("\nComparación (razón = actual / base):")
+        print(df[df["etapa"].str.count("/") <= 1].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
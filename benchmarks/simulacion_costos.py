@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de simular_costos_proyecto frente a un ciclo por muestra
+sobre el motor escalar (_motor_costos + _calcular_tiempos).
+
+El ciclo se corre sobre las primeras --referencia muestras (es lento)
+y se extrapola a todas; en esas muestras costo total, utilidad y días
+deben coincidir con la versión vectorizada. Además, con todas las
+distribuciones fijas los percentiles deben ser el valor determinista,
+también con cuadrillas (días del programa por punto).
+
+Uso:
+  python -m benchmarks.simulacion_costos
+  python -m benchmarks.simulacion_costos --muestras 10000 100000 --referencia 500 --json simulacion.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.escenarios import _entrada_costos, preparar
+from costos_precios.costos_proyecto import (
+    _calcular_tiempos,
+    _datos_base_proyecto,
+    _motor_costos,
+)
+from costos_precios.orquestador_costos import ejecutar_costos
+from costos_precios.simulacion_costos import (
+    DISTRIBUCIONES_DEFECTO,
+    Distribucion,
+    _muestrear_parametros,
+    simular_costos_proyecto,
+)
+from entradas.base_datos import obtener_catalogo
+
+
+# parámetro muestreado → atributo de entrada que lee _leer_parametros_operativos
+ATRIBUTOS_ENTRADA = {
+    "costo_agujero_unitario": "costo_agujero_unitario",
+    "costo_cuadrilla_dia": "costo_cuadrilla_dia",
+    "horas_por_poste": "horas_por_poste",
+    "horas_por_estructura": "horas_por_estructura",
+    "horas_por_retenida": "horas_por_retenida",
+    "costo_tendido_mt_m": "costo_tendido_mt_m",
+    "costo_tendido_bt_m": "costo_tendido_bt_m",
+    "horas_grua": "horas_grua",
+    "precio_hora_grua": "precio_hora_grua",
+    "costo_flete_unitario": "costo_flete",
+}
+
+
+# ==========================================================
+# PROYECTO
+# ==========================================================
+def entrada_proyecto(puntos: int, tension: float, semilla: int = 0) -> SimpleNamespace:
+
+    catalogo = obtener_catalogo()
+    proyecto, df_estructuras, res_mat = preparar(catalogo, puntos, tension, semilla)
+    res = ejecutar_costos(_entrada_costos(catalogo, proyecto, df_estructuras, res_mat, "C1"))
+
+    entrada = SimpleNamespace(
+        df_estructuras=res["df_costos_estructura"].rename(columns={"codigodeestructura": "Estructura"}),
+        df_cables=proyecto.df_cables,
+        df_costos_materiales=res["df_costos_materiales"],
+        precio_venta_proyecto=0.0,
+        horas_grua=12,
+        costo_flete=25000,
+        viajes_flete=2,
+        gastos_ingenieria=25000,
+        costo_tendido_mt_m=3.5,
+        costo_tendido_bt_m=2,
+    )
+
+    # precio de venta: costo determinista + 8 %
+    determinista = simular_costos_proyecto(entrada, muestras=1)["df_percentiles"]
+    entrada.precio_venta_proyecto = float(determinista["Determinista"].iloc[0]) * 1.08
+
+    return entrada
+
+
+# ==========================================================
+# REFERENCIA: UNA CORRIDA DEL MOTOR POR MUESTRA
+# ==========================================================
+def _anterior(entrada, muestras: dict, n: int):
+
+    base = _datos_base_proyecto(entrada)
+    salida = {"costo_total_real": [], "utilidad": [], "dias_totales": []}
+
+    for i in range(n):
+
+        muestra = SimpleNamespace(**vars(entrada))
+
+        for parametro, atributo in ATRIBUTOS_ENTRADA.items():
+            setattr(muestra, atributo, float(np.broadcast_to(muestras[parametro], (n,))[i]))
+
+        res = _motor_costos(
+            df_materiales_costos=base["df_costos_materiales"],
+            longitud_primario_m=base["longitud_primario"],
+            longitud_secundario_m=base["longitud_secundario"],
+            total_estructuras=base["total_estructuras"],
+            num_postes=base["num_postes"],
+            num_retenidas=base["num_retenidas"],
+            precio_total_proyecto=base["precio_total"],
+            entrada=muestra,
+        )
+
+        tiempos = _calcular_tiempos(
+            base["longitud_primario"],
+            base["longitud_secundario"],
+            base["total_estructuras"],
+            base["num_postes"],
+            base["num_retenidas"],
+            rendimientos={
+                k[len("rendimiento_"):]: float(muestras[k][i])
+                for k in muestras
+                if k.startswith("rendimiento_")
+            },
+        )
+
+        salida["costo_total_real"].append(res["costo_total_real"])
+        salida["utilidad"].append(res["utilidad"])
+        salida["dias_totales"].append(tiempos["dias_totales"])
+
+    return salida
+
+
+# ==========================================================
+# EJECUCIÓN
+# ==========================================================
+def ejecutar(muestras_lista, referencia: int, puntos: int, tension: float, semilla: int = 0):
+
+    entrada = entrada_proyecto(puntos, tension, semilla)
+
+    # -------------------------------------------------
+    # distribuciones fijas → percentiles = determinista
+    # -------------------------------------------------
+    fijas = {k: Distribucion("fija") for k in DISTRIBUCIONES_DEFECTO}
+
+    for cuadrillas in (0, 4):
+        entrada.cuadrillas = cuadrillas
+        df = simular_costos_proyecto(entrada, muestras=100, distribuciones=fijas)["df_percentiles"]
+
+        for col in ("P50", "P80", "P95"):
+            np.testing.assert_allclose(
+                df[col], df["Determinista"], rtol=1e-9, atol=0.01, err_msg=f"{col} ({cuadrillas} cuadrillas)"
+            )
+
+    entrada.cuadrillas = 0
+
+    # -------------------------------------------------
+    # referencia sobre las primeras muestras
+    # -------------------------------------------------
+    base = _datos_base_proyecto(entrada)
+    m = _muestrear_parametros(base["params"], DISTRIBUCIONES_DEFECTO, referencia, np.random.default_rng(semilla))
+
+    t0 = time.perf_counter()
+    anterior = _anterior(entrada, m, referencia)
+    t_por_muestra = (time.perf_counter() - t0) / referencia
+
+    vectorizada = simular_costos_proyecto(entrada, muestras=referencia, semilla=semilla, guardar_muestras=True)
+
+    if not vectorizada["ok"]:
+        raise RuntimeError(vectorizada["error"])
+
+    for clave, valores in anterior.items():
+        # el motor redondea a centavos
+        np.testing.assert_allclose(vectorizada["df_muestras"][clave], valores, rtol=0, atol=0.01, err_msg=clave)
+
+    resultados = []
+
+    for muestras in muestras_lista:
+
+        t0 = time.perf_counter()
+        res = simular_costos_proyecto(entrada, muestras=muestras, semilla=semilla)
+        t_vectorizada = time.perf_counter() - t0
+
+        fila = {
+            "puntos": puntos,
+            "muestras": muestras,
+            "anterior_estimado_s": round(t_por_muestra * muestras, 2),
+            "vectorizada_s": round(t_vectorizada, 3),
+        }
+        resultados.append(fila)
+
+        print(
+            f"{muestras:>8,} muestras | anterior ~{fila['anterior_estimado_s']:>8} s "
+            f"(medido en {referencia:,}) | vectorizada {fila['vectorizada_s']} s"
+        )
+
+    print(res["df_percentiles"].head(4).to_string(index=False))
+
+    return resultados
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--muestras", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--referencia", type=int, default=500)
+    parser.add_argument("--puntos", type=int, default=200)
+    parser.add_argument("--tension", type=float, default=13.8)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.muestras, args.referencia, args.puntos, args.tension, args.semilla)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
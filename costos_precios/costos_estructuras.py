@@ -5,38 +5,153 @@ from __future__ import annotations
 import pandas as pd
 from typing import Dict, Any
 
-from costos_precios.costos_materiales import calcular_lista_materiales_con_costos
+from costos_precios.costos_materiales import (
+    normalizar_claves,
+    preparar_catalogo_costos,
+)
 from ayuda.debug import debug_guardar
+from entradas.codigos import canonizar
+
+
+COLUMNAS_BOM = ["Materiales", "Unidad", "Cantidad"]
+
+
+# =========================================================
+# BOM CONCATENADA
+# =========================================================
+def _bom_concatenada(
+    codigos,
+    df_materiales_por_estructura: Dict[str, pd.DataFrame],
+    errores: list,
+) -> pd.DataFrame:
+    """
+    Una tabla codigodeestructura / Materiales / Unidad / Cantidad
+    con la BOM unitaria de todas las estructuras.
+    """
+
+    partes = {}
+
+    for cod in codigos:
+
+        df_mat = df_materiales_por_estructura.get(cod)
+
+        # DEBUG CLAVE
+        if df_mat is None:
+            errores.append(f"{cod}: NO EXISTE EN dict")
+            continue
+
+        if df_mat.empty:
+            errores.append(f"{cod}: SIN MATERIALES")
+            continue
+
+        df_mat = df_mat.rename(columns=lambda c: str(c).strip())
+        faltantes = set(COLUMNAS_BOM) - set(df_mat.columns)
+
+        if faltantes:
+            errores.append(
+                f"{cod}: Faltan columnas requeridas en df_materiales: "
+                f"{sorted(faltantes)}. Columnas disponibles: {list(df_mat.columns)}"
+            )
+            continue
+
+        partes[cod] = df_mat[COLUMNAS_BOM]
+
+    if not partes:
+        return pd.DataFrame(columns=["codigodeestructura"] + COLUMNAS_BOM)
+
+    return (
+        pd.concat(partes, names=["codigodeestructura", None])
+        .reset_index(level=0)
+        .reset_index(drop=True)
+    )
+
+
+def _descartar(bom: pd.DataFrame, validas: pd.Series, mensaje: str, errores: list) -> pd.DataFrame:
+    """
+    Filtra bom y anota mensaje para las estructuras que se quedan
+    sin filas.
+    """
+
+    antes = set(bom["codigodeestructura"])
+    bom = bom[validas]
+
+    for cod in sorted(antes - set(bom["codigodeestructura"])):
+        errores.append(f"{cod}: {mensaje}")
+
+    return bom
 
 
 # =========================================================
-# COSTO UNITARIO DE UNA ESTRUCTURA
+# COSTO UNITARIO DE TODAS LAS ESTRUCTURAS
 # =========================================================
-def _costo_unitario_estructura(
-    df_materiales: pd.DataFrame,
-    df_precios: pd.DataFrame
-) -> float:
-
-    df_val = calcular_lista_materiales_con_costos(
-        df_materiales=df_materiales,
-        df_catalogo_costos=df_precios
+def costos_unitarios_estructuras(
+    bom: pd.DataFrame,
+    catalogo: pd.DataFrame,
+    errores: list,
+) -> pd.Series:
+    """
+    Mismo costo que calcular_lista_materiales_con_costos() por
+    estructura, con una sola normalización y un solo merge.
+
+    SALIDA:
+    -------
+    Serie codigodeestructura → costo unitario (solo las válidas)
+    """
+
+    bom = normalizar_claves(bom)
+    bom["Cantidad"] = pd.to_numeric(bom["Cantidad"], errors="coerce")
+
+    bom = _descartar(
+        bom,
+        bom["Cantidad"].notna()
+        & (bom["Materiales"].str.strip() != "")
+        & (bom["Unidad"].str.strip() != "")
+        & (bom["Cantidad"] > 0),
+        "Todos los materiales fueron descartados después de normalizar. "
+        "Revisá Materiales, Unidad y Cantidad.",
+        errores,
     )
 
-    if df_val is None:
-        raise ValueError("df_val es None")
+    bom = (
+        bom
+        .groupby(["codigodeestructura", "Materiales", "Unidad"], as_index=False)["Cantidad"]
+        .sum()
+        .merge(catalogo, on=["Materiales", "Unidad"], how="left")
+    )
+
+    faltantes = bom[bom["Costo Unitario"].isna()]
+
+    if not faltantes.empty:
+        debug_guardar("WARNING_MATERIALES_SIN_COSTO", lambda: {
+            "cantidad": len(faltantes),
+            "ejemplo": faltantes.head(20).to_dict(orient="records"),
+            "por_estructura": (
+                faltantes.groupby("codigodeestructura")["Materiales"]
+                .apply(list)
+                .to_dict()
+            ),
+        })
 
-    if df_val.empty:
-        raise ValueError("df_val vacío → sin costos")
+    bom = _descartar(
+        bom,
+        bom["Costo Unitario"].notna(),
+        "Todos los materiales quedaron sin costo. "
+        "Revisá nombres de materiales, unidades y catálogo de precios.",
+        errores,
+    )
 
-    if "Costo Total" not in df_val.columns:
-        raise ValueError(f"Columnas inválidas: {list(df_val.columns)}")
+    totales = (
+        (bom["Cantidad"] * bom["Costo Unitario"])
+        .groupby(bom["codigodeestructura"])
+        .sum()
+    )
 
-    total = df_val["Costo Total"].sum()
+    invalidos = totales.isna() | (totales <= 0)
 
-    if pd.isna(total) or total <= 0:
-        raise ValueError("Costo total inválido")
+    for cod in totales.index[invalidos]:
+        errores.append(f"{cod}: Costo total inválido")
 
-    return float(total)
+    return totales[~invalidos]
 
 
 # =========================================================
@@ -72,54 +187,49 @@ def calcular_costos_por_estructura(
         raise ValueError("df_estructuras debe tener columnas 'Estructura' y 'Cantidad'")
 
     # ⚠️ NO normalizar aquí
-    df["codigodeestructura"] = df["Estructura"].astype(str).str.strip()
+    df["codigodeestructura"] = canonizar(df["Estructura"], lambda e: e.str.strip())
     df["Cantidad"] = pd.to_numeric(df["Cantidad"], errors="coerce").fillna(0)
 
     # =====================================================
     # AGRUPAR
     # =====================================================
-    df_group = df.groupby("codigodeestructura", as_index=False)["Cantidad"].sum()
+    df_group = df.groupby("codigodeestructura", as_index=False, observed=True)["Cantidad"].sum()
 
     debug["estructuras_detectadas"] = len(df_group)
     debug["estructuras_sample"] = df_group.head(10).to_dict()
 
-    filas = []
+    df_group = df_group[df_group["Cantidad"] > 0]
+    codigos = df_group["codigodeestructura"].astype(str).str.strip()
+
     errores = []
 
     # =====================================================
-    # LOOP PRINCIPAL
+    # CATÁLOGO (UNA VEZ) + BOM CONCATENADA (UN MERGE)
     # =====================================================
-    for _, row in df_group.iterrows():
+    catalogo = preparar_catalogo_costos(df_precios_materiales)
 
-        cod = str(row["codigodeestructura"]).strip()
-        qty = float(row["Cantidad"])
+    bom = _bom_concatenada(codigos.unique(), df_materiales_por_estructura, errores)
 
-        if qty <= 0:
-            continue
+    costos = (
+        costos_unitarios_estructuras(bom, catalogo, errores)
+        if not bom.empty else pd.Series(dtype=float)
+    )
 
-        df_mat = df_materiales_por_estructura.get(cod)
+    filas = []
 
-        # DEBUG CLAVE
-        if df_mat is None:
-            errores.append(f"{cod}: NO EXISTE EN dict")
-            continue
+    for cod, qty in zip(codigos, df_group["Cantidad"].astype(float)):
 
-        if df_mat.empty:
-            errores.append(f"{cod}: SIN MATERIALES")
+        if cod not in costos.index:
             continue
 
-        try:
-            costo_unit = _costo_unitario_estructura(df_mat, df_precios_materiales)
-
-            filas.append({
-                "codigodeestructura": cod,
-                "Costo Unitario": round(costo_unit, 2),
-                "Cantidad": qty,
-                "Costo Total": round(costo_unit * qty, 2),
-            })
+        costo_unit = float(costos[cod])
 
-        except Exception as e:
-            errores.append(f"{cod}: {str(e)}")
+        filas.append({
+            "codigodeestructura": cod,
+            "Costo Unitario": round(costo_unit, 2),
+            "Cantidad": qty,
+            "Costo Total": round(costo_unit * qty, 2),
+        })
 
     # =========================================================
     # OUTPUT
@@ -127,7 +237,7 @@ def calcular_costos_por_estructura(
     df_out = pd.DataFrame(filas)
 
     if df_out.empty:
-        debug_guardar("COSTOS_ESTRUCTURA_ERROR", {
+        debug_guardar("COSTOS_ESTRUCTURA_ERROR", lambda: {
             "errores": errores,
             "materiales_keys": list(df_materiales_por_estructura.keys())[:20],
             "estructuras": df_group.head(20).to_dict(),
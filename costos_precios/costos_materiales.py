@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import pandas as pd
 from ayuda.debug import debug_guardar
+from entradas.codigos import canonizar
 
 
 # =========================================================
@@ -55,6 +56,20 @@ def _norm_material(s) -> str:
     return texto.strip()
 
 
+def normalizar_claves(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Materiales / Unidad con _norm_material / _norm_text, aplicados
+    una vez por valor distinto (las regex no recorren cada fila).
+    """
+
+    df = df.copy()
+
+    df["Materiales"] = canonizar(df["Materiales"], lambda s: s.map(_norm_material)).astype(str)
+    df["Unidad"] = canonizar(df["Unidad"], lambda s: s.map(_norm_text)).astype(str)
+
+    return df
+
+
 # =========================================================
 # 🔧 NORMALIZAR DATAFRAME DE MATERIALES DEL PROYECTO
 # =========================================================
@@ -92,15 +107,14 @@ def _normalizar_materiales_df(
             f"Columnas disponibles: {list(df.columns)}"
         )
 
-    df["Materiales"] = df["Materiales"].apply(_norm_material)
-    df["Unidad"] = df["Unidad"].apply(_norm_text)
+    df = normalizar_claves(df)
 
     df["Cantidad"] = pd.to_numeric(
         df["Cantidad"],
         errors="coerce",
     )
 
-    debug_guardar("materiales_antes_normalizar", {
+    debug_guardar("materiales_antes_normalizar", lambda: {
         "filas": len(df),
         "cantidades_nulas": int(df["Cantidad"].isna().sum()),
         "preview": df.head(20).to_dict(orient="records"),
@@ -122,7 +136,7 @@ def _normalizar_materiales_df(
             "Revisá Materiales, Unidad y Cantidad."
         )
 
-    debug_guardar("materiales_normalizados", {
+    debug_guardar("materiales_normalizados", lambda: {
         "filas": len(df),
         "preview": df.head(20).to_dict(orient="records"),
     })
@@ -136,10 +150,7 @@ def _normalizar_materiales_df(
 # =========================================================
 def _normalizar_catalogo_df(df: pd.DataFrame) -> pd.DataFrame:
 
-    df = df.copy()
-
-    df["Materiales"] = df["Materiales"].apply(_norm_material)
-    df["Unidad"] = df["Unidad"].apply(_norm_text)
+    df = normalizar_claves(df)
 
     df["Costo Unitario"] = pd.to_numeric(
         df["Costo Unitario"],
@@ -194,7 +205,7 @@ def preparar_catalogo_costos(df_catalogo: pd.DataFrame) -> pd.DataFrame:
 
     df = _normalizar_catalogo_df(df)
 
-    debug_guardar("catalogo_costos_antes_filtrar", {
+    debug_guardar("catalogo_costos_antes_filtrar", lambda: {
         "filas": len(df),
         "costos_nulos": int(df["Costo Unitario"].isna().sum()),
         "costos_validos": int((df["Costo Unitario"].fillna(0) > 0).sum()),
@@ -215,7 +226,7 @@ def preparar_catalogo_costos(df_catalogo: pd.DataFrame) -> pd.DataFrame:
         keep="first"
     )
 
-    debug_guardar("catalogo_costos_procesado", {
+    debug_guardar("catalogo_costos_procesado", lambda: {
         "filas": len(df_validos),
         "preview": df_validos.head(10).to_dict(orient="records"),
     })
@@ -230,30 +241,13 @@ def _consolidar_materiales(df: pd.DataFrame) -> pd.DataFrame:
 
     df = (
         df
-        .groupby(["Materiales", "Unidad"], as_index=False)["Cantidad"]
+        .groupby(["Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"]
         .sum()
     )
 
     return df
 
 
-# =========================================================
-# 🔧 MERGE CON COSTOS
-# =========================================================
-def _merge_costos(
-    df_materiales: pd.DataFrame,
-    catalogo: pd.DataFrame
-) -> pd.DataFrame:
-
-    df = df_materiales.merge(
-        catalogo,
-        on=["Materiales", "Unidad"],
-        how="left"
-    )
-
-    return df
-
-
 # =========================================================
 # 🔧 FILTRAR SIN COSTO
 # =========================================================
@@ -262,7 +256,7 @@ def _filtrar_sin_costo(df: pd.DataFrame) -> pd.DataFrame:
     faltantes = df[df["Costo Unitario"].isna()].copy()
 
     if not faltantes.empty:
-        debug_guardar("WARNING_MATERIALES_SIN_COSTO", {
+        debug_guardar("WARNING_MATERIALES_SIN_COSTO", lambda: {
             "cantidad": len(faltantes),
             "ejemplo": faltantes.head(20).to_dict(orient="records"),
         })
@@ -305,34 +299,51 @@ def _calcular_costos(df: pd.DataFrame) -> pd.DataFrame:
 # =========================================================
 def calcular_lista_materiales_con_costos(
     df_materiales: pd.DataFrame,
-    df_catalogo_costos: pd.DataFrame
+    df_catalogo_costos
 ) -> pd.DataFrame:
+    """
+    df_catalogo_costos: catálogo (DataFrame) o IndicePrecios ya
+    armado desde el catálogo preparado (no se vuelve a preparar).
+    """
+
+    from costos_precios.indice_precios import IndicePrecios
 
     if df_materiales is None or df_materiales.empty:
         raise ValueError("df_materiales vacío")
 
-    if df_catalogo_costos is None or df_catalogo_costos.empty:
+    es_indice = isinstance(df_catalogo_costos, IndicePrecios)
+
+    if not es_indice and (df_catalogo_costos is None or df_catalogo_costos.empty):
+        raise ValueError("df_catalogo_costos vacío")
+
+    if es_indice and len(df_catalogo_costos) == 0:
         raise ValueError("df_catalogo_costos vacío")
 
     # 1. Normalizar materiales del proyecto
     df = _normalizar_materiales_df(df_materiales)
 
-    # 2. Preparar catálogo correctamente
-    catalogo = preparar_catalogo_costos(df_catalogo_costos)
+    # 2. Preparar catálogo correctamente (una vez por corrida si
+    #    llega como índice)
+    indice = (
+        df_catalogo_costos if es_indice
+        else IndicePrecios.desde_df(preparar_catalogo_costos(df_catalogo_costos))
+    )
 
     # 3. Consolidar cantidades repetidas
     df = _consolidar_materiales(df)
 
-    debug_guardar("DEBUG_MATCH_KEYS", {
+    debug_guardar("DEBUG_MATCH_KEYS", lambda: {
         "proyecto": df[["Materiales", "Unidad"]].head(20).to_dict(orient="records"),
-        "catalogo": catalogo[["Materiales", "Unidad"]].head(20).to_dict(orient="records"),
+        "catalogo": [
+            {"Materiales": m, "Unidad": u} for m, u in list(indice.precios)[:20]
+        ],
     })
 
-    # 4. Unir materiales con catálogo de costos
-    df = _merge_costos(df, catalogo)
+    # 4. Precio de cada material (búsqueda en lote en el índice)
+    df["Costo Unitario"] = indice.precios_df(df)
 
     # 5. Guardar diagnóstico de merge
-    debug_guardar("DEBUG_RESULTADO_MERGE_COSTOS", {
+    debug_guardar("DEBUG_RESULTADO_MERGE_COSTOS", lambda: {
         "filas_total": len(df),
         "sin_costo": int(df["Costo Unitario"].isna().sum()),
         "con_costo": int(df["Costo Unitario"].notna().sum()),
@@ -354,7 +365,7 @@ def calcular_lista_materiales_con_costos(
         "Costo Total",
     ]].reset_index(drop=True)
 
-    debug_guardar("resultado_costos_materiales", {
+    debug_guardar("resultado_costos_materiales", lambda: {
         "total_materiales": len(resultado),
         "costo_total": float(resultado["Costo Total"].sum()),
         "preview": resultado.head(20).to_dict(orient="records"),
@@ -80,12 +80,12 @@ def _obtener_columna(df: pd.DataFrame, posibles: list[str]) -> Optional[str]:
 def _leer_session_state() -> Dict[str, Any]:
     """
     Lee Streamlit de forma segura.
-    Si el cálculo se ejecuta fuera de Streamlit, devuelve {}.
+    Fuera de Streamlit devuelve el estado local del proceso.
     """
 
     try:
-        import streamlit as st
-        return st.session_state
+        from ayuda.sesion import estado_sesion
+        return estado_sesion()
     except Exception:
         return {}
 
@@ -612,6 +612,58 @@ def _leer_parametros_operativos(entrada=None) -> Dict[str, float]:
     }
 
 
+# =========================================================
+# MONTOS POR ACTIVIDAD (ESCALARES O ARREGLOS)
+# =========================================================
+def _montos_actividades(
+    params: Dict[str, Any],
+    *,
+    longitud_primario_m,
+    longitud_secundario_m,
+    total_estructuras,
+    num_postes,
+    num_retenidas,
+) -> Dict[str, Any]:
+    """
+    Horas y costos de cuadrilla / agujeros. Solo aritmética: con
+    parámetros escalares da floats y con arreglos NumPy (una
+    muestra por posición, simulacion_costos) da arreglos.
+    """
+
+    costo_hora_cuadrilla = params["costo_hora_cuadrilla"]
+
+    horas_postes = num_postes * params["horas_por_poste"]
+    horas_estructuras = total_estructuras * params["horas_por_estructura"]
+    horas_retenidas = num_retenidas * params["horas_por_retenida"]
+
+    costo_hincado_postes = horas_postes * costo_hora_cuadrilla
+    costo_armado_estructuras = horas_estructuras * costo_hora_cuadrilla
+    costo_instalacion_retenidas = horas_retenidas * costo_hora_cuadrilla
+    costo_tendido_mt = longitud_primario_m * params["costo_tendido_mt_m"]
+    costo_tendido_bt = longitud_secundario_m * params["costo_tendido_bt_m"]
+
+    return {
+        "horas_postes": horas_postes,
+        "horas_estructuras": horas_estructuras,
+        "horas_retenidas": horas_retenidas,
+
+        "costo_agujeros": int(num_postes + num_retenidas) * params["costo_agujero_unitario"],
+        "costo_hincado_postes": costo_hincado_postes,
+        "costo_armado_estructuras": costo_armado_estructuras,
+        "costo_instalacion_retenidas": costo_instalacion_retenidas,
+        "costo_tendido_mt": costo_tendido_mt,
+        "costo_tendido_bt": costo_tendido_bt,
+
+        "costo_cuadrilla": (
+            costo_hincado_postes
+            + costo_armado_estructuras
+            + costo_instalacion_retenidas
+            + costo_tendido_mt
+            + costo_tendido_bt
+        ),
+    }
+
+
 # =========================================================
 # CALCULAR COSTOS REALES POR ACTIVIDAD
 # =========================================================
@@ -646,16 +698,25 @@ def _calcular_costos_actividades(
 
     cantidad_agujeros = int(num_postes + num_retenidas)
 
-    horas_postes = num_postes * horas_por_poste
-    horas_estructuras = total_estructuras * horas_por_estructura
-    horas_retenidas = num_retenidas * horas_por_retenida
+    montos = _montos_actividades(
+        params,
+        longitud_primario_m=longitud_primario_m,
+        longitud_secundario_m=longitud_secundario_m,
+        total_estructuras=total_estructuras,
+        num_postes=num_postes,
+        num_retenidas=num_retenidas,
+    )
 
-    costo_agujeros = cantidad_agujeros * costo_agujero_unitario
-    costo_hincado_postes = horas_postes * costo_hora_cuadrilla
-    costo_armado_estructuras = horas_estructuras * costo_hora_cuadrilla
-    costo_instalacion_retenidas = horas_retenidas * costo_hora_cuadrilla
-    costo_tendido_mt = longitud_primario_m * costo_tendido_mt_m
-    costo_tendido_bt = longitud_secundario_m * costo_tendido_bt_m
+    horas_postes = montos["horas_postes"]
+    horas_estructuras = montos["horas_estructuras"]
+    horas_retenidas = montos["horas_retenidas"]
+
+    costo_agujeros = montos["costo_agujeros"]
+    costo_hincado_postes = montos["costo_hincado_postes"]
+    costo_armado_estructuras = montos["costo_armado_estructuras"]
+    costo_instalacion_retenidas = montos["costo_instalacion_retenidas"]
+    costo_tendido_mt = montos["costo_tendido_mt"]
+    costo_tendido_bt = montos["costo_tendido_bt"]
 
     actividades = [
         {
@@ -745,13 +806,7 @@ def _calcular_costos_actividades(
         if _to_float(item.get("total", 0)) > 0
     ]
 
-    costo_cuadrilla = (
-        costo_hincado_postes
-        + costo_armado_estructuras
-        + costo_instalacion_retenidas
-        + costo_tendido_mt
-        + costo_tendido_bt
-    )
+    costo_cuadrilla = montos["costo_cuadrilla"]
 
     return {
         "detalle_costos_actividades": actividades,
@@ -798,44 +853,59 @@ def _calcular_costos_actividades(
 # =========================================================
 # CALCULAR TIEMPOS / CRONOGRAMA
 # =========================================================
+# Rendimiento de una cuadrilla por día (agujeros y postes sobre
+# num_postes, metros en tendido). simulacion_costos los muestrea.
+RENDIMIENTOS = {
+    "agujeros": 10,
+    "postes": 7,
+    "retenidas": 6,
+    "estructuras": 8,
+    "primario": 500,
+    "secundario": 300,
+}
+
+
 def _calcular_tiempos(
     longitud_primario_m: float,
     longitud_secundario_m: float,
     total_estructuras: int,
     num_postes: int,
     num_retenidas: int,
+    rendimientos: Optional[Dict[str, float]] = None,
 ) -> Dict[str, Any]:
 
+    r = {**RENDIMIENTOS, **(rendimientos or {})}
+
     dias_levantamiento = 1
 
     dias_agujeros = max(
         0,
-        round(num_postes / 10),
+        round(num_postes / r["agujeros"]),
     )
 
     dias_postes = max(
         0,
-        round(num_postes / 7),
+        round(num_postes / r["postes"]),
     )
 
     dias_retenidas = max(
         0,
-        round(num_retenidas / 6),
+        round(num_retenidas / r["retenidas"]),
     )
 
     dias_estructuras = max(
         0,
-        round(total_estructuras / 8),
+        round(total_estructuras / r["estructuras"]),
     )
 
     dias_primario = (
-        max(0, round(longitud_primario_m / 500))
+        max(0, round(longitud_primario_m / r["primario"]))
         if longitud_primario_m
         else 0
     )
 
     dias_secundario = (
-        max(0, round(longitud_secundario_m / 300))
+        max(0, round(longitud_secundario_m / r["secundario"]))
         if longitud_secundario_m
         else 0
     )
@@ -1112,13 +1182,30 @@ def _motor_costos(
 
     costo_otros = costos_tabla["costo_otros"]
 
-    tiempos = _calcular_tiempos(
-        longitud_primario_m=longitud_primario_m,
-        longitud_secundario_m=longitud_secundario_m,
-        total_estructuras=total_estructuras,
-        num_postes=num_postes,
-        num_retenidas=num_retenidas,
-    )
+    # cuadrillas > 0: programa por punto con ruta crítica y
+    # cuadrillas en paralelo (programacion_obra); si no, en serie
+    cuadrillas = int(_to_float(
+        _get_valor(entrada, _leer_session_state(), "cuadrillas", 0),
+        0,
+    ))
+
+    if cuadrillas > 0:
+        from costos_precios.programacion_obra import programar_obra
+
+        tiempos = programar_obra(
+            getattr(entrada, "df_estructuras", None),
+            longitud_primario_m=longitud_primario_m,
+            longitud_secundario_m=longitud_secundario_m,
+            cuadrillas=cuadrillas,
+        )
+    else:
+        tiempos = _calcular_tiempos(
+            longitud_primario_m=longitud_primario_m,
+            longitud_secundario_m=longitud_secundario_m,
+            total_estructuras=total_estructuras,
+            num_postes=num_postes,
+            num_retenidas=num_retenidas,
+        )
 
     dias_totales = tiempos["dias_totales"]
 
@@ -1251,60 +1338,98 @@ def _motor_costos(
 
 
 # =========================================================
-# FUNCIÓN PRINCIPAL
+# DATOS BASE (MÉTRICAS, LONGITUDES, PRECIO DE VENTA)
 # =========================================================
-def calcular_costos_proyecto(
-    entrada,
-) -> Dict[str, Any]:
+def _datos_base_proyecto(entrada) -> Dict[str, Any]:
+    """
+    Lo que calcular_costos_proyecto y simular_costos_proyecto leen
+    de entrada antes del motor de costos.
+    """
 
-    try:
-        df_estructuras_global = getattr(
-            entrada,
-            "df_estructuras",
-            None,
-        )
+    (
+        total_estructuras,
+        num_postes,
+        num_retenidas,
+    ) = _extraer_metricas_estructuras(
+        getattr(entrada, "df_estructuras", None)
+    )
 
-        (
-            total_estructuras,
-            num_postes,
-            num_retenidas,
-        ) = _extraer_metricas_estructuras(
-            df_estructuras_global
-        )
+    (
+        longitud_primario,
+        longitud_secundario,
+    ) = _extraer_longitudes(
+        getattr(entrada, "df_cables", None)
+    )
 
-        (
-            longitud_primario,
-            longitud_secundario,
-        ) = _extraer_longitudes(
-            getattr(entrada, "df_cables", None)
-        )
+    df_costos_materiales = getattr(
+        entrada,
+        "df_costos_materiales",
+        None,
+    )
 
+    if df_costos_materiales is None:
         df_costos_materiales = getattr(
             entrada,
-            "df_costos_materiales",
+            "df_materiales_costos",
             None,
         )
 
-        if df_costos_materiales is None:
-            df_costos_materiales = getattr(
-                entrada,
-                "df_materiales_costos",
-                None,
-            )
+    _validar_materiales(
+        df_costos_materiales
+    )
 
-        _validar_materiales(
-            df_costos_materiales
+    precio_base = _to_float(
+        getattr(
+            entrada,
+            "precio_venta_proyecto",
+            0,
         )
+    )
 
-        precio_base = _to_float(
-            getattr(
-                entrada,
-                "precio_venta_proyecto",
-                0,
-            )
+    params = _leer_parametros_operativos(entrada)
+
+    if params["incluir_logistica_en_venta"]:
+        precio_total = (
+            precio_base
+            + params["costo_grua"]
+            + params["costo_flete"]
+            + params["costo_ingenieria"]
         )
+    else:
+        precio_total = precio_base
+
+    return {
+        "total_estructuras": total_estructuras,
+        "num_postes": num_postes,
+        "num_retenidas": num_retenidas,
+        "longitud_primario": longitud_primario,
+        "longitud_secundario": longitud_secundario,
+        "df_costos_materiales": df_costos_materiales,
+        "precio_base": precio_base,
+        "precio_total": precio_total,
+        "params": params,
+    }
+
+
+# =========================================================
+# FUNCIÓN PRINCIPAL
+# =========================================================
+def calcular_costos_proyecto(
+    entrada,
+) -> Dict[str, Any]:
 
-        params = _leer_parametros_operativos(entrada)
+    try:
+        base = _datos_base_proyecto(entrada)
+
+        total_estructuras = base["total_estructuras"]
+        num_postes = base["num_postes"]
+        num_retenidas = base["num_retenidas"]
+        longitud_primario = base["longitud_primario"]
+        longitud_secundario = base["longitud_secundario"]
+        df_costos_materiales = base["df_costos_materiales"]
+        precio_base = base["precio_base"]
+        precio_total = base["precio_total"]
+        params = base["params"]
 
         costo_grua = params["costo_grua"]
         costo_flete = params["costo_flete"]
@@ -1312,16 +1437,6 @@ def calcular_costos_proyecto(
 
         incluir_logistica_en_venta = params["incluir_logistica_en_venta"]
 
-        if incluir_logistica_en_venta:
-            precio_total = (
-                precio_base
-                + costo_grua
-                + costo_flete
-                + gastos_ingenieria
-            )
-        else:
-            precio_total = precio_base
-
         resultado = _motor_costos(
             df_materiales_costos=df_costos_materiales,
             longitud_primario_m=longitud_primario,
@@ -1333,6 +1448,19 @@ def calcular_costos_proyecto(
             entrada=entrada,
         )
 
+        # -------------------------------------------------
+        # Monte Carlo opcional (simulacion_muestras > 0)
+        # -------------------------------------------------
+        muestras = int(_to_float(
+            _get_valor(entrada, _leer_session_state(), "simulacion_muestras", 0),
+            0,
+        ))
+
+        if muestras > 0:
+            from costos_precios.simulacion_costos import simular_costos_proyecto
+
+            resultado["simulacion"] = simular_costos_proyecto(entrada, muestras=muestras)
+
         debug_costos_proyecto = {
             "entrada": {
                 "precio_base": precio_base,
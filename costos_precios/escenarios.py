@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ayuda.debug import debug_guardar
+from costos_precios.mano_obra_por_punto import obtener_lista_precios
+from costos_precios.precio_estructura import (
+    _agregar_cable_a_precios,
+    _agregar_materiales_extra_a_precios,
+    _validar_df_costos_estructura,
+    calcular_costos_operativos,
+    tabla_mano_obra,
+    unir_mano_obra,
+)
+
+
+# =========================================================
+# 🔷 ESCENARIOS DE COSTO (CONTRATISTA × UTILIDAD × OPERATIVOS)
+# =========================================================
+# Para comparar contratistas o márgenes se corría la app varias
+# veces; materiales y costos de materiales salían iguales en cada
+# corrida y solo cambiaban mano de obra y margen.
+#
+# evaluar_escenarios() parte de los costos por estructura ya
+# calculados y evalúa todos los escenarios a la vez:
+#
+#   ✔ Una columna por escenario (matrices estructuras × escenarios)
+#   ✔ Mano de obra y cables: una vez por contratista distinto
+#   ✔ Materiales extra: una vez para todos
+#   ✔ Mismas fórmulas que precio_estructura.ejecutar_costos
+#     (redondeo a 2 decimales con np.round)
+COLUMNAS_COMPARACION = [
+    "Escenario",
+    "Contratista",
+    "Utilidad %",
+    "Factor Equipos",
+    "Factor Logistica",
+    "Material",
+    "Mano Obra",
+    "Costo Operativo",
+    "Utilidad",
+    "Estructuras",
+    "Cables",
+    "Materiales Extra",
+    "Total Proyecto",
+    "Diferencia",
+    "Diferencia %",
+]
+
+
+@dataclass
+class Escenario:
+    """
+    Parámetros de un escenario (los mismos de ejecutar_costos y
+    calcular_costos_operativos).
+    """
+
+    contratista: str = "C1"
+    porcentaje_utilidad: float = 0.0
+    factor_equipos: float = 0.05
+    factor_logistica: float = 0.15
+    nombre: Optional[str] = None
+
+    @property
+    def etiqueta(self) -> str:
+
+        if self.nombre:
+            return str(self.nombre)
+
+        return (
+            f"{self.contratista} +{self.porcentaje_utilidad * 100:g}% "
+            f"(eq {self.factor_equipos:g}, log {self.factor_logistica:g})"
+        )
+
+
+def _como_escenarios(escenarios: Sequence[Any]) -> List[Escenario]:
+
+    if not escenarios:
+        raise ValueError("No se indicaron escenarios")
+
+    salida = []
+
+    for e in escenarios:
+
+        if isinstance(e, Escenario):
+            salida.append(e)
+        elif isinstance(e, dict):
+            salida.append(Escenario(**e))
+        else:
+            raise TypeError(f"Escenario inválido: {type(e).__name__}")
+
+    etiquetas = [e.etiqueta for e in salida]
+    repetidas = sorted({x for x in etiquetas if etiquetas.count(x) > 1})
+
+    if repetidas:
+        raise ValueError(f"Escenarios repetidos: {repetidas}")
+
+    return salida
+
+
+# =========================================================
+# PRECIOS POR ESCENARIO
+# =========================================================
+def _df_precios(
+    estructuras: np.ndarray,
+    cantidad: np.ndarray,
+    material_unit: np.ndarray,
+    mano_obra_unit: np.ndarray,
+    operativo_unit: np.ndarray,
+    total_unit: np.ndarray,
+    total_proyecto: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Mismas columnas que _crear_fila_estructura_precio.
+    """
+
+    material = np.round(material_unit, 2)
+    operativo = np.round(operativo_unit, 2)
+
+    return pd.DataFrame({
+        "Estructura": estructuras,
+        "Cantidad": cantidad,
+
+        "Material Unitario": material,
+        "Mano Obra Unitaria": np.round(mano_obra_unit, 2),
+        "Costo Operativo Unitario": operativo,
+        "Total Unitario": total_unit,
+        "Total Proyecto": total_proyecto,
+        "Subtotal": total_proyecto,
+
+        "Costo Unitario": material,
+        "Costo Operativo": operativo,
+        "Precio Unitario": total_unit,
+        "Precio Total": total_proyecto,
+    })
+
+
+def _total(df: Optional[pd.DataFrame]) -> float:
+
+    if df is None or df.empty:
+        return 0.0
+
+    return float(pd.to_numeric(df["Total Proyecto"], errors="coerce").fillna(0).sum())
+
+
+def evaluar_escenarios(
+    entrada,
+    escenarios: Sequence[Any],
+    df_costos_estructura: Optional[pd.DataFrame] = None,
+) -> Dict[str, Any]:
+    """
+    Suministro e instalación para varios escenarios en una pasada.
+
+    entrada: la misma de precio_estructura.ejecutar_costos
+    (df_costos_estructura, df_cables, df_materiales_extra,
+    df_costos_materiales / indice_precios); una EntradaCostos ya
+    pasada por orquestador_costos.ejecutar_costos sirve indicando
+    df_costos_estructura.
+
+    escenarios: Escenario o dicts con sus campos.
+
+    SALIDA:
+    -------
+    {
+      "ok", "errores",
+      "df_comparacion": una fila por escenario (Diferencia contra
+                        el más barato),
+      "precios": {etiqueta: df_precios_estructura},
+      "costos_operativos": {etiqueta: calcular_costos_operativos},
+      "sin_mano_obra": {contratista: estructuras sin precio},
+    }
+    """
+
+    try:
+
+        escenarios = _como_escenarios(escenarios)
+
+        if df_costos_estructura is None:
+            df_costos_estructura = getattr(entrada, "df_costos_estructura", None)
+
+        error_validacion = _validar_df_costos_estructura(df_costos_estructura)
+
+        if error_validacion is not None:
+            return {**error_validacion, "df_comparacion": None, "precios": {}}
+
+        # -------------------------------------------------
+        # base común (estructuras)
+        # -------------------------------------------------
+        estructuras = df_costos_estructura["codigodeestructura"].astype(str).str.strip().str.upper().to_numpy()
+        cantidad = np.maximum(1, df_costos_estructura["Cantidad"].astype(int).to_numpy())
+        material_unit = df_costos_estructura["Costo Unitario"].astype(float).to_numpy()
+        material_total = df_costos_estructura["Costo Total"].astype(float).to_numpy()
+
+        material_total_global = float(df_costos_estructura["Costo Total"].sum())
+
+        if material_total_global > 0:
+            peso = material_total / material_total_global
+        else:
+            peso = np.zeros(len(material_total))
+
+        # -------------------------------------------------
+        # una vez por contratista distinto
+        # -------------------------------------------------
+        listas = {e.etiqueta: obtener_lista_precios(e.contratista) for e in escenarios}
+
+        mano_obra: Dict[str, np.ndarray] = {}
+        cables: Dict[str, pd.DataFrame] = {}
+        sin_mano_obra: Dict[str, List[str]] = {}
+
+        for e in escenarios:
+
+            nombre = listas[e.etiqueta].nombre
+
+            if nombre in mano_obra:
+                continue
+
+            df, faltantes = unir_mano_obra(
+                df_costos_estructura,
+                tabla_mano_obra(listas[e.etiqueta]),
+                prefijos=True,
+            )
+
+            mano_obra[nombre] = df["Mano Obra Unitaria"].astype(float).to_numpy()
+            sin_mano_obra[nombre] = faltantes
+            cables[nombre] = _agregar_cable_a_precios(pd.DataFrame(), entrada, nombre)
+
+        if any(sin_mano_obra.values()):
+            debug_guardar("MANO_OBRA_SIN_PRECIO", lambda: sin_mano_obra)
+
+        extras = _agregar_materiales_extra_a_precios(pd.DataFrame(), entrada)
+
+        # -------------------------------------------------
+        # matrices estructuras × escenarios
+        # -------------------------------------------------
+        costos_op = [
+            calcular_costos_operativos(
+                costo_material_total=material_total_global,
+                factor_equipos=e.factor_equipos,
+                factor_logistica=e.factor_logistica,
+            )
+            for e in escenarios
+        ]
+
+        MO = np.column_stack([mano_obra[listas[e.etiqueta].nombre] for e in escenarios])
+        operativo_total = np.array([c["operativo_total"] for c in costos_op])
+        utilidad = np.array([float(e.porcentaje_utilidad) for e in escenarios])
+
+        OP = np.outer(peso, operativo_total) / cantidad[:, None]
+        base = material_unit[:, None] + MO + OP
+        factor = np.where(utilidad > 0, 1 + utilidad, 1.0)
+
+        total_unit = np.round(base * factor, 2)
+        total_proyecto = np.round(total_unit * cantidad[:, None], 2)
+
+        material = float(np.sum(material_unit * cantidad))
+        mano = (MO * cantidad[:, None]).sum(axis=0)
+        operativo = (OP * cantidad[:, None]).sum(axis=0)
+        estructuras_total = total_proyecto.sum(axis=0)
+
+        # -------------------------------------------------
+        # salida por escenario
+        # -------------------------------------------------
+        precios: Dict[str, pd.DataFrame] = {}
+        filas = []
+
+        for j, e in enumerate(escenarios):
+
+            nombre = listas[e.etiqueta].nombre
+
+            df_precios = _df_precios(
+                estructuras,
+                cantidad,
+                material_unit,
+                MO[:, j],
+                OP[:, j],
+                total_unit[:, j],
+                total_proyecto[:, j],
+            )
+
+            df_precios = pd.concat(
+                [p for p in (df_precios, cables[nombre], extras) if not p.empty],
+                ignore_index=True,
+            )
+
+            precios[e.etiqueta] = df_precios
+
+            filas.append({
+                "Escenario": e.etiqueta,
+                "Contratista": nombre,
+                "Utilidad %": float(e.porcentaje_utilidad),
+                "Factor Equipos": float(e.factor_equipos),
+                "Factor Logistica": float(e.factor_logistica),
+                "Material": round(material, 2),
+                "Mano Obra": round(float(mano[j]), 2),
+                "Costo Operativo": round(float(operativo[j]), 2),
+                "Utilidad": round(float(estructuras_total[j]) - material - float(mano[j]) - float(operativo[j]), 2),
+                "Estructuras": round(float(estructuras_total[j]), 2),
+                "Cables": round(_total(cables[nombre]), 2),
+                "Materiales Extra": round(_total(extras), 2),
+                "Total Proyecto": round(_total(df_precios), 2),
+            })
+
+        df_comparacion = pd.DataFrame(filas)
+        minimo = df_comparacion["Total Proyecto"].min()
+
+        df_comparacion["Diferencia"] = (df_comparacion["Total Proyecto"] - minimo).round(2)
+        df_comparacion["Diferencia %"] = (
+            (df_comparacion["Diferencia"] / minimo * 100).round(2) if minimo else 0.0
+        )
+
+        df_comparacion = df_comparacion[COLUMNAS_COMPARACION]
+
+        debug_guardar("ESCENARIOS", lambda: df_comparacion)
+
+        return {
+            "ok": True,
+            "errores": [],
+            "df_comparacion": df_comparacion,
+            "precios": precios,
+            "costos_operativos": dict(zip([e.etiqueta for e in escenarios], costos_op)),
+            "sin_mano_obra": sin_mano_obra,
+        }
+
+    except Exception as e:
+
+        return {
+            "ok": False,
+            "errores": [str(e)],
+            "df_comparacion": None,
+            "precios": {},
+        }
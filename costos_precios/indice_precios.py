@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from costos_precios.costos_materiales import _norm_material, _norm_text, normalizar_claves
+
+
+# =========================================================
+# 🔷 ÍNDICE DE PRECIOS POR (MATERIAL, UNIDAD)
+# =========================================================
+# Antes cada búsqueda (material extra, cable) copiaba toda la tabla
+# de precios y le pasaba _norm_material a cada fila. El índice se
+# arma una vez por corrida de costos desde el catálogo preparado o
+# desde df_costos_materiales:
+#
+#   ✔ buscar / precio: O(1) por clave normalizada
+#   ✔ precios_df: un DataFrame entero con un reindex
+#   ✔ Las claves se normalizan con las mismas funciones que el
+#     merge de costos_materiales (_norm_material / _norm_text)
+Clave = Tuple[str, str]
+
+COLUMNAS_INDICE = ("Materiales", "Unidad", "Costo Unitario")
+
+
+def clave_precio(material, unidad) -> Clave:
+    return _norm_material(material), _norm_text(unidad)
+
+
+@dataclass
+class IndicePrecios:
+    """
+    clave normalizada → costo unitario de cada fila con esa clave
+    (NaN incluidos, para que el que busca decida qué es inválido).
+    """
+
+    precios: Dict[Clave, List[float]] = field(default_factory=dict)
+    _unicos: Optional[pd.Series] = field(default=None, repr=False)
+
+    # -----------------------------------------------------
+    # CONSTRUCCIÓN
+    # -----------------------------------------------------
+    @classmethod
+    def desde_df(cls, df: pd.DataFrame) -> "IndicePrecios":
+        """
+        df: catálogo preparado o df_costos_materiales (Materiales,
+        Unidad, Costo Unitario).
+        """
+
+        if df is None or not isinstance(df, pd.DataFrame):
+            raise TypeError("La tabla de precios debe ser un DataFrame")
+
+        faltantes = set(COLUMNAS_INDICE) - set(df.columns)
+
+        if faltantes:
+            raise ValueError(
+                "La tabla de precios no contiene las columnas "
+                f"requeridas: {sorted(faltantes)}"
+            )
+
+        indice = cls()
+
+        if df.empty:
+            return indice
+
+        claves = normalizar_claves(df[["Materiales", "Unidad"]])
+        costos = pd.to_numeric(df["Costo Unitario"], errors="coerce")
+
+        for material, unidad, costo in zip(claves["Materiales"], claves["Unidad"], costos):
+            indice.precios.setdefault((material, unidad), []).append(float(costo))
+
+        return indice
+
+    def __len__(self) -> int:
+        return len(self.precios)
+
+    # -----------------------------------------------------
+    # BÚSQUEDA
+    # -----------------------------------------------------
+    def buscar(self, material, unidad) -> List[float]:
+        """
+        Costos de las filas con esa clave ([] si no existe).
+        """
+
+        return self.precios.get(clave_precio(material, unidad), [])
+
+    def precio(self, material, unidad) -> Optional[float]:
+        """
+        ✔ Un único costo válido → ese costo
+        ❌ Sin filas, solo NaN o varios costos distintos → None
+        """
+
+        validos = {c for c in self.buscar(material, unidad) if not np.isnan(c)}
+
+        return validos.pop() if len(validos) == 1 else None
+
+    def _serie_unicos(self) -> pd.Series:
+
+        if self._unicos is None:
+            unicos = {}
+
+            for clave, costos in self.precios.items():
+                validos = {c for c in costos if not np.isnan(c)}
+                if len(validos) == 1:
+                    unicos[clave] = validos.pop()
+
+            self._unicos = pd.Series(
+                list(unicos.values()),
+                index=pd.MultiIndex.from_tuples(list(unicos), names=["Materiales", "Unidad"])
+                if unicos else pd.MultiIndex.from_arrays([[], []], names=["Materiales", "Unidad"]),
+                dtype=float,
+            )
+
+        return self._unicos
+
+    def precios_df(
+        self,
+        df: pd.DataFrame,
+        col_material: str = "Materiales",
+        col_unidad: str = "Unidad",
+    ) -> pd.Series:
+        """
+        precio() para cada fila de df en una pasada (NaN donde no
+        hay un costo único), alineado con df.index.
+        """
+
+        if df.empty:
+            return pd.Series(dtype=float, index=df.index)
+
+        claves = normalizar_claves(
+            df[[col_material, col_unidad]].set_axis(["Materiales", "Unidad"], axis=1)
+        )
+
+        valores = self._serie_unicos().reindex(
+            pd.MultiIndex.from_arrays([claves["Materiales"], claves["Unidad"]])
+        )
+
+        return pd.Series(valores.to_numpy(), index=df.index, name="Costo Unitario")
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from entradas.codigos import canonizar
+
+
+# =========================================================
+# 🔷 LISTAS DE PRECIOS DE CONTRATISTAS
+# =========================================================
+# Las listas de mano de obra vivían como dicts en el código
+# (PRECIOS_FIJOS / PRECIOS_FIJOS_2) y cada búsqueda hacía un lookup
+# exacto y después un recorrido startswith sobre toda la lista, una
+# vez por fila de detalle y por cable.
+#
+# Ahora salen de data/precios_contratistas.json (un contratista por
+# clave, tantos como haga falta) y cada lista se compila una vez:
+#
+#   ✔ precio(): prefijo más largo con un lookup por cada largo
+#     distinto de clave (no por cada clave)
+#   ✔ precios_serie(): una búsqueda por valor distinto de la Serie
+#   ✔ Se lee como un dict (get / keys / values / in), así que
+#     tabla_mano_obra y las claves globales de cables no cambian
+#   ❌ Contratista que no está en el archivo → CONTRATISTA_DEFECTO
+#     (como antes: cualquier nombre que no fuera C2 usaba C1)
+CONTRATISTA_DEFECTO = "C1"
+
+MODOS_CABLES = ("detallado", "global")
+
+_CACHE: Dict[str, Tuple[int, Dict[str, "ListaPrecios"]]] = {}
+_LOCK = threading.Lock()
+
+
+def ruta_precios_contratistas() -> Path:
+
+    ruta = os.environ.get("CALCULO_PRECIOS_CONTRATISTAS")
+
+    if ruta:
+        return Path(ruta)
+
+    return Path(__file__).resolve().parent.parent / "data" / "precios_contratistas.json"
+
+
+def _clave(estructura) -> str:
+    return str(estructura).upper().strip()
+
+
+@dataclass
+class ListaPrecios(Mapping):
+    """
+    Lista de un contratista.
+
+    cables: "detallado" (precio por calibre, C1) o "global" (una
+    clave por tipo de conductor, C2).
+    desmontajes: {estructura: {"cantidad", "precio"}} que se suman
+    al detalle de mano de obra.
+    """
+
+    nombre: str
+    precios: Dict[str, float] = field(default_factory=dict)
+    cables: str = "detallado"
+    desmontajes: Dict[str, dict] = field(default_factory=dict)
+    _largos: List[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+
+        if self.cables not in MODOS_CABLES:
+            raise ValueError(
+                f"Contratista {self.nombre}: modo de cables inválido "
+                f"'{self.cables}' (válidos: {', '.join(MODOS_CABLES)})"
+            )
+
+        precios = {}
+
+        for estructura, precio in self.precios.items():
+
+            clave = _clave(estructura)
+
+            if clave in precios:
+                raise ValueError(
+                    f"Contratista {self.nombre}: la estructura '{clave}' "
+                    "está repetida en la lista de precios"
+                )
+
+            if isinstance(precio, bool) or not isinstance(precio, (int, float)):
+                raise TypeError(
+                    f"Contratista {self.nombre}: el precio de '{clave}' "
+                    "debe ser numérico"
+                )
+
+            precios[clave] = precio
+
+        self.precios = precios
+        self._largos = sorted({len(c) for c in precios}, reverse=True)
+
+    # -----------------------------------------------------
+    # DICT
+    # -----------------------------------------------------
+    def __getitem__(self, estructura):
+        return self.precios[estructura]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.precios)
+
+    def __len__(self) -> int:
+        return len(self.precios)
+
+    # -----------------------------------------------------
+    # BÚSQUEDA
+    # -----------------------------------------------------
+    def buscar(self, estructura) -> Optional[float]:
+        """
+        Exacto o, si no, la clave más larga que sea prefijo de la
+        estructura (None si ninguna).
+        """
+
+        estructura = _clave(estructura)
+
+        for largo in self._largos:
+
+            if largo > len(estructura):
+                continue
+
+            precio = self.precios.get(estructura[:largo])
+
+            if precio is not None:
+                return precio
+
+        return None
+
+    def precio(self, estructura, defecto=0):
+
+        precio = self.buscar(estructura)
+
+        return defecto if precio is None else precio
+
+    def precios_serie(self, estructuras: pd.Series, defecto=0) -> pd.Series:
+        """
+        precio() de cada fila, alineado con el índice de la Serie.
+        """
+
+        if estructuras.empty:
+            return pd.Series(dtype=float, index=estructuras.index)
+
+        codigos = canonizar(estructuras).cat
+        valores = np.array(
+            [self.precio(e, defecto) for e in codigos.categories],
+            dtype=object,
+        )
+
+        return pd.Series(
+            list(valores[codigos.codes.to_numpy()]),
+            index=estructuras.index,
+        )
+
+
+# =========================================================
+# CARGA
+# =========================================================
+def _leer(ruta: Path) -> Dict[str, ListaPrecios]:
+
+    with open(ruta, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+
+    if not isinstance(datos, dict) or not datos:
+        raise ValueError(f"{ruta.name}: se esperaba un objeto con al menos un contratista")
+
+    listas = {}
+
+    for nombre, lista in datos.items():
+
+        if not isinstance(lista, dict) or not isinstance(lista.get("precios"), dict):
+            raise ValueError(f"{ruta.name}: el contratista {nombre} no tiene 'precios'")
+
+        nombre = _clave(nombre)
+
+        listas[nombre] = ListaPrecios(
+            nombre=nombre,
+            precios=lista["precios"],
+            cables=lista.get("cables", "detallado"),
+            desmontajes=lista.get("desmontajes") or {},
+        )
+
+    return listas
+
+
+def cargar_listas_precios(ruta: Path | str | None = None) -> Dict[str, ListaPrecios]:
+    """
+    Todas las listas del archivo, compiladas. Se relee solo si
+    cambia el mtime del archivo.
+    """
+
+    ruta = Path(ruta) if ruta is not None else ruta_precios_contratistas()
+    clave = str(ruta.resolve())
+    mtime = ruta.stat().st_mtime_ns
+
+    with _LOCK:
+        guardado = _CACHE.get(clave)
+
+        if guardado is None or guardado[0] != mtime:
+            guardado = _CACHE[clave] = (mtime, _leer(ruta))
+
+    return guardado[1]
+
+
+def contratistas_disponibles() -> List[str]:
+    return list(cargar_listas_precios())
+
+
+def lista_contratista(nombre=CONTRATISTA_DEFECTO) -> ListaPrecios:
+
+    listas = cargar_listas_precios()
+    nombre = _clave(nombre)
+
+    if nombre in listas:
+        return listas[nombre]
+
+    return listas.get(CONTRATISTA_DEFECTO) or next(iter(listas.values()))
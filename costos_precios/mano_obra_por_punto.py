@@ -2,196 +2,20 @@
 from __future__ import annotations
 import pandas as pd
 
+from costos_precios.listas_precios import (
+    CONTRATISTA_DEFECTO,
+    ListaPrecios,
+    lista_contratista,
+)
 
-# ==========================================================
-# 🔥 PRECIOS CONTRATISTA 1 (ORIGINAL)
-# ==========================================================
-PRECIOS_FIJOS = {
-
-    "TS-37.5KVA": 13000,
-    "TS-50KVA": 15000,
-    "TS-15KVA": 10000,
-
-    "CONDUCTOR MT 1/0 AWG RAVEN": 30,
-    "CONDUCTOR BT WP 3/0 AWG FIG": 35,
-    "HILO PILOTO HP WP 2 AWG PEACH": 28,
-    "NEUTRO N 2 AWG SPARROW": 28,
-
-    "R-1": 2100,
-    "R-2": 2100,
-    "R-3V": 2100,
-    "R-4": 2100,
-    "R-5T": 2100,
-    "R-3C": 1500,
-
-    "PC-30": 2000,
-    "PC-40": 2000,
-    "PC-35": 2000,
-    "PCA-40": 3000,
-    "PCA-30": 3000,
-    "PM-40": 3000,
-    "PM-30": 2000,
-
-    "LL-1-50W": 750,
-    "LL-1-100W": 750,
-    
-    "A-III-4V": 3000,
-    "A-III-4": 2800,
-    "A-III-1": 2000,
-    "A-III-1V": 2200,
-    "A-III-5": 3000,
-    "A-III-5V": 3200,
-    "A-III-6": 3500,
-    "A-III-7A": 3200,
-    "A-II-1": 1800,
-    "A-I-1": 1300,
-    "A-I-1V": 1500,
-    "A-II-1V": 2000,
-    "A-II-4": 2200,
-    "A-II-6": 2600,
-    "A-II-4A": 2000,
-    "A-II-5": 2500,
-    "A-I-4": 1600,
-    "A-I-4V": 1700,
-    "A-I-6": 1800,
-    "A-I-5": 1800,
-
-    "B-I-1": 400,
-    "B-I-3": 400,
-    "B-I-4D": 500,
-    "B-I-4": 500,
-    "B-I-4B": 500,
-    "B-I-6": 600,
-    "B-I-5": 600,
-    "B-I-7A": 500,
-    "B-II-1": 500,
-    "B-III-1": 600,
-    "B-III-2": 600,
-    "B-III-4": 700,
-    "B-III-5": 750,
-    "B-III-6": 800,
-    "B-III-7A": 750,
-    "B-III-7": 750,
-    "B-III-8": 700,
-    "CT-N": 500,
-    "CA-32": 800,
-    "CS-2": 1200,
-    "CS-1": 1200,
-}
-
-
-# ==========================================================
-# 🔥 PRECIOS CONTRATISTA 2
-# ==========================================================
-PRECIOS_FIJOS_2 = {
-
-    "TS-37.5KVA": 25000,
-    "TS-50KVA": 30000,
-
-    "CONDUCTOR BT GLOBAL": 100,
-    "CONDUCTOR MT GLOBAL": 120,
-    "CONDUCTOR N GLOBAL": 120,
-    
-    "CONDUCTOR MT 1/0 AWG RAVEN": 120,
-    "CONDUCTOR BT WP 3/0 AWG FIG": 100,
-    "CONDUCTOR N 2 AWG SPARROW": 40,
-    "HILO PILOTO HP WP 2 AWG PEACH": 40,
-
-    "R-1": 2100,
-    "R-2": 2300,
-    "R-3V": 2300,
-    "R-4": 2300,
-    "R-5T": 2300,
-    "R-3C": 1500,
-
-    "PC-30": 2000,
-    "PC-40": 3000,
-    "PC-45": 3500,
-    "PC-35": 2500,
-    "PCA-30": 3500,
-    "PCA-40": 4500,
-    
-    "LL-1-50W": 1000,
-    "LL-2-50W": 1500,
-    "LL-1-150W": 1000,
-    "LL-1-100W": 1000,
-    "LL-1-28A50W": 1000,
-    
-    "A-I-1": 1300,
-    "A-I-1V": 1500,
-    "A-I-2": 1600,
-    "A-II-6": 1500,
-    "A-II-1V": 2200,
-    "A-III-1": 2500,
-    "A-II-2V": 2500,
-    "A-II-4V": 2700,
-    "A-II-5V": 3200,
-    "A-III-5": 3800,
-    "A-III-1V": 2500,
-    "ER-III-1": 2500,
-    "A-III-2V": 3700,
-    "A-III-2": 3000,
-    "A-III-5V": 4400,
-    "A-III-4V": 3900,
-    "A-III-4": 3000,
-    "A-III-7": 3000,
-    "A-I-4": 1600,
-    "A-I-4V": 1500,
-    "A-I-6": 1800,
-    "A-III-6": 4000,
-    
-
-    "G-I-1": 1200,
-    "B-I-1": 1200,
-    "B-I-7": 1500,
-    "B-I-3": 1500,
-    "B-I-4D": 1100,
-    "B-I-4": 1100,
-    "B-I-6": 1300,
-    "B-I-4B": 1100,
-    "B-I-7A": 500,
-    "B-II-1": 1200,
-    "B-II-4C": 1500,
-    "B-II-4": 1300,
-    "B-III-1": 1200,
-    "B-III-2": 1200,
-    "B-III-4": 1400,
-    "B-III-5": 1500,
-    "B-III-6": 1600,
-    "B-III-7A": 1500,
-    "B-III-7": 1400,
-
-    "CT-N": 1500,
-    "CA-32": 2500,
-    "CS-2": 1200,
-    "DESMONTAJE": 35000,
-    "REUBICACION": 80000,
-}
-  
-  
-
-
-# ==========================================================
-# DESMONTAJES DEL PROYECTO
-# ==========================================================
-DESMONTAJES = {
-    "A-III-1": {
-        "cantidad": 20,
-        "precio": 1200,
-    },
-    "A-III-5": {
-        "cantidad": 2,
-        "precio": 1500,
-    },
-}
 
 # ==========================================================
-# 🔥 SELECTOR DE LISTA (CAMBIAS AQUÍ)
+# 🔥 SELECTOR DE LISTA
 # ==========================================================
-def obtener_lista_precios(nombre="C1"):
-    if nombre == "C2":
-        return PRECIOS_FIJOS_2
-    return PRECIOS_FIJOS
+# Las listas (C1, C2, ...) están en data/precios_contratistas.json;
+# ver costos_precios/listas_precios.py.
+def obtener_lista_precios(nombre=CONTRATISTA_DEFECTO) -> ListaPrecios:
+    return lista_contratista(nombre)
 
 
 # ==========================================================
@@ -200,18 +24,9 @@ def obtener_lista_precios(nombre="C1"):
 def _precio_estructura(estructura: str, lista_precios=None) -> float:
 
     if lista_precios is None:
-        lista_precios = PRECIOS_FIJOS
+        lista_precios = obtener_lista_precios()
 
-    estructura = str(estructura).upper().strip()
-
-    if estructura in lista_precios:
-        return lista_precios[estructura]
-
-    for key in lista_precios:
-        if estructura.startswith(key):
-            return lista_precios[key]
-
-    return 0
+    return lista_precios.precio(estructura)
 
 
 # ==========================================================
@@ -227,12 +42,15 @@ def _agregar_cable_resumen(
     if df_cables is None or df_cables.empty:
         return df_detalle
 
+    if lista_precios is None:
+        lista_precios = obtener_lista_precios(contratista)
+
     filas = []
 
     # ======================================================
-    # C1 → DETALLADO (NO SE MODIFICA)
+    # DETALLADO (C1) → PRECIO POR CALIBRE
     # ======================================================
-    if contratista == "C1":
+    if lista_precios.cables == "detallado":
 
         for _, c in df_cables.iterrows():
 
@@ -289,9 +107,9 @@ def _agregar_cable_resumen(
             })
 
     # ======================================================
-    # C2 → MISMA LÓGICA DE PRECIO_ESTRUCTURA
+    # GLOBAL (C2) → MISMA LÓGICA DE PRECIO_ESTRUCTURA
     # ======================================================
-    elif contratista == "C2":
+    elif lista_precios.cables == "global":
 
         for _, c in df_cables.iterrows():
 
@@ -489,26 +307,19 @@ def calcular_detalle_mano_obra(df_estructuras_por_punto: pd.DataFrame, lista_pre
     if df_estructuras_por_punto is None or df_estructuras_por_punto.empty:
         return pd.DataFrame(columns=["Punto", "Estructura", "Cantidad", "Precio", "Subtotal"])
 
-    filas = []
-
-    for _, row in df_estructuras_por_punto.iterrows():
-
-        punto = row["Punto"]
-        estructura = row["Estructura"]
-        cantidad = int(row["Cantidad"])
-
-        precio = _precio_estructura(estructura, lista_precios)
-        subtotal = precio * cantidad
+    df = df_estructuras_por_punto
 
-        filas.append({
-            "Punto": punto,
-            "Estructura": estructura,
-            "Cantidad": cantidad,
-            "Precio": round(precio, 2),
-            "Subtotal": round(subtotal, 2),
-        })
+    # una búsqueda por estructura distinta, no por fila
+    precios = lista_precios.precios_serie(df["Estructura"]).tolist()
+    cantidades = [int(c) for c in df["Cantidad"]]
 
-    return pd.DataFrame(filas)
+    return pd.DataFrame({
+        "Punto": df["Punto"].astype(object).tolist(),
+        "Estructura": df["Estructura"].astype(object).tolist(),
+        "Cantidad": cantidades,
+        "Precio": [round(p, 2) for p in precios],
+        "Subtotal": [round(p * c, 2) for p, c in zip(precios, cantidades)],
+    })
 
 
 # ==========================================================
@@ -521,7 +332,7 @@ def calcular_totales_por_punto(df_detalle: pd.DataFrame):
 
     return (
         df_detalle
-        .groupby("Punto", as_index=False)["Subtotal"]
+        .groupby("Punto", as_index=False, observed=True)["Subtotal"]
         .sum()
         .rename(columns={"Subtotal": "TOTAL_PUNTO"})
     )
@@ -558,14 +369,13 @@ def calcular_mano_obra_proyecto(
     )
 
     # ======================================================
-    # DESMONTAJES HARDCODEADOS
-    # Solo para contratista C2
+    # DESMONTAJES DE LA LISTA DEL CONTRATISTA (C2)
     # ======================================================
-    if contratista == "C2" and DESMONTAJES:
+    if lista_precios.desmontajes:
 
         filas_desmontaje = []
 
-        for estructura, datos in DESMONTAJES.items():
+        for estructura, datos in lista_precios.desmontajes.items():
 
             cantidad = int(datos["cantidad"])
             precio = float(datos["precio"])
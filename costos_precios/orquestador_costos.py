@@ -10,15 +10,17 @@ from costos_precios.costos_materiales import (
     preparar_catalogo_costos
 )
 
+from costos_precios.indice_precios import IndicePrecios
 from costos_precios.costos_estructuras import (
     calcular_costos_por_estructura
 )
-from costos_precios.precio_estructura import _agregar_cable_a_precios
+from costos_precios.precio_estructura import _agregar_cable_a_precios, unir_mano_obra
 #from costos_precios.costos_operativos import calcular_costos_operativos
 #from costos_precios.precio_estructura import calcular_precio_estructura
 from costos_precios.mano_obra_por_punto import calcular_mano_obra_proyecto
 
 from ayuda.debug import debug_guardar
+from ayuda.medicion import etapa
 
 
 # =====================================================
@@ -73,6 +75,92 @@ def calcular_costos_cable(df_cables):
     return total
 
 
+# =====================================================
+# PRECIO POR ESTRUCTURA
+# =====================================================
+def precios_por_estructura(
+    df_costos_estructura: pd.DataFrame,
+    df_mano_obra: pd.DataFrame,
+    detalle: Optional[dict] = None,
+) -> pd.DataFrame:
+    """
+    Una fila por estructura: material + mano de obra unitarios
+    y total del proyecto (sin cables).
+
+    La mano de obra unitaria es la primera fila de df_mano_obra
+    con esa estructura (un solo merge, unir_mano_obra).
+
+    detalle (opcional) recibe "sin_mano_obra": estructuras sin
+    precio de mano de obra.
+    """
+
+    df, faltantes = unir_mano_obra(df_costos_estructura, df_mano_obra)
+
+    if detalle is not None:
+        detalle["sin_mano_obra"] = faltantes
+
+    if faltantes:
+        debug_guardar("MANO_OBRA_SIN_PRECIO", lambda: faltantes)
+
+    filas = []
+
+    for estructura, cantidad, material_unit, mano_obra_unit in zip(
+        df["Estructura"],
+        df["Cantidad"],
+        df["Costo Unitario"],
+        df["Mano Obra Unitaria"],
+    ):
+
+        cantidad = max(
+            1,
+            int(cantidad)
+        )
+
+        material_unit = float(material_unit)
+        mano_obra_unit = float(mano_obra_unit)
+
+        total_unit = (
+            material_unit
+            + mano_obra_unit
+        )
+
+        total_proyecto = (
+            total_unit
+            * cantidad
+        )
+
+        filas.append({
+
+            "Estructura": estructura,
+
+            "Cantidad": cantidad,
+
+            "Material Unitario": round(
+                material_unit,
+                2
+            ),
+
+            "Mano Obra Unitaria": round(
+                mano_obra_unit,
+                2
+            ),
+
+            "Total Unitario": round(
+                total_unit,
+                2
+            ),
+
+            "Total Proyecto": round(
+                total_proyecto,
+                2
+            ),
+        })
+
+    return pd.DataFrame(
+        filas
+    )
+
+
 # =====================================================
 # ORQUESTADOR
 # =====================================================
@@ -110,24 +198,31 @@ def ejecutar_costos(entrada: EntradaCostos) -> Dict[str, Any]:
         # =====================================================
         # 2. CATÁLOGO
         # =====================================================
-        df_costos = preparar_catalogo_costos(
-            entrada.df_catalogo
-        )
+        with etapa("catalogo", entrada.df_catalogo) as e:
+            df_costos = preparar_catalogo_costos(
+                entrada.df_catalogo
+            )
+            e.salida(df_costos)
 
         if df_costos is None or df_costos.empty:
             raise ValueError("df_costos vacío")
 
+        # índice (material, unidad) → costo, una vez por corrida
+        indice_catalogo = IndicePrecios.desde_df(df_costos)
+
         debug["df_costos"] = _preview_df(df_costos)
 
         # =====================================================
         # 3. COSTOS DE MATERIALES
         # =====================================================
-        df_materiales_costos = (
-            calcular_lista_materiales_con_costos(
-                df_materiales=entrada.df_materiales,
-                df_catalogo_costos=df_costos
+        with etapa("materiales", entrada.df_materiales) as e:
+            df_materiales_costos = (
+                calcular_lista_materiales_con_costos(
+                    df_materiales=entrada.df_materiales,
+                    df_catalogo_costos=indice_catalogo
+                )
             )
-        )
+            e.salida(df_materiales_costos)
 
         if (
             df_materiales_costos is None
@@ -140,6 +235,8 @@ def ejecutar_costos(entrada: EntradaCostos) -> Dict[str, Any]:
             df_materiales_costos
         )
         entrada.df_costos_materiales = df_materiales_costos
+        # cables y materiales extra buscan aquí su precio evaluado
+        entrada.indice_precios = IndicePrecios.desde_df(df_materiales_costos)
         # =====================================================
         # 4. VALIDACIÓN ESTRUCTURAS
         # =====================================================
@@ -181,17 +278,19 @@ def ejecutar_costos(entrada: EntradaCostos) -> Dict[str, Any]:
         # =====================================================
         # 5. COSTOS POR ESTRUCTURA
         # =====================================================
-        df_costos_estructura = (
-            calcular_costos_por_estructura(
-                df_estructuras=entrada.df_estructuras,
+        with etapa("por_estructura", entrada.df_estructuras) as e:
+            df_costos_estructura = (
+                calcular_costos_por_estructura(
+                    df_estructuras=entrada.df_estructuras,
 
-                df_materiales_por_estructura=(
-                    entrada.df_materiales_por_estructura
-                ),
+                    df_materiales_por_estructura=(
+                        entrada.df_materiales_por_estructura
+                    ),
 
-                df_precios_materiales=df_costos
+                    df_precios_materiales=df_costos
+                )
             )
-        )
+            e.salida(df_costos_estructura)
 
         if (
             df_costos_estructura is None
@@ -213,11 +312,13 @@ def ejecutar_costos(entrada: EntradaCostos) -> Dict[str, Any]:
 
             try:
 
-                res_mano_obra = calcular_mano_obra_proyecto(
-                    df_estructuras_por_punto=entrada.df_estructuras,
-                    df_cables=entrada.df_cables,
-                    contratista=entrada.contratista
-                )
+                with etapa("mano_obra", entrada.df_estructuras) as e:
+                    res_mano_obra = calcular_mano_obra_proyecto(
+                        df_estructuras_por_punto=entrada.df_estructuras,
+                        df_cables=entrada.df_cables,
+                        contratista=entrada.contratista
+                    )
+                    e.salida(res_mano_obra.get("df_detalle"))
 
                 if not isinstance(res_mano_obra, dict):
                     raise TypeError(
@@ -282,81 +383,16 @@ def ejecutar_costos(entrada: EntradaCostos) -> Dict[str, Any]:
                     f"df_costos_estructura no tiene columna '{col}'. Columnas: {list(df_costos_estructura.columns)}"
                 )
 
-        filas = []
-
-        for _, r in df_costos_estructura.iterrows():
-
-            estructura = str(
-                r["codigodeestructura"]
-            ).strip().upper()
-
-            cantidad = max(
-                1,
-                int(r["Cantidad"])
-            )
-
-            material_unit = float(
-                r["Costo Unitario"]
-            )
-
-            df_match = df_mano_obra[
-                df_mano_obra["Estructura"]
-                .astype(str)
-                .str.strip()
-                .str.upper()
-                == estructura
-            ]
-
-            mano_obra_unit = (
-                float(df_match["Precio"].iloc[0])
-                if not df_match.empty
-                else 0.0
-            )
-
-            total_unit = (
-                material_unit
-                + mano_obra_unit
-            )
-
-            total_proyecto = (
-                total_unit
-                * cantidad
-            )
-
-            filas.append({
-
-                "Estructura": estructura,
-
-                "Cantidad": cantidad,
-
-                "Material Unitario": round(
-                    material_unit,
-                    2
-                ),
-
-                "Mano Obra Unitaria": round(
-                    mano_obra_unit,
-                    2
-                ),
+        detalle_mano_obra: dict = {}
 
-                "Total Unitario": round(
-                    total_unit,
-                    2
-                ),
-
-                "Total Proyecto": round(
-                    total_proyecto,
-                    2
-                ),
-            })
-
-        # =====================================================
-        # DATAFRAME FINAL
-        # =====================================================
-        df_precios_estructura = pd.DataFrame(
-            filas
+        df_precios_estructura = precios_por_estructura(
+            df_costos_estructura,
+            df_mano_obra,
+            detalle=detalle_mano_obra,
         )
 
+        debug["estructuras_sin_mano_obra"] = detalle_mano_obra["sin_mano_obra"]
+
         if df_precios_estructura.empty:
             raise ValueError("df_precios_estructura vacío")
 
@@ -399,7 +435,7 @@ def ejecutar_costos(entrada: EntradaCostos) -> Dict[str, Any]:
         # =====================================================
         debug_guardar(
             "ORQUESTADOR_COSTOS_FINAL",
-            {
+            lambda: {
                 "precios": _preview_df(
                     df_precios_estructura
                 ),
@@ -3,10 +3,11 @@
 
 from __future__ import annotations
 from ayuda.debug import debug_guardar
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
-from costos_precios.costos_materiales import _norm_material
+from costos_precios.indice_precios import IndicePrecios
 from costos_precios.mano_obra_por_punto import obtener_lista_precios
+from entradas.codigos import canonizar
 
 def _numero_seguro(valor, default=0.0) -> float:
     valor = pd.to_numeric(valor, errors="coerce")
@@ -28,31 +29,79 @@ FACTOR_PIE_POR_METRO = 3.28084
 
 
 # =========================================================
-# MANO DE OBRA UNITARIA PARA ESTRUCTURAS
+# MANO DE OBRA POR JOIN (TODAS LAS ESTRUCTURAS A LA VEZ)
 # =========================================================
-def _obtener_mano_obra_unitaria(
-    estructura: str,
-    lista_mano_obra: dict
-) -> float:
+def tabla_mano_obra(lista_mano_obra: dict) -> pd.DataFrame:
+    """
+    Lista de precios (dict) → DataFrame Estructura / Precio, en el
+    orden de la lista.
+    """
+
+    return pd.DataFrame({
+        "Estructura": list(lista_mano_obra.keys()),
+        "Precio": list(lista_mano_obra.values()),
+    })
+
+
+def _por_prefijo(estructura: str, df_precios: pd.DataFrame) -> Optional[float]:
+    # la clave más larga de la lista que sea prefijo de la estructura
+    # (mismo criterio que ListaPrecios.precio)
+    largo, encontrado = -1, None
+    for clave, precio in zip(df_precios["Estructura"], df_precios["Mano Obra Unitaria"]):
+        if len(clave) > largo and estructura.startswith(clave):
+            largo, encontrado = len(clave), precio
+    return encontrado
+
+
+def unir_mano_obra(
+    df_costos_estructura: pd.DataFrame,
+    df_precios_mano_obra: pd.DataFrame,
+    prefijos: bool = False,
+) -> Tuple[pd.DataFrame, List[str]]:
     """
-    Busca la mano de obra unitaria de una estructura.
+    Un merge entre costos por estructura y precios de mano de obra
+    (clave Estructura en mayúsculas y sin espacios; si se repite,
+    vale la primera fila).
+
+    prefijos: las que no coinciden exacto buscan una clave que sea
+    prefijo (solo las que quedaron sin precio, una vez cada una).
 
-    Primero intenta match exacto.
-    Si no encuentra, intenta match parcial por prefijo.
+    SALIDA:
+    -------
+    (df_costos_estructura + Estructura / Mano Obra Unitaria,
+     estructuras sin precio de mano de obra)
     """
 
-    estructura = str(estructura).strip().upper()
+    df = df_costos_estructura.copy()
+    df["Estructura"] = df["codigodeestructura"].astype(str).str.strip().str.upper()
 
-    if estructura in lista_mano_obra:
-        return float(lista_mano_obra[estructura])
+    precios = pd.DataFrame({
+        "Estructura": canonizar(df_precios_mano_obra["Estructura"]).astype(str).to_numpy(),
+        "Mano Obra Unitaria": df_precios_mano_obra["Precio"].to_numpy(),
+    }).drop_duplicates("Estructura", keep="first")
+
+    df = df.merge(precios, on="Estructura", how="left", indicator="_union")
+
+    sin_precio = df["_union"] == "left_only"
+
+    if prefijos and sin_precio.any():
+        encontrados = {
+            e: _por_prefijo(e, precios)
+            for e in df.loc[sin_precio, "Estructura"].unique()
+        }
+        encontrados = {e: p for e, p in encontrados.items() if p is not None}
 
-    for key in lista_mano_obra:
-        key_norm = str(key).strip().upper()
+        por_prefijo = sin_precio & df["Estructura"].isin(list(encontrados))
+        df.loc[por_prefijo, "Mano Obra Unitaria"] = df.loc[por_prefijo, "Estructura"].map(encontrados)
+        sin_precio &= ~por_prefijo
 
-        if estructura.startswith(key_norm):
-            return float(lista_mano_obra[key])
+    faltantes = sorted(df.loc[sin_precio, "Estructura"].unique())
 
-    return 0.0
+    df["Mano Obra Unitaria"] = df["Mano Obra Unitaria"].astype(object)
+    df.loc[sin_precio, "Mano Obra Unitaria"] = 0.0
+    df["Mano Obra Unitaria"] = pd.to_numeric(df["Mano Obra Unitaria"], errors="coerce")
+
+    return df.drop(columns="_union"), faltantes
 
 
 # =========================================================
@@ -235,7 +284,7 @@ def _obtener_claves_cable(
 def _calcular_material_unitario_cable(
     *,
     calibre: str,
-    df_costos_materiales: pd.DataFrame
+    indice_precios: IndicePrecios
 ) -> float:
     """
     Lee el costo unitario ya evaluado contra el Excel.
@@ -248,51 +297,15 @@ def _calcular_material_unitario_cable(
     Únicamente se convierte a L/metro para el presupuesto.
     """
 
-    if (
-        df_costos_materiales is None
-        or not isinstance(df_costos_materiales, pd.DataFrame)
-        or df_costos_materiales.empty
-    ):
+    if len(indice_precios) == 0:
         raise ValueError(
             "df_costos_materiales no está disponible para obtener "
             "el precio del cable."
         )
 
-    columnas_requeridas = {
-        "Materiales",
-        "Unidad",
-        "Costo Unitario",
-    }
+    coincidencias = indice_precios.buscar(calibre, "PIE")
 
-    faltantes = columnas_requeridas - set(df_costos_materiales.columns)
-
-    if faltantes:
-        raise ValueError(
-            "df_costos_materiales no contiene las columnas requeridas "
-            f"para leer el precio del cable: {sorted(faltantes)}"
-        )
-
-    clave_cable = _norm_material(calibre)
-
-    df_busqueda = df_costos_materiales[
-        df_costos_materiales["Unidad"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-        .eq("PIE")
-    ].copy()
-
-    df_busqueda["_Clave Cable"] = (
-        df_busqueda["Materiales"]
-        .astype(str)
-        .apply(_norm_material)
-    )
-
-    coincidencias = df_busqueda[
-        df_busqueda["_Clave Cable"].eq(clave_cable)
-    ]
-
-    if coincidencias.empty:
+    if not coincidencias:
         raise ValueError(
             "No se encontró en df_costos_materiales el precio ya evaluado "
             f"para el cable: {calibre}"
@@ -305,7 +318,7 @@ def _calcular_material_unitario_cable(
         )
 
     precio_material_pie = _numero_seguro(
-        coincidencias.iloc[0]["Costo Unitario"],
+        coincidencias[0],
         0.0
     )
 
@@ -331,17 +344,17 @@ def _obtener_mano_obra_cable(
     """
     Devuelve la mano de obra del cable.
 
-    C1:
+    Lista con cables "detallado" (C1):
         Usa la clave específica.
 
-    C2:
+    Lista con cables "global" (C2):
         MT usa CONDUCTOR MT GLOBAL.
         BT usa CONDUCTOR BT GLOBAL.
         N usa CONDUCTOR N 2 AWG SPARROW.
         HP usa clave específica.
     """
 
-    if contratista_norm == "C2":
+    if getattr(lista_mano_obra, "cables", None) == "global":
 
         if tipo.startswith("MT"):
             return float(
@@ -447,7 +460,7 @@ def _procesar_fila_cable(
     existe_bt: bool,
     lista_mano_obra: dict,
     longitud_bt_mano_obra: float,
-    df_costos_materiales: pd.DataFrame
+    indice_precios: IndicePrecios
 ) -> Optional[Dict[str, Any]]:
 
     tipo = _normalizar_tipo_cable(
@@ -480,10 +493,11 @@ def _procesar_fila_cable(
     if claves is None:
         return None
 
-    # El precio ya evaluado se obtiene desde df_costos_materiales.
+    # El precio ya evaluado se obtiene desde df_costos_materiales
+    # (índice armado una vez por corrida).
     material_unitario = _calcular_material_unitario_cable(
         calibre=calibre,
-        df_costos_materiales=df_costos_materiales
+        indice_precios=indice_precios
     )
 
     mano_obra_unitaria = _obtener_mano_obra_cable(
@@ -571,7 +585,7 @@ def _procesar_fila_cable(
 
         debug_guardar(
             "debug_cable_bt_punto_2",
-            {
+            lambda: {
                 "tipo": tipo,
                 "calibre": calibre,
                 "longitud_lineal": float(
@@ -673,7 +687,7 @@ def _agregar_cable_a_precios(
         df_cables
     )
 
-    df_costos_materiales = _obtener_df_costos_materiales_existente(
+    indice_precios = _obtener_indice_precios(
         entrada
     )
 
@@ -689,7 +703,7 @@ def _agregar_cable_a_precios(
             existe_bt=existe_bt,
             lista_mano_obra=lista_mano_obra,
             longitud_bt_mano_obra=longitud_bt_mano_obra,
-            df_costos_materiales=df_costos_materiales
+            indice_precios=indice_precios
         )
 
         if fila_precio is not None:
@@ -841,76 +855,31 @@ def _buscar_precio_material_extra(
     *,
     material: str,
     unidad: str,
-    df_costos_materiales: pd.DataFrame
+    indice_precios: IndicePrecios
 ) -> float:
     """
     Obtiene el precio ya evaluado de un material extra.
 
-    El precio se lee desde df_costos_materiales.
+    El precio se lee desde el índice de df_costos_materiales.
     No vuelve a leer Excel y no recalcula precios.
     """
 
-    if (
-        df_costos_materiales is None
-        or not isinstance(df_costos_materiales, pd.DataFrame)
-        or df_costos_materiales.empty
-    ):
+    if len(indice_precios) == 0:
         raise ValueError(
             "df_costos_materiales no está disponible para "
             f"obtener el precio de: {material}"
         )
 
-    columnas_requeridas = {
-        "Materiales",
-        "Unidad",
-        "Costo Unitario",
-    }
-
-    faltantes = (
-        columnas_requeridas
-        - set(df_costos_materiales.columns)
-    )
+    coincidencias = indice_precios.buscar(material, unidad)
 
-    if faltantes:
-        raise ValueError(
-            "df_costos_materiales no contiene las columnas "
-            f"requeridas: {sorted(faltantes)}"
-        )
-
-    clave_material = _norm_material(material)
-    clave_unidad = str(unidad).strip().upper()
-
-    df_busqueda = df_costos_materiales.copy()
-
-    df_busqueda["_Clave Material"] = (
-        df_busqueda["Materiales"]
-        .astype(str)
-        .apply(_norm_material)
-    )
-
-    df_busqueda["_Clave Unidad"] = (
-        df_busqueda["Unidad"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-    )
-
-    coincidencias = df_busqueda[
-        df_busqueda["_Clave Material"].eq(clave_material)
-        & df_busqueda["_Clave Unidad"].eq(clave_unidad)
-    ]
-
-    if coincidencias.empty:
+    if not coincidencias:
         raise ValueError(
             "No se encontró el precio evaluado del material "
             f"extra: {material} [{unidad}]"
         )
 
     precios = (
-        pd.to_numeric(
-            coincidencias["Costo Unitario"],
-            errors="coerce",
-        )
+        pd.Series(coincidencias, dtype=float)
         .dropna()
         .unique()
     )
@@ -1088,9 +1057,7 @@ def _agregar_materiales_extra_a_precios(
     if df_materiales_extra is None:
         return df_precios
 
-    df_costos_materiales = (
-        _obtener_df_costos_materiales_existente(entrada)
-    )
+    indice_precios = _obtener_indice_precios(entrada)
 
     filas = []
 
@@ -1116,7 +1083,7 @@ def _agregar_materiales_extra_a_precios(
             _buscar_precio_material_extra(
                 material=material,
                 unidad=unidad,
-                df_costos_materiales=df_costos_materiales,
+                indice_precios=indice_precios,
             )
         )
 
@@ -1144,7 +1111,7 @@ def _agregar_materiales_extra_a_precios(
 
     debug_guardar(
         "MATERIALES_EXTRA_AGREGADOS_A_PRECIOS",
-        {
+        lambda: {
             "cantidad_filas": len(df_extras_precios),
             "materiales": (
                 df_materiales_extra[
@@ -1261,58 +1228,6 @@ def _crear_fila_estructura_precio(
     }
 
 
-def _procesar_fila_estructura(
-    *,
-    fila: pd.Series,
-    lista_mano_obra: dict,
-    material_total_global: float,
-    operativo_total: float,
-    porcentaje_utilidad: float
-) -> Dict[str, Any]:
-    """
-    Procesa una fila de df_costos_estructura y devuelve una fila
-    para df_precios.
-    """
-
-    estructura = str(
-        fila["codigodeestructura"]
-    ).strip().upper()
-
-    cantidad = max(
-        1,
-        int(fila["Cantidad"])
-    )
-
-    material_unit = float(
-        fila["Costo Unitario"]
-    )
-
-    material_total_estructura = float(
-        fila["Costo Total"]
-    )
-
-    costo_operativo_unit = _calcular_costo_operativo_unitario(
-        material_total_estructura=material_total_estructura,
-        material_total_global=material_total_global,
-        operativo_total=operativo_total,
-        cantidad=cantidad
-    )
-
-    mano_obra_unit = _obtener_mano_obra_unitaria(
-        estructura,
-        lista_mano_obra
-    )
-
-    return _crear_fila_estructura_precio(
-        estructura=estructura,
-        cantidad=cantidad,
-        material_unit=material_unit,
-        mano_obra_unit=mano_obra_unit,
-        costo_operativo_unit=costo_operativo_unit,
-        porcentaje_utilidad=porcentaje_utilidad
-    )
-
-
 def _generar_df_precios_estructuras(
     *,
     df_costos_estructura: pd.DataFrame,
@@ -1322,25 +1237,51 @@ def _generar_df_precios_estructuras(
 ) -> pd.DataFrame:
     """
     Genera el dataframe base de precios de estructuras.
+
+    La mano de obra sale de un solo merge con la lista del
+    contratista (exacto y, si no, por prefijo).
     """
 
     material_total_global = float(
         df_costos_estructura["Costo Total"].sum()
     )
 
+    df, faltantes = unir_mano_obra(
+        df_costos_estructura,
+        tabla_mano_obra(lista_mano_obra),
+        prefijos=True,
+    )
+
+    if faltantes:
+        debug_guardar("MANO_OBRA_SIN_PRECIO", lambda: faltantes)
+
     filas = []
 
-    for _, fila in df_costos_estructura.iterrows():
+    for estructura, cantidad, material_unit, material_total, mano_obra_unit in zip(
+        df["Estructura"],
+        df["Cantidad"],
+        df["Costo Unitario"],
+        df["Costo Total"],
+        df["Mano Obra Unitaria"],
+    ):
 
-        fila_precio = _procesar_fila_estructura(
-            fila=fila,
-            lista_mano_obra=lista_mano_obra,
+        cantidad = max(1, int(cantidad))
+
+        costo_operativo_unit = _calcular_costo_operativo_unitario(
+            material_total_estructura=float(material_total),
             material_total_global=material_total_global,
             operativo_total=costos_op["operativo_total"],
-            porcentaje_utilidad=porcentaje_utilidad
+            cantidad=cantidad
         )
 
-        filas.append(fila_precio)
+        filas.append(_crear_fila_estructura_precio(
+            estructura=estructura,
+            cantidad=cantidad,
+            material_unit=float(material_unit),
+            mano_obra_unit=float(mano_obra_unit),
+            costo_operativo_unit=costo_operativo_unit,
+            porcentaje_utilidad=porcentaje_utilidad
+        ))
 
     df_precios = pd.DataFrame(filas)
 
@@ -1397,6 +1338,36 @@ def _obtener_df_costos_materiales_existente(entrada) -> pd.DataFrame:
     return pd.DataFrame()
 
 
+def _obtener_indice_precios(entrada) -> IndicePrecios:
+    """
+    Índice de df_costos_materiales compartido por cables y
+    materiales extra: se usa entrada.indice_precios si ya existe,
+    si no se arma una vez y se deja en entrada.
+    """
+
+    indice = getattr(entrada, "indice_precios", None)
+
+    if isinstance(indice, IndicePrecios):
+        return indice
+
+    df_costos_materiales = _obtener_df_costos_materiales_existente(
+        entrada
+    )
+
+    try:
+        indice = IndicePrecios.desde_df(df_costos_materiales)
+    except ValueError:
+        # sin columnas de precio: las búsquedas avisan "no disponible"
+        indice = IndicePrecios()
+
+    try:
+        entrada.indice_precios = indice
+    except AttributeError:
+        pass
+
+    return indice
+
+
 def _respuesta_ok(
     *,
     entrada,
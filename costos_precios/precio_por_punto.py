@@ -6,6 +6,7 @@ from typing import Tuple
 
 # 🔥 IMPORT DIRECTO DE TU BIBLIOTECA
 from costos_precios.precios_estructura import PRECIOS_BIBLIOTECA
+from entradas.codigos import canonizar
 
 
 # =========================================================
@@ -37,8 +38,8 @@ def calcular_precios_por_punto(
     # =====================================================
     df = df_estructuras_por_punto.copy()
 
-    df["Punto"] = df["Punto"].astype(str).str.strip()
-    df["codigodeestructura"] = df["codigodeestructura"].astype(str).str.strip().str.upper()
+    df["Punto"] = canonizar(df["Punto"], lambda p: p.str.strip())
+    df["codigodeestructura"] = canonizar(df["codigodeestructura"])
     df["Cantidad"] = pd.to_numeric(df["Cantidad"], errors="coerce").fillna(0)
 
     df = df[df["Cantidad"] > 0]
@@ -60,7 +61,7 @@ def calcular_precios_por_punto(
     # =====================================================
     # ASIGNACIÓN DE PRECIOS
     # =====================================================
-    df["Precio Unitario"] = df["codigodeestructura"].map(PRECIOS_BIBLIOTECA)
+    df["Precio Unitario"] = df["codigodeestructura"].map(PRECIOS_BIBLIOTECA).astype(float)
 
     # =====================================================
     # CÁLCULOS
@@ -88,7 +89,7 @@ def calcular_precios_por_punto(
     # RESUMEN POR PUNTO
     # =====================================================
     df_resumen_precios = (
-        df_detalle.groupby("Punto", as_index=False)["Subtotal Precio"]
+        df_detalle.groupby("Punto", as_index=False, observed=True)["Subtotal Precio"]
         .sum()
         .rename(columns={"Subtotal Precio": "TOTAL_PRECIO_PUNTO"})
         .sort_values("Punto")
@@ -0,0 +1,766 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from costos_precios.costos_proyecto import RENDIMIENTOS, _obtener_columna
+from entradas.codigos import canonizar
+
+
+# =========================================================
+# 🔷 PROGRAMACIÓN DE OBRA (RUTA CRÍTICA + CUADRILLAS)
+# =========================================================
+# _calcular_tiempos pone las actividades una detrás de otra con
+# totales del proyecto (postes / 7, metros / 500 …): no sabe de
+# puntos ni de cuadrillas trabajando en paralelo.
+#
+# Aquí cada punto aporta sus actividades a un grafo de precedencias
+# y el tendido se parte en tramos entre puntos consecutivos:
+#
+#   ✔ Levantamiento → Agujeros → Postes → Retenidas / Estructuras
+#     dentro de cada punto; un tramo de tendido espera a los dos
+#     puntos que une
+#   ✔ Ruta crítica (inicio/fin temprano y tardío, holgura) en
+#     O(V + E): una pasada por nivel topológico con NumPy
+#   ✔ N cuadrillas iguales: programación por lista (en cada
+#     instante, la actividad lista con menor inicio tardío),
+#     O((V + E) log V); con cuadrillas de sobra coincide con la
+#     ruta crítica
+#   ✔ El grafo se arma con arreglos (id entero por actividad) y se
+#     convierte a / desde networkx.DiGraph para revisarlo o agregar
+#     precedencias
+#   ✔ plan_cuadrillas + plazos_por_muestras: el mismo programa
+#     (asignación y orden de cada cuadrilla) con duraciones por
+#     muestra, en una pasada hacia adelante vectorizada (Monte Carlo)
+#   ❌ Los metros de tendido se reparten por igual entre tramos
+#     (los cables no traen vano por vano)
+TIPOS_ACTIVIDAD = (
+    "Levantamiento",
+    "Agujeros",
+    "Postes",
+    "Retenidas",
+    "Estructuras",
+    "Tendido MT",
+    "Tendido BT",
+)
+
+DIAS_LEVANTAMIENTO = 1
+
+# actividades por punto: (columna de cantidades, clave de RENDIMIENTOS)
+ACTIVIDADES_PUNTO = {
+    "Agujeros": ("postes", "agujeros"),
+    "Postes": ("postes", "postes"),
+    "Retenidas": ("retenidas", "retenidas"),
+    "Estructuras": ("estructuras", "estructuras"),
+}
+
+PRECEDENCIAS_PUNTO = (
+    ("Agujeros", "Postes"),
+    ("Postes", "Retenidas"),
+    ("Postes", "Estructuras"),
+)
+
+TENDIDOS = (
+    ("Tendido MT", "primario"),
+    ("Tendido BT", "secundario"),
+)
+
+# tipo de actividad → clave de RENDIMIENTOS (Levantamiento es fijo)
+RENDIMIENTO_POR_TIPO = {
+    **{tipo: rendimiento for tipo, (_, rendimiento) in ACTIVIDADES_PUNTO.items()},
+    **dict(TENDIDOS),
+}
+
+# celdas (actividades x muestras) por bloque en plazos_por_muestras
+CELDAS_BLOQUE = 8_000_000
+
+_EPS = 1e-9
+
+
+# =========================================================
+# GRAFO DE ACTIVIDADES
+# =========================================================
+@dataclass
+class GrafoActividades:
+    """
+    Actividad i: tipos[i], etiquetas[i] (punto o tramo), duraciones[i]
+    (días de una cuadrilla). Precedencias: origen[k] → destino[k].
+    """
+
+    tipos: np.ndarray
+    etiquetas: np.ndarray
+    duraciones: np.ndarray
+    origen: np.ndarray
+    destino: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.duraciones)
+
+    def como_networkx(self) -> nx.DiGraph:
+        """
+        Nodos (tipo, etiqueta) con atributos tipo, etiqueta y duracion.
+        """
+
+        nombres = list(zip(self.tipos.tolist(), self.etiquetas.tolist()))
+
+        grafo = nx.DiGraph()
+        grafo.add_nodes_from(
+            (n, {"tipo": n[0], "etiqueta": n[1], "duracion": d})
+            for n, d in zip(nombres, self.duraciones.tolist())
+        )
+        grafo.add_edges_from(
+            (nombres[a], nombres[b])
+            for a, b in zip(self.origen.tolist(), self.destino.tolist())
+        )
+
+        return grafo
+
+    @classmethod
+    def desde_networkx(cls, grafo: nx.DiGraph) -> "GrafoActividades":
+        """
+        Nodos con atributo duracion (y opcionalmente tipo / etiqueta);
+        los ids quedan en orden topológico.
+        """
+
+        try:
+            orden = list(nx.topological_sort(grafo))
+        except nx.NetworkXUnfeasible:
+            raise ValueError(f"Las precedencias tienen un ciclo: {nx.find_cycle(grafo)}")
+
+        ids = {n: i for i, n in enumerate(orden)}
+        nodos = grafo.nodes
+
+        def _parte(n, clave, i):
+            if clave in nodos[n]:
+                return str(nodos[n][clave])
+            if isinstance(n, tuple) and len(n) == 2:
+                return str(n[i])
+            return str(n) if i == 0 else ""
+
+        aristas = np.array([(ids[a], ids[b]) for a, b in grafo.edges], dtype=np.int64).reshape(-1, 2)
+
+        return cls(
+            tipos=np.array([_parte(n, "tipo", 0) for n in orden], dtype=object),
+            etiquetas=np.array([_parte(n, "etiqueta", 1) for n in orden], dtype=object),
+            duraciones=np.array([float(nodos[n].get("duracion", 0.0)) for n in orden]),
+            origen=aristas[:, 0],
+            destino=aristas[:, 1],
+        )
+
+
+def _cantidades_por_punto(df_estructuras: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Postes (PC…), retenidas (R-…) y total de estructuras por punto,
+    con el mismo criterio que _extraer_metricas_estructuras. Sin
+    columna Punto todo queda en un punto "GLOBAL".
+    """
+
+    columnas = ["postes", "retenidas", "estructuras"]
+    vacio = pd.DataFrame(columns=columnas, dtype=float)
+
+    if df_estructuras is None or df_estructuras.empty:
+        return vacio
+
+    col_estructura = _obtener_columna(
+        df_estructuras,
+        ["Estructura", "Codigo", "Código", "codigodeestructura"],
+    )
+    col_cantidad = _obtener_columna(df_estructuras, ["Cantidad", "Cant", "CANT"])
+    col_punto = _obtener_columna(df_estructuras, ["Punto"])
+
+    if not col_estructura or not col_cantidad:
+        return vacio
+
+    # limpieza y prefijos sobre los valores distintos
+    codigo = canonizar(df_estructuras[col_estructura]).cat
+    prefijos = codigo.categories.to_series()
+    es_poste = prefijos.str.startswith("PC").to_numpy()[codigo.codes.to_numpy()]
+    es_retenida = prefijos.str.startswith("R-").to_numpy()[codigo.codes.to_numpy()]
+
+    cantidad = pd.to_numeric(df_estructuras[col_cantidad], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    # orden de aparición de los puntos (define los tramos)
+    if col_punto:
+        grupo, puntos = pd.factorize(
+            canonizar(df_estructuras[col_punto], limpiar=lambda s: s.str.strip())
+        )
+        puntos = np.asarray(puntos.astype(str), dtype=object)
+    else:
+        grupo, puntos = np.zeros(len(cantidad), dtype=np.int64), np.array(["GLOBAL"], dtype=object)
+
+    return pd.DataFrame({
+        "postes": np.bincount(grupo, weights=cantidad * es_poste, minlength=len(puntos)),
+        "retenidas": np.bincount(grupo, weights=cantidad * es_retenida, minlength=len(puntos)),
+        "estructuras": np.bincount(grupo, weights=cantidad, minlength=len(puntos)),
+    }, index=pd.Index(puntos, name="Punto"))
+
+
+def construir_grafo(
+    df_estructuras: Optional[pd.DataFrame],
+    longitud_primario_m: float = 0.0,
+    longitud_secundario_m: float = 0.0,
+    rendimientos: Optional[Dict[str, float]] = None,
+) -> GrafoActividades:
+    """
+    Actividades por punto y tramos de tendido, armadas por tipo con
+    arreglos (sin un ciclo por punto). Los ids quedan en orden
+    topológico: levantamiento, tipos por punto, tendidos.
+    """
+
+    r = {**RENDIMIENTOS, **(rendimientos or {})}
+    cantidades = _cantidades_por_punto(df_estructuras)
+    puntos = cantidades.index.astype(str).to_numpy(dtype=object)
+    n_puntos = len(puntos)
+
+    tipos = [np.array(["Levantamiento"], dtype=object)]
+    etiquetas = [np.array([""], dtype=object)]
+    duraciones = [np.array([float(DIAS_LEVANTAMIENTO)])]
+    origen: List[np.ndarray] = []
+    destino: List[np.ndarray] = []
+
+    siguiente = 1
+
+    def _agregar(tipo, etiqueta, duracion):
+        nonlocal siguiente
+        ids = np.arange(siguiente, siguiente + len(duracion))
+        siguiente += len(duracion)
+        tipos.append(np.full(len(duracion), tipo, dtype=object))
+        etiquetas.append(etiqueta)
+        duraciones.append(duracion)
+        return ids
+
+    def _unir(a, b):
+        origen.append(np.asarray(a, dtype=np.int64))
+        destino.append(np.asarray(b, dtype=np.int64))
+
+    # -------------------------------------------------
+    # actividades por punto (id -1 = el punto no la tiene)
+    # -------------------------------------------------
+    ids_tipo: Dict[str, np.ndarray] = {}
+
+    for tipo, (columna, rendimiento) in ACTIVIDADES_PUNTO.items():
+
+        duracion = cantidades[columna].to_numpy(dtype=float) / r[rendimiento]
+        presente = duracion > 0
+
+        ids = np.full(n_puntos, -1, dtype=np.int64)
+        ids[presente] = _agregar(tipo, puntos[presente], duracion[presente])
+        ids_tipo[tipo] = ids
+
+    con_predecesor = {tipo: np.zeros(n_puntos, dtype=bool) for tipo in ACTIVIDADES_PUNTO}
+    con_sucesor = {tipo: np.zeros(n_puntos, dtype=bool) for tipo in ACTIVIDADES_PUNTO}
+
+    for a, b in PRECEDENCIAS_PUNTO:
+        m = (ids_tipo[a] >= 0) & (ids_tipo[b] >= 0)
+        _unir(ids_tipo[a][m], ids_tipo[b][m])
+        con_sucesor[a] |= m
+        con_predecesor[b] |= m
+
+    for tipo, ids in ids_tipo.items():
+        m = (ids >= 0) & ~con_predecesor[tipo]
+        _unir(np.zeros(m.sum()), ids[m])
+
+    # -------------------------------------------------
+    # tendido por tramos entre puntos consecutivos
+    # -------------------------------------------------
+    n_tramos = max(1, n_puntos - 1)
+    extremos = [np.arange(n_tramos) + k for k in (0, 1) if k < n_puntos]
+
+    nombres_tramos = (
+        np.array([f"{a} - {b}" for a, b in zip(puntos[:-1], puntos[1:])], dtype=object)
+        if n_puntos > 1
+        else np.array([puntos[0] if n_puntos else ""], dtype=object)
+    )
+
+    for tipo, rendimiento in TENDIDOS:
+
+        longitud = float(longitud_primario_m if rendimiento == "primario" else longitud_secundario_m)
+
+        if longitud <= 0:
+            continue
+
+        ids_tramo = _agregar(
+            tipo,
+            nombres_tramos,
+            np.full(n_tramos, longitud / n_tramos / r[rendimiento]),
+        )
+
+        tiene_previo = np.zeros(n_tramos, dtype=bool)
+
+        for tipo_punto, ids in ids_tipo.items():
+
+            final = (ids >= 0) & ~con_sucesor[tipo_punto]
+
+            for pts in extremos:
+                m = final[pts]
+                _unir(ids[pts][m], ids_tramo[m])
+                tiene_previo |= m
+
+        # puntos sin actividades: el tramo solo espera al levantamiento
+        _unir(np.zeros((~tiene_previo).sum()), ids_tramo[~tiene_previo])
+
+    return GrafoActividades(
+        tipos=np.concatenate(tipos),
+        etiquetas=np.concatenate(etiquetas),
+        duraciones=np.concatenate(duraciones),
+        origen=np.concatenate(origen) if origen else np.zeros(0, dtype=np.int64),
+        destino=np.concatenate(destino) if destino else np.zeros(0, dtype=np.int64),
+    )
+
+
+# =========================================================
+# RUTA CRÍTICA
+# =========================================================
+def _aristas_de(nodos: np.ndarray, inicio: np.ndarray, cantidad: np.ndarray) -> np.ndarray:
+    # posiciones de las aristas (CSR) de varios nodos a la vez
+    n = cantidad[nodos]
+    total = int(n.sum())
+
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    desplazamiento = np.repeat(inicio[nodos] - np.cumsum(n) + n, n)
+
+    return desplazamiento + np.arange(total)
+
+
+def _csr(clave: np.ndarray, valor: np.ndarray, n: int):
+    # aristas agrupadas por clave: (valores, inicio, cantidad)
+    orden = np.argsort(clave, kind="stable")
+    cantidad = np.bincount(clave, minlength=n)
+    inicio = np.concatenate([[0], np.cumsum(cantidad)[:-1]]).astype(np.int64)
+
+    return valor[orden], inicio, cantidad
+
+
+def _niveles(grafo: GrafoActividades, suc, suc_inicio, suc_cantidad) -> List[np.ndarray]:
+    """
+    Niveles topológicos (Kahn): cada actividad queda en el nivel
+    siguiente al de su última predecesora. Ciclo → ValueError.
+    """
+
+    n = len(grafo)
+    pendientes = np.bincount(grafo.destino, minlength=n)
+
+    niveles = []
+    frente = np.flatnonzero(pendientes == 0)
+    visitados = 0
+
+    while frente.size:
+
+        niveles.append(frente)
+        visitados += frente.size
+
+        objetivos = suc[_aristas_de(frente, suc_inicio, suc_cantidad)]
+        np.subtract.at(pendientes, objetivos, 1)
+
+        candidatos = np.unique(objetivos)
+        frente = candidatos[pendientes[candidatos] == 0]
+
+    if visitados < n:
+        raise ValueError(
+            f"Las precedencias tienen un ciclo: {nx.find_cycle(grafo.como_networkx())}"
+        )
+
+    return niveles
+
+
+def ruta_critica(grafo: GrafoActividades) -> Dict[str, Any]:
+    """
+    Pasada hacia adelante y hacia atrás por niveles topológicos
+    (Kahn): cada arista se visita una vez en cada pasada.
+
+    SALIDA:
+    -------
+    {
+      "niveles": lista de arreglos de ids,
+      "inicio_temprano", "fin_temprano",
+      "inicio_tardio", "fin_tardio", "holgura": arreglos por id,
+      "duracion": días de la ruta crítica,
+      "ruta": ids de una ruta crítica, en orden,
+    }
+    """
+
+    n = len(grafo)
+    dur = grafo.duraciones.astype(float)
+    origen, destino = grafo.origen, grafo.destino
+
+    # CSR por origen (sucesores)
+    suc, suc_inicio, suc_cantidad = _csr(origen, destino, n)
+
+    # -------------------------------------------------
+    # hacia adelante
+    # -------------------------------------------------
+    es = np.zeros(n)
+    niveles = _niveles(grafo, suc, suc_inicio, suc_cantidad)
+
+    for frente in niveles:
+
+        posiciones = _aristas_de(frente, suc_inicio, suc_cantidad)
+
+        if posiciones.size:
+            np.maximum.at(es, suc[posiciones], np.repeat(es[frente] + dur[frente], suc_cantidad[frente]))
+
+    ef = es + dur
+    total = float(ef.max()) if n else 0.0
+
+    # -------------------------------------------------
+    # hacia atrás
+    # -------------------------------------------------
+    lf = np.full(n, total)
+
+    for frente in reversed(niveles):
+
+        posiciones = _aristas_de(frente, suc_inicio, suc_cantidad)
+
+        if posiciones.size:
+            np.minimum.at(
+                lf,
+                np.repeat(frente, suc_cantidad[frente]),
+                lf[suc[posiciones]] - dur[suc[posiciones]],
+            )
+
+    ls = lf - dur
+    holgura = np.maximum(0.0, ls - es)
+
+    # -------------------------------------------------
+    # una ruta: de un inicio crítico, siguiendo sucesores
+    # críticos que empiezan cuando termina el anterior
+    # -------------------------------------------------
+    critica = holgura <= _EPS
+    ruta = []
+    actual = next((int(i) for i in niveles[0] if critica[i]), None) if niveles else None
+
+    while actual is not None:
+        ruta.append(actual)
+        hijos = suc[suc_inicio[actual]:suc_inicio[actual] + suc_cantidad[actual]]
+        hijos = hijos[critica[hijos] & (np.abs(es[hijos] - ef[actual]) <= _EPS)]
+        actual = int(hijos.min()) if hijos.size else None
+
+    return {
+        "niveles": niveles,
+        "inicio_temprano": es,
+        "fin_temprano": ef,
+        "inicio_tardio": ls,
+        "fin_tardio": lf,
+        "holgura": holgura,
+        "duracion": total,
+        "ruta": ruta,
+    }
+
+
+# =========================================================
+# NIVELACIÓN CON N CUADRILLAS
+# =========================================================
+def nivelar_cuadrillas(
+    grafo: GrafoActividades,
+    cuadrillas: int,
+    cpm: Optional[Dict[str, Any]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Cada actividad ocupa una cuadrilla. Cada vez que hay cuadrillas
+    libres se asignan las actividades listas (predecesoras
+    terminadas) de menor inicio tardío; empate por id.
+
+    Devuelve {"inicio", "fin", "cuadrilla"} por id.
+    """
+
+    cuadrillas = int(cuadrillas)
+
+    if cuadrillas < 1:
+        raise ValueError("Se necesita al menos una cuadrilla")
+
+    cpm = cpm or ruta_critica(grafo)
+
+    n = len(grafo)
+    dur = grafo.duraciones.astype(float).tolist()
+    ls = cpm["inicio_tardio"].tolist()
+
+    por_origen = np.argsort(grafo.origen, kind="stable")
+    suc = grafo.destino[por_origen].tolist()
+    corte = np.concatenate([[0], np.cumsum(np.bincount(grafo.origen, minlength=n))]).tolist()
+    pendientes = np.bincount(grafo.destino, minlength=n).tolist()
+
+    listos = [(ls[i], i) for i in range(n) if pendientes[i] == 0]
+    heapq.heapify(listos)
+
+    libres = list(range(1, cuadrillas + 1))
+    en_curso: List[tuple] = []
+
+    inicio = [0.0] * n
+    fin = [0.0] * n
+    cuadrilla = [0] * n
+    t = 0.0
+
+    while listos or en_curso:
+
+        while listos and libres:
+            _, i = heapq.heappop(listos)
+            c = heapq.heappop(libres)
+            inicio[i], fin[i], cuadrilla[i] = t, t + dur[i], c
+            heapq.heappush(en_curso, (fin[i], i, c))
+
+        t = en_curso[0][0]
+
+        while en_curso and en_curso[0][0] <= t + _EPS:
+
+            _, i, c = heapq.heappop(en_curso)
+            heapq.heappush(libres, c)
+
+            for s in suc[corte[i]:corte[i + 1]]:
+                pendientes[s] -= 1
+                if pendientes[s] == 0:
+                    heapq.heappush(listos, (ls[s], s))
+
+    return {
+        "inicio": np.array(inicio),
+        "fin": np.array(fin),
+        "cuadrilla": np.array(cuadrilla, dtype=np.int64),
+    }
+
+
+# =========================================================
+# PLAZO POR MUESTRA (MONTE CARLO)
+# =========================================================
+def plan_cuadrillas(grafo: GrafoActividades, programa: Dict[str, np.ndarray]) -> GrafoActividades:
+    """
+    Precedencias + una arista de cada actividad a la siguiente de su
+    misma cuadrilla (orden de inicio en el programa de
+    nivelar_cuadrillas).
+
+    Con las duraciones del grafo, la pasada hacia adelante sobre el
+    plan da el mismo fin que el programa: cada actividad empieza
+    cuando terminan sus predecesoras y la anterior de su cuadrilla.
+    """
+
+    orden = np.lexsort((np.arange(len(grafo)), programa["inicio"], programa["cuadrilla"]))
+    misma = programa["cuadrilla"][orden[1:]] == programa["cuadrilla"][orden[:-1]]
+
+    return GrafoActividades(
+        tipos=grafo.tipos,
+        etiquetas=grafo.etiquetas,
+        duraciones=grafo.duraciones,
+        origen=np.concatenate([grafo.origen, orden[:-1][misma]]).astype(np.int64),
+        destino=np.concatenate([grafo.destino, orden[1:][misma]]).astype(np.int64),
+    )
+
+
+def plazos_por_muestras(
+    grafo: GrafoActividades,
+    factores: Dict[str, np.ndarray],
+    muestras: int,
+) -> np.ndarray:
+    """
+    Días de obra de cada muestra: la duración de cada actividad se
+    multiplica por factores[tipo][muestra] (tipo sin factor → 1) y se
+    repite la pasada hacia adelante, una matriz actividades x muestras
+    por nivel topológico (en bloques de CELDAS_BLOQUE).
+
+    Mismo redondeo que programar_grafo: días de obra completos.
+    """
+
+    n = len(grafo)
+    fin_total = np.zeros(muestras)
+
+    if n == 0:
+        return fin_total
+
+    niveles = _niveles(grafo, *_csr(grafo.origen, grafo.destino, n))
+
+    # predecesoras de cada nivel, agrupadas por actividad: no
+    # dependen de la muestra
+    pred, pred_inicio, pred_cantidad = _csr(grafo.destino, grafo.origen, n)
+    pasos = [
+        (
+            frente,
+            pred[_aristas_de(frente, pred_inicio, pred_cantidad)],
+            np.concatenate([[0], np.cumsum(pred_cantidad[frente])[:-1]]),
+        )
+        for frente in niveles[1:]
+    ]
+
+    duraciones = grafo.duraciones.astype(float)
+
+    columnas = [np.ones(muestras)]
+    fila_factor = np.zeros(n, dtype=np.int64)
+
+    for tipo, factor in factores.items():
+        m = grafo.tipos == tipo
+        if m.any():
+            columnas.append(np.broadcast_to(np.asarray(factor, dtype=float), (muestras,)))
+            fila_factor[m] = len(columnas) - 1
+
+    tabla_factores = np.vstack(columnas)
+    bloque = max(1, CELDAS_BLOQUE // n)
+
+    for desde in range(0, muestras, bloque):
+
+        hasta = min(muestras, desde + bloque)
+        factores_bloque = tabla_factores[:, desde:hasta]
+
+        def _dur(ids):
+            return duraciones[ids, None] * factores_bloque[fila_factor[ids]]
+
+        fin = np.empty((n, hasta - desde))
+        fin[niveles[0]] = _dur(niveles[0])
+
+        for frente, predecesoras, cortes in pasos:
+            fin[frente] = np.maximum.reduceat(fin[predecesoras], cortes, axis=0) + _dur(frente)
+
+        fin_total[desde:hasta] = fin.max(axis=0)
+
+    return np.maximum(1, np.ceil(fin_total - _EPS))
+
+
+# =========================================================
+# RESUMEN (cronograma_resumen)
+# =========================================================
+def _dia_inicio(t: float) -> int:
+    return int(math.floor(t + _EPS)) + 1
+
+
+def _dia_fin(t: float) -> int:
+    return max(1, int(math.ceil(t - _EPS)))
+
+
+def _resumen(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Una fila por tipo de actividad, mismas claves que
+    _calcular_tiempos (+ dias_cuadrilla y critica). inicio / fin son
+    días de obra (1 = primer día); los tipos pueden traslaparse.
+    """
+
+    por_tipo = df.groupby("Actividad", sort=False).agg(
+        inicio=("Inicio", "min"),
+        fin=("Fin", "max"),
+        dias_cuadrilla=("Duracion", "sum"),
+        critica=("Critica", "any"),
+    )
+
+    tipos = list(TIPOS_ACTIVIDAD) + [t for t in por_tipo.index if t not in TIPOS_ACTIVIDAD]
+    cronograma = []
+
+    for tipo in tipos:
+
+        if tipo not in por_tipo.index:
+            cronograma.append({
+                "actividad": tipo,
+                "duracion_dias": 0,
+                "inicio": None,
+                "fin": None,
+                "dias_cuadrilla": 0.0,
+                "critica": False,
+            })
+            continue
+
+        fila = por_tipo.loc[tipo]
+        inicio = _dia_inicio(float(fila["inicio"]))
+        fin = max(inicio, _dia_fin(float(fila["fin"])))
+
+        cronograma.append({
+            "actividad": tipo,
+            "duracion_dias": fin - inicio + 1,
+            "inicio": inicio,
+            "fin": fin,
+            "dias_cuadrilla": round(float(fila["dias_cuadrilla"]), 2),
+            "critica": bool(fila["critica"]),
+        })
+
+    return cronograma
+
+
+def programar_grafo(grafo, cuadrillas: int = 1) -> Dict[str, Any]:
+    """
+    Ruta crítica + nivelación. grafo: GrafoActividades o
+    networkx.DiGraph (nodos con atributo duracion).
+
+    SALIDA:
+    -------
+    {
+      "dias_totales": días de obra con las cuadrillas indicadas,
+      "dias_ruta_critica": días sin límite de cuadrillas,
+      "cuadrillas",
+      "cronograma_resumen": una fila por tipo de actividad,
+      "ruta_critica": ["Tipo Etiqueta", …],
+      "df_programa": una fila por actividad (Inicio / Fin en días
+                     desde el arranque, Cuadrilla, Holgura, Critica),
+    }
+    """
+
+    if isinstance(grafo, nx.DiGraph):
+        grafo = GrafoActividades.desde_networkx(grafo)
+
+    cpm = ruta_critica(grafo)
+    programa = nivelar_cuadrillas(grafo, cuadrillas, cpm)
+
+    df = pd.DataFrame({
+        "Actividad": grafo.tipos,
+        "Etiqueta": grafo.etiquetas,
+        "Duracion": grafo.duraciones,
+        "Inicio Temprano": cpm["inicio_temprano"],
+        "Inicio Tardio": cpm["inicio_tardio"],
+        "Holgura": cpm["holgura"],
+        "Critica": cpm["holgura"] <= _EPS,
+        "Inicio": programa["inicio"],
+        "Fin": programa["fin"],
+        "Cuadrilla": programa["cuadrilla"],
+    })
+
+    df = df.sort_values(["Inicio", "Cuadrilla"], kind="stable").reset_index(drop=True)
+
+    return {
+        "dias_totales": _dia_fin(float(df["Fin"].max())) if len(df) else 0,
+        "dias_ruta_critica": _dia_fin(cpm["duracion"]) if len(df) else 0,
+        "cuadrillas": int(cuadrillas),
+        "cronograma_resumen": _resumen(df),
+        "ruta_critica": [
+            f"{grafo.tipos[i]} {grafo.etiquetas[i]}".strip()
+            for i in cpm["ruta"]
+        ],
+        "df_programa": df.round(3),
+    }
+
+
+# =========================================================
+# FUNCIÓN PRINCIPAL
+# =========================================================
+def programar_obra(
+    df_estructuras: Optional[pd.DataFrame],
+    longitud_primario_m: float = 0.0,
+    longitud_secundario_m: float = 0.0,
+    cuadrillas: int = 1,
+    rendimientos: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Lo que devuelve _calcular_tiempos (dias_* por tipo, dias_totales,
+    cronograma_resumen) calculado con el grafo por punto y N
+    cuadrillas, más lo de programar_grafo.
+    """
+
+    grafo = construir_grafo(
+        df_estructuras,
+        longitud_primario_m=longitud_primario_m,
+        longitud_secundario_m=longitud_secundario_m,
+        rendimientos=rendimientos,
+    )
+
+    resultado = programar_grafo(grafo, cuadrillas)
+    dias = {item["actividad"]: item["duracion_dias"] for item in resultado["cronograma_resumen"]}
+
+    return {
+        "dias_levantamiento": dias["Levantamiento"],
+        "dias_agujeros": dias["Agujeros"],
+        "dias_postes": dias["Postes"],
+        "dias_retenidas": dias["Retenidas"],
+        "dias_estructuras": dias["Estructuras"],
+        "dias_primario": dias["Tendido MT"],
+        "dias_secundario": dias["Tendido BT"],
+        **resultado,
+    }
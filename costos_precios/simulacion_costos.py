@@ -0,0 +1,499 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ayuda.debug import debug_guardar
+from costos_precios.costos_proyecto import (
+    RENDIMIENTOS,
+    _clasificar_costos_desde_materiales,
+    _datos_base_proyecto,
+    _extraer_costos_manuales,
+    _montos_actividades,
+    _motor_costos,
+)
+from costos_precios.programacion_obra import (
+    RENDIMIENTO_POR_TIPO,
+    construir_grafo,
+    nivelar_cuadrillas,
+    plan_cuadrillas,
+    plazos_por_muestras,
+)
+
+
+# =========================================================
+# 🔷 SIMULACIÓN MONTE CARLO DE COSTOS Y PLAZO
+# =========================================================
+# calcular_costos_proyecto da un solo total con parámetros puntuales
+# (horas por poste, costo de cuadrilla, grúa, flete, rendimientos).
+# Para ofertar hacen falta P50 / P80 / P95 de costo y de días.
+#
+# simular_costos_proyecto muestrea esos parámetros y evalúa el
+# motor (montos de actividades, días y KPIs) como expresiones NumPy
+# sobre todas las muestras a la vez, sin un ciclo por muestra:
+#
+#   ✔ Distribuciones relativas al valor puntual (factor × valor) o
+#     absolutas; fija, uniforme, triangular, pert y normal
+#   ✔ Materiales, costos manuales y precio de venta no varían (el
+#     precio ya está pactado cuando se ejecuta la obra)
+#   ✔ Con cuadrillas (programacion_obra), los días de cada muestra
+#     salen del grafo de actividades: el programa determinista
+#     (asignación y orden de cuadrillas) con las duraciones de la
+#     muestra, no de la suma en serie
+#   ✔ Con todas las distribuciones fijas reproduce el resultado
+#     determinista de _motor_costos
+MUESTRAS_DEFECTO = int(os.environ.get("CALCULO_SIMULACION_MUESTRAS", 10_000))
+PERCENTILES_DEFECTO = (50, 80, 95)
+INTERVALOS_HISTOGRAMA = 30
+
+TIPOS_DISTRIBUCION = ("fija", "uniforme", "triangular", "pert", "normal")
+
+COLUMNAS_PERCENTILES = ["Indicador", "Determinista", "Media", "Minimo", "Maximo"]
+COLUMNAS_HISTOGRAMA = ["Desde", "Hasta", "Frecuencia", "Acumulado %"]
+
+# Indicadores con percentiles (en este orden)
+INDICADORES = [
+    "costo_total_real",
+    "utilidad",
+    "margen_pct",
+    "dias_totales",
+    "costo_cuadrilla",
+    "costo_agujeros",
+    "costo_grua",
+    "costo_flete",
+    "costo_por_estructura",
+    "costo_por_poste",
+    "utilidad_diaria",
+]
+
+
+@dataclass
+class Distribucion:
+    """
+    relativa=True: minimo / moda / maximo son factores del valor
+    puntual (0.8, 1.0, 1.5 → -20 % / +50 %).
+
+    ✔ fija: siempre moda
+    ✔ uniforme: entre minimo y maximo
+    ✔ triangular / pert: minimo, moda, maximo
+    ✔ normal: media = moda, desviacion; recortada a
+      [minimo, maximo] si se indican
+    """
+
+    tipo: str = "triangular"
+    minimo: Optional[float] = None
+    moda: float = 1.0
+    maximo: Optional[float] = None
+    desviacion: float = 0.0
+    relativa: bool = True
+
+    def __post_init__(self):
+
+        if self.tipo not in TIPOS_DISTRIBUCION:
+            raise ValueError(
+                f"Distribución '{self.tipo}' inválida "
+                f"(válidas: {', '.join(TIPOS_DISTRIBUCION)})"
+            )
+
+        if self.tipo in ("uniforme", "triangular", "pert"):
+
+            if self.minimo is None or self.maximo is None:
+                raise ValueError(f"La distribución {self.tipo} necesita minimo y maximo")
+
+            if not self.minimo <= self.moda <= self.maximo and self.tipo != "uniforme":
+                raise ValueError(
+                    f"Distribución {self.tipo}: se esperaba minimo <= moda <= maximo "
+                    f"({self.minimo}, {self.moda}, {self.maximo})"
+                )
+
+    def muestrear(self, valor: float, n: int, rng: np.random.Generator) -> np.ndarray:
+
+        escala = valor if self.relativa else 1.0
+        minimo, moda, maximo = self.minimo, self.moda, self.maximo
+
+        if self.tipo == "fija" or (minimo is not None and minimo == maximo):
+            x = np.full(n, float(moda))
+
+        elif self.tipo == "uniforme":
+            x = rng.uniform(minimo, maximo, n)
+
+        elif self.tipo == "triangular":
+            x = rng.triangular(minimo, moda, maximo, n)
+
+        elif self.tipo == "pert":
+            # Beta-PERT con lambda = 4
+            rango = maximo - minimo
+            alfa = 1 + 4 * (moda - minimo) / rango
+            beta = 1 + 4 * (maximo - moda) / rango
+            x = minimo + rng.beta(alfa, beta, n) * rango
+
+        else:
+            x = rng.normal(moda, self.desviacion, n)
+            if minimo is not None or maximo is not None:
+                x = np.clip(x, minimo, maximo)
+
+        return x * escala
+
+
+# Parámetros de _leer_parametros_operativos y rendimientos de
+# _calcular_tiempos que se simulan por defecto (los demás quedan
+# fijos). Menos rendimiento = más días.
+DISTRIBUCIONES_DEFECTO: Dict[str, Distribucion] = {
+    "horas_por_poste": Distribucion("triangular", 0.8, 1.0, 1.5),
+    "horas_por_estructura": Distribucion("triangular", 0.8, 1.0, 1.4),
+    "horas_por_retenida": Distribucion("triangular", 0.8, 1.0, 1.4),
+    "costo_cuadrilla_dia": Distribucion("triangular", 0.95, 1.0, 1.15),
+    "costo_agujero_unitario": Distribucion("triangular", 0.9, 1.0, 1.3),
+    "costo_tendido_mt_m": Distribucion("triangular", 0.9, 1.0, 1.2),
+    "costo_tendido_bt_m": Distribucion("triangular", 0.9, 1.0, 1.2),
+    "horas_grua": Distribucion("triangular", 0.9, 1.0, 1.5),
+    "precio_hora_grua": Distribucion("triangular", 0.95, 1.0, 1.1),
+    "costo_flete_unitario": Distribucion("triangular", 0.9, 1.0, 1.25),
+    "rendimiento_agujeros": Distribucion("triangular", 0.7, 1.0, 1.1),
+    "rendimiento_postes": Distribucion("triangular", 0.7, 1.0, 1.1),
+    "rendimiento_retenidas": Distribucion("triangular", 0.7, 1.0, 1.1),
+    "rendimiento_estructuras": Distribucion("triangular", 0.7, 1.0, 1.1),
+    "rendimiento_primario": Distribucion("triangular", 0.7, 1.0, 1.1),
+    "rendimiento_secundario": Distribucion("triangular", 0.7, 1.0, 1.1),
+}
+
+# sin logística (incluir_logistica=False) estos quedan en cero
+PARAMETROS_LOGISTICA = ("horas_grua", "precio_hora_grua", "costo_flete_unitario", "viajes_flete", "costo_ingenieria")
+
+
+# =========================================================
+# MUESTREO
+# =========================================================
+def _como_distribucion(d) -> Distribucion:
+
+    if isinstance(d, Distribucion):
+        return d
+
+    if isinstance(d, dict):
+        return Distribucion(**d)
+
+    if isinstance(d, (tuple, list)) and len(d) == 3:
+        return Distribucion("triangular", *d)
+
+    raise TypeError(f"Distribución inválida: {d!r}")
+
+
+def _muestrear_parametros(
+    params: Dict[str, Any],
+    distribuciones: Dict[str, Any],
+    n: int,
+    rng: np.random.Generator,
+) -> Dict[str, Any]:
+    """
+    params + rendimiento_* → arreglos de n muestras (los que tienen
+    distribución) o escalares.
+    """
+
+    puntuales = {
+        **params,
+        **{f"rendimiento_{k}": float(v) for k, v in RENDIMIENTOS.items()},
+    }
+
+    desconocidos = sorted(set(distribuciones) - set(puntuales))
+
+    if desconocidos:
+        raise ValueError(f"Parámetros a simular desconocidos: {desconocidos}")
+
+    muestras = dict(puntuales)
+
+    # orden fijo: misma semilla → mismas muestras
+    for nombre in sorted(distribuciones):
+
+        d = distribuciones[nombre]
+
+        if d is None:
+            continue
+
+        muestras[nombre] = _como_distribucion(d).muestrear(float(puntuales[nombre]), n, rng)
+
+    if not params["incluir_logistica"]:
+        for nombre in PARAMETROS_LOGISTICA:
+            muestras[nombre] = 0.0
+
+    muestras["costo_hora_cuadrilla"] = np.divide(
+        muestras["costo_cuadrilla_dia"],
+        muestras["horas_jornada"],
+        out=np.zeros(n),
+        where=np.broadcast_to(np.asarray(muestras["horas_jornada"]) > 0, (n,)),
+    )
+    muestras["costo_grua"] = muestras["horas_grua"] * muestras["precio_hora_grua"]
+    muestras["costo_flete"] = muestras["costo_flete_unitario"] * muestras["viajes_flete"]
+
+    return muestras
+
+
+# =========================================================
+# MOTOR VECTORIZADO
+# =========================================================
+def _dividir(a, b, n: int) -> np.ndarray:
+
+    a = np.broadcast_to(np.asarray(a, dtype=float), (n,))
+    b = np.broadcast_to(np.asarray(b, dtype=float), (n,))
+
+    return np.divide(a, b, out=np.zeros(n), where=b != 0)
+
+
+def _dias(cantidad, rendimiento, n: int) -> np.ndarray:
+    # max(0, round(cantidad / rendimiento)) de _calcular_tiempos
+    # (np.rint redondea al par, igual que round)
+    return np.maximum(0, np.rint(_dividir(cantidad, rendimiento, n)))
+
+
+def _dias_programados(entrada, base: Dict[str, Any], m: Dict[str, Any], n: int, cuadrillas: int) -> np.ndarray:
+    """
+    Días por muestra con el programa por punto: el grafo y el plan
+    de cuadrillas son los del caso determinista; cada tipo de
+    actividad escala su duración por rendimiento puntual / muestreado.
+    """
+
+    grafo = construir_grafo(
+        getattr(entrada, "df_estructuras", None),
+        longitud_primario_m=base["longitud_primario"],
+        longitud_secundario_m=base["longitud_secundario"],
+    )
+
+    plan = plan_cuadrillas(grafo, nivelar_cuadrillas(grafo, cuadrillas))
+
+    factores = {
+        tipo: _dividir(RENDIMIENTOS[clave], m[f"rendimiento_{clave}"], n)
+        for tipo, clave in RENDIMIENTO_POR_TIPO.items()
+    }
+
+    return plazos_por_muestras(plan, factores, n)
+
+
+def _evaluar(
+    base: Dict[str, Any],
+    m: Dict[str, Any],
+    tabla: Dict[str, float],
+    manuales: Dict[str, float],
+    n: int,
+    dias_programados: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    _motor_costos (+ _calcular_tiempos y _calcular_kpis) con
+    arreglos de n muestras. dias_programados: días por muestra del
+    programa con cuadrillas (None = actividades en serie).
+    """
+
+    te = base["total_estructuras"]
+    postes = base["num_postes"]
+    retenidas = base["num_retenidas"]
+    primario = base["longitud_primario"]
+    secundario = base["longitud_secundario"]
+
+    montos = _montos_actividades(
+        m,
+        longitud_primario_m=primario,
+        longitud_secundario_m=secundario,
+        total_estructuras=te,
+        num_postes=postes,
+        num_retenidas=retenidas,
+    )
+
+    def _total(clave_tabla, monto, clave_manual):
+        return np.broadcast_to(
+            tabla[clave_tabla] + monto + manuales.get(clave_manual, 0.0), (n,)
+        ).astype(float)
+
+    costos = {
+        "costo_materiales": np.full(n, tabla["costo_materiales"]),
+        "costo_cuadrilla": _total("costo_cuadrilla", montos["costo_cuadrilla"], "costo_cuadrilla_manual"),
+        "costo_agujeros": _total("costo_agujeros", montos["costo_agujeros"], "costo_agujeros_manual"),
+        "costo_grua": _total("costo_grua", m["costo_grua"], "costo_grua_manual"),
+        "costo_flete": _total("costo_flete", m["costo_flete"], "costo_flete_manual"),
+        "costo_enee": _total("costo_enee", m["costo_enee"], "costo_enee_manual"),
+        "costo_ingenieria": _total("costo_ingenieria", m["costo_ingenieria"], "costo_ingenieria_manual"),
+        "costo_otros": np.full(n, tabla["costo_otros"]),
+    }
+
+    subtotal = sum(costos.values())
+    contingencia = subtotal * (np.asarray(m["porcentaje_contingencia"], dtype=float) / 100)
+    costo_total_real = subtotal + contingencia
+
+    precio = base["precio_total"]
+    utilidad = precio - costo_total_real
+    margen_pct = utilidad / precio * 100 if precio else np.zeros(n)
+
+    # -----------------------------------------------------
+    # días: programa con cuadrillas, o actividades en serie
+    # como _calcular_tiempos
+    # -----------------------------------------------------
+    if dias_programados is not None:
+        dias_totales = dias_programados
+    else:
+        dias_totales = 1 + (
+            _dias(postes, m["rendimiento_agujeros"], n)
+            + _dias(postes, m["rendimiento_postes"], n)
+            + _dias(retenidas, m["rendimiento_retenidas"], n)
+            + _dias(te, m["rendimiento_estructuras"], n)
+            + (_dias(primario, m["rendimiento_primario"], n) if primario else 0)
+            + (_dias(secundario, m["rendimiento_secundario"], n) if secundario else 0)
+        )
+
+    return {
+        **costos,
+        "contingencia": contingencia,
+        "costo_total_real": costo_total_real,
+        "utilidad": utilidad,
+        "margen_pct": margen_pct,
+        "dias_totales": dias_totales,
+        "costo_por_estructura": _dividir(costo_total_real, te, n),
+        "costo_por_poste": _dividir(costo_total_real, postes, n),
+        "utilidad_diaria": _dividir(utilidad, dias_totales, n),
+    }
+
+
+# =========================================================
+# TABLAS
+# =========================================================
+def _histograma(x: np.ndarray, intervalos: int) -> pd.DataFrame:
+
+    bins = intervalos
+
+    # días (enteros): un intervalo por día si caben
+    if np.array_equal(x, np.rint(x)) and x.max() - x.min() < intervalos:
+        bins = np.arange(x.min(), x.max() + 2)
+
+    frecuencia, bordes = np.histogram(x, bins=bins)
+
+    return pd.DataFrame({
+        "Desde": bordes[:-1].round(2),
+        "Hasta": bordes[1:].round(2),
+        "Frecuencia": frecuencia,
+        "Acumulado %": (np.cumsum(frecuencia) / len(x) * 100).round(2),
+    }, columns=COLUMNAS_HISTOGRAMA)
+
+
+def simular_costos_proyecto(
+    entrada,
+    muestras: int = MUESTRAS_DEFECTO,
+    distribuciones: Optional[Dict[str, Any]] = None,
+    percentiles: Sequence[float] = PERCENTILES_DEFECTO,
+    semilla: Optional[int] = None,
+    intervalos: int = INTERVALOS_HISTOGRAMA,
+    guardar_muestras: bool = False,
+) -> Dict[str, Any]:
+    """
+    Misma entrada que calcular_costos_proyecto.
+
+    distribuciones: {parametro: Distribucion | dict | (min, moda,
+    max) relativos}; se combinan con DISTRIBUCIONES_DEFECTO (None
+    deja un parámetro fijo).
+
+    SALIDA:
+    -------
+    {
+      "ok", "error", "muestras", "semilla",
+      "df_percentiles": una fila por indicador (Determinista,
+                        Media, P50, P80, P95, Minimo, Maximo),
+      "histogramas": {"costo_total_real", "dias_totales",
+                      "utilidad"} → Desde / Hasta / Frecuencia /
+                      Acumulado %,
+      "probabilidad_perdida": % de muestras con utilidad < 0,
+      "cuadrillas": 0 = días en serie, N = días del programa
+                    con N cuadrillas,
+      "df_muestras": solo con guardar_muestras,
+    }
+    """
+
+    try:
+
+        muestras = int(muestras)
+
+        if muestras <= 0:
+            raise ValueError("La cantidad de muestras debe ser mayor que cero")
+
+        percentiles = [float(p) for p in percentiles]
+
+        if any(p < 0 or p > 100 for p in percentiles):
+            raise ValueError("Los percentiles deben estar entre 0 y 100")
+
+        distribuciones = {**DISTRIBUCIONES_DEFECTO, **(distribuciones or {})}
+
+        base = _datos_base_proyecto(entrada)
+
+        tabla = _clasificar_costos_desde_materiales(base["df_costos_materiales"])
+        manuales = _extraer_costos_manuales(entrada)
+
+        determinista = _motor_costos(
+            df_materiales_costos=base["df_costos_materiales"],
+            longitud_primario_m=base["longitud_primario"],
+            longitud_secundario_m=base["longitud_secundario"],
+            total_estructuras=base["total_estructuras"],
+            num_postes=base["num_postes"],
+            num_retenidas=base["num_retenidas"],
+            precio_total_proyecto=base["precio_total"],
+            entrada=entrada,
+        )
+
+        rng = np.random.default_rng(semilla)
+        m = _muestrear_parametros(base["params"], distribuciones, muestras, rng)
+
+        cuadrillas = int(determinista["tiempos"].get("cuadrillas") or 0)
+
+        dias_programados = (
+            _dias_programados(entrada, base, m, muestras, cuadrillas)
+            if cuadrillas > 0 else None
+        )
+
+        salida = _evaluar(base, m, tabla, manuales, muestras, dias_programados)
+
+        # -------------------------------------------------
+        # percentiles de todos los indicadores en una llamada
+        # -------------------------------------------------
+        matriz = np.vstack([salida[k] for k in INDICADORES])
+        valores = np.percentile(matriz, percentiles, axis=1)
+
+        nombres_p = [f"P{p:g}" for p in percentiles]
+
+        df_percentiles = pd.DataFrame({
+            "Indicador": INDICADORES,
+            "Determinista": [float(determinista.get(k, 0.0)) for k in INDICADORES],
+            "Media": matriz.mean(axis=1),
+            **{nombre: valores[i] for i, nombre in enumerate(nombres_p)},
+            "Minimo": matriz.min(axis=1),
+            "Maximo": matriz.max(axis=1),
+        }, columns=COLUMNAS_PERCENTILES[:3] + nombres_p + COLUMNAS_PERCENTILES[3:]).round(2)
+
+        resultado = {
+            "ok": True,
+            "error": None,
+            "muestras": muestras,
+            "semilla": semilla,
+            "df_percentiles": df_percentiles,
+            "histogramas": {
+                k: _histograma(salida[k], intervalos)
+                for k in ("costo_total_real", "dias_totales", "utilidad")
+            },
+            "probabilidad_perdida": round(float((salida["utilidad"] < 0).mean() * 100), 2),
+            "cuadrillas": cuadrillas,
+        }
+
+        if guardar_muestras:
+            resultado["df_muestras"] = pd.DataFrame(
+                {k: np.broadcast_to(v, (muestras,)) for k, v in salida.items()}
+            )
+
+        debug_guardar("SIMULACION_COSTOS", lambda: df_percentiles)
+
+        return resultado
+
+    except Exception as e:
+
+        return {
+            "ok": False,
+            "error": str(e),
+            "df_percentiles": None,
+            "histogramas": {},
+        }
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+
+# =========================================================
+# 🔷 ASIGNACIÓN ESPACIAL (ETIQUETA → PUNTO MÁS CERCANO)
+# =========================================================
+# KD-tree 2D sin dependencias (no hay scipy en requirements).
+# Construcción O(n log n) con cortes por mediana; cada consulta
+# baja por el árbol y solo abre la otra rama si el plano de
+# corte está más cerca que el mejor encontrado. Funciona igual
+# con puntos alineados, repetidos o con un punto muy alejado.
+TAMANO_HOJA = 16
+
+FACTOR_ATIPICO = 5.0
+
+
+class IndiceEspacial:
+    """
+    Vecino más cercano en 2D.
+
+    Nodos en listas paralelas: eje/corte/izq/der para nodos
+    internos; inicio/fin sobre self.orden para las hojas (eje -1).
+    """
+
+    def __init__(self, xy: np.ndarray, tamano_hoja: int = TAMANO_HOJA):
+
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+
+        if len(xy) == 0:
+            raise ValueError("IndiceEspacial sin puntos")
+
+        if not np.isfinite(xy).all():
+            raise ValueError("IndiceEspacial con coordenadas no finitas")
+
+        self.xy = xy
+        self.orden = np.arange(len(xy))
+
+        self._eje: List[int] = []
+        self._corte: List[float] = []
+        self._izq: List[int] = []
+        self._der: List[int] = []
+
+        self._construir(0, len(xy), max(1, int(tamano_hoja)))
+
+        # Hojas como listas Python: recorrer 16 puntos así es más
+        # rápido que llamar a numpy por hoja
+        self._x = xy[self.orden, 0].tolist()
+        self._y = xy[self.orden, 1].tolist()
+        self._indices = self.orden.tolist()
+
+    def _nuevo_nodo(self) -> int:
+        for lista in (self._eje, self._corte, self._izq, self._der):
+            lista.append(-1)
+        return len(self._eje) - 1
+
+    def _construir(self, inicio: int, fin: int, tamano_hoja: int) -> int:
+
+        nodo = self._nuevo_nodo()
+
+        if fin - inicio <= tamano_hoja:
+            self._izq[nodo], self._der[nodo] = inicio, fin
+            return nodo
+
+        idx = self.orden[inicio:fin]
+        pts = self.xy[idx]
+
+        eje = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+        mitad = (fin - inicio) // 2
+
+        particion = np.argpartition(pts[:, eje], mitad)
+        self.orden[inicio:fin] = idx[particion]
+
+        self._eje[nodo] = eje
+        self._corte[nodo] = float(self.xy[self.orden[inicio + mitad], eje])
+        self._izq[nodo] = self._construir(inicio, inicio + mitad, tamano_hoja)
+        self._der[nodo] = self._construir(inicio + mitad, fin, tamano_hoja)
+
+        return nodo
+
+    def mas_cercano(self, x: float, y: float) -> Tuple[int, float]:
+
+        eje_, corte_, izq_, der_ = self._eje, self._corte, self._izq, self._der
+        xs, ys, indices = self._x, self._y, self._indices
+
+        mejor = -1
+        mejor_d2 = math.inf
+
+        pila = [(0, 0.0)]
+
+        while pila:
+            nodo, d2_plano = pila.pop()
+
+            if d2_plano > mejor_d2:
+                continue
+
+            # bajar hasta la hoja del lado de la consulta
+            while eje_[nodo] >= 0:
+                delta = (x if eje_[nodo] == 0 else y) - corte_[nodo]
+
+                if delta < 0:
+                    cerca, lejos = izq_[nodo], der_[nodo]
+                else:
+                    cerca, lejos = der_[nodo], izq_[nodo]
+
+                pila.append((lejos, delta * delta))
+                nodo = cerca
+
+            for k in range(izq_[nodo], der_[nodo]):
+                dx = xs[k] - x
+                dy = ys[k] - y
+                d2 = dx * dx + dy * dy
+
+                if d2 < mejor_d2 or (d2 == mejor_d2 and indices[k] < mejor):
+                    mejor, mejor_d2 = indices[k], d2
+
+        return mejor, math.sqrt(mejor_d2)
+
+    def consultar(self, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        SALIDA:
+        -------
+        (indices, distancias) del punto más cercano a cada consulta.
+        """
+
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+
+        indices = np.empty(len(xy), dtype=np.int64)
+        distancias = np.empty(len(xy), dtype=float)
+
+        for n, (x, y) in enumerate(xy.tolist()):
+            indices[n], distancias[n] = self.mas_cercano(x, y)
+
+        return indices, distancias
+
+
+def marcar_atipicos(distancias: np.ndarray, factor: float = FACTOR_ATIPICO) -> np.ndarray:
+    """
+    ✔ Atípico: distancia > factor × mediana de las asignaciones
+    ❌ Con mediana 0 no se marca nada
+    """
+
+    distancias = np.asarray(distancias, dtype=float)
+
+    if len(distancias) == 0:
+        return np.zeros(0, dtype=bool)
+
+    mediana = float(np.median(distancias))
+
+    if mediana <= 0:
+        return np.zeros(len(distancias), dtype=bool)
+
+    return distancias > factor * mediana
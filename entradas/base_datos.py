@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable
+
 import pandas as pd
 from pathlib import Path
 
@@ -19,14 +27,81 @@ def _norm_cols(df: pd.DataFrame) -> pd.DataFrame:
 
 
 # ==========================================================
-# CARGA BASE (SIN HEURÍSTICA)
+# SNAPSHOT COMPILADO
 # ==========================================================
-def cargar_base_datos(ruta: Path | None = None) -> dict[str, pd.DataFrame]:
+# El Excel se parsea con openpyxl (lento). Se guarda una copia
+# compilada (un pickle por hoja + manifest.json) junto al libro,
+# identificada por tamaño, mtime y SHA-256 del archivo.
+#
+#   ✔ Cada archivo se escribe a un .tmp y se publica con os.replace:
+#     otro proceso nunca lee un pickle a medio escribir
+#   ✔ Al regenerar se conserva la generación anterior: los catálogos
+#     vivos con el manifest viejo (otros procesos, EstadoIncremental)
+#     siguen cargando sus hojas perezosamente
+VERSION_SNAPSHOT = 1
+
+MODOS_CARGA = ("excel", "snapshot")
+
+
+def ruta_snapshot(ruta: Path | None = None) -> Path:
     ruta = ruta or obtener_ruta_base()
+    return ruta.parent / f".snapshot_{ruta.stem}"
 
-    if not ruta.exists():
-        raise FileNotFoundError(f"No existe: {ruta}")
 
+def _hash_archivo(ruta: Path) -> str:
+    h = hashlib.sha256()
+
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+
+    return h.hexdigest()
+
+
+def _firma_archivo(ruta: Path) -> dict:
+    st_ = ruta.stat()
+    return {
+        "size": st_.st_size,
+        "mtime_ns": st_.st_mtime_ns,
+    }
+
+
+def _leer_manifest(carpeta: Path) -> dict | None:
+    try:
+        with open(carpeta / "manifest.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _escribir_pickle(df: pd.DataFrame, destino: Path) -> None:
+    tmp = destino.with_name(f"{destino.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        df.to_pickle(tmp)
+        os.replace(tmp, destino)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _escribir_manifest(carpeta: Path, manifest: dict) -> None:
+    tmp = carpeta / f"manifest.{os.getpid()}.tmp"
+
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    os.replace(tmp, carpeta / "manifest.json")
+
+
+def _manifest_compatible(manifest: dict | None) -> bool:
+    return (
+        manifest is not None
+        and manifest.get("version") == VERSION_SNAPSHOT
+        and manifest.get("pandas") == pd.__version__
+    )
+
+
+def _leer_excel(ruta: Path) -> dict[str, pd.DataFrame]:
     xls = pd.ExcelFile(ruta)
 
     data: dict[str, pd.DataFrame] = {}
@@ -42,17 +117,350 @@ def cargar_base_datos(ruta: Path | None = None) -> dict[str, pd.DataFrame]:
     return data
 
 
+def _construir_snapshot(ruta: Path, sha256: str) -> dict[str, pd.DataFrame]:
+    """
+    Parsea el Excel y escribe el snapshot. Si la carpeta no es
+    escribible, devuelve igual las hojas leídas.
+    """
+
+    data = _leer_excel(ruta)
+    carpeta = ruta_snapshot(ruta)
+
+    try:
+        carpeta.mkdir(exist_ok=True)
+
+        anterior = _leer_manifest(carpeta) or {}
+
+        hojas = {}
+        for i, (nombre, df) in enumerate(data.items()):
+            archivo = f"{sha256[:12]}_{i:03d}.pkl"
+            _escribir_pickle(df, carpeta / archivo)
+            hojas[nombre] = archivo
+
+        _escribir_manifest(carpeta, {
+            "version": VERSION_SNAPSHOT,
+            "pandas": pd.__version__,
+            "sha256": sha256,
+            **_firma_archivo(ruta),
+            "hojas": hojas,
+        })
+
+        # limpiar hojas y derivados de generaciones más viejas que
+        # la anterior (la anterior puede seguir en uso)
+        conservar = {sha256[:12], str(anterior.get("sha256", ""))[:12]} - {""}
+        for f in carpeta.glob("*.pkl"):
+            if not any(s in f.name for s in conservar):
+                f.unlink(missing_ok=True)
+
+    except OSError:
+        pass
+
+    return data
+
+
+def snapshot_vigente(ruta: Path | None = None) -> dict:
+    """
+    Devuelve el manifest del snapshot, reconstruyéndolo si el
+    Excel cambió. Solo se calcula el hash cuando cambian
+    tamaño o mtime.
+    """
+
+    ruta = ruta or obtener_ruta_base()
+
+    if not ruta.exists():
+        raise FileNotFoundError(f"No existe: {ruta}")
+
+    carpeta = ruta_snapshot(ruta)
+    manifest = _leer_manifest(carpeta)
+    firma = _firma_archivo(ruta)
+
+    if _manifest_compatible(manifest):
+
+        if all(manifest.get(k) == v for k, v in firma.items()):
+            return manifest
+
+        sha256 = _hash_archivo(ruta)
+
+        # mismo contenido (p.ej. checkout nuevo): solo refrescar firma
+        if manifest.get("sha256") == sha256:
+            manifest.update(firma)
+            try:
+                _escribir_manifest(carpeta, manifest)
+            except OSError:
+                pass
+            return manifest
+    else:
+        sha256 = _hash_archivo(ruta)
+
+    _construir_snapshot(ruta, sha256)
+
+    manifest = _leer_manifest(carpeta)
+
+    if not _manifest_compatible(manifest) or manifest.get("sha256") != sha256:
+        raise OSError(f"No se pudo escribir snapshot en {carpeta}")
+
+    return manifest
+
+
+def cargar_hoja_snapshot(nombre: str, ruta: Path | None = None) -> pd.DataFrame | None:
+    ruta = ruta or obtener_ruta_base()
+    manifest = snapshot_vigente(ruta)
+
+    archivo = manifest["hojas"].get(str(nombre).strip().upper())
+
+    if archivo is None:
+        return None
+
+    return pd.read_pickle(ruta_snapshot(ruta) / archivo)
+
+
+def _cargar_snapshot(ruta: Path) -> dict[str, pd.DataFrame]:
+    try:
+        manifest = snapshot_vigente(ruta)
+    except OSError:
+        # sin permisos de escritura: lectura directa
+        return _leer_excel(ruta)
+
+    carpeta = ruta_snapshot(ruta)
+
+    return {
+        nombre: pd.read_pickle(carpeta / archivo)
+        for nombre, archivo in manifest["hojas"].items()
+    }
+
+
+# ==========================================================
+# CARGA BASE (SIN HEURÍSTICA)
+# ==========================================================
+def cargar_base_datos(
+    ruta: Path | None = None,
+    modo: str = "snapshot",
+) -> dict[str, pd.DataFrame]:
+    """
+    modo="snapshot" → usa (o regenera) el snapshot compilado.
+    modo="excel"    → parsea siempre el libro con openpyxl.
+    """
+
+    ruta = ruta or obtener_ruta_base()
+
+    if not ruta.exists():
+        raise FileNotFoundError(f"No existe: {ruta}")
+
+    if modo not in MODOS_CARGA:
+        raise ValueError(f"Modo de carga no soportado: {modo}")
+
+    if modo == "excel":
+        return _leer_excel(ruta)
+
+    return _cargar_snapshot(ruta)
+
+
+# ==========================================================
+# CATÁLOGO COMPARTIDO (UNA COPIA POR PROCESO)
+# ==========================================================
+class CatalogoBase(Mapping):
+    """
+    Vista de solo lectura sobre el snapshot de la base de datos.
+
+    ✔ Cada hoja se carga la primera vez que se pide
+    ✔ Una sola copia por proceso, compartida entre sesiones e hilos
+    ❌ Las hojas NO se deben mutar (usar .copy() si hace falta)
+    """
+
+    def __init__(
+        self,
+        ruta: Path,
+        manifest: dict,
+        hojas: dict[str, pd.DataFrame] | None = None,
+    ):
+        self.ruta = ruta
+        self._carpeta = ruta_snapshot(ruta)
+        self._manifest = manifest
+        self._archivos: dict[str, str] = dict(manifest["hojas"])
+        self._hojas: dict[str, pd.DataFrame] = dict(hojas or {})
+        self._derivados: dict[tuple[str, int], Any] = {}
+        self._lock = threading.RLock()
+
+    # -------------------------
+    # Mapping
+    # -------------------------
+    def __getitem__(self, nombre: str) -> pd.DataFrame:
+        nombre = str(nombre).strip().upper()
+
+        df = self._hojas.get(nombre)
+        if df is not None:
+            return df
+
+        archivo = self._archivos[nombre]
+
+        with self._lock:
+            df = self._hojas.get(nombre)
+            if df is None:
+                df = pd.read_pickle(self._carpeta / archivo)
+                self._hojas[nombre] = df
+
+        return df
+
+    def leer_hoja(self, nombre: str) -> pd.DataFrame:
+        """
+        Como __getitem__ pero sin dejar la hoja en memoria (para
+        compilaciones de una sola pasada sobre todas las hojas).
+        """
+
+        nombre = str(nombre).strip().upper()
+
+        df = self._hojas.get(nombre)
+        if df is not None:
+            return df
+
+        return pd.read_pickle(self._carpeta / self._archivos[nombre])
+
+    def derivado(self, nombre: str, version: int, construir: Callable[["CatalogoBase"], Any]) -> Any:
+        """
+        Artefacto calculado a partir del catálogo (p.ej. la BOM
+        compilada). Se guarda en memoria y junto al snapshot,
+        ligado al SHA-256 del libro: se regenera cuando cambia.
+        """
+
+        clave = (nombre, version)
+
+        valor = self._derivados.get(clave)
+        if valor is not None:
+            return valor
+
+        with self._lock:
+            valor = self._derivados.get(clave)
+            if valor is not None:
+                return valor
+
+            sha256 = self._manifest.get("sha256")
+            archivo = (
+                self._carpeta / f"{nombre}_v{version}_{sha256[:12]}.pkl"
+                if sha256 else None
+            )
+
+            if archivo is not None and archivo.exists():
+                try:
+                    with open(archivo, "rb") as f:
+                        valor = pickle.load(f)
+                except Exception:
+                    valor = None
+
+            if valor is None:
+                valor = construir(self)
+
+                if archivo is not None:
+                    try:
+                        tmp = archivo.with_suffix(f".{os.getpid()}.tmp")
+                        with open(tmp, "wb") as f:
+                            pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+                        os.replace(tmp, archivo)
+                    except OSError:
+                        pass
+
+            self._derivados[clave] = valor
+
+        return valor
+
+    def __contains__(self, nombre) -> bool:
+        return str(nombre).strip().upper() in self._archivos
+
+    def __iter__(self):
+        return iter(self._archivos)
+
+    def __len__(self) -> int:
+        return len(self._archivos)
+
+    # -------------------------
+    # Estado
+    # -------------------------
+    def vigente(self) -> bool:
+        try:
+            firma = _firma_archivo(self.ruta)
+        except OSError:
+            return False
+        return all(self._manifest.get(k) == v for k, v in firma.items())
+
+    def hojas_cargadas(self) -> list[str]:
+        return list(self._hojas)
+
+    def memoria_bytes(self) -> int:
+        return int(sum(
+            df.memory_usage(index=True, deep=True).sum()
+            for df in list(self._hojas.values())
+        ))
+
+    def resumen_memoria(self) -> dict:
+        return {
+            "sha256": self._manifest.get("sha256", "")[:12],
+            "hojas_totales": len(self._archivos),
+            "hojas_cargadas": len(self._hojas),
+            "memoria_bytes": self.memoria_bytes(),
+        }
+
+
+_REGISTRO: dict[Path, CatalogoBase] = {}
+_REGISTRO_LOCK = threading.Lock()
+
+
+def obtener_catalogo(ruta: Path | None = None) -> CatalogoBase:
+    """
+    Devuelve el catálogo compartido del proceso. Si el Excel cambió
+    se crea uno nuevo; las sesiones que tengan el anterior lo
+    conservan hasta terminar.
+    """
+
+    ruta = (ruta or obtener_ruta_base()).resolve()
+
+    cat = _REGISTRO.get(ruta)
+    if cat is not None and cat.vigente():
+        return cat
+
+    with _REGISTRO_LOCK:
+        cat = _REGISTRO.get(ruta)
+        if cat is not None and cat.vigente():
+            return cat
+
+        try:
+            cat = CatalogoBase(ruta, snapshot_vigente(ruta))
+        except OSError:
+            # sin snapshot escribible: todas las hojas en memoria
+            hojas = _leer_excel(ruta)
+            manifest = {
+                **_firma_archivo(ruta),
+                "hojas": {nombre: "" for nombre in hojas},
+            }
+            cat = CatalogoBase(ruta, manifest, hojas=hojas)
+
+        _REGISTRO[ruta] = cat
+
+    return cat
+
+
+def limpiar_registro_catalogos() -> None:
+    with _REGISTRO_LOCK:
+        _REGISTRO.clear()
+
+
 # ==========================================================
 # ACCESO
 # ==========================================================
-def obtener_hoja(data: dict, nombre: str) -> pd.DataFrame | None:
+def obtener_hoja(data: Mapping | None, nombre: str) -> pd.DataFrame | None:
+    """
+    data=None → usa el catálogo compartido del proceso.
+    La hoja devuelta es compartida: no mutar.
+    """
+
+    if data is None:
+        data = obtener_catalogo()
+
     return data.get(str(nombre).strip().upper())
 
 
 # ==========================================================
 # CATÁLOGO DE ESTRUCTURAS (INDICE)
 # ==========================================================
-def cargar_catalogo_estructuras_desde_indice(data: dict) -> dict[str, str]:
+def cargar_catalogo_estructuras_desde_indice(data: Mapping) -> dict[str, str]:
     df = data.get("INDICE")
 
     if df is None:
@@ -76,7 +484,7 @@ def cargar_catalogo_estructuras_desde_indice(data: dict) -> dict[str, str]:
 # ==========================================================
 # CATÁLOGO DE MATERIALES
 # ==========================================================
-def obtener_catalogo_materiales(data: dict) -> pd.DataFrame:
+def obtener_catalogo_materiales(data: Mapping) -> pd.DataFrame:
 
     df = data.get("MATERIALES")
 
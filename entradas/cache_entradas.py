@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional
+
+import pandas as pd
+
+
+# =========================================================
+# 🔷 CACHÉ DE ENTRADAS (POR CONTENIDO)
+# =========================================================
+# Cada "Finalizar" vuelve a llamar a ejecutar_entradas con el mismo
+# archivo aunque solo haya cambiado un cable o un dato del proyecto.
+# La clave es SHA-256(bytes subidos) + tipo + VERSION_ENTRADAS:
+# mismo contenido → mismo df_estructuras, sin leer, normalizar ni
+# validar otra vez.
+#
+# La caché es del proceso (compartida entre reruns y sesiones; al
+# ser por contenido no mezcla proyectos). LRU con tope de entradas
+# y de memoria (memory_usage deep).
+#
+# Subir VERSION_ENTRADAS al cambiar lectores, normalizar o
+# validación de forma que cambie la salida.
+VERSION_ENTRADAS = 1
+
+TIPOS_CACHEABLES = ("excel", "tabla", "pdf", "dxf")
+
+MAX_ENTRADAS = int(os.environ.get("CALCULO_CACHE_ENTRADAS", 16))
+MAX_BYTES = int(os.environ.get("CALCULO_CACHE_ENTRADAS_MAX_BYTES", 256 * 1024 * 1024))
+
+_BLOQUE = 1 << 20
+
+
+@dataclass
+class EntradaProcesada:
+    """
+    Resultado de lectura + normalización + validación.
+    """
+
+    df_estructuras: pd.DataFrame
+    warnings: List[str] = field(default_factory=list)
+    errores_validacion: List[str] = field(default_factory=list)
+    asignacion: Optional[pd.DataFrame] = None
+    bytes: int = 0
+
+    def copia(self) -> "EntradaProcesada":
+        # los módulos de abajo pueden modificar los DataFrames
+        return EntradaProcesada(
+            df_estructuras=self.df_estructuras.copy(),
+            warnings=list(self.warnings),
+            errores_validacion=list(self.errores_validacion),
+            asignacion=None if self.asignacion is None else self.asignacion.copy(),
+            bytes=self.bytes,
+        )
+
+
+_CACHE: "OrderedDict[str, EntradaProcesada]" = OrderedDict()
+_LOCK = threading.Lock()
+_ESTADISTICAS = {"aciertos": 0, "fallos": 0, "descartes": 0}
+
+
+# =========================================================
+# CLAVE
+# =========================================================
+def _hash_contenido(data: Any) -> Optional[str]:
+    """
+    ✔ bytes / str (tabla pegada)
+    ✔ ruta (Path)
+    ✔ archivo abierto / UploadedFile (se lee por bloques y se
+      deja la posición en 0)
+    ❌ otro (DataFrame manual, LibroExcel ya leído) → None
+    """
+
+    h = hashlib.sha256()
+
+    if isinstance(data, (bytes, bytearray)):
+        h.update(data)
+
+    elif isinstance(data, str):
+        h.update(data.encode("utf-8"))
+
+    elif isinstance(data, Path):
+        with open(data, "rb") as f:
+            for bloque in iter(lambda: f.read(_BLOQUE), b""):
+                h.update(bloque)
+
+    elif hasattr(data, "read") and hasattr(data, "seek"):
+        data.seek(0)
+        for bloque in iter(lambda: data.read(_BLOQUE), b""):
+            h.update(bloque if isinstance(bloque, bytes) else str(bloque).encode("utf-8"))
+        data.seek(0)
+
+    else:
+        return None
+
+    return h.hexdigest()
+
+
+def clave_entrada(tipo: str, data: Any) -> Optional[str]:
+    """
+    SALIDA:
+    -------
+    "v<versión>:<tipo>:<sha256>" o None si la entrada no se cachea.
+    """
+
+    if tipo not in TIPOS_CACHEABLES or data is None:
+        return None
+
+    if isinstance(data, str) and tipo != "tabla":
+        data = Path(data)
+
+    sha = _hash_contenido(data)
+
+    if sha is None:
+        return None
+
+    return f"v{VERSION_ENTRADAS}:{tipo}:{sha}"
+
+
+# =========================================================
+# LRU
+# =========================================================
+def _tamano(entrada: EntradaProcesada) -> int:
+
+    total = int(entrada.df_estructuras.memory_usage(deep=True).sum())
+
+    if isinstance(entrada.asignacion, pd.DataFrame):
+        total += int(entrada.asignacion.memory_usage(deep=True).sum())
+
+    return total
+
+
+def _bytes_total() -> int:
+    return sum(e.bytes for e in _CACHE.values())
+
+
+def obtener_entrada(clave: Optional[str]) -> Optional[EntradaProcesada]:
+
+    if clave is None:
+        return None
+
+    with _LOCK:
+        entrada = _CACHE.get(clave)
+
+        if entrada is None:
+            _ESTADISTICAS["fallos"] += 1
+            return None
+
+        _CACHE.move_to_end(clave)
+        _ESTADISTICAS["aciertos"] += 1
+
+        return entrada.copia()
+
+
+def guardar_entrada(clave: Optional[str], entrada: EntradaProcesada) -> bool:
+    """
+    ✔ Descarta las menos usadas hasta entrar en los topes
+    ❌ Una entrada que sola supera MAX_BYTES no se guarda
+    """
+
+    if clave is None:
+        return False
+
+    entrada = entrada.copia()
+    entrada.bytes = _tamano(entrada)
+
+    if entrada.bytes > MAX_BYTES:
+        return False
+
+    with _LOCK:
+        _CACHE.pop(clave, None)
+
+        while _CACHE and (
+            len(_CACHE) >= MAX_ENTRADAS
+            or _bytes_total() + entrada.bytes > MAX_BYTES
+        ):
+            _CACHE.popitem(last=False)
+            _ESTADISTICAS["descartes"] += 1
+
+        _CACHE[clave] = entrada
+
+    return True
+
+
+def limpiar_cache_entradas() -> None:
+    with _LOCK:
+        _CACHE.clear()
+        for k in _ESTADISTICAS:
+            _ESTADISTICAS[k] = 0
+
+
+def resumen_cache_entradas() -> dict:
+    with _LOCK:
+        return {
+            "entradas": len(_CACHE),
+            "bytes": _bytes_total(),
+            "max_entradas": MAX_ENTRADAS,
+            "max_bytes": MAX_BYTES,
+            **_ESTADISTICAS,
+        }
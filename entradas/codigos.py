@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+# =========================================================
+# 🔷 CÓDIGOS CANÓNICOS (CATEGORICAL)
+# =========================================================
+# Punto, Estructura, Materiales y Unidad se limpian una vez en la
+# frontera de entradas (y en la BOM compilada) y viajan como
+# Categorical: cada valor distinto se guarda una sola vez y
+# groupby / merge / isin trabajan sobre códigos enteros.
+#
+# canonizar() sobre una columna que ya es Categorical solo recorre
+# las categorías (O(distintos), no O(filas)): los módulos de
+# materiales, costos y reportes pueden seguir "normalizando" sin
+# volver a limpiar cientos de miles de strings.
+COLUMNAS_CODIGO = ("Punto", "Estructura", "Materiales", "Unidad")
+
+
+def limpiar_mayusculas(valores: pd.Series) -> pd.Series:
+    """
+    .str.upper().str.strip() (la limpieza de siempre).
+    """
+
+    return valores.str.upper().str.strip()
+
+
+def es_categorica(serie) -> bool:
+    return isinstance(getattr(serie, "dtype", None), pd.CategoricalDtype)
+
+
+def canonizar(
+    serie: pd.Series,
+    limpiar: Callable[[pd.Series], pd.Series] = limpiar_mayusculas,
+) -> pd.Series:
+    """
+    Mismo resultado que limpiar(serie.astype(str)), como
+    Categorical con categorías ordenadas (groupby y sort_values
+    dan el mismo orden que con strings).
+
+    ✔ Categorical → se limpian solo las categorías
+    ✔ otro dtype  → se limpian solo los valores distintos
+    ✔ Categorías que quedan iguales tras limpiar se fusionan
+    """
+
+    if es_categorica(serie):
+        codigos = serie.cat.codes.to_numpy()
+        distintos = serie.cat.categories.astype(str)
+
+        # astype(str) de un nulo es "nan": se conserva
+        if (codigos < 0).any():
+            distintos = distintos.append(pd.Index(["nan"]))
+            codigos = np.where(codigos < 0, len(distintos) - 1, codigos)
+    else:
+        codigos, distintos = pd.factorize(serie.astype(str))
+
+    limpios = limpiar(pd.Series(distintos, dtype=object))
+    nuevos, categorias = pd.factorize(limpios, sort=True)
+
+    return pd.Series(
+        pd.Categorical.from_codes(nuevos[codigos], categories=categorias),
+        index=serie.index,
+        name=serie.name,
+    )
+
+
+def canonizar_columnas(
+    df: pd.DataFrame,
+    columnas: Iterable[str] = COLUMNAS_CODIGO,
+) -> pd.DataFrame:
+    """
+    Copia de df con las columnas de código presentes canonizadas.
+    """
+
+    df = df.copy()
+
+    for c in columnas:
+        if c in df.columns:
+            df[c] = canonizar(df[c])
+
+    return df
+
+
+def memoria_columnas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    SALIDA:
+    -------
+    Columna, Tipo, Distintos, Memoria (KB) con memory_usage(deep=True).
+    """
+
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["Columna", "Tipo", "Distintos", "Memoria (KB)"])
+
+    memoria = df.memory_usage(deep=True, index=False)
+
+    return pd.DataFrame({
+        "Columna": list(df.columns),
+        "Tipo": [str(t) for t in df.dtypes],
+        "Distintos": [int(df[c].nunique()) for c in df.columns],
+        "Memoria (KB)": [round(memoria[c] / 1024, 1) for c in df.columns],
+    })
@@ -103,7 +103,7 @@ def construir_dataframe_salida():
         return pd.DataFrame(), None
 
     df_salida = (
-        df.groupby("Punto")["Estructuras"]
+        df.groupby("Punto", observed=True)["Estructuras"]
         .apply(lambda x: "; ".join(x))
         .reset_index()
     )
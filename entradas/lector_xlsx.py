@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import posixpath
+import zipfile
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from xml.etree.ElementTree import iterparse
+
+import pandas as pd
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+
+
+# =========================================================
+# 🔷 LECTOR XLSX EN STREAMING
+# =========================================================
+# Lee las hojas de un .xlsx directo del zip con iterparse (parser
+# C de ElementTree), sin objetos Cell ni estilos de openpyxl:
+#
+#   ✔ Una apertura del zip para todas las hojas pedidas
+#   ✔ Cada hoja se recorre una vez, fila por fila (memoria O(fila))
+#   ✔ Proyección: las celdas de columnas no pedidas se descartan
+#     antes de convertir su valor (ni shared string ni número)
+#   ✔ Números con formato de fecha → datetime (como openpyxl)
+#
+# Cualquier cosa fuera de lo estándar (sin workbook.xml, XML roto)
+# lanza ValueError y leer_excel cae a pd.read_excel.
+Proyeccion = Callable[[tuple], Optional[List[int]]]
+
+_NOMBRES: Dict[str, str] = {}
+_COLUMNAS: Dict[str, int] = {}
+
+
+def _local(tag: str) -> str:
+    """
+    Nombre sin namespace ("{ns}c" → "c"): sirve igual para
+    transitional y strict OOXML.
+    """
+
+    nombre = _NOMBRES.get(tag)
+
+    if nombre is None:
+        nombre = _NOMBRES[tag] = tag.rsplit("}", 1)[-1]
+
+    return nombre
+
+
+def _atributo(elem, nombre: str) -> Optional[str]:
+    # r:id viene con namespace de relaciones
+    for k, v in elem.attrib.items():
+        if _local(k) == nombre:
+            return v
+    return None
+
+
+def _columna(letras: str) -> int:
+    """
+    "A" → 0, "AB" → 27 (memoizado: pocas columnas distintas).
+    """
+
+    idx = _COLUMNAS.get(letras)
+
+    if idx is None:
+        idx = 0
+        for ch in letras:
+            idx = idx * 26 + (ord(ch) - 64)
+        idx = _COLUMNAS[letras] = idx - 1
+
+    return idx
+
+
+# =========================================================
+# PARTES DEL LIBRO
+# =========================================================
+def _relaciones(zf: zipfile.ZipFile, parte: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Id → (tipo, ruta absoluta dentro del zip) del .rels de parte.
+    """
+
+    carpeta, nombre = posixpath.split(parte)
+    ruta_rels = posixpath.join(carpeta, "_rels", f"{nombre}.rels")
+
+    if ruta_rels not in zf.namelist():
+        return {}
+
+    relaciones = {}
+
+    with zf.open(ruta_rels) as f:
+        for _, elem in iterparse(f):
+            if _local(elem.tag) == "Relationship":
+                destino = elem.get("Target", "")
+                destino = (
+                    destino.lstrip("/") if destino.startswith("/")
+                    else posixpath.normpath(posixpath.join(carpeta, destino))
+                )
+                relaciones[elem.get("Id")] = (elem.get("Type", ""), destino)
+
+    return relaciones
+
+
+def _por_tipo(relaciones: Dict[str, Tuple[str, str]], sufijo: str) -> Optional[str]:
+    for tipo, destino in relaciones.values():
+        if tipo.endswith(sufijo):
+            return destino
+    return None
+
+
+def _textos_compartidos(zf: zipfile.ZipFile, ruta: Optional[str]) -> List[str]:
+
+    if not ruta:
+        return []
+
+    textos: List[str] = []
+
+    with zf.open(ruta) as f:
+        for _, elem in iterparse(f):
+            if _local(elem.tag) != "si":
+                continue
+
+            # texto plano (<t>) o rich text (<r><t>); sin fonética (<rPh>)
+            partes = []
+            for hijo in elem:
+                nombre = _local(hijo.tag)
+                if nombre == "t":
+                    partes.append(hijo.text or "")
+                elif nombre == "r":
+                    partes.extend(t.text or "" for t in hijo if _local(t.tag) == "t")
+
+            textos.append("".join(partes))
+            elem.clear()
+
+    return textos
+
+
+def _estilos_fecha(zf: zipfile.ZipFile, ruta: Optional[str]) -> Set[str]:
+    """
+    Índices de cellXfs (atributo s de la celda) con formato de fecha.
+    """
+
+    if not ruta:
+        return set()
+
+    formatos = dict(BUILTIN_FORMATS)
+    xfs: List[int] = []
+
+    with zf.open(ruta) as f:
+        en_cell_xfs = False
+
+        for evento, elem in iterparse(f, events=("start", "end")):
+            nombre = _local(elem.tag)
+
+            if nombre == "cellXfs":
+                en_cell_xfs = evento == "start"
+
+            elif evento == "end" and nombre == "numFmt":
+                formatos[int(elem.get("numFmtId", -1))] = elem.get("formatCode", "")
+
+            elif evento == "end" and nombre == "xf" and en_cell_xfs:
+                xfs.append(int(elem.get("numFmtId", 0)))
+
+    return {
+        str(i) for i, fmt in enumerate(xfs)
+        if fmt in formatos and is_date_format(formatos[fmt])
+    }
+
+
+# =========================================================
+# HOJA
+# =========================================================
+def _valor(celda, compartidos: List[str], fechas: Set[str], epoch: datetime):
+
+    tipo = celda.get("t", "n")
+
+    if tipo == "inlineStr":
+        return "".join(t.text or "" for t in celda.iter() if _local(t.tag) == "t")
+
+    v = None
+    for hijo in celda:
+        if _local(hijo.tag) == "v":
+            v = hijo.text
+            break
+
+    if v is None:
+        return None
+
+    if tipo == "s":
+        return compartidos[int(v)]
+
+    if tipo in ("str", "e"):
+        return v
+
+    if tipo == "b":
+        return v == "1"
+
+    if tipo == "d":
+        return datetime.fromisoformat(v)
+
+    if celda.get("s") in fechas:
+        return from_excel(float(v), epoch)
+
+    numero = float(v)
+
+    # como el motor openpyxl de pandas: entero si no hay decimales
+    return int(numero) if numero.is_integer() else numero
+
+
+def _leer_hoja(
+    zf: zipfile.ZipFile,
+    ruta: str,
+    compartidos: List[str],
+    fechas: Set[str],
+    epoch: datetime,
+    proyeccion: Optional[Proyeccion],
+    max_filas: Optional[int],
+) -> pd.DataFrame:
+    """
+    Filas crudas (la primera = encabezado), sin filas vacías.
+    La proyección se decide con la primera fila no vacía.
+    """
+
+    filas: List[list] = []
+    columnas: Optional[List[int]] = None    # None = todavía sin encabezado
+    elegidas: Optional[Set[int]] = None
+
+    fila: Dict[int, object] = {}
+    siguiente_columna = 0
+    numero_fila = 0
+
+    with zf.open(ruta) as f:
+        for _, elem in iterparse(f):
+            nombre = _NOMBRES.get(elem.tag) or _local(elem.tag)
+
+            if nombre == "c":
+                ref = elem.get("r")
+                col = _columna(ref.rstrip("0123456789")) if ref else siguiente_columna
+                siguiente_columna = col + 1
+
+                if elegidas is None or col in elegidas:
+                    valor = _valor(elem, compartidos, fechas, epoch)
+                    if valor is not None and valor != "":
+                        fila[col] = valor
+
+                elem.clear()
+
+            elif nombre == "row":
+                numero_fila = int(elem.get("r") or numero_fila + 1)
+                elem.clear()
+
+                if max_filas is not None and numero_fila > max_filas:
+                    break
+
+                siguiente_columna = 0
+
+                if not fila:
+                    continue
+
+                if columnas is None:
+                    ancho = max(fila) + 1
+                    encabezado = tuple(fila.get(i) for i in range(ancho))
+                    columnas = (proyeccion(encabezado) if proyeccion else None) or list(range(ancho))
+                    elegidas = set(columnas)
+
+                if any(c in fila for c in columnas):
+                    filas.append([fila.get(c) for c in columnas])
+
+                fila = {}
+
+            elif nombre == "sheetData":
+                break
+
+    return pd.DataFrame(filas, dtype=object)
+
+
+# =========================================================
+# LIBRO
+# =========================================================
+def leer_hojas_xlsx(
+    archivo,
+    hojas: Optional[Iterable[str]] = None,
+    proyecciones: Optional[Dict[str, Proyeccion]] = None,
+    max_filas: Optional[Dict[str, int]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    SALIDA:
+    -------
+    nombre de hoja en minúsculas → DataFrame crudo (header=None).
+    Solo las hojas pedidas (None = todas).
+    """
+
+    proyecciones = proyecciones or {}
+    max_filas = max_filas or {}
+    nombres = None if hojas is None else {h.strip().lower() for h in hojas}
+
+    try:
+        with zipfile.ZipFile(archivo) as zf:
+
+            libro = _por_tipo(_relaciones(zf, ""), "/officeDocument") or "xl/workbook.xml"
+            relaciones = _relaciones(zf, libro)
+
+            epoch = CALENDAR_WINDOWS_1900
+            hojas_libro: List[Tuple[str, str]] = []
+
+            with zf.open(libro) as f:
+                for _, elem in iterparse(f):
+                    nombre = _local(elem.tag)
+
+                    if nombre == "workbookPr" and elem.get("date1904") in ("1", "true"):
+                        epoch = CALENDAR_MAC_1904
+
+                    elif nombre == "sheet":
+                        rid = _atributo(elem, "id")
+                        if rid in relaciones:
+                            hojas_libro.append((elem.get("name", ""), relaciones[rid][1]))
+
+            pedidas = [
+                (h.strip().lower(), ruta) for h, ruta in hojas_libro
+                if nombres is None or h.strip().lower() in nombres
+            ]
+
+            if not pedidas:
+                return {}
+
+            compartidos = _textos_compartidos(zf, _por_tipo(relaciones, "/sharedStrings"))
+            fechas = _estilos_fecha(zf, _por_tipo(relaciones, "/styles"))
+
+            return {
+                clave: _leer_hoja(
+                    zf, ruta, compartidos, fechas, epoch,
+                    proyecciones.get(clave), max_filas.get(clave),
+                )
+                for clave, ruta in pedidas
+            }
+
+    except (KeyError, IndexError, SyntaxError) as e:
+        # ParseError de ElementTree es SyntaxError
+        raise ValueError(f"XLSX no estándar: {e}")
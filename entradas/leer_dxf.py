@@ -1,26 +1,216 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Any
+import re
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Tuple
 import pandas as pd
-import streamlit as st
+
+from ayuda.debug import debug_guardar
 
 
 CAPA_OBJETIVO = "ESTRUCTURAS"
 
+# Solo estas entidades se materializan; el resto del archivo se
+# recorre con búsquedas sobre bytes sin armar líneas ni strings.
+ENTIDADES_TEXTO = (b"TEXT", b"MTEXT")
+
+TAMANO_BLOQUE = 1 << 20   # 1 MiB por lectura
+_COLA = 512               # bytes conservados entre bloques (marcas partidas)
+
+# "0 / SECTION / 2 / ENTITIES": una línea "0" seguida de un nombre
+# solo puede ser código 0 + valor (los códigos son numéricos), así
+# que estas búsquedas no necesitan alinear pares código/valor.
+_RE_INICIO_ENTITIES = re.compile(
+    rb"(?m)^[ \t]*0[ \t]*\r?\n[ \t]*SECTION[ \t]*\r?\n"
+    rb"[ \t]*2[ \t]*\r?\n[ \t]*ENTITIES[ \t]*\r?\n"
+)
+
+_RE_ENTIDAD = re.compile(
+    rb"(?m)^[ \t]*0[ \t]*\r?\n[ \t]*(" + b"|".join(ENTIDADES_TEXTO) + rb"|ENDSEC)[ \t]*\r?\n"
+)
+
+
+@dataclass
+class TextoDXF:
+    tipo: str                   # TEXT / MTEXT
+    capa: str
+    texto: str
+    x: Optional[float] = None   # punto de inserción (códigos 10 / 20)
+    y: Optional[float] = None
+
+
+def _coordenada(valor: bytes) -> Optional[float]:
+    try:
+        return float(valor)
+    except ValueError:
+        return None
+
+
+# =========================================================
+# TOKENIZADOR EN STREAMING
+# =========================================================
+def _leer_entidad(buf: bytes, pos: int, final: bool):
+    """
+    Pares código/valor desde pos (inicio de línea de código)
+    hasta el siguiente código 0.
+
+    SALIDA:
+    -------
+    (capa, partes, xy, fin) con fin = inicio del código 0
+    siguiente, o None si la entidad no terminó dentro de buf.
+    """
+
+    capa = ""
+    partes: List[Tuple[str, str]] = []
+    xy = [None, None]
+
+    while True:
+        fin_codigo = buf.find(b"\n", pos)
+
+        if fin_codigo < 0:
+            break
+
+        codigo = buf[pos:fin_codigo].strip()
+
+        if codigo == b"0":
+            return capa, partes, xy, pos
+
+        fin_valor = buf.find(b"\n", fin_codigo + 1)
+
+        if fin_valor < 0:
+            break
+
+        if codigo in (b"10", b"20"):
+            eje = 0 if codigo == b"10" else 1
+
+            if xy[eje] is None:
+                xy[eje] = _coordenada(buf[fin_codigo + 1:fin_valor])
+
+        elif codigo in (b"1", b"3", b"8"):
+            valor = buf[fin_codigo + 1:fin_valor].rstrip(b"\r").decode("latin-1", errors="ignore")
+
+            if codigo == b"8":
+                capa = valor.strip().upper()
+            else:
+                partes.append((codigo.decode(), valor))
+
+        pos = fin_valor + 1
+
+    if final:
+        return capa, partes, xy, len(buf)
+
+    return None
+
+
+def _texto_entidad(tipo: bytes, partes: List[Tuple[str, str]]) -> str:
+
+    if tipo == b"MTEXT":
+        # MTEXT parte el texto en trozos de 250 (código 3) + resto
+        # (código 1): se concatenan tal cual
+        return "".join(v for _, v in partes).strip()
+
+    return " ".join(v.strip() for c, v in partes if c == "1").strip()
+
+
+def iterar_textos_dxf(
+    archivo_dxf: Any,
+    tamano_bloque: int = TAMANO_BLOQUE,
+    estadisticas: Optional[dict] = None,
+) -> Iterator[TextoDXF]:
+    """
+    Recorre el DXF por bloques y produce un TextoDXF por cada
+    TEXT/MTEXT de la sección ENTITIES.
+
+    ✔ Memoria acotada: bloque + cola + la entidad en curso
+    ✔ HEADER / TABLES / BLOCKS / OBJECTS se saltan sin tokenizar
+    ❌ No filtra por capa (eso lo hace leer_dxf)
+    """
+
+    if hasattr(archivo_dxf, "seek"):
+        archivo_dxf.seek(0)
+
+    stats = estadisticas if estadisticas is not None else {}
+    stats.update(bytes_leidos=0, secciones_entities=0, entidades_texto=0)
+
+    buf = b""
+    pos = 0
+    en_entities = False
+    final = False
 
+    while True:
+
+        m = (_RE_ENTIDAD if en_entities else _RE_INICIO_ENTITIES).search(buf, pos)
+
+        if m and not en_entities:
+            en_entities = True
+            stats["secciones_entities"] += 1
+            pos = m.end()
+            continue
+
+        if m and m.group(1) == b"ENDSEC":
+            en_entities = False
+            pos = m.end()
+            continue
+
+        if m:
+            entidad = _leer_entidad(buf, m.end(), final)
+
+            if entidad is not None:
+                capa, partes, (x, y), pos = entidad
+                stats["entidades_texto"] += 1
+                yield TextoDXF(
+                    tipo=m.group(1).decode(),
+                    capa=capa,
+                    texto=_texto_entidad(m.group(1), partes),
+                    x=x,
+                    y=y,
+                )
+                continue
+
+            # entidad partida entre bloques: se conserva completa
+            inicio = m.start()
+
+        elif final:
+            break
+
+        else:
+            # solo puede quedar una marca partida al final
+            corte = max(pos, len(buf) - _COLA)
+            inicio = buf.rfind(b"\n", pos, corte)
+            inicio = pos if inicio < 0 else inicio + 1
+
+        bloque = archivo_dxf.read(tamano_bloque)
+
+        if isinstance(bloque, str):
+            bloque = bloque.encode("latin-1", errors="ignore")
+
+        stats["bytes_leidos"] += len(bloque or b"")
+
+        if not bloque:
+            final = True
+            bloque = b"" if buf.endswith(b"\n") else b"\n"
+
+        buf = buf[inicio:] + bloque
+        pos = 0
+
+
+# =========================================================
+# LECTOR
+# =========================================================
 def leer_dxf(archivo_dxf: Any) -> pd.DataFrame:
     """
     Lector DXF (modo crudo)
 
-    ✔ SOLO extrae texto desde la capa objetivo
+    ✔ SOLO extrae texto de TEXT/MTEXT en la capa objetivo
     ✔ NO interpreta estructuras
     ✔ NO normaliza
     ✔ NO valida
 
     OUTPUT:
-        DataFrame con columna:
+        DataFrame con columnas:
             - texto (str)
+            - x, y (float, punto de inserción; NaN si falta)
     """
 
     debug = {
@@ -37,61 +227,30 @@ def leer_dxf(archivo_dxf: Any) -> pd.DataFrame:
         _guardar_debug(debug)
         raise ValueError("archivo_dxf es None")
 
-    try:
-        if hasattr(archivo_dxf, "seek"):
-            archivo_dxf.seek(0)
-
-        raw = archivo_dxf.read()
-
-        if not raw:
-            raise ValueError("DXF vacío")
-
-        contenido = raw.decode("latin-1", errors="ignore")
-       
-    except Exception as e:
-        debug["estado"] = {"ok": False, "error": str(e)}
-        _guardar_debug(debug)
-        raise ValueError(f"No se pudo leer DXF: {e}")
-
     # =====================================================
-    # PARSEO (SOLO TEXTO)
+    # PARSEO EN STREAMING (SOLO TEXTO)
     # =====================================================
-    lineas = contenido.splitlines()
-
-    layer_actual = ""
-    buffer_texto = []
+    stats: dict = {}
     textos = []
-
+    coordenadas = []
     capas_detectadas = set()
 
-    for i in range(len(lineas) - 1):
-
-        codigo = lineas[i].strip()
-        valor = lineas[i + 1].strip()
-
-        # Detectar capa
-        if codigo == "8":
-            layer_actual = valor.upper()
-            capas_detectadas.add(layer_actual)
-
-        # Capturar texto solo en capa objetivo
-        if codigo in ("1", "3") and CAPA_OBJETIVO in layer_actual:
-            buffer_texto.append(valor)
+    try:
+        for t in iterar_textos_dxf(archivo_dxf, estadisticas=stats):
 
-        # Fin de entidad
-        if codigo == "0" and buffer_texto:
-            texto_unido = " ".join(buffer_texto).strip()
+            capas_detectadas.add(t.capa)
 
-            if texto_unido:
-                textos.append(texto_unido)
+            if CAPA_OBJETIVO in t.capa and t.texto:
+                textos.append(t.texto)
+                coordenadas.append((t.x, t.y))
 
-            buffer_texto = []
+        if not stats.get("bytes_leidos"):
+            raise ValueError("DXF vacío")
 
-    # último bloque
-    if buffer_texto:
-        texto_unido = " ".join(buffer_texto).strip()
-        if texto_unido:
-            textos.append(texto_unido)
+    except Exception as e:
+        debug["estado"] = {"ok": False, "error": str(e)}
+        _guardar_debug(debug)
+        raise ValueError(f"No se pudo leer DXF: {e}")
 
     # =====================================================
     # VALIDACIÓN
@@ -108,15 +267,17 @@ def leer_dxf(archivo_dxf: Any) -> pd.DataFrame:
     # OUTPUT
     # =====================================================
     df = pd.DataFrame({
-        "texto": textos
+        "texto": textos,
+        "x": pd.to_numeric([c[0] for c in coordenadas], errors="coerce"),
+        "y": pd.to_numeric([c[1] for c in coordenadas], errors="coerce"),
     })
 
     # =====================================================
     # DEBUG
     # =====================================================
     debug["proceso"] = {
-        "total_lineas": len(lineas),
-        "capas_detectadas": list(capas_detectadas),
+        **stats,
+        "capas_detectadas": sorted(capas_detectadas),
         "total_textos": len(textos),
         "preview_textos": [
             {
@@ -125,7 +286,7 @@ def leer_dxf(archivo_dxf: Any) -> pd.DataFrame:
                 "conteo_P": t.upper().count("P-"),
                 "empieza_con_P": t.upper().strip().startswith("P-")
             }
-            for i, t in enumerate(textos)
+            for i, t in enumerate(textos[:50])
         ]
     }
 
@@ -145,13 +306,6 @@ def leer_dxf(archivo_dxf: Any) -> pd.DataFrame:
 # DEBUG STORAGE
 # =========================================================
 def _guardar_debug(debug: dict):
-    st.session_state.setdefault("debug_pipeline", {})
-
-    # 🔥 guardar debug completo SIEMPRE
-    st.session_state["debug_pipeline"]["DXF"] = debug
-
-    # 🔥 FORZAR VISUALIZACIÓN DE TODO (sin depender de raw_dxf)
-    try:
-        st.session_state["debug_pipeline"]["DXF_RAW"] = str(debug)[:5000]
-    except:
-        st.session_state["debug_pipeline"]["DXF_RAW"] = "ERROR AL MOSTRAR DEBUG"
+    # Pasa por el buffer con tope; con nivel "off" no se arma nada
+    debug_guardar("DXF", lambda: debug)
+    debug_guardar("DXF_RAW", lambda: str(debug)[:5000])
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ayuda.debug import debug_guardar
+from entradas.cache_entradas import (
+    EntradaProcesada,
+    clave_entrada,
+    guardar_entrada,
+    obtener_entrada,
+)
+from entradas.codigos import canonizar_columnas
+from entradas.leer_dxf import leer_dxf
+from entradas.normalizar import normalizar_estructuras
+from entradas.validacion import validar_estructuras
+
+
+# =========================================================
+# 🔷 VARIOS DXF (UNA HOJA POR ARCHIVO)
+# =========================================================
+# Los alimentadores grandes llegan partidos en varias hojas. Cada
+# archivo pasa por leer_dxf + normalizar_estructuras + validación
+# por separado (en un pool de procesos) y después se unen en un solo
+# df_estructuras:
+#
+#   ✔ Cada archivo usa la caché de entradas con la misma clave que
+#     si se subiera solo: agregar una hoja procesa solo esa hoja
+#   ✔ Punto repetido con las mismas estructuras (borde entre hojas)
+#     → se toma una vez
+#   ✔ Punto repetido con estructuras distintas (conflicto) → un solo
+#     punto con la unión de estructuras (máximo de Cantidad por
+#     estructura); nunca se cuenta dos veces
+#   ❌ Un archivo que no se puede leer o normalizar corta la entrada
+#     (faltaría una hoja del alimentador)
+UMBRAL_PARALELO = 2        # con menos archivos pendientes, en serie
+PROCESOS = int(os.environ.get("CALCULO_DXF_PROCESOS", 0)) or None
+
+COLUMNAS_ARCHIVOS = ["Archivo", "Segundos", "Cache", "Filas", "Puntos", "Duplicados", "Conflictos", "Errores"]
+COLUMNAS_CONFLICTOS = ["Punto", "Archivo", "Primero_en", "Tipo", "Resuelto_como"]
+
+
+@dataclass
+class ArchivoDXF:
+    nombre: str
+    procesada: Optional[EntradaProcesada] = None
+    errores: List[str] = field(default_factory=list)
+    segundos: float = 0.0
+    cache: bool = False
+
+
+# =========================================================
+# UN ARCHIVO
+# =========================================================
+def _nombre(archivo: Any, i: int) -> str:
+
+    nombre = getattr(archivo, "name", None)
+
+    if nombre is None and isinstance(archivo, (str, Path)):
+        nombre = str(archivo)
+
+    return Path(str(nombre)).name if nombre else f"archivo_{i + 1}.dxf"
+
+
+def _bytes(archivo: Any) -> bytes:
+
+    if isinstance(archivo, (bytes, bytearray)):
+        return bytes(archivo)
+
+    if isinstance(archivo, (str, Path)):
+        return Path(archivo).read_bytes()
+
+    if hasattr(archivo, "seek"):
+        archivo.seek(0)
+
+    datos = archivo.read()
+
+    if hasattr(archivo, "seek"):
+        archivo.seek(0)
+
+    return datos if isinstance(datos, bytes) else str(datos).encode("latin-1", errors="ignore")
+
+
+def procesar_dxf(datos: bytes) -> Tuple[Optional[EntradaProcesada], List[str], float]:
+    """
+    Lectura + normalización + validación + canonización de un DXF,
+    igual que ejecutar_entradas con un solo archivo.
+
+    SALIDA:
+    -------
+    (procesada | None, errores, segundos)
+    """
+
+    t0 = time.perf_counter()
+
+    try:
+        df_raw = leer_dxf(io.BytesIO(datos))
+
+        detalle: dict = {}
+        df_norm, errores, warnings = normalizar_estructuras(df_raw, detalle=detalle)
+
+        if errores:
+            return None, errores, time.perf_counter() - t0
+
+        errores_val = validar_estructuras(df_norm)
+
+        procesada = EntradaProcesada(
+            df_estructuras=canonizar_columnas(df_norm),
+            warnings=warnings + errores_val,
+            errores_validacion=errores_val,
+            asignacion=detalle.get("asignacion"),
+        )
+
+    except Exception as e:
+        return None, [str(e)], time.perf_counter() - t0
+
+    return procesada, [], time.perf_counter() - t0
+
+
+def _procesar_todos(pendientes: List[bytes], procesos: Optional[int]):
+
+    procesos = max(1, min(procesos or PROCESOS or os.cpu_count() or 1, len(pendientes)))
+
+    if procesos == 1 or len(pendientes) < UMBRAL_PARALELO:
+        return [procesar_dxf(d) for d in pendientes]
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(procesar_dxf, pendientes))
+
+
+# =========================================================
+# UNIÓN
+# =========================================================
+def _contenido(df: pd.DataFrame) -> Dict[str, frozenset]:
+    """
+    Punto → {(Estructura, Cantidad)} de un archivo.
+    """
+
+    grupos: Dict[str, set] = {}
+
+    for p, e, c in zip(
+        df["Punto"].astype(str),
+        df["Estructura"].astype(str),
+        df["Cantidad"].astype(float),
+    ):
+        grupos.setdefault(p, set()).add((e, c))
+
+    return {p: frozenset(g) for p, g in grupos.items()}
+
+
+def _fusionar_puntos(df: pd.DataFrame, puntos: set) -> pd.DataFrame:
+    """
+    Puntos en conflicto → una fila por estructura, con el máximo de
+    Cantidad entre hojas, en la posición donde apareció primero.
+    """
+
+    en = df["Punto"].isin(puntos)
+    parte = df[en]
+
+    maximo = parte.groupby(["Punto", "Estructura"], observed=True, sort=False)["Cantidad"].transform("max")
+    parte = parte.assign(Cantidad=maximo).drop_duplicates(["Punto", "Estructura"])
+
+    return pd.concat([df[~en], parte]).sort_index().reset_index(drop=True)
+
+
+def combinar_dxf(archivos: List[ArchivoDXF]) -> Tuple[EntradaProcesada, pd.DataFrame, Dict[str, Tuple[int, int]]]:
+    """
+    Une los df_estructuras en el orden de subida.
+
+    SALIDA:
+    -------
+    (procesada, conflictos, {archivo: (duplicados, conflictos)})
+    """
+
+    vistos: Dict[str, Tuple[str, frozenset]] = {}
+    fusionados: set = set()
+    partes: List[pd.DataFrame] = []
+    asignaciones: List[pd.DataFrame] = []
+    warnings: List[str] = []
+    conflictos: List[dict] = []
+    cuentas: Dict[str, Tuple[int, int]] = {}
+
+    for a in archivos:
+
+        p = a.procesada
+        df = p.df_estructuras.copy()
+        df["Punto"] = df["Punto"].astype(str)
+
+        descartar = set()
+        conflictivos = 0
+
+        for punto, contenido in _contenido(df).items():
+
+            if punto not in vistos:
+                vistos[punto] = (a.nombre, contenido)
+                continue
+
+            primero, anterior = vistos[punto]
+
+            if contenido == anterior:
+                descartar.add(punto)
+                tipo, resuelto = "duplicado", "una vez"
+            else:
+                fusionados.add(punto)
+                vistos[punto] = (primero, anterior | contenido)
+                conflictivos += 1
+                tipo, resuelto = "conflicto", "unión de estructuras"
+
+            conflictos.append({
+                "Punto": punto,
+                "Archivo": a.nombre,
+                "Primero_en": primero,
+                "Tipo": tipo,
+                "Resuelto_como": resuelto,
+            })
+
+        cuentas[a.nombre] = (len(descartar), conflictivos)
+
+        partes.append(df[~df["Punto"].isin(descartar)])
+
+        if isinstance(p.asignacion, pd.DataFrame) and not p.asignacion.empty:
+            asig = p.asignacion.copy()
+            asig.insert(0, "Archivo", a.nombre)
+            asignaciones.append(asig)
+
+        validacion = set(p.errores_validacion)
+        warnings += [f"[{a.nombre}] {w}" for w in p.warnings if w not in validacion]
+
+    df_estructuras = pd.concat(partes, ignore_index=True)
+
+    if fusionados:
+        df_estructuras = _fusionar_puntos(df_estructuras, fusionados)
+
+    df_conflictos = pd.DataFrame(conflictos, columns=COLUMNAS_CONFLICTOS)
+
+    distintos = df_conflictos[df_conflictos["Tipo"] == "conflicto"]
+    duplicados = df_conflictos[df_conflictos["Tipo"] == "duplicado"]
+
+    if not distintos.empty:
+        ejemplos = ", ".join(
+            f"{r.Punto} ({r.Primero_en} / {r.Archivo})" for r in distintos.head(5).itertuples()
+        )
+        warnings.append(
+            f"{len(distintos)} puntos repetidos en varios DXF con estructuras "
+            f"distintas; se unieron sus estructuras con la mayor cantidad "
+            f"de cada una ({ejemplos})"
+        )
+
+    if not duplicados.empty:
+        warnings.append(
+            f"{len(duplicados)} puntos repetidos en varios DXF con las mismas "
+            f"estructuras; se tomaron una vez"
+        )
+
+    errores_val = validar_estructuras(df_estructuras)
+
+    procesada = EntradaProcesada(
+        df_estructuras=canonizar_columnas(df_estructuras),
+        warnings=warnings + errores_val,
+        errores_validacion=errores_val,
+        asignacion=pd.concat(asignaciones, ignore_index=True) if asignaciones else None,
+    )
+
+    return procesada, df_conflictos, cuentas
+
+
+# =========================================================
+# ENTRADA
+# =========================================================
+def leer_dxf_multiple(
+    archivos: Sequence[Any],
+    procesos: Optional[int] = None,
+) -> Tuple[Optional[EntradaProcesada], List[str], Dict[str, pd.DataFrame]]:
+    """
+    Varios DXF → un df_estructuras (ya normalizado, validado y
+    canonizado, como EntradaProcesada).
+
+    procesos: tamaño del pool (None = CALCULO_DXF_PROCESOS o
+    cpu_count, 1 = en serie)
+
+    SALIDA:
+    -------
+    (procesada | None, errores, informe) con informe =
+    {"dxf_archivos": tiempos por archivo, "dxf_conflictos": puntos
+    repetidos entre archivos}
+    """
+
+    archivos = list(archivos or [])
+
+    if not archivos:
+        return None, ["No se subieron archivos DXF"], {}
+
+    resultados: List[ArchivoDXF] = []
+    pendientes: List[Tuple[int, str, bytes]] = []
+
+    # -----------------------------------------------------
+    # caché por archivo (misma clave que un DXF suelto)
+    # -----------------------------------------------------
+    for i, archivo in enumerate(archivos):
+
+        resultado = ArchivoDXF(nombre=_nombre(archivo, i))
+        resultados.append(resultado)
+
+        try:
+            datos = _bytes(archivo)
+        except Exception as e:
+            resultado.errores = [f"No se pudo leer el archivo: {e}"]
+            continue
+
+        clave = clave_entrada("dxf", datos)
+        t0 = time.perf_counter()
+        procesada = obtener_entrada(clave)
+
+        if procesada is not None:
+            resultado.procesada = procesada
+            resultado.cache = True
+            resultado.segundos = time.perf_counter() - t0
+        else:
+            pendientes.append((i, clave, datos))
+
+    # -----------------------------------------------------
+    # pendientes en paralelo
+    # -----------------------------------------------------
+    if pendientes:
+        salidas = _procesar_todos([d for _, _, d in pendientes], procesos)
+
+        for (i, clave, _), (procesada, errores, segundos) in zip(pendientes, salidas):
+
+            resultado = resultados[i]
+            resultado.procesada = procesada
+            resultado.errores = errores
+            resultado.segundos = segundos
+
+            if procesada is not None:
+                guardar_entrada(clave, procesada)
+
+    # -----------------------------------------------------
+    # unión + informe
+    # -----------------------------------------------------
+    errores = [
+        f"[{r.nombre}] {e}" for r in resultados for e in r.errores
+    ]
+
+    procesada = None
+    df_conflictos = pd.DataFrame(columns=COLUMNAS_CONFLICTOS)
+    cuentas: Dict[str, Tuple[int, int]] = {}
+
+    if not errores:
+        procesada, df_conflictos, cuentas = combinar_dxf(resultados)
+
+    df_archivos = pd.DataFrame([
+        {
+            "Archivo": r.nombre,
+            "Segundos": round(r.segundos, 4),
+            "Cache": r.cache,
+            "Filas": len(r.procesada.df_estructuras) if r.procesada is not None else 0,
+            "Puntos": r.procesada.df_estructuras["Punto"].nunique() if r.procesada is not None else 0,
+            "Duplicados": cuentas.get(r.nombre, (0, 0))[0],
+            "Conflictos": cuentas.get(r.nombre, (0, 0))[1],
+            "Errores": "; ".join(r.errores),
+        }
+        for r in resultados
+    ], columns=COLUMNAS_ARCHIVOS)
+
+    informe = {"dxf_archivos": df_archivos, "dxf_conflictos": df_conflictos}
+
+    debug_guardar("DXF_MULTIPLE", lambda: informe)
+
+    return procesada, errores, informe
@@ -5,8 +5,172 @@ leer_excel.py
 Lectura de datos desde Excel (INPUT LIMPIO, SIN LÓGICA DE NEGOCIO).
 """
 
-import pandas as pd
+import io
 import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from entradas.lector_xlsx import leer_hojas_xlsx
+
+
+# =========================================================
+# 🔷 LIBRO (UNA APERTURA POR ARCHIVO)
+# =========================================================
+# Las hojas se leen en una sola apertura del libro, en streaming
+# (entradas/lector_xlsx.py), y cada lector toma la suya del
+# LibroExcel: leer_entrada_excel() + leer_estructuras(libro) +
+# leer_datos_proyecto(libro) abren el archivo una sola vez.
+HOJAS_ENTRADA = ("estructuras", "datos_proyecto", "materialesadicionados")
+
+# 'estructuras' se lee completa: normalizar_estructuras une todas
+# las celdas de la fila y los códigos pueden venir en cualquier
+# columna (vertical, o la horizontal Poste | Primario | ... de la
+# interfaz). Solo 'datos_proyecto' se proyecta.
+FILAS_DATOS_PROYECTO = 20
+
+Proyeccion = Callable[[tuple], Optional[List[int]]]
+
+
+@dataclass
+class LibroExcel:
+    """
+    Hojas leídas de un libro: nombre en minúsculas → filas crudas
+    (la primera fila es el encabezado, como header=None).
+    """
+
+    hojas: Dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    def hoja(self, nombre: str, header: Optional[int] = 0) -> Optional[pd.DataFrame]:
+
+        df = self.hojas.get(nombre.strip().lower())
+
+        if df is None or header is None:
+            return df
+
+        return _con_encabezado(df)
+
+
+def _nombres_columnas(encabezado: Iterable) -> List[str]:
+    """
+    Mismos nombres que pd.read_excel: vacío → "Unnamed: i",
+    repetidos → "X", "X.1", ...
+    """
+
+    nombres: List[str] = []
+    vistos: Dict[str, int] = {}
+
+    for i, c in enumerate(encabezado):
+        nombre = f"Unnamed: {i}" if c is None or (isinstance(c, float) and pd.isna(c)) else c
+
+        if nombre in vistos:
+            vistos[nombre] += 1
+            nombre = f"{nombre}.{vistos[nombre]}"
+        else:
+            vistos[nombre] = 0
+
+        nombres.append(nombre)
+
+    return nombres
+
+
+def _con_encabezado(df: pd.DataFrame) -> pd.DataFrame:
+
+    if df.empty:
+        return pd.DataFrame()
+
+    cuerpo = df.iloc[1:].reset_index(drop=True)
+    cuerpo.columns = _nombres_columnas(df.iloc[0].tolist())
+
+    return cuerpo.infer_objects()
+
+
+def _proyeccion_datos_proyecto(encabezado: tuple) -> Optional[List[int]]:
+    return [0, 1]
+
+
+PROYECCIONES: Dict[str, Proyeccion] = {
+    "datos_proyecto": _proyeccion_datos_proyecto,
+}
+
+MAX_FILAS: Dict[str, int] = {
+    # encabezado + 20 filas (como nrows=20)
+    "datos_proyecto": FILAS_DATOS_PROYECTO + 1,
+}
+
+
+def _leer_libro_pandas(archivo, nombres: Optional[set]) -> LibroExcel:
+    """
+    Formatos que openpyxl no abre (.xls): pd.read_excel de todas
+    las hojas, con la misma proyección.
+    """
+
+    libro = LibroExcel()
+
+    for hoja, df in pd.read_excel(archivo, sheet_name=None, header=None, dtype=object).items():
+
+        clave = str(hoja).strip().lower()
+
+        if nombres is not None and clave not in nombres:
+            continue
+
+        df = df.dropna(how="all").astype(object).where(df.notna(), None)
+
+        if clave in MAX_FILAS:
+            df = df.head(MAX_FILAS[clave])
+
+        proyeccion = PROYECCIONES.get(clave)
+        if proyeccion is not None and not df.empty:
+            idx = proyeccion(tuple(df.iloc[0])) or list(range(df.shape[1]))
+            df = df.iloc[:, [i for i in idx if i < df.shape[1]]]
+
+        df = df.reset_index(drop=True)
+        df.columns = range(df.shape[1])
+
+        libro.hojas[clave] = df
+
+    return libro
+
+
+def leer_libro(archivo, hojas: Optional[Iterable[str]] = None) -> LibroExcel:
+    """
+    Abre el libro una vez y lee las hojas pedidas (None = todas),
+    aplicando PROYECCIONES y MAX_FILAS.
+
+    archivo: ruta, bytes o archivo abierto (UploadedFile).
+    """
+
+    if isinstance(archivo, LibroExcel):
+        return archivo
+
+    if isinstance(archivo, (bytes, bytearray)):
+        archivo = io.BytesIO(archivo)
+
+    if hasattr(archivo, "seek"):
+        archivo.seek(0)
+
+    try:
+        return LibroExcel(leer_hojas_xlsx(archivo, hojas, PROYECCIONES, MAX_FILAS))
+
+    except (ValueError, zipfile.BadZipFile):
+        # .xls u xlsx fuera de lo estándar
+        if hasattr(archivo, "seek"):
+            archivo.seek(0)
+
+        nombres = None if hojas is None else {h.strip().lower() for h in hojas}
+        return _leer_libro_pandas(archivo, nombres)
+
+
+def leer_entrada_excel(archivo) -> LibroExcel:
+    """
+    Todas las hojas de un Excel de proyecto en una apertura:
+    estructuras, datos_proyecto y materialesadicionados.
+    """
+
+    return leer_libro(archivo, HOJAS_ENTRADA)
 
 
 # =========================================================
@@ -18,19 +182,33 @@ def _limpiar_columnas(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _limpiar_texto_basico(s):
-    if pd.isna(s):
-        return ""
+def limpiar_textos(valores: pd.Series) -> pd.Series:
+    """
+    Limpieza superficial vectorizada, una vez por valor distinto:
+
+    ✔ nulo → ""
+    ✔ saltos de línea / espacios repetidos → un espacio
+    ✔ strip
+    """
+
+    codigos, distintos = pd.factorize(valores, use_na_sentinel=True)
+
+    limpios = (
+        pd.Series(distintos, dtype=object).astype(str)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .tolist()
+    )
+
+    # código -1 (nulo) → "" al final de la tabla de distintos
+    tabla = np.array(limpios + [""], dtype=object)
 
-    s = str(s).strip()
+    return pd.Series(tabla[codigos], index=valores.index, name=valores.name, dtype=object)
 
-    # eliminar saltos de línea raros
-    s = s.replace("\n", " ").replace("\r", " ")
 
-    # normalizar espacios
-    s = re.sub(r"\s+", " ", s)
+def _hoja_o_leer(archivo, hoja: str, header: Optional[int] = 0) -> Optional[pd.DataFrame]:
 
-    return s
+    return leer_libro(archivo, [hoja]).hoja(hoja, header=header)
 
 
 # =========================================================
@@ -38,25 +216,20 @@ def _limpiar_texto_basico(s):
 # =========================================================
 def leer_datos_proyecto(archivo):
 
-    df = pd.read_excel(
-        archivo,
-        sheet_name='datos_proyecto',
-        usecols=[0, 1],
-        nrows=20
-    )
-
-    df = _limpiar_columnas(df)
+    df = _hoja_o_leer(archivo, "datos_proyecto")
 
-    salida = {}
+    if df is None:
+        raise ValueError("No existe la hoja 'datos_proyecto'")
 
-    for k, v in df.values:
-        key = _limpiar_texto_basico(k).lower().replace(":", "")
-        val = _limpiar_texto_basico(v)
+    if df.empty or df.shape[1] < 2:
+        return {}
 
-        if key:
-            salida[key] = val
+    claves = (
+        limpiar_textos(df.iloc[:, 0]).str.lower().str.replace(":", "", regex=False)
+    )
+    valores = limpiar_textos(df.iloc[:, 1])
 
-    return salida
+    return {k: v for k, v in zip(claves, valores) if k}
 
 
 # =========================================================
@@ -76,13 +249,16 @@ def leer_estructuras(archivo) -> pd.DataFrame:
         - limpiar texto superficial
     """
 
-    df = pd.read_excel(archivo, sheet_name='estructuras')
+    df = _hoja_o_leer(archivo, "estructuras")
+
+    if df is None:
+        raise ValueError("No existe la hoja 'estructuras'")
 
     df = _limpiar_columnas(df)
 
     # limpieza ligera (NO lógica de negocio)
     for col in df.columns:
-        df[col] = df[col].apply(_limpiar_texto_basico)
+        df[col] = limpiar_textos(df[col])
 
     return df
 
@@ -92,7 +268,11 @@ def leer_estructuras(archivo) -> pd.DataFrame:
 # =========================================================
 def leer_materiales(archivo, hoja, header=None):
 
-    df = pd.read_excel(archivo, sheet_name=hoja, header=header)
+    df = _hoja_o_leer(archivo, hoja, header=header)
+
+    if df is None:
+        raise ValueError(f"No existe la hoja '{hoja}'")
+
     df = _limpiar_columnas(df)
 
     return df
@@ -104,7 +284,7 @@ def leer_materiales(archivo, hoja, header=None):
 def leer_indice_materiales(archivo):
 
     try:
-        df = pd.read_excel(archivo, sheet_name='indice')
+        df = _hoja_o_leer(archivo, "indice")
 
         df = _limpiar_columnas(df)
         df.columns = df.columns.str.lower()
@@ -140,7 +320,7 @@ def leer_indice_materiales(archivo):
 def leer_catalogo_materiales(archivo):
 
     try:
-        df = pd.read_excel(archivo, sheet_name="Materiales")
+        df = _hoja_o_leer(archivo, "Materiales")
 
         df = _limpiar_columnas(df)
         df.columns = df.columns.str.upper()
@@ -200,7 +380,7 @@ def leer_catalogo_materiales(archivo):
 def leer_adicionales(archivo):
 
     try:
-        df = pd.read_excel(archivo, sheet_name='materialesadicionados')
+        df = _hoja_o_leer(archivo, "materialesadicionados")
 
         df = _limpiar_columnas(df)
 
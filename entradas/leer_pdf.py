@@ -6,24 +6,466 @@ Devuelve datos crudos para normalizar después.
 """
 
 from __future__ import annotations
+
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
 import pandas as pd
 
+from ayuda.debug import debug_guardar
+from entradas.normalizar import PATRON
+
+
+# =========================================================
+# 🔷 CONFIG
+# =========================================================
+# Un juego de planos trae decenas o cientos de páginas y solo
+# unas pocas tienen tablas o notas de estructuras. Por página:
+#
+#   1. hash del contenido y de sus recursos (formularios XObject,
+#      fuentes), sobre los bytes comprimidos, sin decodificar
+#   2. si el hash ya se procesó → filas desde la caché
+#   3. filtro barato: PATRON sobre los strings de Tj/TJ del
+#      stream (extract_text de PyPDF2 si las fuentes no son simples)
+#   4. solo las que pasan el filtro: tablas + líneas con pdfplumber
+#
+# 3 y 4 corren repartidos en un pool de procesos.
+UMBRAL_PARALELO = 8        # con menos páginas pendientes, en serie
+PAGINAS_POR_TAREA = 4
+
+MAX_CACHE_PAGINAS = 4096
+
+_CACHE_PAGINAS: "OrderedDict[str, Tuple[bool, List[str]]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+COLUMNAS_PAGINAS = ["pagina", "hash", "cache", "con_estructuras", "filas"]
+
+
+# =========================================================
+# ENTRADA
+# =========================================================
+def _leer_bytes(archivo_pdf: Any) -> bytes:
+    """
+    ✔ ruta (str / Path)
+    ✔ bytes
+    ✔ archivo abierto / UploadedFile de Streamlit
+    """
+
+    if isinstance(archivo_pdf, (bytes, bytearray)):
+        return bytes(archivo_pdf)
+
+    if isinstance(archivo_pdf, (str, Path)):
+        return Path(archivo_pdf).read_bytes()
+
+    if hasattr(archivo_pdf, "read"):
+        if hasattr(archivo_pdf, "seek"):
+            archivo_pdf.seek(0)
+        return archivo_pdf.read()
+
+    raise TypeError(f"Entrada PDF no soportada: {type(archivo_pdf)}")
+
+
+def _streams_contenido(pagina) -> list:
+    contenido = pagina.get("/Contents")
+
+    if contenido is None:
+        return []
+
+    contenido = contenido.get_object()
+
+    if isinstance(contenido, list):
+        return [c.get_object() for c in contenido]
+
+    return [contenido]
+
+
+def _hash_objeto(h, obj, memo: Dict[tuple, bytes]) -> None:
+    """
+    Objeto PDF → h, siguiendo referencias (formularios anidados,
+    fuentes con /ToUnicode o /Differences).
+
+    memo: resumen por objeto indirecto, compartido entre las páginas
+    de un documento (fuentes y formularios comunes se leen una vez).
+    Una referencia que vuelve a un objeto en curso no se sigue.
+    """
+
+    if hasattr(obj, "idnum"):
+        clave = (obj.idnum, obj.generation)
+        resumen = memo.get(clave)
+
+        if resumen is None:
+            memo[clave] = b"<ciclo>"
+            sub = hashlib.sha256()
+            _hash_objeto(sub, obj.get_object(), memo)
+            resumen = memo[clave] = sub.digest()
+
+        h.update(b"R" + resumen)
+        return
+
+    if isinstance(obj, dict):
+        datos = getattr(obj, "_data", None)
+
+        if datos is not None:
+            h.update(b"S%d:" % len(datos))
+            h.update(datos)
+
+        h.update(b"{")
+        for k in sorted(obj):
+            h.update(repr(k).encode())
+            _hash_objeto(h, obj.raw_get(k) if hasattr(obj, "raw_get") else obj[k], memo)
+        h.update(b"}")
+        return
+
+    if isinstance(obj, list):
+        h.update(b"[")
+        for v in obj:
+            _hash_objeto(h, v, memo)
+        h.update(b"]")
+        return
+
+    h.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+
+def _hash_pagina(pagina, memo: Optional[Dict[tuple, bytes]] = None) -> str:
+    """
+    SHA-256 del stream de contenido + recursos + caja de página +
+    rotación.
+
+    ✔ Sobre los bytes tal como están en el archivo (_data):
+      decodificar Flate/ASCII85 solo para el hash es lo más caro
+    ✔ Recursos completos: los planos CAD dibujan cada hoja como un
+      formulario ("/Fm0 Do"), así que el stream de la página es el
+      mismo en todas y el texto vive en el XObject
+    """
+
+    h = hashlib.sha256()
+
+    for stream in _streams_contenido(pagina):
+        h.update(stream._data or b"")
+
+    recursos = pagina.raw_get("/Resources") if "/Resources" in pagina else None
+    _hash_objeto(h, recursos, {} if memo is None else memo)
+
+    h.update(repr([float(v) for v in pagina.mediabox]).encode())
+    h.update(str(pagina.get("/Rotate", 0)).encode())
+
+    return h.hexdigest()
+
+
+# =========================================================
+# 🔷 CACHÉ POR PÁGINA
+# =========================================================
+def _cache_obtener(clave: str):
+    with _CACHE_LOCK:
+        valor = _CACHE_PAGINAS.get(clave)
+        if valor is not None:
+            _CACHE_PAGINAS.move_to_end(clave)
+        return valor
+
+
+def _cache_guardar(clave: str, valor: Tuple[bool, List[str]]) -> None:
+    with _CACHE_LOCK:
+        _CACHE_PAGINAS[clave] = valor
+        _CACHE_PAGINAS.move_to_end(clave)
+
+        while len(_CACHE_PAGINAS) > MAX_CACHE_PAGINAS:
+            _CACHE_PAGINAS.popitem(last=False)
+
+
+def limpiar_cache_pdf() -> None:
+    with _CACHE_LOCK:
+        _CACHE_PAGINAS.clear()
+
+
+# =========================================================
+# FILTRO BARATO (STRINGS DEL STREAM)
+# =========================================================
+_RE_ESCAPE = re.compile(rb"\\([()\\])")
+
+
+def _literales(datos: bytes) -> str:
+    """
+    Strings (...) del stream de contenido, sin interpretar los
+    operadores. Los trozos de un mismo TJ (kerning) se pegan; los
+    Tj sueltos se separan con espacio.
+
+    El trazado (líneas, curvas) no lleva paréntesis: find() salta
+    de string en string sin recorrer la geometría byte a byte.
+    """
+
+    partes = []
+    n = len(datos)
+    pos = datos.find(b"(")
+
+    while pos >= 0:
+        nivel, i = 1, pos + 1
+
+        while i < n and nivel:
+            c = datos[i]
+            if c == 0x5C:           # \
+                i += 2
+                continue
+            if c == 0x28:           # (
+                nivel += 1
+            elif c == 0x29:         # )
+                nivel -= 1
+            i += 1
+
+        partes.append(_RE_ESCAPE.sub(rb"\1", datos[pos + 1:i - 1]))
+
+        # dentro de un TJ sigue un número de kerning u otro string
+        siguiente = datos[i:i + 16].lstrip()
+        if not siguiente[:1] or siguiente[:1] not in b"(-.0123456789":
+            partes.append(b" ")
+
+        pos = datos.find(b"(", i)
+
+    return b"".join(partes).decode("latin-1")
+
 
-def leer_pdf(archivo_pdf) -> pd.DataFrame:
+def _fuentes_simples(pagina) -> bool:
+    """
+    ✔ Type1/TrueType con codificación estándar → los bytes de los
+      strings son el texto
+    ❌ Type0, /ToUnicode, /Differences o formularios (XObject) →
+      hace falta extract_text
+    """
+
+    recursos = (pagina.get("/Resources") or {})
+    recursos = recursos.get_object() if hasattr(recursos, "get_object") else recursos
+
+    xobjects = (recursos.get("/XObject") or {})
+    xobjects = xobjects.get_object() if hasattr(xobjects, "get_object") else xobjects
+
+    for x in xobjects.values():
+        if x.get_object().get("/Subtype") == "/Form":
+            return False
+
+    fuentes = (recursos.get("/Font") or {})
+    fuentes = fuentes.get_object() if hasattr(fuentes, "get_object") else fuentes
+
+    for f in fuentes.values():
+        f = f.get_object()
+
+        if f.get("/Subtype") == "/Type0" or "/ToUnicode" in f:
+            return False
+
+        codificacion = f.get("/Encoding")
+        if codificacion is not None and not isinstance(codificacion.get_object(), str):
+            return False
+
+    return True
+
+
+def _texto_filtro(pagina) -> str:
+
+    if _fuentes_simples(pagina):
+        return "".join(_literales(s.get_data() or b"") for s in _streams_contenido(pagina))
+
+    return pagina.extract_text() or ""
+
+
+# =========================================================
+# EXTRACCIÓN DE UNA PÁGINA (pdfplumber)
+# =========================================================
+def _texto_celdas(celdas) -> str:
+    return " ".join(
+        " ".join(str(c).split())
+        for c in celdas
+        if c is not None and str(c).strip()
+    )
+
+
+def _filas_pagina(pagina) -> List[str]:
+    """
+    Tablas + texto libre en orden de lectura (arriba → abajo).
+
+    ✔ Tabla: una fila por fila de tabla (celdas unidas con " ")
+    ✔ Texto: una fila por línea, sin lo que ya cae dentro de
+      una tabla (no se cuenta dos veces)
+    """
+
+    items: List[Tuple[float, float, str]] = []
+
+    tablas = pagina.find_tables()
+
+    for tabla in tablas:
+        for fila, celdas in zip(tabla.rows, tabla.extract()):
+            texto = _texto_celdas(celdas)
+            if texto:
+                items.append((fila.bbox[1], fila.bbox[0], texto))
+
+    resto = pagina
+    for tabla in tablas:
+        resto = resto.outside_bbox(tabla.bbox)
+
+    for linea in resto.extract_text_lines():
+        texto = " ".join(linea["text"].split())
+        if texto:
+            items.append((linea["top"], linea["x0"], texto))
+
+    items.sort(key=lambda t: (round(t[0], 1), t[1]))
+
+    return [t for _, _, t in items]
+
+
+def _procesar_paginas(datos: bytes, numeros: List[int]) -> List[Tuple[int, bool, List[str]]]:
+    """
+    SALIDA:
+    -------
+    (número, con_estructuras, filas) por página pedida.
+    Páginas sin PATRON en el texto del filtro → (n, False, []).
+    """
+
+    import pdfplumber
+    from PyPDF2 import PdfReader
+
+    lector = PdfReader(io.BytesIO(datos))
+
+    candidatas = []
+    resultado = []
+
+    for n in numeros:
+        texto = _texto_filtro(lector.pages[n]).upper()
+
+        if PATRON.search(texto):
+            candidatas.append(n)
+        else:
+            resultado.append((n, False, []))
+
+    if candidatas:
+        with pdfplumber.open(io.BytesIO(datos)) as pdf:
+            for n in candidatas:
+                pagina = pdf.pages[n]
+                resultado.append((n, True, _filas_pagina(pagina)))
+                pagina.close()
+
+    return resultado
+
+
+# ---------------------------------------------------------
+# Worker: el PDF se envía una vez por proceso
+# ---------------------------------------------------------
+_DATOS_WORKER: Optional[bytes] = None
+
+
+def _inicializar_worker(datos: bytes):
+    global _DATOS_WORKER
+    _DATOS_WORKER = datos
+
+
+def _procesar_en_worker(numeros: List[int]):
+    return _procesar_paginas(_DATOS_WORKER, numeros)
+
+
+def _extraer(datos: bytes, numeros: List[int], procesos: Optional[int]) -> List[Tuple[int, bool, List[str]]]:
+
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(numeros)))
+
+    if procesos == 1 or len(numeros) < UMBRAL_PARALELO:
+        return _procesar_paginas(datos, numeros)
+
+    tareas = [
+        numeros[i:i + PAGINAS_POR_TAREA]
+        for i in range(0, len(numeros), PAGINAS_POR_TAREA)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        initializer=_inicializar_worker,
+        initargs=(datos,),
+    ) as pool:
+        return [r for parte in pool.map(_procesar_en_worker, tareas) for r in parte]
+
+
+# =========================================================
+# LECTOR
+# =========================================================
+def leer_pdf(archivo_pdf, procesos: Optional[int] = None) -> pd.DataFrame:
     """
     Entrada desde PDF.
 
     archivo_pdf:
         - ruta
         - bytes (Streamlit)
+        - archivo abierto
+
+    procesos: tamaño del pool (None = cpu_count, 1 = en serie)
 
     Retorna:
-        DataFrame con información cruda de estructuras
+        DataFrame con columna texto (una fila por fila de tabla o
+        línea de texto, en orden de página), el mismo formato
+        crudo que normalizar_estructuras recibe del DXF sin x/y.
     """
 
-    # 🔴 Aquí irá tu lógica real (PyMuPDF, pdfplumber, etc.)
+    from PyPDF2 import PdfReader
+    from PyPDF2.errors import PdfReadError
+
+    if archivo_pdf is None:
+        raise ValueError("archivo_pdf es None")
+
+    datos = _leer_bytes(archivo_pdf)
+
+    if not datos:
+        raise ValueError("PDF vacío")
+
+    try:
+        lector = PdfReader(io.BytesIO(datos))
+        memo: Dict[tuple, bytes] = {}
+        hashes = [_hash_pagina(p, memo) for p in lector.pages]
+    except (PdfReadError, ValueError, KeyError) as e:
+        raise ValueError(f"No se pudo leer PDF: {e}")
+
+    # =====================================================
+    # CACHÉ
+    # =====================================================
+    por_pagina: Dict[int, Tuple[bool, List[str]]] = {}
+    desde_cache = set()
+    pendientes: Dict[str, List[int]] = {}
+
+    for n, clave in enumerate(hashes):
+        valor = _cache_obtener(clave)
+
+        if valor is not None:
+            por_pagina[n] = valor
+            desde_cache.add(n)
+        else:
+            # páginas repetidas (carátulas, notas) se extraen una vez
+            pendientes.setdefault(clave, []).append(n)
+
+    # =====================================================
+    # EXTRACCIÓN (POOL)
+    # =====================================================
+    if pendientes:
+        representantes = [ns[0] for ns in pendientes.values()]
+
+        for n, con_estructuras, filas in _extraer(datos, representantes, procesos):
+            clave = hashes[n]
+            _cache_guardar(clave, (con_estructuras, filas))
+
+            for m in pendientes[clave]:
+                por_pagina[m] = (con_estructuras, filas)
+
+    # =====================================================
+    # OUTPUT
+    # =====================================================
+    textos = [t for n in range(len(hashes)) for t in por_pagina[n][1]]
+
+    df = pd.DataFrame({"texto": pd.Series(textos, dtype=object)})
 
-    # Ejemplo placeholder:
-    df = pd.DataFrame()
+    debug_guardar("PDF", lambda: pd.DataFrame({
+        "pagina": range(1, len(hashes) + 1),
+        "hash": [h[:12] for h in hashes],
+        "cache": [n in desde_cache for n in range(len(hashes))],
+        "con_estructuras": [por_pagina[n][0] for n in range(len(hashes))],
+        "filas": [len(por_pagina[n][1]) for n in range(len(hashes))],
+    }, columns=COLUMNAS_PAGINAS))
 
     return df
@@ -2,9 +2,16 @@
 from __future__ import annotations
 
 import re
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from ayuda.debug import debug_guardar
+from ayuda.sesion import en_streamlit
+from entradas.asignacion_espacial import IndiceEspacial, marcar_atipicos
+
 # =========================================================
 # LIMPIEZA DXF (CRÍTICO)
 # =========================================================
@@ -93,137 +100,324 @@ PATRON = re.compile(
     re.VERBOSE
 )
 
+PATRON_PUNTO = re.compile(r"\bP[-\s]?(\d+)\b")
+
+# Token = código (con multiplicador opcional) + estado opcional
+# "(P)/(E)/(D)/(R)", pegado o separado por espacios
+PATRON_TOKEN = re.compile(r"\S+(?:\s*\([EPDR]\))?")
+
+PATRON_ESTADO = re.compile(r"\(([PDER])\)")
+
+PATRON_MULTIPLICADOR = re.compile(r"^(\d+)([A-Z].*)$")
+
+COLUMNAS_ASIGNACION = ["Fila", "Texto", "Punto", "Origen", "Distancia", "X", "Y", "Atipico"]
+
 
 # =========================================================
-# CORE
+# VERSIONES VECTORIZADAS (SERIES)
 # =========================================================
-def _convertir(df: pd.DataFrame):
+def limpiar_textos_dxf(textos: pd.Series) -> pd.Series:
+    """
+    limpiar_texto_dxf sobre una Series de str.
+    Solo reescribe los textos con formato MTEXT ({ } \\).
+    """
+
+    con_formato = textos.str.contains(r"[{}\\]", regex=True)
+
+    if not con_formato.any():
+        return textos
+
+    textos = textos.copy()
+    textos[con_formato] = (
+        textos[con_formato]
+        .str.replace(r"\{.*?;", "", regex=True)
+        .str.replace("{", "", regex=False)
+        .str.replace("}", "", regex=False)
+        .str.replace("\\P", " ", regex=False)
+    )
+
+    return textos
+
+
+def limpiar_codigos(codigos: pd.Series) -> pd.Series:
+    """
+    limpiar_codigo sobre una Series de str.
+    """
+
+    return (
+        codigos
+        .str.upper()
+        .str.strip()
+        .str.replace(r"\(.*?\)", "", regex=True)
+        .str.replace(",", "", regex=False)
+        .str.replace(" ", "-", regex=False)
+        .str.replace(r"[^A-Z0-9\.\-]", "", regex=True)
+        .str.replace(r"-+", "-", regex=True)
+        .str.replace("-KVA", "KVA", regex=False)
+        .str.strip("-")
+    )
+
+
+def _textos_por_fila(df: pd.DataFrame) -> pd.Series:
+    """
+    ✔ DXF (texto/x/y): solo la columna texto
+    ✔ Otro: valores no nulos de la fila unidos con " "
+    """
+
+    if {"texto", "x", "y"}.issubset(df.columns):
+        col = df["texto"]
+        return col.astype(str).where(col.notna(), "").reset_index(drop=True)
+
+    texto = None
+
+    for j in range(df.shape[1]):
+        col = df.iloc[:, j].reset_index(drop=True)
+        valores = col.astype(str).where(col.notna())
+
+        if texto is None:
+            texto = valores
+        else:
+            texto = (texto + " " + valores).fillna(texto).fillna(valores)
+
+    return texto.fillna("")
+
+
+# =========================================================
+# ASIGNACIÓN DE PUNTOS
+# =========================================================
+def _asignar_puntos(df: pd.DataFrame):
+    """
+    Resuelve el punto de cada fila con texto.
+
+    ✔ texto:    la fila trae su propia etiqueta P-xx
+    ✔ espacial: DXF con x/y → etiqueta de punto más cercana
+    ✔ orden:    sin coordenadas → último punto leído (arrastre)
+
+    SALIDA:
+    -------
+    (filas, df_asignacion) con filas = DataFrame Fila/Texto/Punto
+    (índice posicional, solo filas con texto)
+    """
 
-    registros = []
-    punto_actual = None  # 🔥 estado del punto
+    espacial = {"texto", "x", "y"}.issubset(df.columns)
 
-    for idx, row in df.iterrows():
+    textos = limpiar_textos_dxf(_textos_por_fila(df))
 
-        texto = " ".join(str(v) for v in row.values if pd.notna(v))
-        texto = limpiar_texto_dxf(texto)
+    filas = pd.DataFrame({"Fila": df.index, "Texto": textos.str.upper()})
+    filas = filas[textos.str.len() > 0]
 
-        if not texto:
-            continue
+    propio = "P-" + filas["Texto"].str.extract(PATRON_PUNTO, expand=False)
 
-        texto_upper = texto.upper()
+    # =====================================================
+    # 🔷 ESPACIAL: etiquetas sin punto → punto más cercano
+    # =====================================================
+    cercano = pd.Series(np.nan, index=filas.index, dtype=object)
+    distancia = pd.Series(np.nan, index=filas.index)
 
-        # =====================================================
-        # 🔥 DETECTAR PUNTO
-        # =====================================================
-        m_punto = re.search(r"\bP[-\s]?(\d+)\b", texto_upper)
-        if m_punto:
-            punto_actual = f"P-{m_punto.group(1)}"
+    if espacial:
+        xy = df[["x", "y"]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        xy = xy[filas.index]
 
-        # =====================================================
-        # ⚠ FALLBACK CONTROLADO
-        # =====================================================
-        if not punto_actual:
-            punto_actual = f"SIN_PUNTO_{idx+1}"
+        con_xy = np.isfinite(xy).all(axis=1)
+        anclas = propio.notna().to_numpy() & con_xy
+        sueltas = propio.isna().to_numpy() & con_xy
 
-            try:
-                debug_guardar("WARNING_SIN_PUNTO", {
-                    "fila": idx,
-                    "texto": texto_upper
-                })
-            except:
-                pass
+        if anclas.any() and sueltas.any():
+            indice = IndiceEspacial(xy[anclas])
+            k, d = indice.consultar(xy[sueltas])
 
-        # =====================================================
-        # TOKENIZAR
-        # Soporta:
-        # R-2 (P)
-        # 3R-2 (P)
-        # 2A-I-1 (P)
-        # =====================================================
-        tokens = re.findall(r'\S+(?:\s*\([EPDR]\))?', texto_upper)
+            cercano[sueltas] = propio[anclas].to_numpy()[k]
+            distancia[sueltas] = d
 
-        for token in tokens:
+    # =====================================================
+    # 🔷 ORDEN: arrastre del último punto propio
+    # =====================================================
+    orden = propio.ffill()
+    sin_punto = orden.isna() & propio.isna() & cercano.isna()
 
-            m_tipo = re.search(r'\((P|D|E|R)\)', token)
+    # ⚠ FALLBACK CONTROLADO: antes del primer punto
+    if sin_punto.any():
+        primera = filas[sin_punto].iloc[0]
+        orden = orden.fillna(f"SIN_PUNTO_{primera['Fila']+1}")
+
+        debug_guardar("WARNING_SIN_PUNTO", lambda: {
+            "fila": primera["Fila"],
+            "texto": primera["Texto"]
+        })
+
+    filas["Punto"] = propio.fillna(cercano).fillna(orden)
+
+    if not espacial:
+        return filas, pd.DataFrame(columns=COLUMNAS_ASIGNACION)
+
+    origen = np.select(
+        [propio.notna(), cercano.notna()],
+        ["texto", "espacial"],
+        default="orden",
+    )
+
+    df_asignacion = pd.DataFrame({
+        "Fila": filas["Fila"],
+        "Texto": filas["Texto"],
+        "Punto": filas["Punto"],
+        "Origen": origen,
+        "Distancia": distancia,
+        "X": xy[:, 0],
+        "Y": xy[:, 1],
+    }).reset_index(drop=True)
+
+    mask = df_asignacion["Origen"] == "espacial"
+    df_asignacion["Atipico"] = False
+    df_asignacion.loc[mask, "Atipico"] = marcar_atipicos(df_asignacion.loc[mask, "Distancia"])
+
+    return filas, df_asignacion
+
+
+# =========================================================
+# TOKENS → ESTRUCTURAS
+# =========================================================
+def _tokens_a_estructuras(tokens: pd.Series) -> pd.DataFrame:
+    """
+    Soporta:
+    R-2 (P)    → 1 × R-2
+    3R-2 (P)   → 3 × R-2
+    2A-I-1 (P) → 2 × A-I-1
+    R-2 (E)    → se descarta (DXF: solo proyectado)
+    R-2        → 1 × R-2 (manual)
+
+    SALIDA:
+    -------
+    DataFrame Estructura/Cantidad alineado con tokens;
+    Estructura = None si el token no es una estructura válida.
+    """
+
+    # =====================================================
+    # 🔥 ESTADO: solo (P) o sin estado
+    # =====================================================
+    estado = tokens.str.extract(PATRON_ESTADO, expand=False)
+
+    crudo = tokens.str.replace(r"\s*\([EPDR]\)", "", regex=True).str.strip()
+
+    # =====================================================
+    # 🔥 MULTIPLICADOR
+    # =====================================================
+    mult = crudo.str.extract(PATRON_MULTIPLICADOR)
+
+    cantidad = pd.to_numeric(mult[0]).fillna(1).astype("int64")
+    crudo = mult[1].str.strip().fillna(crudo)
+
+    est = limpiar_codigos(crudo)
+
+    validos = (
+        (estado.isna() | (estado == "P"))
+        & (est != "")
+        & est.str.match(PATRON).fillna(False).astype(bool)
+    )
+
+    return pd.DataFrame({
+        "Estructura": est.where(validos, None),
+        "Cantidad": cantidad,
+    })
 
-            # =====================================================
-            # 🔥 SOPORTE DXF + MANUAL
-            # =====================================================
-            if m_tipo:
-                # DXF: solo proyectado
-                if m_tipo.group(1) != "P":
-                    continue
 
-                est_raw = re.sub(r'\s*\([EPDR]\)', '', token)
-            else:
-                # Manual: aceptar directo
-                est_raw = token
+# =========================================================
+# CORE
+# =========================================================
+def _convertir(df: pd.DataFrame):
+    """
+    Tokeniza todos los textos a la vez y limpia cada token
+    distinto una sola vez: en un DXF los mismos códigos se
+    repiten miles de veces.
 
-            # =====================================================
-            # 🔥 MULTIPLICADOR
-            # 3R-2 -> cantidad 3, estructura R-2
-            # R-2  -> cantidad 1, estructura R-2
-            # =====================================================
-            cantidad = 1
+    SALIDA:
+    -------
+    (df_estructuras, df_asignacion)
+    """
 
-            m_mult = re.match(r"^(\d+)([A-Z].*)$", est_raw.strip())
+    filas, df_asignacion = _asignar_puntos(df)
 
-            if m_mult:
-                cantidad = int(m_mult.group(1))
-                est_raw = m_mult.group(2).strip()
+    vacio = pd.DataFrame(columns=["Punto", "Estructura", "Cantidad"])
 
-            est = limpiar_codigo(est_raw)
+    if filas.empty:
+        return vacio, df_asignacion
 
-            if not est:
-                continue
+    tokens = filas["Texto"].str.findall(PATRON_TOKEN).explode().dropna()
 
-            if not PATRON.match(est):
-                continue
+    if tokens.empty:
+        return vacio, df_asignacion
 
-            registros.append({
-                "Punto": punto_actual,
-                "Estructura": est,
-                "Cantidad": cantidad
-            })
+    codigos, unicos = pd.factorize(tokens)
+    estructuras = _tokens_a_estructuras(pd.Series(unicos, dtype=object))
 
-    df_out = pd.DataFrame(registros)
+    df_out = pd.DataFrame({
+        "Punto": filas["Punto"].reindex(tokens.index).to_numpy(),
+        "Estructura": estructuras["Estructura"].to_numpy()[codigos],
+        "Cantidad": estructuras["Cantidad"].to_numpy()[codigos],
+    }).dropna(subset=["Estructura"])
 
     if df_out.empty:
-        return pd.DataFrame(columns=["Punto", "Estructura", "Cantidad"])
+        return vacio, df_asignacion
 
     return (
         df_out
         .groupby(["Punto", "Estructura"], as_index=False)["Cantidad"]
         .sum()
-    )
+    ), df_asignacion
+
+
 # =========================================================
 # API
 # =========================================================
-def normalizar_estructuras(df: pd.DataFrame):
+def normalizar_estructuras(df: pd.DataFrame, detalle: Optional[dict] = None):
+    """
+    detalle (opcional) recibe "asignacion": una fila por texto con
+    el punto asignado, su origen (texto/espacial/orden), la distancia
+    a la etiqueta de punto y si es atípica.
+    """
 
     if not isinstance(df, pd.DataFrame) or df.empty:
         return pd.DataFrame(), ["df inválido o vacío"], []
 
     try:
-        df_norm = _convertir(df)
+        df_norm, df_asignacion = _convertir(df)
+
+        warnings = []
+
+        if not df_asignacion.empty:
+            debug_guardar("ASIGNACION_ESPACIAL", lambda: df_asignacion)
+
+            atipicos = df_asignacion[df_asignacion["Atipico"]]
+
+            if not atipicos.empty:
+                warnings.append(
+                    f"{len(atipicos)} etiquetas asignadas a un punto lejano "
+                    f"(revisar: {', '.join(atipicos['Texto'].str.slice(0, 30).head(5))})"
+                )
+
+        if detalle is not None:
+            detalle["asignacion"] = df_asignacion
 
         if df_norm.empty:
-            return df_norm, ["No se detectaron estructuras"], []
+            return df_norm, ["No se detectaron estructuras"], warnings
 
-        st.write("### DEBUG - df_norm")
-        st.write(df_norm)
+        if en_streamlit():
+            st.write("### DEBUG - df_norm")
+            st.write(df_norm)
 
-        st.write("Shape:", df_norm.shape)
-        st.write("Columnas:", list(df_norm.columns))
+            st.write("Shape:", df_norm.shape)
+            st.write("Columnas:", list(df_norm.columns))
 
-        return df_norm, [], []
+        return df_norm, [], warnings
 
     except Exception as e:
         import traceback
 
-        debug_guardar("DXF_EXCEPTION", {
-            "error": str(e),
-            "traceback": traceback.format_exc()
+        error = str(e)
+        traza = traceback.format_exc()
+
+        debug_guardar("DXF_EXCEPTION", lambda: {
+            "error": error,
+            "traceback": traza
         })
 
         raise
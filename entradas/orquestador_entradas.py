@@ -20,13 +20,23 @@ from entradas.leer_excel import leer_estructuras as leer_excel
 from entradas.leer_tabla import leer_tabla
 from entradas.leer_pdf import leer_pdf
 from entradas.leer_dxf import leer_dxf
+from entradas.leer_dxf_multiple import leer_dxf_multiple
 
 # =========================================================
 # PROCESAMIENTO
 # =========================================================
 from entradas.normalizar import normalizar_estructuras
 from entradas.validacion import validar_estructuras
-from entradas.base_datos import cargar_base_datos
+from entradas.base_datos import obtener_catalogo
+from entradas.codigos import canonizar_columnas, memoria_columnas
+from entradas.cache_entradas import (
+    EntradaProcesada,
+    clave_entrada,
+    guardar_entrada,
+    obtener_entrada,
+    resumen_cache_entradas,
+)
+from ayuda.medicion import etapa
 
 
 # =========================================================
@@ -99,83 +109,163 @@ def ejecutar_entradas(
 
     try:
         # =====================================================
-        # 1. LECTURA
+        # 0. CACHÉ (MISMO ARCHIVO → MISMO RESULTADO)
         # =====================================================
-        df_raw = _leer(entrada.tipo_entrada, entrada.data_entrada)
-
-        debug["lectura"] = _safe_df_info(df_raw)
-
-        if df_raw is None or getattr(df_raw, "empty", True):
-            debug["estado"] = pd.DataFrame({
-                "ok": [False],
-                "fase": ["lectura"],
-                "error": ["df_raw vacío o inválido"]
+        if entrada.tipo_entrada == "dxf" and isinstance(entrada.data_entrada, (list, tuple)):
+            # varias hojas DXF: cada una con su caché, unidas en una
+            with etapa("dxf_multiple") as e:
+                procesada, errores_dxf, informe_dxf = leer_dxf_multiple(entrada.data_entrada)
+                if procesada is not None:
+                    e.salida(procesada.df_estructuras)
+
+            debug.update(informe_dxf)
+
+            if errores_dxf:
+                debug["estado"] = pd.DataFrame({
+                    "ok": [False],
+                    "fase": ["dxf_multiple"],
+                    "error": [str(errores_dxf)]
+                })
+
+                return SalidaEntradas(
+                    ok=False,
+                    errores=errores_dxf,
+                    warnings=[],
+                    debug=debug
+                )
+
+        else:
+            with etapa("cache_entradas"):
+                clave = clave_entrada(entrada.tipo_entrada, entrada.data_entrada)
+                procesada = obtener_entrada(clave)
+
+            debug["cache_entradas"] = pd.DataFrame([{
+                "clave": clave[:24] if clave else None,
+                "acierto": procesada is not None,
+                **resumen_cache_entradas(),
+            }])
+
+        if procesada is None:
+            # =====================================================
+            # 1. LECTURA
+            # =====================================================
+            with etapa("lectura") as e:
+                df_raw = _leer(entrada.tipo_entrada, entrada.data_entrada)
+                e.salida(df_raw)
+
+            debug["lectura"] = _safe_df_info(df_raw)
+
+            if df_raw is None or getattr(df_raw, "empty", True):
+                debug["estado"] = pd.DataFrame({
+                    "ok": [False],
+                    "fase": ["lectura"],
+                    "error": ["df_raw vacío o inválido"]
+                })
+
+                return SalidaEntradas(
+                    ok=False,
+                    errores=["No se pudo leer la entrada"],
+                    warnings=[],
+                    debug=debug
+                )
+
+            # =====================================================
+            # 2. NORMALIZACIÓN
+            # =====================================================
+            detalle_norm: dict = {}
+
+            with etapa("normalizacion", df_raw) as e:
+                df_norm, errores_norm, warnings_norm = normalizar_estructuras(
+                    df_raw, detalle=detalle_norm
+                )
+                e.salida(df_norm)
+
+            debug["normalizacion_df"] = _safe_df_info(df_norm)
+
+            df_asignacion = detalle_norm.get("asignacion")
+
+            if df_asignacion is not None and not df_asignacion.empty:
+                debug["asignacion_espacial"] = df_asignacion
+
+            debug["normalizacion_info"] = pd.DataFrame({
+                "errores": [str(errores_norm)],
+                "warnings": [str(warnings_norm)]
             })
 
-            return SalidaEntradas(
-                ok=False,
-                errores=["No se pudo leer la entrada"],
-                warnings=[],
-                debug=debug
-            )
-
-        # =====================================================
-        # 2. NORMALIZACIÓN
-        # =====================================================
-        df_norm, errores_norm, warnings_norm = normalizar_estructuras(df_raw)
+            if errores_norm:
+                debug["estado"] = pd.DataFrame({
+                    "ok": [False],
+                    "fase": ["normalizacion"]
+                })
+
+                return SalidaEntradas(
+                    ok=False,
+                    errores=errores_norm,
+                    warnings=warnings_norm,
+                    debug=debug
+                )
+
+            # =====================================================
+            # 3. VALIDACIÓN (🔥 FIX)
+            # =====================================================
+            errores_val = validar_estructuras(df_norm)
+
+            debug["validacion"] = pd.DataFrame({
+                "errores": [str(errores_val)]
+            })
 
-        debug["normalizacion_df"] = _safe_df_info(df_norm)
+            if errores_val:
+                # 🔥 NO cortamos el flujo
+                debug["estado"] = pd.DataFrame({
+                    "ok": [True],
+                    "fase": ["validacion_con_errores"]
+                })
 
-        debug["normalizacion_info"] = pd.DataFrame({
-            "errores": [str(errores_norm)],
-            "warnings": [str(warnings_norm)]
-        })
+                # 🔥 Se convierten en warnings
+                warnings_norm = warnings_norm + errores_val
 
-        if errores_norm:
-            debug["estado"] = pd.DataFrame({
-                "ok": [False],
-                "fase": ["normalizacion"]
-            })
+            # Punto / Estructura canónicos (Categorical) desde aquí
+            df_norm = canonizar_columnas(df_norm)
 
-            return SalidaEntradas(
-                ok=False,
-                errores=errores_norm,
+            guardar_entrada(clave, EntradaProcesada(
+                df_estructuras=df_norm,
                 warnings=warnings_norm,
-                debug=debug
-            )
+                errores_validacion=errores_val,
+                asignacion=df_asignacion,
+            ))
 
-        # =====================================================
-        # 3. VALIDACIÓN (🔥 FIX)
-        # =====================================================
-        errores_val = validar_estructuras(df_norm)
+        else:
+            df_norm = procesada.df_estructuras
+            warnings_norm = procesada.warnings
+            errores_val = procesada.errores_validacion
 
-        debug["validacion"] = pd.DataFrame({
-            "errores": [str(errores_val)]
-        })
+            if procesada.asignacion is not None and not procesada.asignacion.empty:
+                debug["asignacion_espacial"] = procesada.asignacion
 
-        if errores_val:
-            # 🔥 NO cortamos el flujo
-            debug["estado"] = pd.DataFrame({
-                "ok": [True],
-                "fase": ["validacion_con_errores"]
-            })
-
-            # 🔥 Se convierten en warnings
-            warnings_norm = warnings_norm + errores_val
+            if errores_val:
+                debug["estado"] = pd.DataFrame({
+                    "ok": [True],
+                    "fase": ["validacion_con_errores"]
+                })
 
         # =====================================================
         # 4. BASE DE DATOS
         # =====================================================
-        base_datos = cargar_base_datos()
+        base_datos = obtener_catalogo()
 
         debug["base_datos"] = pd.DataFrame({
             "hojas": list(base_datos.keys())
         })
 
+        debug["base_datos_memoria"] = pd.DataFrame([
+            base_datos.resumen_memoria()
+        ])
+
         # =====================================================
         # 5. OUTPUT FINAL
         # =====================================================
         debug["output"] = _safe_df_info(df_norm)
+        debug["output_memoria"] = memoria_columnas(df_norm)
 
         if not errores_val:
             debug["estado"] = pd.DataFrame({
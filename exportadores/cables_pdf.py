@@ -34,11 +34,12 @@ def tabla_cables_pdf(datos_proyecto: dict):
     # ----------------------------
     fuente = None
     try:
-        import streamlit as st
-        if isinstance(st.session_state.get("cables_proyecto"), list) and st.session_state["cables_proyecto"]:
-            fuente = st.session_state["cables_proyecto"]
-        elif isinstance(st.session_state.get("cables_proyecto_df"), pd.DataFrame) and not st.session_state["cables_proyecto_df"].empty:
-            fuente = st.session_state["cables_proyecto_df"].to_dict(orient="records")
+        from ayuda.sesion import estado_sesion
+        ss = estado_sesion()
+        if isinstance(ss.get("cables_proyecto"), list) and ss["cables_proyecto"]:
+            fuente = ss["cables_proyecto"]
+        elif isinstance(ss.get("cables_proyecto_df"), pd.DataFrame) and not ss["cables_proyecto_df"].empty:
+            fuente = ss["cables_proyecto_df"].to_dict(orient="records")
     except Exception:
         fuente = None
 
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import pandas as pd
-import streamlit as st
+from ayuda.sesion import estado_sesion
 
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
@@ -240,7 +240,7 @@ def _leer_logistica_streamlit() -> dict:
     Usa los mismos nombres que tu reporte de contratista.
     """
 
-    incluir_logistica = st.session_state.get(
+    incluir_logistica = estado_sesion().get(
         "incluir_logistica",
         True,
     )
@@ -257,25 +257,25 @@ def _leer_logistica_streamlit() -> dict:
         }
 
     horas_grua = _to_float(
-        st.session_state.get("horas_grua", 12)
+        estado_sesion().get("horas_grua", 12)
     )
 
     precio_hora_grua = _to_float(
-        st.session_state.get("precio_hora_grua", 1700)
+        estado_sesion().get("precio_hora_grua", 1700)
     )
 
     costo_flete = _to_float(
-        st.session_state.get("costo_flete", 25000)
+        estado_sesion().get("costo_flete", 25000)
     )
 
     viajes_flete = _to_float(
-        st.session_state.get("viajes_flete", 1)
+        estado_sesion().get("viajes_flete", 1)
     )
 
     ingenieria = _to_float(
-        st.session_state.get(
+        estado_sesion().get(
             "ingenieria",
-            st.session_state.get("gastos_ingenieria", 25000),
+            estado_sesion().get("gastos_ingenieria", 25000),
         )
     )
 
@@ -8,6 +8,7 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.enums import TA_CENTER
 import re
 from exportadores.pdf_base import formatear_tension
+from entradas.codigos import canonizar
 # =========================================================
 # HELPERS
 # =========================================================
@@ -95,7 +96,7 @@ def _desc_postes(df):
     if postes.empty:
         return None
 
-    resumen = postes.groupby("cod")["Cantidad"].sum().reset_index()
+    resumen = postes.groupby("cod", observed=True)["Cantidad"].sum().reset_index()
     partes = [f'{int(r["Cantidad"])} {r["cod"]}' for _, r in resumen.iterrows()]
     total = int(postes["Cantidad"].sum())
 
@@ -111,7 +112,7 @@ def _desc_transformadores(df):
     if trafos.empty:
         return None
 
-    resumen = trafos.groupby("cod")["Cantidad"].sum().reset_index()
+    resumen = trafos.groupby("cod", observed=True)["Cantidad"].sum().reset_index()
     partes = [f'{int(r["Cantidad"])} x {r["cod"]}' for _, r in resumen.iterrows()]
     total = int(trafos["Cantidad"].sum())
 
@@ -451,7 +452,7 @@ def hoja_info_proyecto(datos_proyecto, df_estructuras=None, doc_width=None):
 
     if isinstance(df_estructuras, pd.DataFrame) and not df_estructuras.empty:
         df = df_estructuras.copy()
-        df["cod"] = df["Estructura"].astype(str).str.upper()
+        df["cod"] = canonizar(df["Estructura"], lambda e: e.str.upper())
 
         for fn in [_desc_postes, _desc_transformadores, _desc_luminarias]:
             res = fn(df)
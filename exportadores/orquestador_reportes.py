@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 import pandas as pd
 import traceback
 from exportadores.pdf_contratista import generar_pdf_contratista
@@ -25,6 +25,27 @@ class EntradaReportes:
     df_cables: Optional[pd.DataFrame] = None
     df_costos_materiales: Optional[pd.DataFrame] = None
 
+# =========================================================
+# 🔗 DEPENDENCIAS
+# =========================================================
+# Tablas de entrada que usa cada PDF (aplicacion/incremental.py
+# marca como obsoletos solo los PDF cuyas tablas cambiaron).
+# datos_proyecto, catálogo y cables no figuran: si cambian se
+# recalcula todo.
+DEPENDENCIAS_REPORTES: Dict[str, tuple] = {
+    "estructuras_global.pdf": ("df_estructuras",),
+    "estructuras_por_punto.pdf": ("df_estructuras_por_punto",),
+    "materiales.pdf": ("df_materiales",),
+    "materiales_por_punto.pdf": ("df_materiales_por_punto",),
+    "hoja_info.pdf": ("df_estructuras",),
+    "reporte_completo.pdf": (
+        "df_materiales", "df_estructuras", "df_precios_estructura", "costos",
+    ),
+    "contratista.pdf": ("df_estructuras",),
+    "lista_materiales.pdf": ("df_costos_materiales",),
+}
+
+
 # =========================================================
 # 📄 IMPORTS
 # =========================================================
@@ -36,6 +57,7 @@ from exportadores.pdf_reportes_simples import (
 )
 
 from exportadores.pdf_completo import generar_pdf_completo
+from ayuda.medicion import etapa
 
 
 # =========================================================
@@ -74,7 +96,13 @@ def _validar_df(df, nombre):
 # =========================================================
 # 🚀 ORQUESTADOR
 # =========================================================
-def generar_reportes(entrada: EntradaReportes) -> Dict[str, Any]:
+def generar_reportes(
+    entrada: EntradaReportes,
+    solo: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    solo: nombres de archivo a generar (None = todos).
+    """
 
     debug = {}
     errores_lista = []
@@ -237,15 +265,20 @@ def generar_reportes(entrada: EntradaReportes) -> Dict[str, Any]:
             ),
         ]
 
+        if solo is not None:
+            pedidos = set(solo)
+            tasks = [t for t in tasks if t[0] in pedidos]
+
         # =====================================================
         # EJECUCIÓN
         # =====================================================
         for nombre_archivo, fn in tasks:
 
-            contenido, err = _safe_exec(
-                nombre_archivo,
-                fn
-            )
+            with etapa(nombre_archivo):
+                contenido, err = _safe_exec(
+                    nombre_archivo,
+                    fn
+                )
 
             if err:
                 errores_lista.append(err)
@@ -15,7 +15,7 @@ from reportlab.lib import colors
 from io import BytesIO
 
 import pandas as pd
-import streamlit as st
+from ayuda.sesion import estado_sesion
 
 
 from materiales.calculos.calculo_estructuras import (
@@ -404,7 +404,8 @@ def tabla_presupuesto_general(df_detalle):
         df_detalle
         .groupby(
             "Estructura",
-            as_index=False
+            as_index=False,
+            observed=True
         )
         .agg({
             "Cantidad": "sum",
@@ -435,32 +436,32 @@ def tabla_presupuesto_general(df_detalle):
             f"L {r['Subtotal']:,.2f}",
         ])
 
-    if st.session_state.get(
+    if estado_sesion().get(
         "incluir_logistica",
         True
     ):
 
-        horas = st.session_state.get(
+        horas = estado_sesion().get(
             "horas_grua",
             12
         )
 
-        precio = st.session_state.get(
+        precio = estado_sesion().get(
             "precio_hora_grua",
             1700
         )
 
-        flete = st.session_state.get(
+        flete = estado_sesion().get(
             "costo_flete",
             25000
         )
 
-        viajes = st.session_state.get(
+        viajes = estado_sesion().get(
             "viajes_flete",
             1
         )
 
-        ingenieria = st.session_state.get(
+        ingenieria = estado_sesion().get(
             "ingenieria",
             25000
         )
@@ -540,7 +541,8 @@ def tabla_presupuesto(df_detalle):
         df_base
         .groupby(
             "Estructura",
-            as_index=False
+            as_index=False,
+            observed=True
         )
         .agg({
             "Cantidad": "sum",
@@ -710,33 +712,33 @@ def tabla_desmontajes():
 
 def tabla_logistica():
 
-    if not st.session_state.get(
+    if not estado_sesion().get(
         "incluir_logistica",
         True
     ):
         return None
 
-    horas = st.session_state.get(
+    horas = estado_sesion().get(
         "horas_grua",
         12
     )
 
-    precio = st.session_state.get(
+    precio = estado_sesion().get(
         "precio_hora_grua",
         1700
     )
 
-    flete = st.session_state.get(
+    flete = estado_sesion().get(
         "costo_flete",
         25000
     )
 
-    viajes = st.session_state.get(
+    viajes = estado_sesion().get(
         "viajes_flete",
         1
     )
 
-    ingenieria = st.session_state.get(
+    ingenieria = estado_sesion().get(
         "ingenieria",
         25000
     )
@@ -1040,7 +1042,7 @@ def tabla_detalle_por_punto(df_detalle):
 
 def generar_pdf_contratista(entrada):
 
-    contratista = st.session_state.get(
+    contratista = estado_sesion().get(
         "contratista",
         "C1"
     )
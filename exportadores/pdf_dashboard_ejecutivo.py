@@ -144,6 +144,12 @@ def draw_donut_chart(c, x, y, data_dict):
 # =========================================================
 
 def draw_gantt(c, x, y, actividades):
+    """
+    actividades: (nombre, dias) una detrás de otra, o
+    (nombre, dias, inicio) con el día de inicio (se pueden
+    traslapar, como en el programa con cuadrillas en paralelo).
+    Más de 40 días se comprimen al mismo ancho.
+    """
 
     row_h = 24
 
@@ -157,6 +163,19 @@ def draw_gantt(c, x, y, actividades):
 
     total_w = left_w + dur_w + max_dias * day_w
 
+    # día final de cada barra
+    current = 0
+    ultimo = 0
+
+    for item in actividades:
+        dias = item[1]
+        inicio = item[2] - 1 if len(item) > 2 and item[2] else current
+        current = inicio + dias
+        ultimo = max(ultimo, current)
+
+    escala = min(1.0, max_dias / ultimo) if ultimo else 1.0
+    paso = math.ceil(1 / escala)
+
     total_h = (len(actividades) + 1) * row_h
 
     rect_round(
@@ -188,19 +207,24 @@ def draw_gantt(c, x, y, actividades):
 
     c.drawString(x + left_w + 10, y - 16, "DÍAS")
 
-    for d in range(max_dias):
+    for d in range(0, math.ceil(max_dias / escala), paso):
 
-        dx = x + left_w + dur_w + d * day_w
+        dx = x + left_w + dur_w + d * day_w * escala
 
         c.drawCentredString(
-            dx + 6,
+            dx + day_w * escala / 2,
             y - 16,
             str(d + 1)
         )
 
     current = 0
 
-    for idx, (nombre, dias) in enumerate(actividades):
+    for idx, item in enumerate(actividades):
+
+        nombre, dias = item[0], item[1]
+
+        if len(item) > 2 and item[2]:
+            current = item[2] - 1
 
         yy = y - row_h * (idx + 2)
 
@@ -216,9 +240,9 @@ def draw_gantt(c, x, y, actividades):
             str(dias)
         )
 
-        bar_x = x + left_w + dur_w + current * day_w
+        bar_x = x + left_w + dur_w + current * day_w * escala
 
-        bar_w = dias * day_w
+        bar_w = dias * day_w * escala
 
         c.setFillColor(colors.HexColor("#1565C0"))
 
@@ -442,8 +466,17 @@ def generar_pdf_dashboard_ejecutivo(
         "CRONOGRAMA DE OBRA"
     )
 
+    # cronograma de costos_proyecto (en serie o con cuadrillas en
+    # paralelo); sin cronograma se usa el ejemplo de siempre
     actividades = [
 
+        (item["actividad"], int(item["duracion_dias"]), item.get("inicio"))
+
+        for item in resultado.get("cronograma_resumen") or []
+
+        if item.get("duracion_dias")
+    ] or [
+
         ("Levantamiento", 1),
 
         ("Agujeros", 4),
@@ -24,6 +24,7 @@ from exportadores.pdf_base import (
 )
 
 from ayuda.debug import debug_guardar
+from entradas.codigos import canonizar
 
 
 # ==========================================================
@@ -42,7 +43,7 @@ def _debug_indice(base_datos):
 
     if isinstance(df_indice, pd.DataFrame):
         debug_guardar("PDF", "INDICE_COLUMNAS", list(df_indice.columns))
-        debug_guardar("PDF", "INDICE_PREVIEW", df_indice.head(3))
+        debug_guardar("PDF", "INDICE_PREVIEW", lambda: df_indice.head(3))
 
 
 # ==========================================================
@@ -99,7 +100,7 @@ def generar_pdf_materiales(df_mat, nombre_proy, datos_proyecto=None):
         return buffer.getvalue()
 
     df_agrupado = (
-        df_mat.groupby(["Materiales", "Unidad"], as_index=False)["Cantidad"]
+        df_mat.groupby(["Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"]
         .sum()
     )
 
@@ -162,12 +163,9 @@ def generar_pdf_estructuras_global(df_estructuras, nombre_proy, base_datos=None,
     # ======================================================
     col_codigo = "CODIGO" if "CODIGO" in df.columns else "Estructura"
 
-    df[col_codigo] = (
-        df[col_codigo]
-        .astype(str)
-        .str.replace(r"\s+", "", regex=True)
-        .str.strip()
-        .str.upper()
+    df[col_codigo] = canonizar(
+        df[col_codigo],
+        lambda c: c.str.replace(r"\s+", "", regex=True).str.strip().str.upper(),
     )
 
     if "Descripcion" not in df.columns:
@@ -182,7 +180,7 @@ def generar_pdf_estructuras_global(df_estructuras, nombre_proy, base_datos=None,
     # ======================================================
     # AGRUPACIÓN
     # ======================================================
-    df = df.groupby(col_codigo, as_index=False).agg({
+    df = df.groupby(col_codigo, as_index=False, observed=True).agg({
         "Cantidad": "sum",
         "Descripcion": "first"
     })
@@ -484,12 +482,12 @@ def generar_pdf_materiales_por_punto(df, nombre_proy, datos_proyecto=None):
         doc.build(elems)
         return buffer.getvalue()
 
-    for punto, df_p in df.groupby("Punto"):
+    for punto, df_p in df.groupby("Punto", observed=True):
 
         elems.append(Paragraph(f"<b>{punto}</b>", styles["Heading2"]))
 
         df_agr = (
-            df_p.groupby(["Materiales", "Unidad"], as_index=False)["Cantidad"]
+            df_p.groupby(["Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"]
             .sum()
         )
 
@@ -8,6 +8,7 @@ from reportlab.lib.styles import ParagraphStyle
 
 # 🔥 IMPORT DEL ESTILO GLOBAL
 from exportadores.pdf_base import estilo_tabla
+from entradas.codigos import canonizar
 
 def _numero_seguro(valor, default=0.0) -> float:
     valor = pd.to_numeric(valor, errors="coerce")
@@ -58,11 +59,7 @@ def generar_tabla_precios_estructura(
 
         df_tmp = df_estructuras.copy()
 
-        df_tmp["Estructura"] = (
-            df_tmp["Estructura"]
-            .astype(str)
-            .str.strip()
-        )
+        df_tmp["Estructura"] = canonizar(df_tmp["Estructura"], lambda e: e.str.strip())
 
         df_tmp["Cantidad"] = pd.to_numeric(
             df_tmp["Cantidad"],
@@ -70,7 +67,7 @@ def generar_tabla_precios_estructura(
         ).fillna(0)
 
         cantidades = (
-            df_tmp.groupby("Estructura")["Cantidad"]
+            df_tmp.groupby("Estructura", observed=True)["Cantidad"]
             .sum()
             .to_dict()
         )
@@ -132,7 +132,7 @@ def calcular_costos_por_punto(
     # RESUMEN COSTOS
     # =====================================================
     df_resumen_costos_punto = (
-        df_costos_por_punto.groupby("Punto")["Subtotal Precio"]
+        df_costos_por_punto.groupby("Punto", observed=True)["Subtotal Precio"]
         .sum()
         .reset_index()
         .rename(columns={"Subtotal Precio": "TOTAL_COSTO_PUNTO"})
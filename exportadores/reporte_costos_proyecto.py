@@ -13,6 +13,8 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.platypus.tables import TableStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.charts.barcharts import VerticalBarChart
 
 
 styles = getSampleStyleSheet()
@@ -751,13 +753,33 @@ def _bloque_cronograma(elementos, resultado):
             "BACKGROUND",
             (col_inicio, fila_idx),
             (col_fin, fila_idx),
-            colors.HexColor("#1565C0"),
+            colors.HexColor("#C62828" if item.get("critica") else "#1565C0"),
         ))
 
     tabla.setStyle(TableStyle(style))
 
     elementos.append(tabla)
 
+    # programa con cuadrillas en paralelo (programacion_obra)
+    tiempos = resultado.get("tiempos") or {}
+
+    if tiempos.get("cuadrillas"):
+        criticas = [
+            item.get("actividad", "")
+            for item in cronograma
+            if item.get("critica")
+        ]
+
+        elementos.append(Spacer(1, 4))
+        elementos.append(
+            Paragraph(
+                f"{int(tiempos['cuadrillas'])} cuadrilla(s) en paralelo; "
+                f"sin límite de cuadrillas: {int(tiempos.get('dias_ruta_critica', 0))} días. "
+                f"Ruta crítica (en rojo): {' → '.join(criticas) or '—'}.",
+                st["nota"],
+            )
+        )
+
     if max_dia > max_visible:
         elementos.append(Spacer(1, 4))
         elementos.append(
@@ -851,6 +873,133 @@ def _bloque_evaluacion(elementos, resultado):
     elementos.append(Spacer(1, 12))
 
 
+# =====================================================
+# SIMULACIÓN MONTE CARLO
+# =====================================================
+_INDICADORES_SIMULACION = [
+    ("costo_total_real", "Costo total real", _fmt_lps),
+    ("utilidad", "Utilidad", _fmt_lps),
+    ("margen_pct", "Margen", _fmt_pct),
+    ("dias_totales", "Días estimados", lambda v: f"{_to_float(v):,.0f}"),
+]
+
+
+def _grafico_histograma(df_hist, ancho=430, alto=120):
+
+    dibujo = Drawing(ancho, alto)
+
+    grafico = VerticalBarChart()
+    grafico.x = 40
+    grafico.y = 18
+    grafico.width = ancho - 50
+    grafico.height = alto - 28
+    grafico.data = [[int(f) for f in df_hist["Frecuencia"]]]
+    grafico.categoryAxis.categoryNames = [""] * len(df_hist)
+    grafico.categoryAxis.labels.fontSize = 6
+    grafico.valueAxis.valueMin = 0
+    grafico.valueAxis.labels.fontSize = 6
+    grafico.bars[0].fillColor = colors.HexColor("#0B3B63")
+    grafico.bars[0].strokeColor = None
+    grafico.barSpacing = 0.5
+
+    dibujo.add(grafico)
+
+    return dibujo
+
+
+def _bloque_simulacion(elementos, resultado):
+
+    simulacion = resultado.get("simulacion")
+
+    if not isinstance(simulacion, dict) or not simulacion.get("ok"):
+        return
+
+    df = simulacion.get("df_percentiles")
+
+    if df is None or df.empty:
+        return
+
+    st = _estilos()
+
+    elementos.append(
+        Paragraph(
+            f"Simulación Monte Carlo ({int(simulacion.get('muestras', 0)):,} muestras)",
+            st["subtitulo"],
+        )
+    )
+
+    columnas = ["Determinista"] + [c for c in df.columns if str(c).startswith("P")]
+    filas = df.set_index("Indicador")
+
+    data = [["Indicador"] + columnas]
+
+    for clave, nombre, fmt in _INDICADORES_SIMULACION:
+        if clave in filas.index:
+            data.append([nombre] + [fmt(filas.at[clave, c]) for c in columnas])
+
+    tabla = Table(
+        data,
+        colWidths=[130] + [300 / len(columnas)] * len(columnas),
+        repeatRows=1,
+    )
+
+    tabla.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0B3B63")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 8),
+
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), 7.3),
+
+        ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+
+        ("GRID", (0, 0), (-1, -1), 0.30, colors.HexColor("#D9E2EC")),
+
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [
+            colors.white,
+            colors.HexColor("#F7F9FB"),
+        ]),
+
+        ("TOPPADDING", (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+    ]))
+
+    elementos.append(tabla)
+    elementos.append(Spacer(1, 6))
+
+    elementos.append(
+        Paragraph(
+            f"Probabilidad de pérdida: {_fmt_pct(simulacion.get('probabilidad_perdida', 0))}",
+            st["texto"],
+        )
+    )
+
+    if simulacion.get("cuadrillas"):
+        elementos.append(
+            Paragraph(
+                f"Días por muestra con el programa de {int(simulacion['cuadrillas'])} cuadrillas "
+                f"(misma asignación y orden; cambian las duraciones).",
+                st["texto"],
+            )
+        )
+
+    df_hist = simulacion.get("histogramas", {}).get("costo_total_real")
+
+    if df_hist is not None and not df_hist.empty:
+        elementos.append(
+            Paragraph(
+                f"Distribución del costo total real "
+                f"({_fmt_lps(df_hist['Desde'].iloc[0])} a {_fmt_lps(df_hist['Hasta'].iloc[-1])})",
+                st["texto"],
+            )
+        )
+        elementos.append(_grafico_histograma(df_hist))
+
+    elementos.append(Spacer(1, 14))
+
+
 # =====================================================
 # BLOQUE COMPLETO
 # =====================================================
@@ -894,6 +1043,11 @@ def construir_bloque_costos(
         resultado,
     )
 
+    _bloque_simulacion(
+        elementos,
+        resultado,
+    )
+
     _bloque_evaluacion(
         elementos,
         resultado,
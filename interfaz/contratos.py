@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 import pandas as pd
-from typing import Optional, Literal, Dict, Any, List
+from typing import Optional, Literal, Dict, Any, List, Mapping
 
 
 # =========================================================
@@ -42,7 +42,7 @@ class SalidaEntradas:
 
     df_estructuras: pd.DataFrame = field(default_factory=pd.DataFrame)
 
-    base_datos: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    base_datos: Mapping[str, pd.DataFrame] = field(default_factory=dict)
 
     datos_proyecto: Dict[str, Any] = field(default_factory=dict)
 
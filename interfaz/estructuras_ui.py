@@ -15,7 +15,7 @@ from entradas.estructuras import (
     crear_nuevo_punto,
 )
 
-from entradas.base_datos import cargar_base_datos
+from entradas.base_datos import obtener_hoja
 
 
 # =========================================================
@@ -24,17 +24,14 @@ from entradas.base_datos import cargar_base_datos
 def _obtener_opciones_desde_orquestador() -> dict:
 
     try:
-        base_datos = cargar_base_datos()
-        df_indice = base_datos.get("INDICE", pd.DataFrame())
+        # hoja compartida del catálogo (columnas ya normalizadas): no mutar
+        df_indice = obtener_hoja(None, "INDICE")
     except:
         return {}
 
-    if df_indice.empty or "CODIGO" not in df_indice.columns:
+    if df_indice is None or df_indice.empty or "CODIGO" not in df_indice.columns:
         return {}
 
-    df_indice = df_indice.copy()
-    df_indice.columns = df_indice.columns.str.strip().str.upper()
-
     def clasificar(c):
         c = str(c).upper()
         if c.startswith("PC"): return "Poste"
@@ -46,11 +43,11 @@ def _obtener_opciones_desde_orquestador() -> dict:
         elif c.startswith("LL"): return "Luminarias"
         return "Otros"
 
-    df_indice["CATEGORIA"] = df_indice["CODIGO"].apply(clasificar)
+    categorias = df_indice["CODIGO"].apply(clasificar)
 
     opciones = {}
 
-    for cat, g in df_indice.groupby("CATEGORIA"):
+    for cat, g in df_indice.groupby(categorias):
         opciones[cat] = {
             "valores": sorted(g["CODIGO"].dropna().unique().tolist()),
             "etiquetas": {
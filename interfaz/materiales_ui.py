@@ -2,6 +2,7 @@
 # interfaz/materiales_ui.py
 
 from __future__ import annotations
+from collections.abc import Mapping
 import streamlit as st
 import pandas as pd
 
@@ -24,16 +25,17 @@ def seccion_adicionar_material():
     # =====================================================
     # CARGAR CATÁLOGO
     # =====================================================
-    from entradas.base_datos import cargar_base_datos
+    from entradas.base_datos import obtener_catalogo
 
-    base = cargar_base_datos()
+    # catálogo compartido del proceso: solo lectura
+    base = obtener_catalogo()
 
     catalogo_df = pd.DataFrame(
         columns=["Materiales", "Unidad"]
     )
 
     # La base normalmente viene como dict de hojas
-    if isinstance(base, dict):
+    if isinstance(base, Mapping):
 
         posibles_hojas = [
             "MATERIALES",
@@ -47,7 +49,7 @@ def seccion_adicionar_material():
             df_hoja = base.get(nombre_hoja)
 
             if isinstance(df_hoja, pd.DataFrame) and not df_hoja.empty:
-                catalogo_df = df_hoja.copy()
+                catalogo_df = df_hoja
                 break
 
     elif isinstance(base, pd.DataFrame):
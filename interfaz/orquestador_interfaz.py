@@ -12,7 +12,7 @@ from interfaz.contratos import SalidaInterfaz
 # =========================================================
 # ORQUESTADOR APP
 # =========================================================
-from aplicacion.orquestador_proyecto import ejecutar_proyecto
+from aplicacion.incremental import actualizar_reportes, ejecutar_proyecto_incremental
 
 # =========================================================
 # UI
@@ -22,7 +22,7 @@ from interfaz.datos_proyecto import seccion_datos_proyecto
 from interfaz.cables_ui import seccion_cables
 from interfaz.estructuras_ui import seccion_entrada_estructuras
 from interfaz.exportacion_ui import seccion_exportacion
-from ayuda.debug import seccion_debug
+from ayuda.debug import debug_activo, debug_guardar, debug_limpiar, seccion_debug
 from interfaz.materiales_ui import seccion_adicionar_material
 
 # =========================================================
@@ -37,6 +37,7 @@ def _init_state():
         "cables_proyecto_df": pd.DataFrame(),
         "df_materiales_extra": None,
         "resultado_calculo": None,
+        "estado_incremental": None,
         "ejecutar_proyecto_flag": False,
         "debug_pipeline": {},
     }
@@ -102,13 +103,16 @@ def renderizar_estructuras():
         data = st.file_uploader("Subir PDF", type=["pdf"])
 
     elif modo == "dxf":
-        data = st.file_uploader("Subir DXF", type=["dxf"])
+        # un alimentador grande viene en varias hojas
+        data = st.file_uploader("Subir DXF", type=["dxf"], accept_multiple_files=True) or None
 
     if data is not None and modo != "manual":
         st.session_state["data_entrada"] = data
         st.session_state["resultado_calculo"] = None
 
-        if hasattr(data, "name"):
+        if isinstance(data, list):
+            st.success(f"✅ {len(data)} archivo(s) cargado(s): {', '.join(a.name for a in data)}")
+        elif hasattr(data, "name"):
             st.success(f"✅ Archivo cargado: {data.name}")
         else:
             st.success("✅ Datos cargados correctamente")
@@ -145,10 +149,16 @@ def renderizar_final():
 
     if st.session_state.get("ejecutar_proyecto_flag"):
 
-        with st.spinner("Ejecutando proyecto completo..."):
-            resultado = ejecutar_proyecto(salida_interfaz)
+        # Solo se recalculan los puntos editados desde la última
+        # ejecución (si no hay estado o cambió otra cosa, todo)
+        with st.spinner("Ejecutando proyecto..."):
+            resultado, estado = ejecutar_proyecto_incremental(
+                salida_interfaz,
+                st.session_state.get("estado_incremental"),
+            )
 
         st.session_state["resultado_calculo"] = resultado
+        st.session_state["estado_incremental"] = estado
         st.session_state["ejecutar_proyecto_flag"] = False
 
         if resultado and resultado.ok:
@@ -164,6 +174,13 @@ def renderizar_exportacion():
         st.warning("⚠️ Debes ejecutar el cálculo primero.")
         return
 
+    # PDF marcados como obsoletos por el recálculo incremental
+    estado = st.session_state.get("estado_incremental")
+
+    if estado is not None and estado.resultado is resultado and estado.obsoletos:
+        with st.spinner(f"Actualizando {len(estado.obsoletos)} reportes..."):
+            actualizar_reportes(estado)
+
     seccion_exportacion()
 
 
@@ -264,7 +281,16 @@ def ejecutar_orquestador_interfaz(
         if hasattr(resultado, "debug") and isinstance(resultado.debug, dict):
             debug_actual.update(resultado.debug)
 
-    st.session_state["debug_pipeline"] = debug_actual
+    if not debug_activo():
+        return resultado
+
+    # Pasa por el buffer con tope (nivel summary/full)
+    debug_limpiar()
+
+    for bloque, contenido in debug_actual.items():
+        debug_guardar(bloque, contenido)
+
+    debug_actual = st.session_state.get("debug_pipeline", {})
 
     # =========================================================
     # 🔥 DEBUG VISUAL EN TABLAS
@@ -79,5 +79,5 @@ def materiales_desde_cables(df_cables: Optional[pd.DataFrame]) -> pd.DataFrame:
 
     out = pd.DataFrame(filas)
     # Consolidar por si hay calibres repetidos
-    out = out.groupby(["Materiales", "Unidad"], as_index=False)["Cantidad"].sum()
+    out = out.groupby(["Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"].sum()
     return out
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from entradas.base_datos import CatalogoBase
+from materiales.calculos.lector_materiales import _limpiar_str, _parse_tension_col
+
+# ==========================================================
+# BOM COMPILADA (ESTRUCTURA × MATERIAL × TENSIÓN)
+# ==========================================================
+# Todas las hojas de estructuras se convierten una sola vez en
+# una tabla larga. Reemplaza a leer_hoja_materiales() por fila:
+# detección de columnas, regex de tensión y limpieza con .apply
+# se hacen aquí, no en cada cálculo.
+VERSION_BOM = 2
+
+HOJAS_CATALOGO = {"INDICE", "MATERIALES", "INTERNOS", "CONECTORES"}
+
+POSIBLES_MATERIAL = ["MATERIALES", "MATERIAL", "DESCRIPCION", "DESCRIPCIÓN"]
+
+COLUMNAS_BOM = ["Estructura", "Orden", "Fila", "Materiales", "Unidad", "Cantidad"]
+
+COLUMNAS_TENSION = ["Estructura", "Orden", "Tension"]
+
+
+# ==========================================================
+# COMPILACIÓN DE UNA HOJA
+# ==========================================================
+def _compilar_hoja(nombre: str, df: pd.DataFrame):
+    """
+    SALIDA:
+    -------
+    (df_bom, df_tensiones) o str con el error de la hoja.
+
+    Misma lógica que leer_hoja_materiales(): primera columna de
+    materiales reconocida, UNIDAD opcional, y filas con cantidad > 0
+    y material no vacío.
+    """
+
+    columnas = {}
+    for c in df.columns:
+        columnas.setdefault(str(c).strip().upper(), c)
+
+    col_material = next((c for c in columnas if c in POSIBLES_MATERIAL), None)
+
+    if col_material is None:
+        return f"No se encontró columna de materiales: {list(columnas)}"
+
+    materiales = df[columnas[col_material]].apply(_limpiar_str)
+
+    if "UNIDAD" in columnas:
+        unidad = df[columnas["UNIDAD"]].apply(_limpiar_str)
+    else:
+        unidad = pd.Series("", index=df.index)
+
+    material_valido = (
+        (materiales != "")
+        & (~materiales.str.lower().isin(["nan", "none"]))
+    )
+
+    fila = np.arange(len(df))
+
+    partes = []
+    tensiones = []
+
+    for orden, c in enumerate(columnas):
+
+        valor = _parse_tension_col(c)
+
+        if valor is None:
+            continue
+
+        tensiones.append((nombre, orden, valor))
+
+        cantidad = pd.to_numeric(df[columnas[c]], errors="coerce").fillna(0)
+        mask = ((cantidad > 0) & material_valido).to_numpy()
+
+        if not mask.any():
+            continue
+
+        partes.append(pd.DataFrame({
+            "Estructura": nombre,
+            "Orden": orden,
+            "Fila": fila[mask],
+            "Materiales": materiales.to_numpy()[mask],
+            "Unidad": unidad.to_numpy()[mask],
+            "Cantidad": cantidad.to_numpy(dtype=float)[mask],
+        }))
+
+    df_bom = (
+        pd.concat(partes, ignore_index=True)
+        if partes else pd.DataFrame(columns=COLUMNAS_BOM)
+    )
+
+    return df_bom, pd.DataFrame(tensiones, columns=COLUMNAS_TENSION)
+
+
+def _tension(tension) -> float:
+    if tension is None:
+        raise ValueError("tension es None")
+
+    try:
+        return float(tension)
+    except Exception:
+        raise ValueError(f"tension inválida: {tension}")
+
+
+# ==========================================================
+# MATRIZ DISPERSA POR TENSIÓN
+# ==========================================================
+@dataclass
+class MatrizBOM:
+    """
+    Matriz estructura × material en formato COO (sin scipy).
+
+    filas/columnas/valores describen los elementos no nulos;
+    multiplicar() es un producto vector × matriz con np.bincount.
+    """
+
+    tension: float
+    estructuras: pd.Index
+    materiales: pd.DataFrame  # Materiales, Unidad (una fila por columna)
+    filas: np.ndarray
+    columnas: np.ndarray
+    valores: np.ndarray
+
+    def multiplicar(self, cantidades: pd.Series) -> pd.DataFrame:
+        """
+        cantidades: Serie indexada por código de estructura.
+        Estructuras que no están en la matriz se ignoran.
+        """
+
+        x = np.zeros(len(self.estructuras))
+
+        if len(cantidades):
+            pos = self.estructuras.get_indexer(cantidades.index)
+            ok = pos >= 0
+            np.add.at(x, pos[ok], cantidades.to_numpy(dtype=float)[ok])
+
+        totales = np.bincount(
+            self.columnas,
+            weights=self.valores * x[self.filas],
+            minlength=len(self.materiales),
+        )
+
+        df = self.materiales.assign(Cantidad=totales)
+
+        return df[df["Cantidad"] > 0].reset_index(drop=True)
+
+
+# ==========================================================
+# BOM COMPLETA
+# ==========================================================
+@dataclass
+class BOMEstructuras:
+    df: pd.DataFrame            # COLUMNAS_BOM, todas las tensiones
+    df_tensiones: pd.DataFrame  # COLUMNAS_TENSION
+    hojas: set
+    vacias: set
+    errores: Dict[str, str]
+
+    _cache: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __getstate__(self):
+        estado = dict(self.__dict__)
+        estado["_cache"] = {}
+        return estado
+
+    # -------------------------
+    # Tabla por tensión
+    # -------------------------
+    def para_tension(self, tension: float) -> pd.DataFrame:
+        """
+        SALIDA:
+        -------
+        DataFrame: Estructura, Materiales, Unidad (Categorical),
+        Cantidad
+
+        Por estructura se usa la PRIMERA columna cuya tensión
+        difiere menos de 0.1 (igual que leer_hoja_materiales).
+        """
+
+        tension = _tension(tension)
+        clave = ("tabla", tension)
+
+        if clave in self._cache:
+            return self._cache[clave]
+
+        t = self.df_tensiones
+        elegidas = (
+            t[(t["Tension"] - tension).abs() < 0.1]
+            .drop_duplicates("Estructura", keep="first")
+        )
+
+        df = self.df.merge(
+            elegidas[["Estructura", "Orden"]],
+            on=["Estructura", "Orden"],
+            how="inner",
+        )
+
+        df = (
+            df.sort_values(["Estructura", "Fila"], kind="stable")
+            [["Estructura", "Materiales", "Unidad", "Cantidad"]]
+            .reset_index(drop=True)
+        )
+
+        # Los códigos viajan como Categorical (ver entradas/codigos.py)
+        for c in ("Estructura", "Materiales", "Unidad"):
+            df[c] = df[c].astype("category")
+
+        self._cache[clave] = df
+        return df
+
+    def por_estructura(self, tension: float) -> Dict[str, pd.DataFrame]:
+        tension = _tension(tension)
+        clave = ("dict", tension)
+
+        if clave not in self._cache:
+            df = self.para_tension(tension)
+            self._cache[clave] = {
+                cod: g[["Materiales", "Unidad", "Cantidad"]].reset_index(drop=True)
+                for cod, g in df.groupby("Estructura", sort=False, observed=True)
+            }
+
+        return self._cache[clave]
+
+    def matriz(self, tension: float) -> MatrizBOM:
+        tension = _tension(tension)
+        clave = ("matriz", tension)
+
+        if clave in self._cache:
+            return self._cache[clave]
+
+        df = self.para_tension(tension)
+
+        filas, estructuras = pd.factorize(df["Estructura"], sort=True)
+
+        pares = pd.MultiIndex.from_arrays([df["Materiales"], df["Unidad"]])
+        columnas, materiales = pd.factorize(pares, sort=True)
+
+        matriz = MatrizBOM(
+            tension=tension,
+            estructuras=pd.Index(estructuras),
+            materiales=pd.DataFrame({
+                "Materiales": materiales.get_level_values(0),
+                "Unidad": materiales.get_level_values(1),
+            }),
+            filas=filas.astype(np.int64),
+            columnas=columnas.astype(np.int64),
+            valores=df["Cantidad"].to_numpy(dtype=float),
+        )
+
+        self._cache[clave] = matriz
+        return matriz
+
+
+def compilar_bom(
+    hojas_base: Mapping,
+    estructuras: Optional[Iterable[str]] = None,
+) -> BOMEstructuras:
+    """
+    Compila las hojas de estructuras a una BOM larga.
+
+    estructuras=None → todas las hojas salvo las de catálogo.
+    """
+
+    if estructuras is None:
+        nombres = [n for n in hojas_base if n not in HOJAS_CATALOGO]
+    else:
+        nombres = [str(e).strip().upper() for e in dict.fromkeys(estructuras)]
+
+    leer = (
+        hojas_base.leer_hoja
+        if isinstance(hojas_base, CatalogoBase)
+        else hojas_base.get
+    )
+
+    partes = []
+    tensiones = []
+    hojas = set()
+    vacias = set()
+    errores = {}
+
+    for nombre in nombres:
+
+        if nombre not in hojas_base:
+            continue
+
+        df = leer(nombre)
+
+        if not isinstance(df, pd.DataFrame):
+            continue
+
+        hojas.add(nombre)
+
+        if df.empty:
+            vacias.add(nombre)
+            continue
+
+        resultado = _compilar_hoja(nombre, df)
+
+        if isinstance(resultado, str):
+            errores[nombre] = resultado
+            continue
+
+        partes.append(resultado[0])
+        tensiones.append(resultado[1])
+
+    df_bom = (
+        pd.concat(partes, ignore_index=True)
+        if partes else pd.DataFrame(columns=COLUMNAS_BOM)
+    )
+
+    df_tensiones = (
+        pd.concat(tensiones, ignore_index=True)
+        if tensiones else pd.DataFrame(columns=COLUMNAS_TENSION)
+    )
+
+    return BOMEstructuras(
+        df=df_bom,
+        df_tensiones=df_tensiones,
+        hojas=hojas,
+        vacias=vacias,
+        errores=errores,
+    )
+
+
+def obtener_bom(
+    hojas_base: Mapping,
+    estructuras: Optional[Iterable[str]] = None,
+) -> BOMEstructuras:
+    """
+    Catálogo compartido → BOM completa cacheada junto al snapshot.
+    dict simple → se compilan solo las estructuras pedidas.
+    """
+
+    if isinstance(hojas_base, CatalogoBase):
+        return hojas_base.derivado("bom", VERSION_BOM, compilar_bom)
+
+    return compilar_bom(hojas_base, estructuras)
@@ -161,7 +161,7 @@ def calcular_estructuras_global(df_estructuras) -> pd.DataFrame:
     )
 
     debug_guardar("GLOBAL", "RESULTADO", "FILAS", len(df_out))
-    debug_guardar("GLOBAL", "RESULTADO", "PREVIEW", df_out.head(10))
+    debug_guardar("GLOBAL", "RESULTADO", "PREVIEW", lambda: df_out.head(10))
 
     return df_out
 
@@ -187,12 +187,12 @@ def calcular_estructuras_por_punto(df_estructuras) -> pd.DataFrame:
 
     df_out = (
         df
-        .groupby(["Punto", "Estructura"], as_index=False)["Cantidad"]
+        .groupby(["Punto", "Estructura"], as_index=False, observed=True)["Cantidad"]
         .sum()
     )
 
     debug_guardar("POR_PUNTO", "RESULTADO", "FILAS", len(df_out))
-    debug_guardar("POR_PUNTO", "PUNTOS", df_out["Punto"].unique().tolist())
+    debug_guardar("POR_PUNTO", "PUNTOS", lambda: df_out["Punto"].unique().tolist())
 
     return df_out
 
@@ -255,3 +255,72 @@ def calcular_estructuras_proyecto(df_estructuras):
     debug_guardar("PROYECTO", "SALIDA", "df_por_punto_shape", resultado["df_estructuras_por_punto"].shape)
 
     return resultado
+
+
+# ==========================================================
+# DESDE LA TABLA EXPANDIDA (MOTOR ÚNICO)
+# ==========================================================
+def _cantidad_entera(cantidad: pd.Series) -> pd.Series:
+    if len(cantidad) and (cantidad % 1 == 0).all():
+        return cantidad.astype("int64")
+    return cantidad
+
+
+def estructuras_desde_filas(filas: pd.DataFrame) -> dict:
+    """
+    filas: salida de expandir_estructuras() (Punto, Codigo,
+    Cantidad, Descripcion).
+
+    SALIDA:
+    -------
+    Mismo dict que calcular_estructuras_proyecto(), sin volver a
+    normalizar ni recorrer la lista de estructuras.
+    """
+
+    if filas is None or filas.empty:
+        return {
+            "df_estructuras": pd.DataFrame(columns=["Estructura", "Cantidad", "Descripcion"]),
+            "df_estructuras_por_punto": pd.DataFrame(columns=["Punto", "Estructura", "Cantidad"]),
+            "descripcion_estructuras": {},
+        }
+
+    df = filas.drop(columns="Estructura").rename(columns={"Codigo": "Estructura"})
+    df["Cantidad"] = _cantidad_entera(df["Cantidad"].fillna(1))
+
+    df_global = (
+        df
+        .groupby("Estructura", as_index=False, observed=True)
+        .agg({
+            "Cantidad": "sum",
+            "Descripcion": "first"
+        })
+    )
+
+    df_por_punto = (
+        df
+        .groupby(["Punto", "Estructura"], as_index=False, observed=True)["Cantidad"]
+        .sum()
+    )
+
+    etiquetas = (
+        df_por_punto["Estructura"].astype(str)
+        + " ("
+        + df_por_punto["Cantidad"].astype(int).astype(str)
+        + ")"
+    )
+
+    descripcion = (
+        etiquetas
+        .groupby(df_por_punto["Punto"], sort=True, observed=True)
+        .agg(", ".join)
+        .to_dict()
+    )
+
+    debug_guardar("PROYECTO", "SALIDA", "df_estructuras_shape", df_global.shape)
+    debug_guardar("PROYECTO", "SALIDA", "df_por_punto_shape", df_por_punto.shape)
+
+    return {
+        "df_estructuras": df_global,
+        "df_estructuras_por_punto": df_por_punto,
+        "descripcion_estructuras": descripcion,
+    }
@@ -1,9 +1,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+from collections.abc import Mapping
 import pandas as pd
 
-from materiales.calculos.materiales_puntos import calcular_materiales_por_punto
+from materiales.calculos.materiales_puntos import (
+    expandir_estructuras,
+    materiales_por_estructura_desde_bom,
+    materiales_por_punto_desde_filas,
+)
+from materiales.calculos.calculo_estructuras import estructuras_desde_filas
+from materiales.calculos.bom_estructuras import obtener_bom
 from ayuda.debug import debug_guardar
+from ayuda.medicion import etapa
+from entradas.codigos import canonizar
 from materiales.cables.cables_materiales import materiales_desde_cables
 COLUMNAS_STD = ["Materiales", "Unidad", "Cantidad"]
 
@@ -34,8 +43,8 @@ def _validar_hojas_base(hojas_base):
     if hojas_base is None:
         raise ValueError("hojas_base es None")
 
-    if not isinstance(hojas_base, dict):
-        raise TypeError("hojas_base debe ser dict[str, DataFrame]")
+    if not isinstance(hojas_base, Mapping):
+        raise TypeError("hojas_base debe ser Mapping[str, DataFrame]")
 
     if not hojas_base:
         raise ValueError("hojas_base está vacío")
@@ -74,26 +83,14 @@ def _normalizar_estructuras(df: pd.DataFrame) -> pd.DataFrame:
 
     df = df.copy()
 
-    df["Estructura"] = (
-        df["Estructura"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-    )
+    df["Estructura"] = canonizar(df["Estructura"])
 
     return df
 
 
-def _normalizar_df_materiales(df: pd.DataFrame) -> pd.DataFrame:
-
-    import re
-
-    df = df.copy()
-
-    # 🔥 NORMALIZAR MATERIAL (CLAVE)
-    df["Materiales"] = (
-        df["Materiales"]
-        .astype(str)
+def _limpiar_material(materiales: pd.Series) -> pd.Series:
+    return (
+        materiales
         .str.upper()
         .str.replace(r'\s+', ' ', regex=True)   # elimina espacios dobles
         .str.replace('"', '')                  # elimina comillas
@@ -101,13 +98,16 @@ def _normalizar_df_materiales(df: pd.DataFrame) -> pd.DataFrame:
         .str.strip()
     )
 
+
+def _normalizar_df_materiales(df: pd.DataFrame) -> pd.DataFrame:
+
+    df = df.copy()
+
+    # 🔥 NORMALIZAR MATERIAL (CLAVE): sobre las categorías, no las filas
+    df["Materiales"] = canonizar(df["Materiales"], _limpiar_material)
+
     # 🔧 UNIDAD
-    df["Unidad"] = (
-        df["Unidad"]
-        .astype(str)
-        .str.upper()
-        .str.strip()
-    )
+    df["Unidad"] = canonizar(df["Unidad"])
 
     # 🔧 CANTIDAD
     df["Cantidad"] = pd.to_numeric(df["Cantidad"], errors="coerce").fillna(0.0)
@@ -120,7 +120,7 @@ def _validar_match_estructuras(df_estructuras, hojas_base):
 
     estructuras = df_estructuras["Estructura"].unique()
 
-    debug_guardar("CALCULO::estructuras_unicas", list(estructuras)[:50])
+    debug_guardar("CALCULO::estructuras_unicas", lambda: list(estructuras)[:50])
 
     faltantes = [e for e in estructuras if e not in hojas_base]
 
@@ -137,7 +137,7 @@ def _consolidar(df: pd.DataFrame) -> pd.DataFrame:
 
     return (
         df
-        .groupby(["Materiales", "Unidad"], as_index=False)["Cantidad"]
+        .groupby(["Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"]
         .sum()
         .sort_values(["Materiales", "Unidad"])
         .reset_index(drop=True)
@@ -145,8 +145,57 @@ def _consolidar(df: pd.DataFrame) -> pd.DataFrame:
 
 
 # =========================================================
-# FUNCIÓN PRINCIPAL
+# CABLES + CONSOLIDADO GLOBAL
 # =========================================================
+def integrar_cables(
+    df_global: pd.DataFrame,
+    df_detalle: pd.DataFrame,
+    df_cables=None,
+):
+    """
+    SALIDA:
+    -------
+    (df_global, df_detalle) con los materiales de cables sumados.
+
+    df_global sale consolidado y validado. Con cables, df_detalle
+    se consolida sin Punto (como siempre).
+    """
+
+    df_cables_mat = materiales_desde_cables(df_cables)
+
+    if isinstance(df_cables_mat, pd.DataFrame) and not df_cables_mat.empty:
+
+        df_cables_mat = _normalizar_df_materiales(df_cables_mat)
+
+        df_global = _normalizar_df_materiales(
+            pd.concat([df_global, df_cables_mat], ignore_index=True)
+        )
+
+        df_detalle = pd.concat(
+            [df_detalle, df_cables_mat],
+            ignore_index=True
+        )
+
+        df_detalle = (
+            _normalizar_df_materiales(df_detalle)
+            .groupby(["Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"]
+            .sum()
+        )
+
+        debug_guardar("CALCULO::cables_integrados", {
+            "filas_cables": len(df_cables_mat)
+        })
+
+    # -----------------------------
+    # CONSOLIDADO GLOBAL
+    # -----------------------------
+    df_global = _consolidar(df_global)
+    df_global = _normalizar_df_materiales(df_global)
+    _validar_df_salida(df_global)
+
+    return df_global, df_detalle
+
+
 # =========================================================
 # FUNCIÓN PRINCIPAL
 # =========================================================
@@ -159,6 +208,20 @@ def calcular_materiales_proyecto(
     tabla_conectores_mt=None,
     df_cables=None,  # 🔥 NUEVO
 ) -> dict:
+    """
+    Motor único: las estructuras se expanden una vez y de esa tabla
+    salen todas las vistas.
+
+    SALIDA:
+    -------
+    dict:
+        - df_materiales
+        - df_materiales_por_punto
+        - df_materiales_por_estructura
+        - df_estructuras
+        - df_estructuras_por_punto
+        - descripcion_estructuras
+    """
 
     from materiales.cables.cables_materiales import materiales_desde_cables
 
@@ -190,22 +253,37 @@ def calcular_materiales_proyecto(
     # -----------------------------
     _validar_match_estructuras(df_estructuras, hojas_base)
 
+    # -----------------------------
+    # EXPANSIÓN ÚNICA + BOM COMPILADA
+    # -----------------------------
+    with etapa("expansion", df_estructuras) as e:
+        filas = expandir_estructuras(df_estructuras)
+        cantidades = filas.groupby("Codigo", sort=False, observed=True)["Cantidad"].sum()
+        e.salida(filas)
+
+    with etapa("bom", cantidades) as e:
+        bom = obtener_bom(hojas_base, cantidades.index)
+        e.salida(bom.df)
+
     # -----------------------------
     # CÁLCULO DETALLE (ESTRUCTURAS)
     # -----------------------------
     try:
-        df_detalle = calcular_materiales_por_punto(
-            hojas_base=hojas_base,
-            df_estructuras=df_estructuras,
-            tension=tension,
-            calibre_mt=calibre_mt,
-            tabla_conectores_mt=tabla_conectores_mt
-        )
+        with etapa("por_punto", filas) as e:
+            df_detalle = materiales_por_punto_desde_filas(
+                hojas_base=hojas_base,
+                filas=filas,
+                tension=tension,
+                bom=bom,
+                calibre_mt=calibre_mt,
+                tabla_conectores_mt=tabla_conectores_mt,
+            )
+            e.salida(df_detalle)
     except Exception as e:
         raise RuntimeError(f"Error en materiales_por_punto: {e}")
 
     if not isinstance(df_detalle, pd.DataFrame):
-        raise TypeError("calcular_materiales_por_punto no devolvió DataFrame")
+        raise TypeError("materiales_por_punto_desde_filas no devolvió DataFrame")
 
     df_detalle = _normalizar_df_materiales(df_detalle)
     _validar_df_salida(df_detalle)
@@ -213,33 +291,14 @@ def calcular_materiales_proyecto(
     # =====================================================
     # 🔥 INTEGRACIÓN DE CABLES (AQUÍ ESTÁ LA MAGIA)
     # =====================================================
-    df_cables_mat = materiales_desde_cables(df_cables)
-
-    if isinstance(df_cables_mat, pd.DataFrame) and not df_cables_mat.empty:
-
-        df_cables_mat = _normalizar_df_materiales(df_cables_mat)
-
-        df_detalle = pd.concat(
-            [df_detalle, df_cables_mat],
-            ignore_index=True
-        )
-
-        df_detalle = (
-            df_detalle
-            .groupby(["Materiales", "Unidad"], as_index=False)["Cantidad"]
-            .sum()
+    # Global = cantidades por estructura × matriz BOM de la tensión
+    with etapa("global", cantidades) as e:
+        df_global = _normalizar_df_materiales(
+            bom.matriz(tension).multiplicar(cantidades)
         )
+        e.salida(df_global)
 
-        debug_guardar("CALCULO::cables_integrados", {
-            "filas_cables": len(df_cables_mat)
-        })
-
-    # -----------------------------
-    # CONSOLIDADO GLOBAL
-    # -----------------------------
-    df_global = _consolidar(df_detalle)
-    df_global = _normalizar_df_materiales(df_global)
-    _validar_df_salida(df_global)
+    df_global, df_detalle = integrar_cables(df_global, df_detalle, df_cables)
 
     # -----------------------------
     # DEBUG OUTPUT
@@ -255,5 +314,9 @@ def calcular_materiales_proyecto(
     return {
         "ok": True,
         "df_materiales": df_global,
-        "df_materiales_por_punto": df_detalle
+        "df_materiales_por_punto": df_detalle,
+        "df_materiales_por_estructura": materiales_por_estructura_desde_bom(
+            bom, filas["Codigo"], tension
+        ),
+        **estructuras_desde_filas(filas),
     }
@@ -36,7 +36,7 @@ def leer_hoja_materiales(df: pd.DataFrame, tension: float) -> pd.DataFrame | Non
     # DEBUG ENTRADA
     # =========================
     debug_guardar("lector_input_shape", getattr(df, "shape", None))
-    debug_guardar("lector_input_columns_raw", list(df.columns) if df is not None else None)
+    debug_guardar("lector_input_columns_raw", lambda: list(df.columns) if df is not None else None)
     debug_guardar("lector_tension", tension)
 
     # =========================
@@ -54,13 +54,15 @@ def leer_hoja_materiales(df: pd.DataFrame, tension: float) -> pd.DataFrame | Non
     except Exception:
         raise ValueError(f"tension inválida: {tension}")
 
-    df = df.copy()
+    # La hoja puede venir del catálogo compartido: no se copia ni se muta
+    columnas = {}
+    for c in df.columns:
+        columnas.setdefault(str(c).strip().upper(), c)
 
     # =========================
     # NORMALIZAR COLUMNAS (🔥 CLAVE)
     # =========================
-    df.columns = [str(c).strip().upper() for c in df.columns]
-    debug_guardar("lector_columns_normalized", list(df.columns))
+    debug_guardar("lector_columns_normalized", list(columnas))
 
     # =========================
     # DETECTAR COLUMNA MATERIALES
@@ -74,7 +76,7 @@ def leer_hoja_materiales(df: pd.DataFrame, tension: float) -> pd.DataFrame | Non
 
     col_material = None
 
-    for c in df.columns:
+    for c in columnas:
         if c in posibles_material:
             col_material = c
             break
@@ -82,26 +84,16 @@ def leer_hoja_materiales(df: pd.DataFrame, tension: float) -> pd.DataFrame | Non
     if col_material is None:
         debug_guardar("lector_error", {
             "msg": "No se encontró columna de materiales",
-            "columnas": list(df.columns)
+            "columnas": list(columnas)
         })
-        raise ValueError(f"No se encontró columna de materiales: {df.columns}")
-
-    df["Materiales"] = df[col_material]
-
-    # =========================
-    # UNIDAD
-    # =========================
-    if "UNIDAD" in df.columns:
-        df["Unidad"] = df["UNIDAD"]
-    else:
-        df["Unidad"] = ""
+        raise ValueError(f"No se encontró columna de materiales: {list(columnas)}")
 
     # =========================
     # DETECTAR COLUMNA TENSIÓN
     # =========================
     col_tension = None
 
-    for c in df.columns:
+    for c in columnas:
         c_val = _parse_tension_col(c)
 
         if c_val is None:
@@ -120,11 +112,15 @@ def leer_hoja_materiales(df: pd.DataFrame, tension: float) -> pd.DataFrame | Non
     # =========================
     # LIMPIEZA
     # =========================
-    df["Materiales"] = df["Materiales"].apply(_limpiar_str)
-    df["Unidad"] = df["Unidad"].apply(_limpiar_str)
+    materiales = df[columnas[col_material]].apply(_limpiar_str)
 
-    df[col_tension] = pd.to_numeric(
-        df[col_tension],
+    if "UNIDAD" in columnas:
+        unidad = df[columnas["UNIDAD"]].apply(_limpiar_str)
+    else:
+        unidad = pd.Series("", index=df.index)
+
+    cantidad = pd.to_numeric(
+        df[columnas[col_tension]],
         errors="coerce"
     ).fillna(0)
 
@@ -132,23 +128,22 @@ def leer_hoja_materiales(df: pd.DataFrame, tension: float) -> pd.DataFrame | Non
     # FILTRO
     # =========================
     mask = (
-        (df[col_tension] > 0)
-        & (df["Materiales"] != "")
-        & (~df["Materiales"].str.lower().isin(["nan", "none"]))
+        (cantidad > 0)
+        & (materiales != "")
+        & (~materiales.str.lower().isin(["nan", "none"]))
     )
 
-    df_out = df.loc[
-        mask,
-        ["Materiales", "Unidad", col_tension]
-    ].copy()
-
-    df_out.rename(columns={col_tension: "Cantidad"}, inplace=True)
+    df_out = pd.DataFrame({
+        "Materiales": materiales[mask],
+        "Unidad": unidad[mask],
+        "Cantidad": cantidad[mask],
+    })
 
     # =========================
     # DEBUG SALIDA
     # =========================
     debug_guardar("lector_output_shape", df_out.shape)
-    debug_guardar("lector_output_preview", df_out.head(10))
+    debug_guardar("lector_output_preview", lambda: df_out.head(10))
 
     # =========================
     # VALIDACIÓN FINAL (CONTRATO)
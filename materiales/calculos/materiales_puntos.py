@@ -3,8 +3,9 @@ from __future__ import annotations
 
 import pandas as pd
 
+from entradas.codigos import canonizar, es_categorica
 from entradas.normalizar import limpiar_codigo
-from materiales.calculos.lector_materiales import leer_hoja_materiales
+from materiales.calculos.bom_estructuras import obtener_bom
 
 COLUMNAS_STD = ["Materiales", "Unidad", "Cantidad"]
 
@@ -24,6 +25,122 @@ def _normalizar_codigo(estructura: str) -> str:
     return estructura
 
 
+# ==========================================================
+# ESTRUCTURAS POR FILA (VECTORIZADO)
+# ==========================================================
+def _cantidad_o_uno(valor) -> float:
+    try:
+        return float(valor)
+    except Exception:
+        return 1.0
+
+
+def _primera_no_vacia(df: pd.DataFrame, columnas, defecto) -> list:
+    """
+    Equivalente por columnas de row.get(a) or row.get(b) or defecto.
+    """
+
+    valores = [defecto] * len(df)
+
+    for c in reversed(columnas):
+        if c in df.columns:
+            valores = [v or d for v, d in zip(df[c].tolist(), valores)]
+
+    return valores
+
+
+def _cantidades(df: pd.DataFrame) -> pd.Series:
+    """
+    cantidad → Cantidad → 1; valores no convertibles valen 1.0.
+    """
+
+    if "cantidad" in df.columns:
+        bruto = df["cantidad"]
+    elif "Cantidad" in df.columns:
+        bruto = df["Cantidad"]
+    else:
+        return pd.Series(1.0, index=df.index)
+
+    cantidad = pd.to_numeric(bruto, errors="coerce").astype(float)
+
+    # Solo los valores que no convierte to_numeric pasan por float()
+    faltantes = cantidad.isna()
+
+    if faltantes.any():
+        cantidad.loc[faltantes] = [
+            _cantidad_o_uno(v) for v in bruto[faltantes]
+        ]
+
+    return cantidad
+
+
+def _descripciones(df: pd.DataFrame) -> list:
+    columna = next(
+        (c for c in df.columns if str(c).strip().lower() == "descripcion"),
+        None,
+    )
+
+    if columna is None:
+        return [""] * len(df)
+
+    return df[columna].astype(str).tolist()
+
+
+def _punto_o_general(puntos: pd.Series) -> pd.Series:
+    return puntos.map(lambda p: str(p).strip() or "General")
+
+
+def _columna_codigo(df: pd.DataFrame, columnas, defecto):
+    """
+    Igual que _primera_no_vacia(), pero si solo existe una de las
+    columnas y es Categorical se devuelve tal cual (sin tolist).
+    """
+
+    presentes = [c for c in columnas if c in df.columns]
+
+    if len(presentes) == 1 and es_categorica(df[presentes[0]]):
+        return df[presentes[0]].reset_index(drop=True)
+
+    return pd.Series(_primera_no_vacia(df, columnas, defecto), dtype=object)
+
+
+def expandir_estructuras(df_estructuras: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabla intermedia única de la que salen materiales y estructuras.
+
+    SALIDA:
+    -------
+    DataFrame: Punto, Estructura (texto original), Codigo, Cantidad,
+    Descripcion
+
+    Punto, Estructura y Codigo salen Categorical; la limpieza se
+    hace una vez por valor distinto. Filas con cantidad <= 0 o sin
+    estructura se omiten.
+    """
+
+    punto = _columna_codigo(df_estructuras, ["Punto", "punto"], "")
+    estructura = _columna_codigo(
+        df_estructuras, ["codigodeestructura", "Estructura"], ""
+    )
+
+    filas = pd.DataFrame({
+        "Punto": canonizar(punto, _punto_o_general),
+        "Estructura": estructura.astype("category"),
+        "Cantidad": _cantidades(df_estructuras).to_numpy(),
+        "Descripcion": _descripciones(df_estructuras),
+    })
+
+    validas = ~(filas["Cantidad"] <= 0) & (filas["Estructura"] != "")
+    filas = filas[validas].reset_index(drop=True)
+
+    filas["Estructura"] = filas["Estructura"].cat.remove_unused_categories()
+    filas["Codigo"] = canonizar(
+        filas["Estructura"], lambda e: e.map(_normalizar_codigo)
+    )
+
+    return filas
+
+
 # ==========================================================
 # MATERIAL POR ESTRUCTURA (BASE)
 # ==========================================================
@@ -34,6 +151,7 @@ def calcular_materiales_estructura(
     tension,
     calibre_mt=None,
     tabla_conectores_mt=None,
+    bom=None,
 ):
 
     estructura = _normalizar_codigo(estructura)
@@ -49,16 +167,28 @@ def calcular_materiales_estructura(
     if cantidad <= 0:
         raise ValueError(f"Cantidad inválida para {estructura}: {cantidad}")
 
-    df_hoja = hojas_base.get(estructura)
+    if bom is None:
+        bom = obtener_bom(hojas_base, [estructura])
 
-    if df_hoja is None or not isinstance(df_hoja, pd.DataFrame):
+    if estructura not in bom.hojas:
         raise ValueError(f"Estructura no encontrada o inválida: {estructura}")
 
+    # Mismo orden de validación que leer_hoja_materiales()
+    if estructura in bom.vacias:
+        raise ValueError(f"Sin materiales para {estructura} @ {tension}")
+
     try:
-        df_filtrado = leer_hoja_materiales(df_hoja, tension)
+        tabla = bom.por_estructura(tension)
     except Exception as e:
         raise RuntimeError(f"Error leyendo hoja {estructura}: {e}")
 
+    if estructura in bom.errores:
+        raise RuntimeError(
+            f"Error leyendo hoja {estructura}: {bom.errores[estructura]}"
+        )
+
+    df_filtrado = tabla.get(estructura)
+
     if df_filtrado is None or df_filtrado.empty:
         raise ValueError(f"Sin materiales para {estructura} @ {tension}")
 
@@ -89,62 +219,99 @@ def calcular_materiales_por_punto(
     tension,
     calibre_mt=None,
     tabla_conectores_mt=None,
+    bom=None,
 ):
 
     if df_estructuras is None or df_estructuras.empty:
         return pd.DataFrame(columns=["Punto", "Materiales", "Unidad", "Cantidad"])
 
-    resultados = []
-    errores = []
+    filas = expandir_estructuras(df_estructuras)
 
-    for row in df_estructuras.to_dict("records"):
+    if bom is None:
+        bom = obtener_bom(hojas_base, filas["Codigo"].unique())
 
-        punto = str(row.get("Punto") or row.get("punto") or "").strip() or "General"
+    return materiales_por_punto_desde_filas(
+        hojas_base=hojas_base,
+        filas=filas,
+        tension=tension,
+        bom=bom,
+        calibre_mt=calibre_mt,
+        tabla_conectores_mt=tabla_conectores_mt,
+    )
 
-        estructura = (
-            row.get("codigodeestructura")
-            or row.get("Estructura")
-            or ""
-        )
 
-        try:
-            cantidad = float(row.get("cantidad", row.get("Cantidad", 1)))
-        except Exception:
-            cantidad = 1.0
+def materiales_por_punto_desde_filas(
+    hojas_base,
+    filas: pd.DataFrame,
+    tension,
+    bom,
+    calibre_mt=None,
+    tabla_conectores_mt=None,
+) -> pd.DataFrame:
+    """
+    filas: salida de expandir_estructuras().
+    """
+
+    # -----------------------------
+    # Errores por estructura (una vez por código, no por fila);
+    # solo los códigos sin BOM pasan por la validación completa
+    # -----------------------------
+    try:
+        tabla = bom.por_estructura(tension)
+    except Exception:
+        tabla = {}
+
+    errores_estructura = {}
 
-        if cantidad <= 0 or not estructura:
+    for estructura, codigo in (
+        filas[["Estructura", "Codigo"]].drop_duplicates().itertuples(index=False)
+    ):
+        if codigo in tabla:
             continue
 
         try:
-            # ✔️ CORRECTO: aquí sí multiplicamos
-            df_mat = calcular_materiales_estructura(
+            calcular_materiales_estructura(
                 hojas_base=hojas_base,
                 estructura=estructura,
-                cantidad=cantidad,
+                cantidad=1,
                 tension=tension,
                 calibre_mt=calibre_mt,
                 tabla_conectores_mt=tabla_conectores_mt,
+                bom=bom,
             )
+        except Exception as e:
+            errores_estructura[estructura] = str(e)
 
-            df_mat = df_mat.copy()
-            df_mat["Punto"] = punto
+    con_error = filas["Estructura"].isin(list(errores_estructura))
 
-            resultados.append(df_mat)
+    errores = [
+        f"{e}: {errores_estructura[e]}"
+        for e in filas.loc[con_error, "Estructura"]
+    ]
 
-        except Exception as e:
-            errores.append(f"{estructura}: {e}")
+    filas = filas[~con_error]
 
-    if not resultados:
+    if filas.empty:
         raise ValueError(
             f"No se pudo calcular ningún material. "
             f"Errores: {errores[:5]}"
         )
 
-    df_final = pd.concat(resultados, ignore_index=True)
+    # -----------------------------
+    # Un solo merge filas × BOM
+    # -----------------------------
+    df_bom = bom.para_tension(tension).rename(
+        columns={"Estructura": "Codigo", "Cantidad": "Unitario"}
+    )
+
+    df_final = filas[["Punto", "Codigo", "Cantidad"]].merge(
+        df_bom, on="Codigo", how="inner", sort=False
+    )
+    df_final["Cantidad"] = df_final["Unitario"] * df_final["Cantidad"]
 
     df_final = (
         df_final
-        .groupby(["Punto", "Materiales", "Unidad"], as_index=False)["Cantidad"]
+        .groupby(["Punto", "Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"]
         .sum()
         .sort_values(["Punto", "Materiales"])
         .reset_index(drop=True)
@@ -162,6 +329,7 @@ def calcular_materiales_por_estructura(
     tension,
     calibre_mt=None,
     tabla_conectores_mt=None,
+    bom=None,
 ):
 
     if df_estructuras is None or df_estructuras.empty:
@@ -177,6 +345,11 @@ def calcular_materiales_por_estructura(
         .unique()
     )
 
+    if bom is None:
+        bom = obtener_bom(
+            hojas_base, [_normalizar_codigo(e) for e in estructuras_unicas]
+        )
+
     for estructura in estructuras_unicas:
 
         try:
@@ -187,6 +360,7 @@ def calcular_materiales_por_estructura(
                 tension=tension,
                 calibre_mt=calibre_mt,
                 tabla_conectores_mt=tabla_conectores_mt,
+                bom=bom,
             )
 
             cod = _normalizar_codigo(estructura)
@@ -196,3 +370,21 @@ def calcular_materiales_por_estructura(
             continue
 
     return resultado
+
+
+def materiales_por_estructura_desde_bom(bom, codigos, tension) -> dict:
+    """
+    Igual que calcular_materiales_por_estructura() pero sin volver
+    a validar cada código: los que no tienen BOM se omiten.
+    """
+
+    try:
+        tabla = bom.por_estructura(tension)
+    except Exception:
+        return {}
+
+    return {
+        cod: tabla[cod].copy()
+        for cod in dict.fromkeys(codigos)
+        if cod in tabla
+    }
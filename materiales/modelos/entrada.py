@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping
 import pandas as pd
 
+from entradas.codigos import canonizar
+
 
 @dataclass(slots=True)
 class EntradaMateriales:
     estructuras_df: pd.DataFrame
     tension: float
-    base_datos: Dict[str, pd.DataFrame]
+    base_datos: Mapping[str, pd.DataFrame]
 
     # 👇 NUEVO (CLAVE)
     datos_proyecto: Optional[Dict[str, Any]] = None
@@ -58,9 +60,7 @@ class EntradaMateriales:
             raise ValueError("estructuras_df debe contener columna 'Estructura'")
 
         # limpiar valores
-        self.estructuras_df["Estructura"] = (
-            self.estructuras_df["Estructura"].astype(str).str.strip().str.upper()
-        )
+        self.estructuras_df["Estructura"] = canonizar(self.estructuras_df["Estructura"])
 
         # 🔥 asegurar Cantidad
         if "Cantidad" not in self.estructuras_df.columns:
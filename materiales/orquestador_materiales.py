@@ -18,17 +18,10 @@ from materiales.modelos.entrada import EntradaMateriales
 # CÁLCULO
 # =========================================================
 from materiales.calculos.calculo_materiales import (calcular_materiales_proyecto)
-from materiales.calculos.materiales_puntos import (
-    calcular_materiales_por_estructura,
-)
 from materiales.validaciones.materiales_validacion import (
     validar_datos_proyecto,
 )
 
-from materiales.calculos.calculo_estructuras import (
-    calcular_estructuras_proyecto
-)
-
 # =========================================================
 # DEBUG
 # =========================================================
@@ -71,7 +64,7 @@ def _merge_materiales(df_a, df_b):
     df["Cantidad"] = pd.to_numeric(df["Cantidad"], errors="coerce").fillna(0.0)
 
     return (
-        df.groupby(["Materiales", "Unidad"], as_index=False)["Cantidad"]
+        df.groupby(["Materiales", "Unidad"], as_index=False, observed=True)["Cantidad"]
         .sum()
         .sort_values(["Materiales", "Unidad"])
         .reset_index(drop=True)
@@ -134,7 +127,9 @@ def ejecutar_materiales(
             df_estructuras=df_norm,
             hojas_base=hojas_base,
             tension=float(tension) if tension is not None else None,
-            df_cables=entrada.df_cables, 
+            calibre_mt=entrada.calibre_mt,
+            tabla_conectores_mt=entrada.tabla_conectores_mt,
+            df_cables=entrada.df_cables,
         )
 
         debug["calculo_materiales"] = {
@@ -162,56 +157,22 @@ def ejecutar_materiales(
         )
 
     # =====================================================
-    # 🔥 NUEVO: MATERIALES POR ESTRUCTURA
+    # 2. MATERIALES POR ESTRUCTURA Y ESTRUCTURAS
+    #    (misma expansión que el cálculo de materiales)
     # =====================================================
-    materiales_por_estructura = calcular_materiales_por_estructura(
-        hojas_base=hojas_base,
-        df_estructuras=df_norm,
-        tension=tension,
-        calibre_mt=entrada.calibre_mt,
-        tabla_conectores_mt=entrada.tabla_conectores_mt,
-    )
+    materiales_por_estructura = resultado_calc.get("df_materiales_por_estructura") or {}
+    df_estructuras = resultado_calc.get("df_estructuras")
+    df_estructuras_por_punto = resultado_calc.get("df_estructuras_por_punto")
 
     debug_guardar("MATERIALES_POR_ESTRUCTURA_FULL", {
         "total": len(materiales_por_estructura),
         "keys": list(materiales_por_estructura.keys())[:20]
     })
 
-    # =====================================================
-    # 2. CÁLCULO ESTRUCTURAS
-    # =====================================================
-    try:
-        resultado_estructuras = calcular_estructuras_proyecto(df_norm)
-
-        df_estructuras = resultado_estructuras.get("df_estructuras")
-        df_estructuras_por_punto = resultado_estructuras.get("df_estructuras_por_punto")
-
-        debug["calculo_estructuras"] = {
-            "filas": len(df_estructuras) if isinstance(df_estructuras, pd.DataFrame) else 0
-        }
-
-    except Exception as e:
-        import traceback
-
-        debug["calculo_estructuras"] = {
-            "ok": False,
-            "error": str(e),
-            "traceback": traceback.format_exc(),
-            "df_norm_shape": df_norm.shape if isinstance(df_norm, pd.DataFrame) else None,
-            "df_norm_columns": list(df_norm.columns) if isinstance(df_norm, pd.DataFrame) else None,
-            "df_norm_preview": (
-                df_norm.head(30).to_dict("records")
-                if isinstance(df_norm, pd.DataFrame)
-                else None
-            ),
-        }
-
-        debug_guardar("ERROR_CALCULO_ESTRUCTURAS", debug["calculo_estructuras"])
+    debug["calculo_estructuras"] = {
+        "filas": len(df_estructuras) if isinstance(df_estructuras, pd.DataFrame) else 0
+    }
 
-        raise RuntimeError(
-            f"Falló calcular_estructuras_proyecto(). "
-            f"Error real: {e}"
-        ) from e
     # =====================================================
     # 3. EXTRAER RESULTADOS
     # =====================================================
@@ -262,6 +223,7 @@ def ejecutar_materiales(
         df_materiales_por_punto=df_detalle,
         df_estructuras=df_estructuras,
         df_estructuras_por_punto=df_estructuras_por_punto,
+        descripcion_estructuras=resultado_calc.get("descripcion_estructuras"),
 
         # 🔥 AQUÍ ESTÁ LA CLAVE
         df_materiales_por_estructura=materiales_por_estructura,